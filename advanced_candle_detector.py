@@ -2,6 +2,10 @@
 """
 고급 캔들 패턴 감지기 - 개선 버전
 더 정교한 패턴 인식 + 다양한 패턴 추가
+
+- AdvancedCandleDetector: 지정 봉 하나씩 패턴 판정
+- detect_all_vectorized / detect_panel_vectorized: 전체 구간(전 종목) 봉별 패턴 + 신뢰도를 한 번에 계산
+- scan_dates_with_candles: 종목 1회 조회로 여러 기준일 scan_with_candles 결과 계산
 """
 
 import sys
@@ -106,8 +110,8 @@ class AdvancedCandleDetector:
     
     def _avg_range(self, n: int = 20) -> float:
         """평균 범위"""
-        ranges = [self._candle_range(i) for i in range(-n, 0)]
-        return np.mean(ranges) if ranges else 1.0
+        ranges = self.highs[-n:] - self.lows[-n:]
+        return np.mean(ranges) if len(ranges) else 1.0
     
     def _avg_volume(self, n: int = 20) -> float:
         """평균 거래량"""
@@ -306,6 +310,273 @@ class AdvancedCandleDetector:
         # 신뢰도 높은 순으로 정렬
         patterns.sort(key=lambda x: x['reliability'], reverse=True)
         return patterns[0]
+    
+    def detect_all_vectorized(self, min_reliability: int = 4) -> pd.DataFrame:
+        """전체 구간 봉별 패턴 감지 (detect_all_vectorized 참고)"""
+        arrays = (self.opens, self.highs, self.lows, self.closes, self.volumes)
+        result = _detect_arrays(*[np.asarray(a, dtype=float) for a in arrays],
+                                np.arange(len(self.closes)), min_reliability)
+        return _pattern_frame(result, self.df.index)
+
+
+# 벡터화 패턴 컬럼 (detect_all_patterns 우선순위 순서)
+VECTOR_PATTERNS = ('pinbar', 'hammer', 'bullish_engulfing', 'morning_star')
+
+
+def _shift(x: np.ndarray, k: int) -> np.ndarray:
+    """k봉 전 값 (앞부분은 NaN, 종목 경계는 pos 조건으로 걸러냄)"""
+    out = np.full(len(x), np.nan)
+    if k < len(x):
+        out[k:] = x[:len(x) - k]
+    return out
+
+
+def _rolling_mean(x: np.ndarray, pos: np.ndarray, n: int) -> np.ndarray:
+    """
+    최근 n봉 평균 (봉 수가 n 미만이면 있는 만큼) - np.mean(x[-n:])과 동일
+    누적합 차분이라 정수 가격/거래량이면 결과가 정확히 같다.
+    """
+    cs = np.concatenate(([0.0], np.cumsum(x, dtype=float)))
+    idx = np.arange(len(x))
+    lo = idx - np.minimum(pos, n - 1)
+    return (cs[idx + 1] - cs[lo]) / (idx + 1 - lo)
+
+
+def _rolling_extreme(x: np.ndarray, pos: np.ndarray, n: int, func) -> np.ndarray:
+    """최근 n봉 최대/최소 (func = np.fmax / np.fmin)"""
+    out = x.copy()
+    for k in range(1, n):
+        shifted = _shift(x, k)
+        valid = pos >= k
+        out[valid] = func(out[valid], shifted[valid])
+    return out
+
+
+def _detect_arrays(o, h, l, c, v, pos, min_reliability: int = 4) -> Dict[str, np.ndarray]:
+    """
+    봉별 패턴 신뢰도 배열 계산 (detect_* 메서드를 idx=-1로 부른 결과와 동일)
+
+    pos는 종목 내 봉 순번 (0부터). 이전 봉 참조는 pos로 종목 경계를 넘지 않게 막는다.
+    패턴이 없으면 신뢰도 0.
+    """
+    body = np.abs(c - o)
+    rng = h - l
+    upper = h - np.maximum(o, c)
+    lower = np.minimum(o, c) - l
+    bull = c > o
+    bear = c < o
+    avg_vol = _rolling_mean(v, pos, 20)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vol_ratio = v / avg_vol
+        prev_v = _shift(v, 1)
+        engulf_vol = np.where(prev_v > 0, v / prev_v, 1.0)
+        body2, rng2 = _shift(body, 1), _shift(rng, 1)
+        small_body2 = ~((rng2 == 0) | (body2 / rng2 > 0.3))
+
+    # 핀바: 아래꼬리 ≥ 몸통×2, ≥ 범위×60%, 위꼬리 ≤ 범위×10%
+    pinbar = (pos >= 1) & (rng != 0) & (lower >= body * 2) & (lower >= rng * 0.6) & (upper <= rng * 0.1)
+    pin_vol = np.where(avg_vol > 0, vol_ratio, 1.0)
+    pinbar_rel = np.where(pinbar, 4 + bull + (pin_vol >= 1.5), 0)
+
+    # 망치형: 전봉 음봉 + 현재 양봉, 아래꼬리 ≥ 몸통×2, 위꼬리 ≤ 몸통×0.5
+    prev_bear = _shift(c, 1) < _shift(o, 1)
+    hammer = ((pos >= 2) & prev_bear & (rng != 0) & bull
+              & (lower >= body * 2) & (upper <= body * 0.5))
+    hammer_rel = np.where(hammer, np.where(vol_ratio >= 1.2, 4, 3), 0)
+
+    # 상승 장악형: 전봉 음봉을 현재 양봉이 완전히 감쌈
+    engulfing = (pos >= 2) & prev_bear & bull & (o < _shift(c, 1)) & (c > _shift(o, 1))
+    engulfing_rel = np.where(engulfing, np.where(engulf_vol > 1.5, 5, 4), 0)
+
+    # 모닝스타: 2봉 전 음봉, 1봉 전 작은 몸통, 현재 양봉이 2봉 전 몸통 중간 이상 회복
+    o3, c3 = _shift(o, 2), _shift(c, 2)
+    morning = (pos >= 3) & (c3 < o3) & small_body2 & bull & (c > (o3 + c3) / 2)
+    morning_rel = np.where(morning, 5, 0)
+
+    rel = np.stack([pinbar_rel, hammer_rel, engulfing_rel, morning_rel])
+    n_patterns = (rel >= 3).sum(axis=0)
+    rel_best = np.where(rel >= min_reliability, rel, 0)
+    best = rel_best.argmax(axis=0)   # 동률이면 앞 패턴 (get_best_pattern의 안정 정렬과 동일)
+    reliability = rel_best.max(axis=0)
+
+    names = np.array(VECTOR_PATTERNS, dtype=object)[best]
+    names[(best == 0) & ~bull] = 'pinbar'
+    names[(best == 0) & bull] = 'bullish_pinbar'
+    names[reliability == 0] = None
+
+    return {
+        'pinbar': pinbar_rel,
+        'hammer': hammer_rel,
+        'bullish_engulfing': engulfing_rel,
+        'morning_star': morning_rel,
+        'pattern': names,
+        'reliability': reliability,
+        'n_patterns': n_patterns,
+    }
+
+
+def _pattern_frame(columns: Dict, index) -> pd.DataFrame:
+    """감지 결과 → DataFrame (pattern은 object 컬럼으로 두어 패턴 없음을 None으로 유지)"""
+    columns = dict(columns, pattern=pd.Series(columns['pattern'], index=index, dtype=object))
+    return pd.DataFrame(columns, index=index)
+
+
+def _ohlcv_arrays(df: pd.DataFrame) -> List[np.ndarray]:
+    """Open/High/Low/Close/Volume 배열 (대소문자 컬럼 모두 허용)"""
+    cols = []
+    for name in ('Open', 'High', 'Low', 'Close', 'Volume'):
+        col = name if name in df.columns else name.lower()
+        cols.append(df[col].to_numpy(dtype=float))
+    return cols
+
+
+def detect_all_vectorized(df: pd.DataFrame, min_reliability: int = 4) -> pd.DataFrame:
+    """
+    전체 구간 봉별 캔들 패턴 감지
+
+    몸통/꼬리/범위 배열을 한 번만 계산해 모든 봉에 대해 detect_pinbar / detect_hammer /
+    detect_engulfing / detect_morning_star를 (그 봉을 마지막 봉으로 두고) 적용한 결과를 낸다.
+
+    Returns:
+    --------
+    pd.DataFrame (df와 같은 index)
+        pinbar / hammer / bullish_engulfing / morning_star : 패턴별 신뢰도 (0 = 없음)
+        pattern / reliability : get_best_pattern(min_reliability) 결과 (없으면 None / 0)
+        n_patterns : detect_all_patterns(3)에 잡히는 패턴 수
+    """
+    result = _detect_arrays(*_ohlcv_arrays(df), np.arange(len(df)), min_reliability)
+    return _pattern_frame(result, df.index)
+
+
+def detect_panel_vectorized(panel: pd.DataFrame,
+                            code_col: str = 'symbol',
+                            min_reliability: int = 4) -> pd.DataFrame:
+    """
+    전 종목 캔들 패턴 일괄 감지
+
+    panel : 종목별로 날짜순 정렬된 long 포맷 (code_col + OHLCV 컬럼)
+    종목별 루프 없이 전체 행을 한 번에 계산하고, 이전 봉 참조는 종목 내 순번으로 경계를 막는다.
+    """
+    codes = panel[code_col].to_numpy()
+    starts = np.r_[True, codes[1:] != codes[:-1]] if len(codes) else np.zeros(0, dtype=bool)
+    idx = np.arange(len(codes))
+    pos = idx - np.maximum.accumulate(np.where(starts, idx, 0))
+    result = _detect_arrays(*_ohlcv_arrays(panel), pos, min_reliability)
+    out = _pattern_frame(result, panel.index)
+    out.insert(0, code_col, codes)
+    return out
+
+
+def scan_with_candles_series(df: pd.DataFrame, combo_type: str = 'advanced') -> pd.DataFrame:
+    """
+    scan_with_candles 점수를 전체 구간 봉별로 한 번에 계산
+
+    각 봉을 마지막 봉으로 둔 scan_with_candles 결과와 같다 (조회 구간 봉 수 ≥ 30 조건은 호출자 몫).
+    signal=False인 봉은 scan_with_candles가 None을 내는 봉.
+    """
+    opens, highs, lows, closes, volumes = _ohlcv_arrays(df)
+    pos = np.arange(len(df))
+    patterns = _detect_arrays(opens, highs, lows, closes, volumes, pos, min_reliability=4)
+
+    # 1. 피보나치 되돌림 25~75%
+    recent_high = _rolling_extreme(highs, pos, 20, np.fmax)
+    recent_low = _rolling_extreme(lows, pos, 20, np.fmin)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        retracement = np.where(recent_high > recent_low,
+                               ((recent_high - closes) / (recent_high - recent_low)) * 100, 50)
+    fib_ok = (retracement >= 25) & (retracement <= 75)
+    score = np.full(len(df), 20)
+
+    # 2. 거래량
+    avg_vol = _rolling_mean(volumes, pos, 20)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rvol = np.where(avg_vol > 0, volumes / avg_vol, 1.0)
+    score += np.select([rvol >= 2.0, rvol >= 1.5, rvol >= 1.2], [15, 10, 5], 0)
+
+    # 3. 캔들 패턴 (신뢰도 4+ 우선, 없으면 약한 패턴)
+    reliability = patterns['reliability']
+    weak = (reliability == 0) & (patterns['n_patterns'] > 0)
+    score += np.select([reliability >= 5, reliability >= 4, weak], [25, 20, 10], 0)
+    no_pattern = (reliability == 0) & ~weak
+
+    # 4. 추세
+    ma5 = _rolling_mean(closes, pos, 5)
+    ma20 = _rolling_mean(closes, pos, 20)
+    bullish_trend = (closes > ma5) & (ma5 > ma20)
+    above_ma20 = ~bullish_trend & (closes > ma20)
+    score += np.select([bullish_trend, above_ma20], [10, 5], 0)
+
+    signal = fib_ok & (score >= 35)
+    if combo_type == 'strict':
+        signal &= ~no_pattern & (score >= 50)
+
+    out = pd.DataFrame({
+        'signal': signal,
+        'score': score,
+        'price': closes,
+        'retracement': retracement,
+        'rvol': rvol,
+        'pattern': patterns['pattern'],
+        'pattern_reliability': reliability,
+        'weak_pattern': weak,
+        'bullish_trend': bullish_trend,
+        'above_ma20': above_ma20,
+    }, index=df.index)
+    return out
+
+
+def _scan_row_to_signal(symbol: str, date: str, row) -> Dict:
+    """scan_with_candles_series 한 행 → scan_with_candles 반환 형식"""
+    reasons = [f'Fib_{row.retracement:.0f}']
+    if row.rvol >= 1.2:
+        reasons.append(f'RVol_{row.rvol:.1f}')
+    if row.pattern_reliability > 0:
+        reasons.append(row.pattern.upper())
+    elif row.weak_pattern:
+        reasons.append('Weak_Pattern')
+    if row.bullish_trend:
+        reasons.append('Bullish_Trend')
+    elif row.above_ma20:
+        reasons.append('Above_MA20')
+
+    return {
+        'symbol': symbol,
+        'date': date,
+        'score': int(row.score),
+        'price': round(row.price, 0),
+        'retracement': round(row.retracement, 1),
+        'rvol': round(row.rvol, 2),
+        'pattern': row.pattern if row.pattern_reliability > 0 else 'None',
+        'pattern_reliability': int(row.pattern_reliability),
+        'reasons': reasons
+    }
+
+
+def scan_dates_with_candles(symbol: str, df: pd.DataFrame, dates: List[str],
+                            combo_type: str = 'advanced') -> Dict[str, Dict]:
+    """
+    한 종목의 여러 기준일을 한 번에 스캔 (scan_with_candles를 날짜마다 부른 것과 동일)
+
+    df : 가장 이른 기준일 90일 전 ~ 가장 늦은 기준일까지의 get_price 결과
+    Returns: {기준일: 신호 dict} (신호 없는 날짜는 제외)
+    """
+    if df is None or df.empty:
+        return {}
+
+    series = scan_with_candles_series(df, combo_type)
+    index = pd.DatetimeIndex(df.index)
+    signals = {}
+    for date in dates:
+        end_dt = pd.Timestamp(date)
+        i = index.searchsorted(end_dt, side='right') - 1
+        start = index.searchsorted(end_dt - timedelta(days=90), side='left')
+        if i < 0 or i - start + 1 < 30:
+            continue
+        row = series.iloc[i]
+        if row.signal:
+            signals[date] = _scan_row_to_signal(symbol, date, row)
+    return signals
 
 
 def scan_with_candles(symbol: str, date: str, combo_type: str = 'advanced') -> Optional[Dict]:
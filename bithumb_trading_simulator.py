@@ -2,6 +2,10 @@
 """
 Bithumb Trading Simulator - 빗썸 매매 시뮬레이션
 Public API를 활용한 백테스트 및 시뮬레이션
+
+백테스트는 전략별 매수/매도 조건을 배열로 미리 계산하고, 체결 루프(_fill_events)는
+종가/조건 배열만 훑어 매매 시점을 정한다 (numba가 있으면 JIT).
+run_batch: 전 코인 × 전 전략을 지표 1회 계산으로 돌리고 HTML 리포트 생성
 """
 
 import sys
@@ -21,8 +25,76 @@ except ImportError:
     BITHUMB_AVAILABLE = False
     print("⚠️ python-bithumb 미설치, HTTP API 직접 사용")
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 import requests
 
+STRATEGIES = ('rsi_bollinger', 'momentum', 'mean_reversion')
+
+# 체결 이벤트 종류 (_fill_events)
+EVENT_BUY, EVENT_STOP_LOSS, EVENT_TAKE_PROFIT, EVENT_SIGNAL_SELL = 0, 1, 2, 3
+
+
+def _fill_events(close, buy, sell, start, balance, fee_rate, risk_pct, stop_loss_pct, take_profit_pct):
+    """
+    단일 코인 체결 루프 → (이벤트 봉 위치, 이벤트 종류) 배열
+
+    BithumbTradingSimulator.buy / sell / calculate_position_size와 같은 순서로 계산한다.
+    보유 중이면 손절 → 익절 → 신호 매도 순으로 확인, 미보유면 매수 신호 확인.
+    """
+    n = len(close)
+    bars = np.empty(n, dtype=np.int64)
+    kinds = np.empty(n, dtype=np.int64)
+    k = 0
+    holding = False
+    avg_price = 0.0
+    volume = 0.0
+    for i in range(start, n):
+        price = close[i]
+        if holding:
+            change_pct = (price - avg_price) / avg_price
+            if change_pct <= -stop_loss_pct:
+                kind = EVENT_STOP_LOSS
+            elif change_pct >= take_profit_pct:
+                kind = EVENT_TAKE_PROFIT
+            elif sell[i]:
+                kind = EVENT_SIGNAL_SELL
+            else:
+                continue
+            amount = price * volume
+            balance += amount - amount * fee_rate
+            holding = False
+        elif buy[i]:
+            volume = balance * risk_pct / stop_loss_pct / price
+            if not volume > 0:
+                continue
+            amount = price * volume
+            total_cost = amount + amount * fee_rate
+            if total_cost > balance:
+                continue
+            balance -= total_cost
+            avg_price = price
+            holding = True
+            kind = EVENT_BUY
+        else:
+            continue
+        bars[k] = i
+        kinds[k] = kind
+        k += 1
+    return bars[:k], kinds[:k]
+
+
+if NUMBA_AVAILABLE:
+    _fill_events_kernel = njit(cache=True)(_fill_events)
+else:
+    def _fill_events_kernel(close, buy, sell, *args):
+        # numpy 스칼라 인덱싱보다 파이썬 리스트 순회가 훨씬 빠름 (연산은 동일한 float64)
+        return _fill_events(close.tolist(), buy.tolist(), sell.tolist(), *args)
+
 
 class BithumbPublicAPI:
     """빗썸 Public API 래퍼"""
@@ -232,41 +304,33 @@ class BithumbTradingSimulator:
         strategy : str
             전략명 (rsi_bollinger, momentum, mean_reversion)
         """
-        self.reset()
-        
         # 기술적 지표 계산
         df = self._calculate_indicators(df)
+        return self._run_prepared(coin, df, strategy)
+    
+    def _run_prepared(self, coin: str, df: pd.DataFrame, strategy: str, start: int = 50) -> Dict:
+        """지표가 계산된 df로 백테스트 (조건 배열 → 체결 루프 → 체결 재생)"""
+        self.reset()
         
-        initial_price = df['close'].iloc[0]
-        
-        for i in range(50, len(df)):  # 50일부터 시작 (지표 계산 여유)
-            row = df.iloc[i]
-            date = df.index[i]
-            price = row['close']
-            
-            # 현재 포지션 확인
-            has_position = coin in self.positions
-            
-            if has_position:
-                avg_price = self.positions[coin]['avg_price']
-                
-                # 손절/익절 체크
-                change_pct = (price - avg_price) / avg_price
-                
-                if change_pct <= -self.stop_loss_pct:
-                    self.sell(coin, price, f"STOP_LOSS ({change_pct*100:.1f}%)")
-                elif change_pct >= self.take_profit_pct:
-                    self.sell(coin, price, f"TAKE_PROFIT ({change_pct*100:.1f}%)")
-                else:
-                    # 전략 기반 매도 신호
-                    if self._check_sell_signal(df, i, strategy):
-                        self.sell(coin, price, f"SIGNAL_{strategy}")
+        close = df['close'].to_numpy(dtype=float)
+        buy, sell = self._signal_arrays(df, strategy, start)
+        bars, kinds = _fill_events_kernel(close, buy, sell, start, float(self.balance_krw), self.fee_rate,
+                                          0.02, self.stop_loss_pct, self.take_profit_pct)
+        
+        # 체결 시점만 buy / sell로 재생 → 거래 내역/잔고는 기존 계산 그대로
+        for i, kind in zip(bars.tolist(), kinds.tolist()):
+            price = close[i]
+            if kind == EVENT_BUY:
+                self.buy(coin, price, self.calculate_position_size(price), f"SIGNAL_{strategy}")
+                continue
+            avg_price = self.positions[coin]['avg_price']
+            change_pct = (price - avg_price) / avg_price
+            if kind == EVENT_STOP_LOSS:
+                self.sell(coin, price, f"STOP_LOSS ({change_pct*100:.1f}%)")
+            elif kind == EVENT_TAKE_PROFIT:
+                self.sell(coin, price, f"TAKE_PROFIT ({change_pct*100:.1f}%)")
             else:
-                # 매수 신호 체크
-                if self._check_buy_signal(df, i, strategy):
-                    volume = self.calculate_position_size(price)
-                    if volume > 0:
-                        self.buy(coin, price, volume, f"SIGNAL_{strategy}")
+                self.sell(coin, price, f"SIGNAL_{strategy}")
         
         # 최종 평가
         final_price = df['close'].iloc[-1]
@@ -320,49 +384,67 @@ class BithumbTradingSimulator:
         
         return df
     
-    def _check_buy_signal(self, df: pd.DataFrame, idx: int, strategy: str) -> bool:
-        """매수 신호 확인"""
-        row = df.iloc[idx]
-        prev = df.iloc[idx-1]
-        
-        if strategy == "rsi_bollinger":
-            # RSI 과매도 + 볼린저 하단 접근
-            return (row['rsi'] < 35 and 
-                    row['close'] < row['lower_band'] * 1.02 and
-                    row['volume'] > df['volume'].iloc[idx-20:idx].mean() * 1.2)
-        
-        elif strategy == "momentum":
-            # 모멘텀 돌파
-            return (row['close'] > row['sma5'] and
-                    prev['close'] <= prev['sma5'] and
-                    row['macd'] > row['macd_signal'] and
-                    row['volume'] > df['volume'].iloc[idx-20:idx].mean())
+    def _signal_arrays(self, df: pd.DataFrame, strategy: str, start: int = 50) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        전략별 (매수 조건, 매도 조건) 봉 배열
         
-        elif strategy == "mean_reversion":
-            # 평균회귀
-            deviation = (row['close'] - row['sma20']) / row['sma20']
-            return deviation < -0.03 and row['rsi'] < 40
+        rsi_bollinger: 매수 RSI < 35 + 볼린저 하단 2% 이내 + 거래량 > 직전 20봉 평균 × 1.2
+                       매도 RSI > 70 또는 볼린저 상단 돌파
+        momentum: 매수 종가 SMA5 상향 돌파 + MACD > 시그널 + 거래량 > 직전 20봉 평균
+                  매도 MACD < 시그널
+        mean_reversion: 매수 SMA20 대비 -3% 미만 + RSI < 40 / 매도 SMA20 대비 +5% 초과
         
-        return False
-    
-    def _check_sell_signal(self, df: pd.DataFrame, idx: int, strategy: str) -> bool:
-        """매도 신호 확인"""
-        row = df.iloc[idx]
+        거래량 조건은 나머지 조건을 통과한 start 이후 봉에서만 직전 20봉 평균을 계산한다.
+        """
+        close = df['close'].to_numpy(dtype=float)
+        n = len(close)
+        buy = np.zeros(n, dtype=bool)
+        sell = np.zeros(n, dtype=bool)
+        volume_mult = None
         
         if strategy == "rsi_bollinger":
-            # RSI 과매수 또는 볼린저 상단
-            return row['rsi'] > 70 or row['close'] > row['upper_band']
+            rsi = df['rsi'].to_numpy(dtype=float)
+            buy = (rsi < 35) & (close < df['lower_band'].to_numpy(dtype=float) * 1.02)
+            sell = (rsi > 70) | (close > df['upper_band'].to_numpy(dtype=float))
+            volume_mult = 1.2
         
         elif strategy == "momentum":
-            # 모멘텀 약화
-            return row['macd'] < row['macd_signal']
+            sma5 = df['sma5'].to_numpy(dtype=float)
+            macd = df['macd'].to_numpy(dtype=float)
+            macd_signal = df['macd_signal'].to_numpy(dtype=float)
+            crossed = np.zeros(n, dtype=bool)
+            crossed[1:] = (close[1:] > sma5[1:]) & (close[:-1] <= sma5[:-1])
+            buy = crossed & (macd > macd_signal)
+            sell = macd < macd_signal
+            volume_mult = 1.0
         
         elif strategy == "mean_reversion":
-            # 평균 회복
-            deviation = (row['close'] - row['sma20']) / row['sma20']
-            return deviation > 0.05
+            sma20 = df['sma20'].to_numpy(dtype=float)
+            deviation = (close - sma20) / sma20
+            buy = (deviation < -0.03) & (df['rsi'].to_numpy(dtype=float) < 40)
+            sell = deviation > 0.05
+        
+        if volume_mult is not None:
+            buy[:start] = False
+            volume = df['volume']
+            for idx in np.flatnonzero(buy):
+                buy[idx] = volume.iloc[idx] > volume.iloc[idx-20:idx].mean() * volume_mult
+        return buy, sell
+    
+    def run_batch(self, data: Dict[str, pd.DataFrame], strategies=STRATEGIES) -> List[Dict]:
+        """
+        코인 × 전략 일괄 백테스트 (코인별 지표 1회 계산)
         
-        return False
+        data: {코인: OHLCV df} - 원본 df는 바꾸지 않는다
+        """
+        results = []
+        for coin, df in data.items():
+            if len(df) <= 50:
+                continue
+            prepared = self._calculate_indicators(df.copy())
+            for strategy in strategies:
+                results.append(self._run_prepared(coin, prepared, strategy))
+        return results
     
     def run_live_simulation(self, coins: List[str], duration_minutes: int = 60):
         """
@@ -481,17 +563,86 @@ class BithumbTradingSimulator:
                 print(f"   {coin}: {pos['volume']:.6f} @ {pos['avg_price']:,.0f}")
 
 
+def generate_simulation_report(results: List[Dict], path: str = 'BITHUMB_SIMULATION_REPORT.html') -> str:
+    """run_batch 결과 → 코인 × 전략 HTML 리포트"""
+    date_str = datetime.now().strftime('%Y-%m-%d %H:%M')
+    
+    html = f"""<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="UTF-8">
+    <title>빗썸 매매 시뮬레이션 - {date_str}</title>
+    <style>
+        body {{ font-family: 'Segoe UI', sans-serif; background: #1a1a2e; color: #eee; padding: 20px; }}
+        .container {{ max-width: 1200px; margin: 0 auto; }}
+        .header {{ text-align: center; padding: 40px; background: linear-gradient(135deg, #f37321, #ffb347); border-radius: 15px; margin-bottom: 30px; }}
+        .header h1 {{ color: #1a1a2e; font-size: 2.5em; }}
+        .section {{ background: rgba(255,255,255,0.05); padding: 25px; border-radius: 12px; margin-bottom: 20px; }}
+        .section h3 {{ color: #f37321; margin-bottom: 15px; font-size: 1.5em; }}
+        table {{ width: 100%; border-collapse: collapse; font-size: 0.9em; margin-top: 15px; }}
+        th, td {{ padding: 10px; text-align: center; border-bottom: 1px solid rgba(255,255,255,0.1); }}
+        th {{ color: #f37321; }}
+        .profit {{ color: #4ecca3; font-weight: bold; }} .loss {{ color: #ff6b6b; font-weight: bold; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>📊 빗썸 매매 시뮬레이션</h1>
+            <div style="color: #333; margin-top: 10px;">{len({r['coin'] for r in results})}개 코인 × {len({r['strategy'] for r in results})}개 전략 | 일봉</div>
+        </div>
+"""
+    
+    for strategy in dict.fromkeys(r['strategy'] for r in results):
+        rows = sorted([r for r in results if r['strategy'] == strategy],
+                      key=lambda r: r['total_return_pct'], reverse=True)
+        trades = sum(r['total_trades'] for r in rows)
+        wins = sum(r['winning_trades'] for r in rows)
+        avg = np.mean([r['total_return_pct'] for r in rows]) if rows else 0
+        
+        html += f"""
+        <div class="section">
+            <h3>{strategy}</h3>
+            <div>평균 수익률 <span class="{'profit' if avg > 0 else 'loss'}">{avg:+.2f}%</span> | 거래 {trades}회 | 승률 {wins / trades * 100 if trades else 0:.1f}%</div>
+            <table>
+                <tr><th>코인</th><th>기간</th><th>최종 평가</th><th>수익률</th><th>거래</th><th>승리</th><th>보유</th></tr>
+"""
+        for r in rows:
+            ret_class = 'profit' if r['total_return_pct'] > 0 else 'loss'
+            html += (f"<tr><td>{r['coin']}</td><td>{r['period']}</td><td>{r['final_balance']:,.0f}</td>"
+                     f"<td class='{ret_class}'>{r['total_return_pct']:+.2f}%</td><td>{r['total_trades']}</td>"
+                     f"<td>{r['winning_trades']}</td><td>{'보유' if r['positions'] else '-'}</td></tr>")
+        
+        html += "</table></div>"
+    
+    html += """
+        <div style="text-align: center; padding: 30px; color: #666;">
+            <p>⚠️ 과거 성과가 미래 수익을 보장하지 않습니다.</p>
+        </div>
+    </div>
+</body>
+</html>"""
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(html)
+    return path
+
+
 def main():
     """메인 실행"""
     import argparse
     
     parser = argparse.ArgumentParser(description='Bithumb Trading Simulator')
-    parser.add_argument('--mode', choices=['backtest', 'live'], default='backtest',
-                       help='실행 모드 (backtest: 백테스트, live: 실시간 시뮬레이션)')
+    parser.add_argument('--mode', choices=['backtest', 'batch', 'live'], default='backtest',
+                       help='실행 모드 (backtest: 백테스트, batch: 전 코인 × 전 전략 리포트, live: 실시간 시뮬레이션)')
     parser.add_argument('--coin', default='BTC', help='대상 코인 (예: BTC, ETH)')
+    parser.add_argument('--coins', default=None,
+                       help='batch 대상 코인 (쉼표 구분, 기본: 빗썸 KRW 마켓 전체)')
     parser.add_argument('--strategy', default='rsi_bollinger',
-                       choices=['rsi_bollinger', 'momentum', 'mean_reversion'],
+                       choices=list(STRATEGIES),
                        help='전략 선택')
+    parser.add_argument('--report', default='BITHUMB_SIMULATION_REPORT.html',
+                       help='batch 리포트 경로')
     parser.add_argument('--balance', type=float, default=10_000_000,
                        help='초기 자본 (KRW)')
     parser.add_argument('--days', type=int, default=200,
@@ -542,6 +693,23 @@ def main():
                     pnl_str = ""
                 print(f"   {trade['type']} {trade['coin']} @ {trade['price']:,.0f}{pnl_str}")
         
+    elif args.mode == 'batch':
+        coins = args.coins.split(',') if args.coins else sim.api.get_market_all()
+        print(f"📊 {len(coins)}개 코인 × {len(STRATEGIES)}개 전략 일괄 백테스트...")
+        
+        data = {}
+        for coin in coins:
+            df = sim.api.get_ohlcv(coin, chart_intervals="24h", count=args.days)
+            if not df.empty:
+                data[coin] = df
+        
+        start = time.time()
+        results = sim.run_batch(data)
+        print(f"   {len(results)}건 완료 ({time.time() - start:.1f}초)")
+        
+        path = generate_simulation_report(results, args.report)
+        print(f"💾 리포트 저장: {path}")
+        
     else:  # live simulation
         sim.run_live_simulation([args.coin, 'ETH', 'XRP'], duration_minutes=60)
 
@@ -11,7 +11,10 @@ from dataclasses import dataclass
 from typing import List, Dict, Optional
 import os
 import json
-import yfinance as yf
+
+from crypto_candle_store import CryptoCandleStore, to_ms, yahoo_fetcher
+from indicator_filters import pmo_smooth, rolling_mean_abs_dev
+from swing_pivots import swing_pivots
 
 REPORT_DIR = "/root/.openclaw/workspace/sub/reports"
 
@@ -33,20 +36,15 @@ def get_btc_data(start_date: str, end_date: str) -> pd.DataFrame:
     """비트코인 데이터 다운로드 (Yahoo Finance)"""
     print(f"📊 BTC 데이터 다운로드 중... ({start_date} ~ {end_date})")
     
-    # Yahoo Finance에서 BTC-USD 데이터 가져오기
-    ticker = yf.Ticker("BTC-USD")
-    df = ticker.history(start=start_date, end=end_date, interval='1d')
+    # Yahoo Finance BTC-USD 일봉 (로컬 저장소에 없는 최근 봉만 다운로드, end 당일 제외)
+    store = CryptoCandleStore(fetcher=yahoo_fetcher(), exchange='yahoo')
+    df = store.load("BTC-USD", '1d', start_date, to_ms(end_date) - 1)
     
     if df.empty:
         raise ValueError("BTC 데이터를 가져올 수 없습니다")
     
-    df = df.reset_index()
-    df.columns = [c.lower().replace(' ', '_') for c in df.columns]
-    df['date'] = pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d')
-    
-    # 거래량 컬럼명 통일
-    if 'volume' not in df.columns and 'volumefrom' in df.columns:
-        df['volume'] = df['volumefrom']
+    df = df.reset_index().rename(columns={'timestamp': 'date'})
+    df['date'] = df['date'].dt.strftime('%Y-%m-%d')
     
     print(f"   총 {len(df)}일 데이터 로드 완료")
     return df
@@ -65,19 +63,9 @@ def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
     
     # Swing Pivots (5-5)
     left = right = 5
-    df['pivot_high'] = 0
-    df['pivot_low'] = 0
-    
-    for i in range(left, len(df) - right):
-        is_high = all(df.iloc[i]['high'] >= df.iloc[i-j]['high'] for j in range(1, left+1)) and \
-                  all(df.iloc[i]['high'] >= df.iloc[i+j]['high'] for j in range(1, right+1))
-        if is_high:
-            df.iloc[i, df.columns.get_loc('pivot_high')] = 1
-        
-        is_low = all(df.iloc[i]['low'] <= df.iloc[i-j]['low'] for j in range(1, left+1)) and \
-                 all(df.iloc[i]['low'] <= df.iloc[i+j]['low'] for j in range(1, right+1))
-        if is_low:
-            df.iloc[i, df.columns.get_loc('pivot_low')] = 1
+    pivot_high, pivot_low = swing_pivots(df['high'], df['low'], left, right)
+    df['pivot_high'] = pivot_high.astype(int)
+    df['pivot_low'] = pivot_low.astype(int)
     
     # Swing Areas
     width_mult = 1.0
@@ -110,7 +98,7 @@ def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
     
     tp = (df['high'] + df['low'] + df['close']) / 3
     sma_tp = tp.rolling(window=20).mean()
-    mean_dev = tp.rolling(window=20).apply(lambda x: np.mean(np.abs(x - x.mean())))
+    mean_dev = rolling_mean_abs_dev(tp, 20)
     df['cci'] = (tp - sma_tp) / (0.015 * mean_dev)
     df['obv_color'] = np.where(df['cci'] >= 0, 'GREEN', 'RED')
     df['obv_ema'] = df['obv'].ewm(span=13, adjust=False).mean()
@@ -118,18 +106,11 @@ def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
     df['obv_cross_down'] = (df['obv'] < df['obv_ema']) & (df['obv'].shift(1) >= df['obv_ema'].shift(1))
     
     # PMO
-    def custom_smooth(series, period):
-        result = series.copy()
-        multiplier = 2 / period
-        for i in range(1, len(series)):
-            result.iloc[i] = (series.iloc[i] - result.iloc[i-1]) * multiplier + result.iloc[i-1]
-        return result
-    
     df['roc'] = ((df['close'] / df['close'].shift(1)) * 100) - 100
     df['roc'] = df['roc'].fillna(0)
-    df['roc_smooth1'] = custom_smooth(df['roc'], 35)
+    df['roc_smooth1'] = pmo_smooth(df['roc'], 35)
     df['roc_10x'] = df['roc_smooth1'] * 10
-    df['pmo'] = custom_smooth(df['roc_10x'], 20)
+    df['pmo'] = pmo_smooth(df['roc_10x'], 20)
     df['pmo_signal'] = df['pmo'].ewm(span=10, adjust=False).mean()
     
     special_level = 1.7
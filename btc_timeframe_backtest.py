@@ -12,6 +12,10 @@ from typing import List, Dict, Optional
 import os
 import json
 
+from crypto_candle_store import CryptoCandleStore, ccxt_fetcher
+from indicator_filters import pmo_smooth, rolling_mean_abs_dev
+from swing_pivots import swing_pivots
+
 # CCXT 없으면 설치 안내
 try:
     import ccxt
@@ -35,39 +39,38 @@ class BTCTimeframeResult:
     holding_bars: int
 
 class BTCTimeframeBacktest:
-    def __init__(self, timeframe='4h', leverage=1.0, start_date='2020-01-01', end_date='2025-03-28'):
+    def __init__(self, timeframe='4h', leverage=1.0, start_date='2020-01-01', end_date='2025-03-28',
+                 store: Optional[CryptoCandleStore] = None):
         self.timeframe = timeframe
         self.leverage = leverage
         self.start_date = start_date
         self.end_date = end_date
         self.exchange = ccxt.binance({'enableRateLimit': True})
+        self.store = store  # 여러 시간대가 같은 1h 기준 봉을 공유하도록 외부 주입 가능
         
     def fetch_data(self) -> pd.DataFrame:
         """Binance에서 OHLCV 데이터 가져오기"""
         print(f"📊 Binance에서 BTC/USDT {self.timeframe} 데이터 로드 중...")
         
-        since = self.exchange.parse8601(f'{self.start_date}T00:00:00Z')
+        # 저장된 봉 이후만 받고, 4h/1d는 1h 봉에서 로컬 리샘플 (mtf_resampler)
+        if self.store is None:
+            self.store = CryptoCandleStore(fetcher=ccxt_fetcher(self.exchange), resample_from='1h')
+        store = self.store
+        try:
+            candles = store.load('BTC/USDT', self.timeframe, self.start_date, self.end_date)
+        except Exception as e:
+            print(f"   오류: {e}")
+            candles = pd.DataFrame()
+        print(f"   거래소 요청 {store.requests}회")
         
-        all_ohlcv = []
-        while since < self.exchange.parse8601(f'{self.end_date}T00:00:00Z'):
-            try:
-                ohlcv = self.exchange.fetch_ohlcv('BTC/USDT', self.timeframe, since, limit=1000)
-                if not ohlcv:
-                    break
-                all_ohlcv.extend(ohlcv)
-                since = ohlcv[-1][0] + 1
-                print(f"   {len(all_ohlcv)}개 봉 수집...", end='\r')
-            except Exception as e:
-                print(f"   오류: {e}")
-                break
-        
-        if not all_ohlcv:
+        if candles.empty:
             raise ValueError("데이터를 가져올 수 없습니다")
         
-        df = pd.DataFrame(all_ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+        df = candles.reset_index()
+        df['timestamp'] = df['timestamp'].astype('datetime64[ms]').astype('int64')
         df['date'] = pd.to_datetime(df['timestamp'], unit='ms').dt.strftime('%Y-%m-%d %H:%M')
         
-        print(f"\n   총 {len(df)}개 {self.timeframe}봉 로드 완료")
+        print(f"   총 {len(df)}개 {self.timeframe}봉 로드 완료")
         return df
     
     def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -92,19 +95,9 @@ class BTCTimeframeBacktest:
         else:
             left = right = 10
         
-        df['pivot_high'] = 0
-        df['pivot_low'] = 0
-        
-        for i in range(left, len(df) - right):
-            is_high = all(df.iloc[i]['high'] >= df.iloc[i-j]['high'] for j in range(1, left+1)) and \
-                      all(df.iloc[i]['high'] >= df.iloc[i+j]['high'] for j in range(1, right+1))
-            if is_high:
-                df.iloc[i, df.columns.get_loc('pivot_high')] = 1
-            
-            is_low = all(df.iloc[i]['low'] <= df.iloc[i-j]['low'] for j in range(1, left+1)) and \
-                     all(df.iloc[i]['low'] <= df.iloc[i+j]['low'] for j in range(1, right+1))
-            if is_low:
-                df.iloc[i, df.columns.get_loc('pivot_low')] = 1
+        pivot_high, pivot_low = swing_pivots(df['high'], df['low'], left, right)
+        df['pivot_high'] = pivot_high.astype(int)
+        df['pivot_low'] = pivot_low.astype(int)
         
         # Swing Areas
         width_mult = 1.0
@@ -137,7 +130,7 @@ class BTCTimeframeBacktest:
         
         tp = (df['high'] + df['low'] + df['close']) / 3
         sma_tp = tp.rolling(window=20).mean()
-        mean_dev = tp.rolling(window=20).apply(lambda x: np.mean(np.abs(x - x.mean())))
+        mean_dev = rolling_mean_abs_dev(tp, 20)
         df['cci'] = (tp - sma_tp) / (0.015 * mean_dev)
         df['obv_color'] = np.where(df['cci'] >= 0, 'GREEN', 'RED')
         df['obv_ema'] = df['obv'].ewm(span=13, adjust=False).mean()
@@ -145,18 +138,11 @@ class BTCTimeframeBacktest:
         df['obv_cross_down'] = (df['obv'] < df['obv_ema']) & (df['obv'].shift(1) >= df['obv_ema'].shift(1))
         
         # PMO (시간대별 조정)
-        def custom_smooth(series, period):
-            result = series.copy()
-            multiplier = 2 / period
-            for i in range(1, len(series)):
-                result.iloc[i] = (series.iloc[i] - result.iloc[i-1]) * multiplier + result.iloc[i-1]
-            return result
-        
         df['roc'] = ((df['close'] / df['close'].shift(1)) * 100) - 100
         df['roc'] = df['roc'].fillna(0)
-        df['roc_smooth1'] = custom_smooth(df['roc'], 35)
+        df['roc_smooth1'] = pmo_smooth(df['roc'], 35)
         df['roc_10x'] = df['roc_smooth1'] * 10
-        df['pmo'] = custom_smooth(df['roc_10x'], 20)
+        df['pmo'] = pmo_smooth(df['roc_10x'], 20)
         df['pmo_signal'] = df['pmo'].ewm(span=10, adjust=False).mean()
         
         # PMO 레벨 조정 (BTC 변동성 고려)
@@ -302,9 +288,12 @@ def test_multiple_timeframes():
     timeframes = ['1d', '4h', '1h']
     all_results = {}
     
+    # 1h 기준 봉 한 벌을 받아 1d/4h를 리샘플 → 시간대 수만큼 거래소를 다시 부르지 않음
+    store = CryptoCandleStore(fetcher=ccxt_fetcher(ccxt.binance({'enableRateLimit': True})), resample_from='1h')
+    
     for tf in timeframes:
         try:
-            backtest = BTCTimeframeBacktest(timeframe=tf, leverage=1.0)
+            backtest = BTCTimeframeBacktest(timeframe=tf, leverage=1.0, store=store)
             results = backtest.run()
             all_results[tf] = results
             
@@ -10,6 +10,11 @@ from typing import Dict, List, Optional, Any
 from collections import deque
 import json
 
+from event_log import EventLog
+
+STATE_STREAM = 'circuit_state'
+TRADE_STREAM = 'circuit_trades'
+
 
 class CircuitState(Enum):
     """서킷 브레이커 상태"""
@@ -29,7 +34,8 @@ class CircuitBreaker:
         daily_loss_limit_percent: float = 5.0,
         open_duration_minutes: int = 30,
         max_trades_per_hour: int = 20,
-        max_trades_per_day: int = 100
+        max_trades_per_day: int = 100,
+        event_log: Optional[EventLog] = None
     ):
         self.consecutive_losses_threshold = consecutive_losses_threshold
         self.daily_loss_limit_percent = daily_loss_limit_percent
@@ -44,14 +50,18 @@ class CircuitBreaker:
         self._daily_pnl = 0.0
         self._initial_balance = 0.0
         
-        # 상태 파일
+        # 상태 파일 (event_log가 있으면 상태 스냅샷 / 거래 기록을 로그에 누적)
         self.state_file = "paper_trading_data/circuit_state.json"
+        self.event_log = event_log
         self._load_state()
     
     def _load_state(self):
         """상태 로드"""
         import os
-        if os.path.exists(self.state_file):
+        if self.event_log is not None and self.event_log.count(STATE_STREAM):
+            self.compact_history()
+            self._load_from_log()
+        elif os.path.exists(self.state_file):
             try:
                 with open(self.state_file, 'r') as f:
                     data = json.load(f)
@@ -60,9 +70,60 @@ class CircuitBreaker:
             except:
                 pass
     
-    def _save_state(self):
-        """상태 저장"""
+    def _load_from_log(self):
+        """
+        최근 상태 스냅샷 + 오늘 거래 기록으로 복원 (오늘 구간만 조회)
+        
+        오늘 수동 리셋이 있었으면 리셋 이후 거래만 다시 반영한다.
+        """
+        data = self.event_log.latest(STATE_STREAM)
+        self.state = CircuitState(data.get('state', 'closed'))
+        
+        now = datetime.now()
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        reset_at = next((datetime.fromisoformat(s['updated_at'])
+                         for s in self.event_log.range(STATE_STREAM, start=today, descending=True)
+                         if s.get('reset')), None)
+        trades = self.event_log.range(TRADE_STREAM, start=reset_at or today)
+        for t in trades:
+            t['timestamp'] = datetime.fromisoformat(t['timestamp'])
+        if reset_at is not None:
+            trades = [t for t in trades if t['timestamp'] > reset_at]
+        self._trade_history.extend(trades)
+        if trades:
+            self._daily_pnl = sum(t['pnl'] for t in trades)
+        else:
+            self._daily_pnl = 0.0 if reset_at is not None else data.get('daily_pnl', 0.0)
+        
+        # 마지막 수익 거래 이후의 손실 = 연속 손실
+        for t in trades:
+            if t['pnl'] < 0:
+                self._loss_history.append({'timestamp': t['timestamp'], 'pnl': t['pnl']})
+            else:
+                self._loss_history.clear()
+    
+    def compact_history(self, keep_days: int = 90, keep_last_per: Optional[str] = 'day') -> int:
+        """keep_days 이전 상태 스냅샷 / 거래 기록은 하루 마지막 1건만 남김 (복원은 오늘 구간만 사용)"""
+        if self.event_log is None:
+            return 0
+        before = datetime.now() - timedelta(days=keep_days)
+        return (self.event_log.compact(STATE_STREAM, before, keep_last_per)
+                + self.event_log.compact(TRADE_STREAM, before, keep_last_per))
+    
+    def _save_state(self, reset: bool = False):
+        """상태 저장 (reset=True면 로그 복원 시 이 시점 이전 거래를 건너뛰는 리셋 표시)"""
         import os
+        if self.event_log is not None:
+            now = datetime.now()
+            snapshot = {
+                'state': self.state.value,
+                'daily_pnl': self._daily_pnl,
+                'updated_at': now.isoformat()
+            }
+            if reset:
+                snapshot['reset'] = True
+            self.event_log.append(STATE_STREAM, snapshot, now)
+            return
         os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
         with open(self.state_file, 'w') as f:
             json.dump({
@@ -79,13 +140,16 @@ class CircuitBreaker:
         """거래 결과 기록"""
         now = datetime.now()
         
-        self._trade_history.append({
+        trade = {
             'timestamp': now,
             'coin': coin,
             'side': side,
             'pnl': pnl,
             'pnl_pct': pnl_pct
-        })
+        }
+        self._trade_history.append(trade)
+        if self.event_log is not None:
+            self.event_log.append(TRADE_STREAM, {**trade, 'timestamp': now.isoformat()}, now)
         
         self._daily_pnl += pnl
         
@@ -175,7 +239,7 @@ class CircuitBreaker:
         self.state = CircuitState.CLOSED
         self._loss_history.clear()
         self._daily_pnl = 0.0
-        self._save_state()
+        self._save_state(reset=True)
         print("✅ 서킷 브레이커 리셋 완료")
 
 
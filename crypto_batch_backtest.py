@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Crypto Batch Backtest - 다종목 가상화폐 동시 백테스트 커널
+코인별 df.iloc 루프를 돌리는 대신 전 코인을 공통 시각 격자에 정렬하고
+진입/청산 상태머신을 (코인 벡터) 단위로 한 번에 진행한다 (봉 수만큼만 반복).
+
+- align_frames: {심볼: OHLCV+신호 df} → AlignedPanel (시각 × 코인 배열, 봉 없는 칸은 NaN)
+- run_signal_machine: 진입 신호 → 청산 신호 (WaveTrend)
+- run_bracket_machine: 진입 신호 → 손절/확장익절/익절/보유기간 청산 (RSI+BB)
+- sweep: 파라미터 조합별 전체 코인 백테스트를 프로세스 풀로 병렬 실행
+- bithumb_universe: 빗썸 KRW 전 마켓 일봉 + 거래대금 순위 티어 (Major/Large/Mid)
+
+코인별 인덱스 기준(예: 30봉째부터 매매)은 격자 위치가 아니라 그 코인의 봉 순번으로 지킨다.
+
+사용법:
+    python3 crypto_batch_backtest.py --strategy wavetrend --universe bithumb
+    python3 crypto_batch_backtest.py --strategy rsibb --sweep
+"""
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+TIERS = ('Major', 'Large', 'Mid')
+EXIT_REASONS = ('STOP_LOSS', 'TP_EXT', 'TAKE_PROFIT', 'TIME_EXIT')
+
+
+@dataclass
+class AlignedPanel:
+    """공통 시각 격자에 정렬된 코인 패널"""
+    index: pd.DatetimeIndex
+    symbols: List[str]
+    present: np.ndarray                      # (시각 × 코인) 봉 존재 여부
+    values: Dict[str, np.ndarray] = field(repr=False)
+
+    def __getitem__(self, col: str) -> np.ndarray:
+        return self.values[col]
+
+    def flag(self, col: str) -> np.ndarray:
+        """bool 신호 컬럼 (봉 없는 칸은 False)"""
+        v = self.values[col]
+        return self.present & (np.nan_to_num(v) != 0)
+
+    def active(self, start_bar: int) -> np.ndarray:
+        """코인별 start_bar번째 봉부터 True (for i in range(start_bar, len(df))와 동일)"""
+        ordinal = np.cumsum(self.present, axis=0) - 1
+        return self.present & (ordinal >= start_bar)
+
+
+def align_frames(frames: Dict[str, pd.DataFrame], columns: Sequence[str]) -> AlignedPanel:
+    """{심볼: df} → 합집합 시각 격자 위 (시각 × 코인) 배열"""
+    symbols = list(frames)
+    index = pd.DatetimeIndex([])
+    for df in frames.values():
+        index = index.union(df.index)
+    n_t, n_c = len(index), len(symbols)
+
+    present = np.zeros((n_t, n_c), dtype=bool)
+    values = {col: np.full((n_t, n_c), np.nan) for col in columns}
+    for j, sym in enumerate(symbols):
+        df = frames[sym]
+        pos = index.get_indexer(df.index)
+        present[pos, j] = True
+        for col in columns:
+            values[col][pos, j] = df[col].to_numpy(dtype=float)
+    return AlignedPanel(index=index, symbols=symbols, present=present, values=values)
+
+
+def _collect(parts: List[Tuple[np.ndarray, ...]], n_fields: int) -> Tuple[np.ndarray, ...]:
+    if not parts:
+        return tuple(np.empty(0, dtype=np.int64) for _ in range(n_fields))
+    out = tuple(np.concatenate([p[k] for p in parts]) for k in range(n_fields))
+    # 코인 순서 → 진입 순서 (코인별 순차 백테스트와 같은 거래 순서)
+    order = np.lexsort((out[1], out[0]))
+    return tuple(a[order] for a in out)
+
+
+def run_signal_machine(buy: np.ndarray, sell: np.ndarray,
+                       active: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    무포지션이면 buy에 진입, 보유 중이면 sell에 청산 (같은 봉 진입·청산 없음)
+
+    Returns: (코인 열, 진입 행, 청산 행) - 코인·진입 순 정렬
+    """
+    n_t, n_c = buy.shape
+    holding = np.zeros(n_c, dtype=bool)
+    entry_t = np.zeros(n_c, dtype=np.int64)
+    parts = []
+    for t in range(n_t):
+        act = active[t]
+        exits = holding & sell[t] & act
+        entries = ~holding & buy[t] & act
+        if exits.any():
+            cols = np.flatnonzero(exits)
+            parts.append((cols, entry_t[cols], np.full(len(cols), t)))
+            holding[cols] = False
+        if entries.any():
+            holding |= entries
+            entry_t[entries] = t
+    return _collect(parts, 3)
+
+
+def run_bracket_machine(close: np.ndarray, buy: np.ndarray, active: np.ndarray, index: pd.DatetimeIndex,
+                        sl_rate: float, tp_rate: float, tp_rate_ext: float,
+                        max_hold_days: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    buy에 종가 진입, 이후 봉 종가 기준 손절 → 확장익절 → 익절 → 보유일수 순으로 청산
+
+    보유일수는 진입 봉과 현재 봉의 경과 일수 (timedelta.days와 같이 나노초 차를 하루 단위로 내림)
+    Returns: (코인 열, 진입 행, 청산 행, 청산 사유 코드 - EXIT_REASONS 인덱스)
+    """
+    n_t, n_c = close.shape
+    ns = index.as_unit('ns').asi8
+    holding = np.zeros(n_c, dtype=bool)
+    entry_t = np.zeros(n_c, dtype=np.int64)
+    entry_px = np.zeros(n_c)
+    parts = []
+    for t in range(n_t):
+        act = active[t]
+        check = holding & act
+        if check.any():
+            cols = np.flatnonzero(check)
+            pnl = (close[t, cols] - entry_px[cols]) / entry_px[cols]
+            held = (ns[t] - ns[entry_t[cols]]) // 86_400_000_000_000
+            reason = np.select([pnl <= -sl_rate, pnl >= tp_rate_ext, pnl >= tp_rate, held >= max_hold_days],
+                               [0, 1, 2, 3], default=-1)
+            done = reason >= 0
+            if done.any():
+                cols, reason = cols[done], reason[done]
+                parts.append((cols, entry_t[cols], np.full(len(cols), t), reason))
+                holding[cols] = False
+        # 같은 봉 청산 후 재진입 없음 (elif 구조) → 이 봉 시작 시 무포지션이던 코인만
+        entries = ~(check | holding) & buy[t] & act
+        if entries.any():
+            holding |= entries
+            entry_t[entries] = t
+            entry_px[entries] = close[t, entries]
+    return _collect(parts, 4)
+
+
+def summarize_trades(trades: List[Dict]) -> Dict:
+    """거래 리스트 → 거래 수 / 승률 / 평균·복리 수익률 (net_pnl_rate, result 컬럼 기준)"""
+    if not trades:
+        return {'trades': 0, 'wins': 0, 'win_rate': 0.0, 'avg_pnl': 0.0, 'total_return': 0.0}
+    pnl = np.array([t['net_pnl_rate'] for t in trades], dtype=float)
+    wins = sum(1 for t in trades if t['result'] == 'WIN')
+    return {
+        'trades': len(trades),
+        'wins': wins,
+        'win_rate': wins / len(trades) * 100,
+        'avg_pnl': float(pnl.mean()),
+        'total_return': float((np.prod(1 + pnl / 100) - 1) * 100),
+    }
+
+
+def group_results(coins: List[Dict], trades_by_symbol: Dict[str, List[Dict]]):
+    """코인별 거래 → (all_trades, results_by_tier, coin_results)"""
+    all_trades = []
+    results_by_tier = {tier: [] for tier in TIERS}
+    coin_results = []
+    for coin in coins:
+        trades = trades_by_symbol.get(coin['symbol'])
+        if not trades:
+            continue
+        all_trades.extend(trades)
+        results_by_tier.setdefault(coin.get('tier', 'Mid'), []).extend(trades)
+        s = summarize_trades(trades)
+        coin_results.append({
+            'symbol': coin['symbol'],
+            'name': coin['name'],
+            'tier': coin.get('tier', 'Mid'),
+            'trades': s['trades'],
+            'wins': s['wins'],
+            'win_rate': s['win_rate'],
+            'avg_pnl': s['avg_pnl'],
+        })
+    return all_trades, results_by_tier, coin_results
+
+
+# ── 파라미터 스윕 (프로세스 풀) ──
+_SWEEP_STATE = {}
+
+
+def _init_sweep(factory, coins, frames):
+    _SWEEP_STATE.update(factory=factory, coins=coins, frames=frames)
+
+
+def _sweep_job(params: Dict) -> Dict:
+    bt = _SWEEP_STATE['factory']()
+    for key, value in params.items():
+        setattr(bt, key, value)
+    trades_by_symbol = bt.batch_trades(_SWEEP_STATE['coins'], _SWEEP_STATE['frames'])
+    all_trades, results_by_tier, _ = group_results(_SWEEP_STATE['coins'], trades_by_symbol)
+    row = dict(params)
+    row.update(summarize_trades(all_trades))
+    for tier, trades in results_by_tier.items():
+        s = summarize_trades(trades)
+        row[f'{tier}_trades'] = s['trades']
+        row[f'{tier}_win_rate'] = s['win_rate']
+    return row
+
+
+def sweep(factory, coins: List[Dict], frames: Dict[str, pd.DataFrame],
+          grid: Dict[str, Sequence], max_workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    파라미터 조합별 전체 코인 배치 백테스트
+
+    factory: 인자 없이 생성 가능한 전략 클래스 (batch_trades(coins, frames) 제공)
+    grid: {속성명: 후보 값 리스트} - 조합마다 setattr 후 실행
+    데이터는 워커 초기화 때 한 번만 전달한다.
+    """
+    keys = list(grid)
+    jobs = [dict(zip(keys, combo)) for combo in itertools.product(*(grid[k] for k in keys))]
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs)), initializer=_init_sweep,
+                                 initargs=(factory, coins, frames)) as ex:
+            rows = list(ex.map(_sweep_job, jobs))
+    else:
+        _init_sweep(factory, coins, frames)
+        rows = [_sweep_job(job) for job in jobs]
+    return pd.DataFrame(rows).sort_values('total_return', ascending=False).reset_index(drop=True)
+
+
+# ── 빗썸 전 마켓 ──
+def bithumb_universe(api=None, candle_store=None, start_date: Optional[str] = None,
+                     end_date: Optional[str] = None, min_bars: int = 50,
+                     tier_sizes: Tuple[int, int] = (5, 10),
+                     max_workers: int = 8) -> Tuple[List[Dict], Dict[str, pd.DataFrame]]:
+    """
+    빗썸 KRW 전 마켓 일봉 → (coins, frames)
+
+    티어: 최근 20일 평균 거래대금 순위 상위 tier_sizes[0]개 Major, 다음 tier_sizes[1]개 Large, 나머지 Mid
+    candle_store(CryptoCandleStore)가 있으면 저장된 봉 이후만 요청한다.
+    조회에 실패한 마켓은 건너뛰고 경고를 출력한다 (한 마켓 오류로 전체가 중단되지 않도록).
+    """
+    if api is None:
+        from bithumb_trading_simulator import BithumbPublicAPI
+        api = BithumbPublicAPI()
+    markets = api.get_market_all()
+
+    def load(currency):
+        try:
+            if candle_store is not None:
+                df = candle_store.load(f"{currency}_KRW", '1d', start=start_date or 0, end=end_date)
+            else:
+                df = api.get_ohlcv(currency)
+                if not df.empty:
+                    if start_date:
+                        df = df[df.index >= start_date]
+                    if end_date:
+                        df = df[df.index <= end_date]
+        except Exception as e:
+            return currency, None, e
+        return currency, df, None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        loaded = list(ex.map(load, markets))
+
+    failed = [(currency, err) for currency, _, err in loaded if err is not None]
+    for currency, err in failed:
+        print(f"⚠️ {currency}: 일봉 조회 실패, 건너뜀 ({type(err).__name__}: {err})")
+
+    frames, turnover = {}, {}
+    for currency, df, _ in loaded:
+        if df is None or len(df) < min_bars:
+            continue
+        df = df.rename(columns=str.capitalize)[['Open', 'High', 'Low', 'Close', 'Volume']]
+        symbol = f"{currency}/KRW"
+        frames[symbol] = df
+        turnover[symbol] = float((df['Close'] * df['Volume']).iloc[-20:].mean())
+
+    ranked = sorted(frames, key=lambda s: turnover[s], reverse=True)
+    n_major, n_large = tier_sizes
+    coins = []
+    for rank, symbol in enumerate(ranked):
+        tier = 'Major' if rank < n_major else 'Large' if rank < n_major + n_large else 'Mid'
+        coins.append({'symbol': symbol, 'name': symbol.split('/')[0], 'tier': tier})
+    return coins, frames
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='가상화폐 다종목 배치 백테스트')
+    parser.add_argument('--strategy', choices=['wavetrend', 'rsibb'], default='wavetrend')
+    parser.add_argument('--universe', choices=['binance', 'bithumb'], default='binance')
+    parser.add_argument('--start', default='2024-01-01')
+    parser.add_argument('--end', default='2025-03-30')
+    parser.add_argument('--sweep', action='store_true', help='파라미터 조합 스윕')
+    parser.add_argument('--workers', type=int, default=None, help='스윕 프로세스 수')
+    args = parser.parse_args()
+
+    if args.strategy == 'wavetrend':
+        from wavetrend_crypto_extended import WaveTrendCryptoBacktest as factory
+        grid = {'os_level': [-60, -53, -45], 'ob_level': [45, 53, 60]}
+    else:
+        from global_backtest import RSIBBBacktestGlobal as factory
+        grid = {'sl_rate': [0.02, 0.03, 0.05], 'tp_rate': [0.02, 0.03, 0.05]}
+
+    if args.universe == 'bithumb':
+        from crypto_candle_store import CryptoCandleStore, bithumb_fetcher
+        store = CryptoCandleStore(fetcher=bithumb_fetcher(), exchange='bithumb')
+        coins, frames = bithumb_universe(candle_store=store, start_date=args.start, end_date=args.end)
+    else:
+        from wavetrend_crypto_extended import WaveTrendCryptoBacktest
+        loader = WaveTrendCryptoBacktest()
+        coins = loader.coins
+        frames = loader.load_frames(coins, args.start, args.end)
+    print(f"📊 {args.universe} {len(frames)}개 코인 × {args.strategy}")
+
+    if args.sweep:
+        print(sweep(factory, coins, frames, grid, args.workers).to_string())
+        return
+
+    bt = factory()
+    all_trades, results_by_tier, coin_results = group_results(coins, bt.batch_trades(coins, frames))
+    s = summarize_trades(all_trades)
+    print(f"   총 {s['trades']}거래 | 승률 {s['win_rate']:.1f}% | 수익률 {s['total_return']:+.2f}%")
+    for tier in TIERS:
+        t = summarize_trades(results_by_tier.get(tier, []))
+        print(f"   {tier:<6}: {t['trades']}거래 | 승률 {t['win_rate']:.1f}% | 수익률 {t['total_return']:+.2f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Crypto Candle Store - 가상화폐 OHLCV 로컬 캔들 저장소
+거래소 히스토리를 매번 처음부터 페이지네이션하지 않도록 심볼/시간대별로 봉을 쌓아 둔다.
+
+- 저장: {root}/{exchange}/{심볼}/{시간대}.bin
+  고정 길이 레코드(ts int64 ms + OHLCV float64) 추가 전용 파일 → np.memmap으로 필요한 구간만 읽음
+- 갱신: 마지막 저장 봉 이후만 요청 (since = 마지막 ts + 봉 길이), 마감된 봉만 저장
+  저장소가 최신이면 네트워크 요청 없음
+- 과거 확장: 저장 시작보다 이른 구간을 요청하면 그 구간만 받아 앞에 붙여 다시 씀
+- 리샘플: resample_from='1h'면 1h의 배수 시간대(4h, 1d, 1w 등)는 1h 봉에서 로컬로 만든다 (mtf_resampler)
+  거래소 공백으로 1h 봉이 빠진 버킷도 남기고(keep_gaps), 결측/버린 버킷 수는 resample_stats에 기록
+- live=True: 아직 마감되지 않은 진행 중 봉을 한 번 더 받아 붙여 줌 (저장 안 함)
+
+fetcher는 (symbol, timeframe, since_ms, limit) → [[ts, o, h, l, c, v], ...] 호출 가능 객체.
+거래소 어댑터(ccxt_fetcher / bithumb_fetcher / yahoo_fetcher) 대신 로컬 가짜 함수를 넣어 테스트할 수 있다.
+
+사용법:
+    store = CryptoCandleStore(fetcher=ccxt_fetcher(ccxt.binance()), resample_from='1h')
+    df = store.load('BTC/USDT', '4h', '2020-01-01', '2025-03-28')
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from mtf_resampler import (FIELDS, bucket_start, canonical_timeframe, check_multiple, resample_ohlcv,
+                           timeframe_ms, to_ms)
+
+DEFAULT_ROOT = 'data/crypto_candles'
+RECORD_DTYPE = np.dtype([('ts', '<i8')] + [(f, '<f8') for f in FIELDS])
+
+Fetcher = Callable[[str, str, int, int], Sequence[Sequence[float]]]
+
+
+class CryptoCandleStore:
+    """심볼/시간대별 추가 전용 캔들 저장소"""
+
+    def __init__(self,
+                 fetcher: Fetcher,
+                 exchange: str = 'binance',
+                 root: str = DEFAULT_ROOT,
+                 page_limit: int = 1000,
+                 resample_from: Optional[str] = None,
+                 clock: Callable[[], float] = time.time,
+                 keep_gaps: bool = True):
+        self.fetcher = fetcher
+        self.exchange = exchange
+        self.root = Path(root)
+        self.page_limit = page_limit
+        self.resample_from = canonical_timeframe(resample_from) if resample_from else None
+        self.clock = clock
+        self.requests = 0
+        self.keep_gaps = keep_gaps
+        self.resample_stats = {}  # {(심볼, 시간대): {'gap_buckets': n, 'dropped_buckets': n}}
+
+    def _now_ms(self) -> int:
+        return int(self.clock() * 1000)
+
+    # ── 파일 ──
+    def path(self, symbol: str, timeframe: str) -> Path:
+        safe = symbol.replace('/', '_').replace(':', '_')
+        return self.root / self.exchange / safe / f"{canonical_timeframe(timeframe)}.bin"
+
+    def _meta_path(self, path: Path) -> Path:
+        return path.with_suffix('.json')
+
+    def _read(self, path: Path) -> np.ndarray:
+        """저장된 레코드 (memmap, 없으면 빈 배열)"""
+        if not path.exists():
+            return np.empty(0, dtype=RECORD_DTYPE)
+        size = path.stat().st_size
+        n = size // RECORD_DTYPE.itemsize
+        if size % RECORD_DTYPE.itemsize:
+            # 쓰다 끊긴 꼬리 레코드는 버림
+            with open(path, 'r+b') as f:
+                f.truncate(n * RECORD_DTYPE.itemsize)
+        if n == 0:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return np.memmap(path, dtype=RECORD_DTYPE, mode='r', shape=(n,))
+
+    def _append(self, path: Path, records: np.ndarray):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'ab') as f:
+            records.tofile(f)
+
+    def _rewrite(self, path: Path, records: np.ndarray):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        records.tofile(str(tmp))
+        os.replace(tmp, path)
+
+    def _load_meta(self, path: Path) -> dict:
+        meta = self._meta_path(path)
+        if meta.exists():
+            with open(meta, 'r') as f:
+                return json.load(f)
+        return {}
+
+    def _save_meta(self, path: Path, **fields):
+        meta = self._load_meta(path)
+        meta.update(fields)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._meta_path(path), 'w') as f:
+            json.dump(meta, f)
+
+    def last_timestamp(self, symbol: str, timeframe: str) -> Optional[int]:
+        records = self._read(self.path(symbol, timeframe))
+        return int(records['ts'][-1]) if len(records) else None
+
+    # ── 수집 ──
+    def _fetch_range(self, symbol: str, timeframe: str, since: int, until: int) -> List[list]:
+        """since ≤ ts ≤ until 봉을 페이지 단위로 수집 (오름차순, 중복 제거)"""
+        step = timeframe_ms(timeframe)
+        rows = []
+        while since <= until:
+            self.requests += 1
+            page = self.fetcher(symbol, timeframe, since, self.page_limit)
+            page = sorted((r for r in page if since <= int(r[0]) <= until), key=lambda r: r[0])
+            if not page:
+                break
+            rows.extend(page)
+            since = int(page[-1][0]) + step
+        dedup = {}
+        for r in rows:
+            dedup[int(r[0])] = r
+        return [dedup[k] for k in sorted(dedup)]
+
+    @staticmethod
+    def _to_records(rows: List[list]) -> np.ndarray:
+        records = np.empty(len(rows), dtype=RECORD_DTYPE)
+        if rows:
+            arr = np.asarray(rows, dtype=float)
+            records['ts'] = arr[:, 0].astype(np.int64)
+            for i, f in enumerate(FIELDS, start=1):
+                records[f] = arr[:, i]
+        return records
+
+    def update(self, symbol: str, timeframe: str, start=None, end=None) -> int:
+        """
+        마감된 봉을 저장소에 채움 → 새로 저장한 봉 수
+
+        start: 저장소가 비었거나 저장 시작보다 이를 때 받을 시작 시각
+        end: 이 시각까지만 받음 (None이면 현재까지)
+        """
+        path = self.path(symbol, timeframe)
+        step = timeframe_ms(timeframe)
+        closed_until = self._now_ms() - step
+        until = closed_until if end is None else min(closed_until, to_ms(end))
+        records = self._read(path)
+        added = 0
+
+        start_ms = to_ms(start) if start is not None else None
+        covered_from = self._load_meta(path).get('start_ms')
+        if len(records) and start_ms is not None and covered_from is not None and start_ms < covered_from:
+            # 저장 시작 이전 구간 확장 (드문 경우라 파일을 다시 씀)
+            older = self._to_records(self._fetch_range(symbol, timeframe, start_ms,
+                                                       min(int(records['ts'][0]) - step, until)))
+            if len(older):
+                self._rewrite(path, np.concatenate([older, np.asarray(records)]))
+                added += len(older)
+            self._save_meta(path, start_ms=start_ms)
+            records = self._read(path)
+
+        if len(records):
+            since = int(records['ts'][-1]) + step
+        elif start_ms is not None:
+            since = start_ms
+        else:
+            raise ValueError(f"{symbol} {timeframe}: 저장된 봉이 없으면 start가 필요합니다")
+
+        if since <= until:
+            new = self._to_records(self._fetch_range(symbol, timeframe, since, until))
+            if len(new):
+                self._append(path, new)
+                added += len(new)
+            if not len(records):
+                self._save_meta(path, start_ms=start_ms if start_ms is not None else since)
+        return added
+
+    # ── 조회 ──
+    @staticmethod
+    def _frame(records) -> pd.DataFrame:
+        df = pd.DataFrame({f: np.asarray(records[f]) for f in FIELDS},
+                          index=pd.to_datetime(np.asarray(records['ts']), unit='ms'))
+        df.index.name = 'timestamp'
+        return df
+
+    def _slice(self, path: Path, start, end) -> np.ndarray:
+        records = self._read(path)
+        ts = records['ts']
+        lo = 0 if start is None else int(np.searchsorted(ts, to_ms(start), side='left'))
+        hi = len(ts) if end is None else int(np.searchsorted(ts, to_ms(end), side='right'))
+        return np.array(records[lo:hi])
+
+    def _can_resample(self, timeframe: str) -> bool:
+        return bool(self.resample_from) and check_multiple(self.resample_from, timeframe)
+
+    def _resampled(self, symbol: str, timeframe: str, start, end) -> pd.DataFrame:
+        """resample_from 봉 → 상위 시간대 (epoch 기준 정렬, 주봉은 월요일, 완성 버킷 + keep_gaps면 결측 버킷)"""
+        step = timeframe_ms(timeframe)
+        base_step = timeframe_ms(self.resample_from)
+        start_ms = None if start is None else int(bucket_start(to_ms(start), timeframe))
+        end_ms = None if end is None else to_ms(end) + step - base_step
+        self.update(symbol, self.resample_from, start_ms, end_ms)
+        base = self._frame(self._slice(self.path(symbol, self.resample_from), start_ms, end_ms))
+        if base.empty:
+            return base
+
+        df = resample_ohlcv(base, timeframe, self.resample_from, keep_gaps=self.keep_gaps)
+        stats = {k: df.attrs.get(k, 0) for k in ('gap_buckets', 'dropped_buckets')}
+        self.resample_stats[(symbol, timeframe)] = stats
+        if stats['gap_buckets'] or (stats['dropped_buckets'] and not self.keep_gaps):
+            print(f"   ⚠️ {symbol} {timeframe} 리샘플: 결측 버킷 {stats['gap_buckets']}개 포함, "
+                  f"{stats['dropped_buckets']}개 제외")
+        if end is not None:
+            df = df[df.index <= pd.Timestamp(to_ms(end), unit='ms')]
+        return df
+
+    def load(self, symbol: str, timeframe: str, start=None, end=None, live: bool = False) -> pd.DataFrame:
+        """
+        start ≤ 봉 시작 ≤ end OHLCV (index: 봉 시작 UTC, 컬럼: open/high/low/close/volume)
+
+        live=True면 진행 중인 봉까지 붙여 반환 (저장하지 않음)
+        """
+        timeframe = canonical_timeframe(timeframe)
+        if self._can_resample(timeframe) and not live:
+            return self._resampled(symbol, timeframe, start, end)
+
+        self.update(symbol, timeframe, start, end)
+        df = self._frame(self._slice(self.path(symbol, timeframe), start, end))
+        if live and end is None and (len(df) or start is not None):
+            step = timeframe_ms(timeframe)
+            since = to_ms(df.index[-1]) + step if len(df) else to_ms(start)
+            forming = self._fetch_range(symbol, timeframe, since, self._now_ms())
+            if forming:
+                df = pd.concat([df, self._frame(self._to_records(forming))])
+        return df
+
+
+# ── 거래소 어댑터 ──
+
+def ccxt_fetcher(exchange) -> Fetcher:
+    """ccxt 거래소 객체 → fetcher"""
+    def fetch(symbol, timeframe, since, limit):
+        return exchange.fetch_ohlcv(symbol, timeframe, since, limit=limit)
+    return fetch
+
+
+def bithumb_fetcher(session=None, base_url: str = 'https://api.bithumb.com') -> Fetcher:
+    """빗썸 Public 캔들 API → fetcher (symbol 예: 'BTC_KRW', 전체 히스토리를 한 번에 반환)"""
+    import requests
+    session = session or requests.Session()
+    intervals = {'1d': '24h'}
+
+    def fetch(symbol, timeframe, since, limit):
+        interval = intervals.get(timeframe, timeframe)
+        data = session.get(f"{base_url}/public/candlestick/{symbol}/{interval}", timeout=10).json()
+        if data.get('status') != '0000':
+            return []
+        # 빗썸 컬럼 순서: ts, open, close, high, low, volume
+        return [[int(r[0]), float(r[1]), float(r[3]), float(r[4]), float(r[2]), float(r[5])]
+                for r in data.get('data', []) if int(r[0]) >= since]
+    return fetch
+
+
+def yahoo_fetcher() -> Fetcher:
+    """Yahoo Finance → fetcher (symbol 예: 'BTC-USD')"""
+    import yfinance as yf
+
+    def fetch(symbol, timeframe, since, limit):
+        interval = {'1w': '1wk'}.get(timeframe, timeframe)
+        hist = yf.Ticker(symbol).history(start=pd.Timestamp(since, unit='ms'), interval=interval)
+        if hist.empty:
+            return []
+        index = hist.index
+        if index.tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+        ts = index.as_unit('ms').asi8
+        cols = hist[['Open', 'High', 'Low', 'Close', 'Volume']].to_numpy(dtype=float)
+        return [[int(t), *row] for t, row in zip(ts, cols.tolist())]
+    return fetch
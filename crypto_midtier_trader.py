@@ -4,13 +4,14 @@ Mid-tier 가상화폐 WaveTrend 자동매매 시스템
 백테스트 승률 50%+, 수익률 +55% 종목 대상
 """
 
-import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
 import json
 import os
 import sys
 
+from crypto_candle_store import CryptoCandleStore, ccxt_fetcher
+from indicator_filters import wavetrend
+
 class WaveTrendMidCryptoTrader:
     """WaveTrend Mid-tier 가상화폐 트레이더"""
     
@@ -25,6 +26,7 @@ class WaveTrendMidCryptoTrader:
         self.avg_len = 21
         self.os_level = -53  # 과매도
         self.ob_level = 53   # 과매수
+        self.candles = None  # CryptoCandleStore (첫 조회 시 생성)
         
         # Mid-tier 종목만 (백테스트 우수 종목)
         self.coins = [
@@ -59,27 +61,20 @@ class WaveTrendMidCryptoTrader:
             json.dump(state, f, indent=2)
     
     def calculate_wavetrend(self, df):
-        hlc3 = (df['High'] + df['Low'] + df['Close']) / 3
-        esa = hlc3.ewm(span=self.channel_len, adjust=False).mean()
-        de = abs(hlc3 - esa).ewm(span=self.channel_len, adjust=False).mean()
-        ci = (hlc3 - esa) / (0.015 * de)
-        wt1 = ci.ewm(span=self.avg_len, adjust=False).mean()
-        wt2 = wt1.rolling(window=4).mean()
-        return wt1, wt2
+        return wavetrend(df['High'], df['Low'], df['Close'], self.channel_len, self.avg_len)
     
     def get_data(self, symbol):
         try:
-            import ccxt
-            exchange = ccxt.binance({'enableRateLimit': True})
-            since = exchange.parse8601((datetime.now() - timedelta(days=60)).isoformat())
-            ohlcv = exchange.fetch_ohlcv(symbol, '1d', since)
+            if self.candles is None:
+                import ccxt
+                self.candles = CryptoCandleStore(fetcher=ccxt_fetcher(ccxt.binance({'enableRateLimit': True})))
+            # 마감 봉은 저장소에서, 진행 중인 오늘 봉만 새로 요청
+            df = self.candles.load(symbol, '1d', datetime.now() - timedelta(days=60), live=True)
             
-            if len(ohlcv) < 30:
+            if len(df) < 30:
                 return None
             
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'Open', 'High', 'Low', 'Close', 'Volume'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
+            df.columns = ['Open', 'High', 'Low', 'Close', 'Volume']
             return df
         except:
             return None
@@ -20,9 +20,10 @@ import asyncio
 import aiohttp
 import json
 import logging
+import time
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from enum import Enum
 import os
 import sys
@@ -31,6 +32,10 @@ import sys
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+from event_log import EventLog
+
+SIGNAL_STREAM = 'signal'
+
 # 텔레그램 알림 임포트
 try:
     from telegram_alert import TelegramAlert, get_telegram_alert
@@ -64,6 +69,10 @@ class DataSourceScore:
     weight: float  # 가중치
     raw_data: Dict = field(default_factory=dict)
     timestamp: datetime = field(default_factory=datetime.now)
+    status: str = 'fresh'  # fresh | cached | stale | timeout | error (SourceResult.status)
+    latency_ms: float = 0.0  # 이번 신호에서 이 소스를 기다린 시간
+    age_seconds: float = 0.0  # 사용한 데이터의 나이 (캐시/stale이면 > 0)
+    contribution: float = 0.0  # 총점 중 이 소스 몫 (score × weight / 총 가중치)
 
 
 @dataclass
@@ -93,31 +102,53 @@ class TradingSignal:
                 {
                     'source': s.source,
                     'score': round(s.score, 2),
-                    'weight': s.weight
+                    'weight': s.weight,
+                    'status': s.status,
+                    'latency_ms': round(s.latency_ms, 1),
+                    'age_seconds': round(s.age_seconds, 1),
+                    'contribution': round(s.contribution, 2)
                 } for s in self.source_scores
             ]
         }
 
 
-class CoinGeckoAPI:
-    """CoinGecko API 연동"""
+class _SourceAPI:
+    """소스 API 공통 - session을 넘기면 공용 세션 사용 (닫지 않음), 없으면 컨텍스트마다 생성"""
     
-    BASE_URL = "https://api.coingecko.com/api/v3"
+    BASE_URL = ""
     
-    def __init__(self):
-        self.session: Optional[aiohttp.ClientSession] = None
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None, base_url: Optional[str] = None):
+        self.session = session
+        self.base_url = base_url or self.BASE_URL
+        self._owns_session = False
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        if self.session is None:
+            self.session = aiohttp.ClientSession()
+            self._owns_session = True
         return self
     
     async def __aexit__(self, *args):
-        if self.session:
+        if self.session and self._owns_session:
             await self.session.close()
+            self.session = None
+            self._owns_session = False
+
+
+class CoinGeckoAPI(_SourceAPI):
+    """CoinGecko API 연동"""
+    
+    BASE_URL = "https://api.coingecko.com/api/v3"
+    FNG_URL = "https://api.alternative.me/fng/"
+    
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None,
+                 base_url: Optional[str] = None, fng_url: Optional[str] = None):
+        super().__init__(session, base_url)
+        self.fng_url = fng_url or self.FNG_URL
     
     async def get_price(self, ids: List[str]) -> Dict[str, float]:
         """현재가 조회"""
-        url = f"{self.BASE_URL}/simple/price"
+        url = f"{self.base_url}/simple/price"
         params = {
             'ids': ','.join(ids),
             'vs_currencies': 'usd',
@@ -145,8 +176,7 @@ class CoinGeckoAPI:
     async def get_fear_greed(self) -> Optional[Dict]:
         """공포탐욕지수"""
         try:
-            url = "https://api.alternative.me/fng/"
-            async with self.session.get(url, timeout=10) as resp:
+            async with self.session.get(self.fng_url, timeout=10) as resp:
                 if resp.status == 200:
                     data = await resp.json()
                     return data.get('data', [{}])[0]
@@ -155,29 +185,18 @@ class CoinGeckoAPI:
         return None
 
 
-class DeFiLlamaAPI:
+class DeFiLlamaAPI(_SourceAPI):
     """DeFiLlama API 연동"""
     
     BASE_URL = "https://api.llama.fi"
     
-    def __init__(self):
-        self.session: Optional[aiohttp.ClientSession] = None
-    
-    async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
-        return self
-    
-    async def __aexit__(self, *args):
-        if self.session:
-            await self.session.close()
-    
     async def get_tvl(self, protocol: str = None) -> Dict:
         """TVL 데이터"""
         try:
             if protocol:
-                url = f"{self.BASE_URL}/protocol/{protocol}"
+                url = f"{self.base_url}/protocol/{protocol}"
             else:
-                url = f"{self.BASE_URL}/charts"
+                url = f"{self.base_url}/charts"
             
             async with self.session.get(url, timeout=10) as resp:
                 if resp.status == 200:
@@ -189,7 +208,7 @@ class DeFiLlamaAPI:
     async def get_stablecoins(self) -> Dict:
         """스테이블코인 유동성"""
         try:
-            url = f"{self.BASE_URL}/stablecoins"
+            url = f"{self.base_url}/stablecoins"
             async with self.session.get(url, timeout=10) as resp:
                 if resp.status == 200:
                     return await resp.json()
@@ -198,20 +217,12 @@ class DeFiLlamaAPI:
         return {}
 
 
-class CoinGlassAPI:
+class CoinGlassAPI(_SourceAPI):
     """CoinGlass API 연동 (일부 물리 API)"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, session: Optional[aiohttp.ClientSession] = None):
+        super().__init__(session)
         self.api_key = api_key
-        self.session: Optional[aiohttp.ClientSession] = None
-    
-    async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
-        return self
-    
-    async def __aexit__(self, *args):
-        if self.session:
-            await self.session.close()
     
     async def get_funding_rate(self, symbol: str = "BTC") -> Optional[float]:
         """펀딩비 조회"""
@@ -223,26 +234,15 @@ class CoinGlassAPI:
         return None
 
 
-class BithumbAPI:
+class BithumbAPI(_SourceAPI):
     """Bithumb Public API"""
     
     BASE_URL = "https://api.bithumb.com/public"
     
-    def __init__(self):
-        self.session: Optional[aiohttp.ClientSession] = None
-    
-    async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
-        return self
-    
-    async def __aexit__(self, *args):
-        if self.session:
-            await self.session.close()
-    
     async def get_ticker(self, coin: str) -> Optional[Dict]:
         """현재가 조회"""
         try:
-            url = f"{self.BASE_URL}/ticker/{coin}_KRW"
+            url = f"{self.base_url}/ticker/{coin}_KRW"
             async with self.session.get(url, timeout=5) as resp:
                 if resp.status == 200:
                     data = await resp.json()
@@ -253,6 +253,113 @@ class BithumbAPI:
         return None
 
 
+class SessionPool:
+    """소스 API 공용 aiohttp 세션 (호스트별 keep-alive 연결 재사용)"""
+    
+    def __init__(self, limit: int = 20, limit_per_host: int = 4, keepalive_timeout: float = 30):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def get(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host,
+                                             keepalive_timeout=self.keepalive_timeout, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+    
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def __aenter__(self):
+        await self.get()
+        return self
+    
+    async def __aexit__(self, *args):
+        await self.close()
+
+
+@dataclass
+class SourceResult:
+    """소스 조회 결과"""
+    value: Any
+    status: str  # fresh: 방금 받음 / cached: TTL 내 캐시 / stale: 기한 초과·실패로 지난 값 / timeout / error
+    latency_ms: float = 0.0
+    age_seconds: float = 0.0
+
+
+# 소스별 (응답 기한 초, 캐시 TTL 초, stale 허용 한도 초)
+SOURCE_POLICY = {
+    'coingecko_price': (4.0, 60, 1800),
+    'fear_greed': (4.0, 3600, 86400),
+    'defillama': (6.0, 1800, 86400),
+    'bithumb': (3.0, 5, 300),
+}
+
+
+class SourceCache:
+    """
+    stale-while-revalidate 소스 캐시
+
+    TTL 내 값은 바로 반환. 지나면 갱신 요청을 띄우고 응답 기한만큼만 기다린다.
+    기한 안에 못 받거나 실패(빈 응답)하면 stale 한도 내 지난 값으로 대신하고,
+    갱신 요청은 백그라운드에서 계속돼 다음 조회 때 캐시에 반영된다 (같은 키 중복 요청 없음).
+    """
+    
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._entries: Dict[str, Tuple[Any, float]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+    
+    async def _refresh(self, key: str, factory: Callable[[], Awaitable[Any]]):
+        try:
+            value = await factory()
+            if value:
+                self._entries[key] = (value, self.clock())
+            return value
+        finally:
+            self._inflight.pop(key, None)
+    
+    async def fetch(self, key: str, factory: Callable[[], Awaitable[Any]],
+                    deadline: float, ttl: float, max_stale: float) -> SourceResult:
+        start = self.clock()
+        entry = self._entries.get(key)
+        if entry and start - entry[1] < ttl:
+            return SourceResult(entry[0], 'cached', 0.0, start - entry[1])
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._refresh(key, factory))
+            self._inflight[key] = task
+        try:
+            value = await asyncio.wait_for(asyncio.shield(task), deadline)
+            status = 'fresh' if value else 'error'
+        except asyncio.TimeoutError:
+            value, status = None, 'timeout'
+        except Exception as e:
+            logger.error(f"{key} error: {e}")
+            value, status = None, 'error'
+        
+        now = self.clock()
+        latency_ms = (now - start) * 1000
+        if value:
+            return SourceResult(value, status, latency_ms)
+        if entry and now - entry[1] <= max_stale:
+            return SourceResult(entry[0], 'stale', latency_ms, now - entry[1])
+        return SourceResult(None, status, latency_ms)
+    
+    async def close(self):
+        """진행 중인 백그라운드 갱신 취소"""
+        tasks = list(self._inflight.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._inflight.clear()
+
+
 class SignalEngine:
     """신호 생성 엔진"""
     
@@ -266,8 +373,44 @@ class SignalEngine:
         'onchain': 0.15,        # 온체인
     }
     
-    def __init__(self):
+    def __init__(self,
+                 session_pool: Optional[SessionPool] = None,
+                 cache: Optional[SourceCache] = None,
+                 policy: Optional[Dict[str, Tuple[float, float, float]]] = None,
+                 endpoints: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            session_pool: 공용 세션 (None이면 엔진 전용 풀 생성)
+            cache: 소스 캐시 (None이면 새로 생성)
+            policy: SOURCE_POLICY 덮어쓰기 {소스: (기한, TTL, stale 한도)}
+            endpoints: 소스 URL 덮어쓰기 {'coingecko', 'fear_greed', 'defillama', 'bithumb'} (로컬 가짜 서버 테스트용)
+        """
         self.scores: Dict[str, List[DataSourceScore]] = {}
+        self.pool = session_pool or SessionPool()
+        self.cache = cache or SourceCache()
+        self.policy = {**SOURCE_POLICY, **(policy or {})}
+        self.endpoints = endpoints or {}
+    
+    async def close(self):
+        await self.cache.close()
+        await self.pool.close()
+    
+    async def _fetch_source(self, key: str, source: str, factory) -> SourceResult:
+        deadline, ttl, max_stale = self.policy[source]
+        return await self.cache.fetch(key, factory, deadline, ttl, max_stale)
+    
+    @staticmethod
+    def _source_score(source: str, score: float, weight: float, result: SourceResult,
+                      raw_data: Optional[Dict] = None) -> DataSourceScore:
+        return DataSourceScore(
+            source=source,
+            score=score,
+            weight=weight,
+            raw_data=raw_data if raw_data is not None else (result.value or {}),
+            status=result.status,
+            latency_ms=result.latency_ms,
+            age_seconds=result.age_seconds
+        )
     
     def calculate_fear_greed_score(self, fear_greed_data: Optional[Dict]) -> float:
         """공포탐욕지수 점수 계산 (0-100)"""
@@ -306,42 +449,43 @@ class SignalEngine:
         return 50  # 기본값
     
     async def generate_signal(self, symbol: str = "BTC") -> Optional[TradingSignal]:
-        """통합 신호 생성"""
+        """
+        통합 신호 생성
+
+        모든 소스를 공용 세션으로 동시에 요청하고 소스별 기한까지만 기다린다 (지연 = 가장 느린 소스).
+        기한을 넘긴 소스는 캐시된 지난 값(stale)을 쓰거나 빠지며, 상태는 DataSourceScore에 남는다.
+        """
+        session = await self.pool.get()
+        cg = CoinGeckoAPI(session, self.endpoints.get('coingecko'), self.endpoints.get('fear_greed'))
+        llama = DeFiLlamaAPI(session, self.endpoints.get('defillama'))
+        bithumb = BithumbAPI(session, self.endpoints.get('bithumb'))
+        
+        price_r, fg_r, tvl_r, ticker_r = await asyncio.gather(
+            self._fetch_source('coingecko_price', 'coingecko_price', lambda: cg.get_price(['bitcoin'])),
+            self._fetch_source('fear_greed', 'fear_greed', cg.get_fear_greed),
+            self._fetch_source('defillama', 'defillama', llama.get_tvl),
+            self._fetch_source('bithumb:BTC', 'bithumb', lambda: bithumb.get_ticker("BTC")),
+        )
+        
         source_scores = []
         
-        async with CoinGeckoAPI() as cg:
-            # CoinGecko 데이터
-            price_data = await cg.get_price(['bitcoin'])
-            fear_greed = await cg.get_fear_greed()
-            
-            # 공포탐욕 점수
-            fg_score = self.calculate_fear_greed_score(fear_greed)
-            source_scores.append(DataSourceScore(
-                source='fear_greed',
-                score=fg_score,
-                weight=self.WEIGHTS['fear_greed'],
-                raw_data=fear_greed or {}
-            ))
-            
-            # 가격 모멘텀 점수
-            if 'bitcoin' in price_data:
-                pm_score = self.calculate_price_momentum_score(price_data['bitcoin'])
-                source_scores.append(DataSourceScore(
-                    source='coingecko_price',
-                    score=pm_score,
-                    weight=0.15,
-                    raw_data=price_data['bitcoin']
-                ))
+        # 공포탐욕 점수 (없으면 중립 50)
+        fear_greed = fg_r.value
+        fg_score = self.calculate_fear_greed_score(fear_greed)
+        source_scores.append(self._source_score('fear_greed', fg_score, self.WEIGHTS['fear_greed'], fg_r))
+        
+        # 가격 모멘텀 점수 (없으면 가중치 0으로 상태만 기록)
+        price_data = price_r.value or {}
+        if 'bitcoin' in price_data:
+            pm_score = self.calculate_price_momentum_score(price_data['bitcoin'])
+            source_scores.append(self._source_score('coingecko_price', pm_score, 0.15, price_r,
+                                                    price_data['bitcoin']))
+        else:
+            source_scores.append(self._source_score('coingecko_price', 50, 0.0, price_r))
         
-        async with DeFiLlamaAPI() as llama:
-            tvl_data = await llama.get_tvl()
-            defi_score = self.calculate_defi_score(tvl_data)
-            source_scores.append(DataSourceScore(
-                source='defillama',
-                score=defi_score,
-                weight=self.WEIGHTS['defillama'],
-                raw_data=tvl_data
-            ))
+        tvl_data = tvl_r.value or {}
+        defi_score = self.calculate_defi_score(tvl_data)
+        source_scores.append(self._source_score('defillama', defi_score, self.WEIGHTS['defillama'], tvl_r))
         
         # 총점 계산
         total_weight = sum(s.weight for s in source_scores)
@@ -350,6 +494,8 @@ class SignalEngine:
         
         weighted_sum = sum(s.score * s.weight for s in source_scores)
         total_score = weighted_sum / total_weight
+        for s in source_scores:
+            s.contribution = s.score * s.weight / total_weight
         
         # 신호 강도 결정
         if total_score >= 80:
@@ -365,10 +511,9 @@ class SignalEngine:
         
         # 진입가 계산 (Bithumb)
         entry_price = None
-        async with BithumbAPI() as bithumb:
-            ticker = await bithumb.get_ticker("BTC")
-            if ticker:
-                entry_price = float(ticker.get('closing_price', 0))
+        ticker = ticker_r.value
+        if ticker:
+            entry_price = float(ticker.get('closing_price', 0))
         
         # 손절/익절 설정
         stop_loss = entry_price * 0.93 if entry_price else None  # -7%
@@ -404,6 +549,10 @@ class SignalMonitor:
         self.data_dir = '/tmp/crypto_signal_data'
         os.makedirs(self.data_dir, exist_ok=True)
         
+        # 신호 히스토리 (추가 전용 로그, 기존 건별 JSON 파일은 처음 한 번 이관)
+        self.signal_log = EventLog(f"{self.data_dir}/signal_log.db")
+        self._migrate_signal_files()
+        
         # 텔레그램 알림
         self.telegram = get_telegram_alert() if TELEGRAM_AVAILABLE else None
         
@@ -411,21 +560,31 @@ class SignalMonitor:
         self.paper = get_paper_connector() if PAPER_AVAILABLE else None
         self.auto_trade = auto_trade and PAPER_AVAILABLE
     
+    def _migrate_signal_files(self):
+        """signal_*.json → signal 스트림 (로그가 비어 있을 때만)"""
+        if self.signal_log.count(SIGNAL_STREAM):
+            return
+        files = sorted(f for f in os.listdir(self.data_dir) if f.startswith('signal_') and f.endswith('.json'))
+        if files:
+            n = self.signal_log.import_json_files(SIGNAL_STREAM, (f"{self.data_dir}/{f}" for f in files))
+            logger.info(f"Signal history migrated: {n} files")
+    
     def save_signal(self, signal: TradingSignal):
         """신호 저장"""
-        filename = f"{self.data_dir}/signal_{signal.timestamp.strftime('%Y%m%d_%H%M%S')}.json"
-        with open(filename, 'w') as f:
-            json.dump(signal.to_dict(), f, indent=2)
-        logger.info(f"Signal saved: {filename}")
-    
-    def load_history(self) -> List[Dict]:
-        """히스토리 로드"""
-        signals = []
-        for f in os.listdir(self.data_dir):
-            if f.startswith('signal_') and f.endswith('.json'):
-                with open(f"{self.data_dir}/{f}") as file:
-                    signals.append(json.load(file))
-        return sorted(signals, key=lambda x: x['timestamp'])
+        self.signal_log.append(SIGNAL_STREAM, signal.to_dict(), signal.timestamp)
+        logger.info(f"Signal saved: {self.signal_log.path} ({signal.timestamp.isoformat()})")
+    
+    def load_history(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                     limit: Optional[int] = None) -> List[Dict]:
+        """히스토리 로드 (start ~ end 구간만, 시각순)"""
+        return self.signal_log.range(SIGNAL_STREAM, start, end, limit)
+    
+    def compact_history(self, keep_days: int = 90, keep_last_per: Optional[str] = 'day') -> int:
+        """keep_days 이전 신호(와 페이퍼트레이딩 계좌 스냅샷)는 하루 마지막 1건만 남김"""
+        deleted = self.signal_log.compact(SIGNAL_STREAM, datetime.now() - timedelta(days=keep_days), keep_last_per)
+        if self.paper:
+            deleted += self.paper.compact_history(keep_days, keep_last_per)
+        return deleted
     
     async def run(self):
         """메인 실행 루프"""
@@ -437,10 +596,18 @@ class SignalMonitor:
             logger.info("📱 텔레그램 알림: 활성화")
         logger.info("="*70)
         
+        compacted_on = None
         while True:
             try:
                 logger.info(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 신호 분석 시작...")
                 
+                # 오래된 히스토리 정리 (하루 한 번)
+                if compacted_on != datetime.now().date():
+                    compacted_on = datetime.now().date()
+                    deleted = self.compact_history()
+                    if deleted:
+                        logger.info(f"History compacted: {deleted} records")
+                
                 # 신호 생성
                 signal = await self.engine.generate_signal("BTC")
                 
@@ -480,11 +647,12 @@ class SignalMonitor:
     async def _get_current_prices(self) -> dict:
         """현재가 조회"""
         prices = {}
-        async with BithumbAPI() as api:
-            for coin in ['BTC', 'ETH', 'XRP', 'SOL']:
-                ticker = await api.get_ticker(coin)
-                if ticker:
-                    prices[coin] = float(ticker.get('closing_price', 0))
+        coins = ['BTC', 'ETH', 'XRP', 'SOL']
+        api = BithumbAPI(await self.engine.pool.get(), self.engine.endpoints.get('bithumb'))
+        tickers = await asyncio.gather(*(api.get_ticker(coin) for coin in coins))
+        for coin, ticker in zip(coins, tickers):
+            if ticker:
+                prices[coin] = float(ticker.get('closing_price', 0))
         return prices
     
     def print_signal(self, signal: TradingSignal):
@@ -508,7 +676,8 @@ class SignalMonitor:
         print(f"\n세부 점수:")
         for s in signal.source_scores:
             bar = "█" * int(s.score / 10) + "░" * (10 - int(s.score / 10))
-            print(f"  {s.source:15} [{bar}] {s.score:5.1f} (w:{s.weight:.2f})")
+            status = "" if s.status == 'fresh' else f" [{s.status}]"
+            print(f"  {s.source:15} [{bar}] {s.score:5.1f} (w:{s.weight:.2f}){status}")
         print(f"{'='*70}\n")
     
     async def send_alert(self, signal: TradingSignal):
@@ -522,10 +691,13 @@ async def main():
     
     # 단일 실행 모드
     if '--once' in os.sys.argv:
-        signal = await monitor.engine.generate_signal("BTC")
-        if signal:
-            monitor.print_signal(signal)
-            monitor.save_signal(signal)
+        try:
+            signal = await monitor.engine.generate_signal("BTC")
+            if signal:
+                monitor.print_signal(signal)
+                monitor.save_signal(signal)
+        finally:
+            await monitor.engine.close()
         return
     
     # 지속 모니터링
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Event Log - 추가 전용 이벤트 로그 (SQLite, 스트림 + 시각 인덱스)
+신호 히스토리 / 페이퍼트레이딩 계좌 스냅샷 / 서킷 브레이커 기록처럼
+"시각순으로 쌓고 구간으로 읽는" 레코드를 건별 JSON 파일 대신 한 DB에 쌓는다.
+
+- append / extend: 스트림에 레코드(dict) 추가 (ts: datetime 또는 ISO 문자열)
+- range: (stream, ts) 인덱스로 요청 구간만 읽음 → 전체 기록 수와 무관
+- latest / count
+- compact: 기준 시각 이전 기록 삭제 (keep_last_per='hour'|'day'면 구간별 마지막 1건 유지) + VACUUM
+- import_json_files: 기존 건별 JSON 파일 이관
+
+사용법:
+    log = EventLog('/tmp/crypto_signal_data/signal_log.db')
+    log.append('signal', signal.to_dict(), signal.timestamp)
+    recent = log.range('signal', start=datetime.now() - timedelta(days=7))
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Union
+
+Timestamp = Union[datetime, str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    stream TEXT NOT NULL,
+    ts TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_stream_ts ON events (stream, ts);
+"""
+
+# compact(keep_last_per=...) 구간 → ISO 문자열 앞부분 길이
+_PERIOD_PREFIX = {'minute': 16, 'hour': 13, 'day': 10, 'month': 7}
+
+
+def _iso(ts: Optional[Timestamp]) -> str:
+    """datetime / ISO 문자열 → 사전순 = 시간순인 고정 형식 문자열"""
+    if ts is None:
+        ts = datetime.now()
+    elif isinstance(ts, str):
+        ts = datetime.fromisoformat(ts)
+    return ts.isoformat(timespec='microseconds')
+
+
+class EventLog:
+    """스트림별 추가 전용 로그 (첫 사용 시 DB 생성)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # ── 쓰기 ──
+    def append(self, stream: str, record: Dict, ts: Optional[Timestamp] = None) -> int:
+        """레코드 1건 추가 → 이벤트 id"""
+        with self._lock:
+            cur = self._db().execute("INSERT INTO events (stream, ts, payload) VALUES (?, ?, ?)",
+                                     (stream, _iso(ts), json.dumps(record, ensure_ascii=False, default=str)))
+            return cur.lastrowid
+
+    def extend(self, stream: str, records: Iterable[Dict], ts_key: str = 'timestamp') -> int:
+        """레코드 여러 건 추가 (시각은 record[ts_key]) → 추가 건수"""
+        rows = [(stream, _iso(r.get(ts_key)), json.dumps(r, ensure_ascii=False, default=str)) for r in records]
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN")
+            db.executemany("INSERT INTO events (stream, ts, payload) VALUES (?, ?, ?)", rows)
+            db.execute("COMMIT")
+        return len(rows)
+
+    # ── 읽기 ──
+    @staticmethod
+    def _where(stream: str, start: Optional[Timestamp], end: Optional[Timestamp]):
+        sql, args = "stream = ?", [stream]
+        if start is not None:
+            sql += " AND ts >= ?"
+            args.append(_iso(start))
+        if end is not None:
+            sql += " AND ts <= ?"
+            args.append(_iso(end))
+        return sql, args
+
+    def range(self, stream: str, start: Optional[Timestamp] = None, end: Optional[Timestamp] = None,
+              limit: Optional[int] = None, descending: bool = False) -> List[Dict]:
+        """start ≤ ts ≤ end 레코드 (시각순, descending이면 최근순)"""
+        where, args = self._where(stream, start, end)
+        sql = f"SELECT payload FROM events WHERE {where} ORDER BY ts {'DESC' if descending else 'ASC'}, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+        with self._lock:
+            rows = self._db().execute(sql, args).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def latest(self, stream: str) -> Optional[Dict]:
+        rows = self.range(stream, limit=1, descending=True)
+        return rows[0] if rows else None
+
+    def count(self, stream: str, start: Optional[Timestamp] = None, end: Optional[Timestamp] = None) -> int:
+        where, args = self._where(stream, start, end)
+        with self._lock:
+            return self._db().execute(f"SELECT COUNT(*) FROM events WHERE {where}", args).fetchone()[0]
+
+    # ── 정리 ──
+    def compact(self, stream: str, before: Timestamp, keep_last_per: Optional[str] = None) -> int:
+        """
+        before 이전 기록 삭제 → 삭제 건수
+
+        keep_last_per: 'minute' | 'hour' | 'day' | 'month' - 그 구간별 마지막 1건은 남김 (다운샘플)
+        """
+        where, args = self._where(stream, None, None)
+        where += " AND ts < ?"
+        args.append(_iso(before))
+        sql = f"DELETE FROM events WHERE {where}"
+        if keep_last_per is not None:
+            n = _PERIOD_PREFIX[keep_last_per]
+            sql += (f" AND id NOT IN (SELECT MAX(id) FROM events WHERE {where}"
+                    f" GROUP BY substr(ts, 1, {n}))")
+            args = args + args
+        with self._lock:
+            db = self._db()
+            deleted = db.execute(sql, args).rowcount
+            if deleted:
+                db.execute("VACUUM")
+        return deleted
+
+    def import_json_files(self, stream: str, paths: Iterable[str], ts_key: str = 'timestamp') -> int:
+        """건별 JSON 파일 → 스트림 이관 (읽을 수 없는 파일은 건너뜀) → 이관 건수"""
+        records = []
+        for path in paths:
+            try:
+                with open(path) as f:
+                    records.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return self.extend(stream, records, ts_key) if records else 0
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Exit Grid Evaluator - 청산 조건 그리드 일괄 평가
+보유기간 × 손절 × 익절 조합 전체를 신호별 가격 경로 한 번 로드로 계산
+
+구조:
+- ForwardBars: 신호별 진입 이후 OHLC 경로 (신호 × 일수 배열, 없는 칸은 NaN)
+- load_forward_bars(): price_data에서 모든 신호의 경로를 한 번에 조회
+- evaluate_exit_grid(): 손절/익절 수준별 최초 도달일을 브로드캐스팅으로 구하고
+  보유기간별 결과를 조합해 (신호 × 보유 × 손절 × 익절) 결과 큐브 반환
+- ExitGridResult: 결과 큐브 + 평면 테이블(to_frame) + 조합별 통계(summary)
+
+판정 규칙 (기존 backtest_single 루프와 동일):
+- 1일차부터 매일 손절 → 익절 순서로 확인 (같은 날 둘 다 닿으면 손절)
+- 보유기간 마지막 날까지 미청산이면 그날 종가로 청산
+
+사용법:
+    bars = load_forward_bars('data/level1_prices.db', signals, n_days=12)
+    path = bars.window(2)                   # 진입일(1) 다음날부터 청산 판정
+    grid = evaluate_exit_grid(bars.open[:, 1], path.high, path.low, path.close,
+                              holding_days=[1, 3, 5, 10],
+                              stop_pcts=[-3, -5, -7], target_pcts=[6, 10, 15],
+                              n_bars=path.n_bars)
+    print(grid.summary())
+"""
+
+import sqlite3
+import warnings
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+NO_TRADE, STOP_LOSS, TAKE_PROFIT, TIME_EXIT, HOLD = range(5)
+REASONS = ('', 'stop_loss', 'take_profit', 'time_exit', 'hold')
+
+
+@dataclass
+class ForwardBars:
+    """신호별 진입 이후 가격 경로 (왼쪽 정렬, 없는 칸은 NaN)"""
+    dates: np.ndarray    # (신호, 일수) object
+    open: np.ndarray     # (신호, 일수) float
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    n_bars: np.ndarray   # (신호,) 실제 존재하는 일수
+
+    def window(self, start: int, length: Optional[int] = None) -> 'ForwardBars':
+        """start번째 날부터의 경로 (예: 다음날 진입 → window(1))"""
+        stop = None if length is None else start + length
+        cols = slice(start, stop)
+        n_bars = np.maximum(self.n_bars - start, 0)
+        if length is not None:
+            n_bars = np.minimum(n_bars, length)
+        return ForwardBars(self.dates[:, cols], self.open[:, cols], self.high[:, cols],
+                           self.low[:, cols], self.close[:, cols], n_bars)
+
+    @classmethod
+    def from_frames(cls, frames: Sequence[Optional[pd.DataFrame]], n_days: int) -> 'ForwardBars':
+        """
+        신호별 DataFrame 목록으로 생성 (get_price 결과처럼 'Open' 등 대문자 컬럼도 허용)
+        None/빈 DataFrame은 경로 없음으로 처리
+        """
+        S = len(frames)
+        out = {col: np.full((S, n_days), np.nan) for col in ('open', 'high', 'low', 'close')}
+        dates = np.full((S, n_days), None, dtype=object)
+        n_bars = np.zeros(S, dtype=int)
+        for i, df in enumerate(frames):
+            if df is None or df.empty:
+                continue
+            df = df.iloc[:n_days]
+            cols = {c.lower(): c for c in df.columns}
+            n = len(df)
+            for col in out:
+                out[col][i, :n] = df[cols[col]].to_numpy(dtype=float)
+            if 'date' in cols:
+                dates[i, :n] = df[cols['date']].astype(str).str[:10].to_numpy()
+            else:
+                dates[i, :n] = pd.Index(df.index).astype(str).str[:10]
+            n_bars[i] = n
+        return cls(dates, out['open'], out['high'], out['low'], out['close'], n_bars)
+
+
+def load_forward_bars(db_path: str, signals: Sequence[Dict], n_days: int,
+                      code_key: str = 'code', date_key: str = 'date') -> ForwardBars:
+    """
+    신호일 다음 거래일부터 n_days일 경로를 전체 신호에 대해 한 번에 조회
+
+    신호마다 read_sql을 반복하는 대신 종목 단위로 묶어 읽고 searchsorted로 자른다.
+    """
+    S = len(signals)
+    empty = ForwardBars(np.full((S, n_days), None, dtype=object),
+                        *(np.full((S, n_days), np.nan) for _ in range(4)),
+                        np.zeros(S, dtype=int))
+    if S == 0:
+        return empty
+
+    by_code: Dict[str, List[int]] = {}
+    for i, sig in enumerate(signals):
+        by_code.setdefault(sig[code_key], []).append(i)
+    start = min(str(sig[date_key])[:10] for sig in signals)
+
+    conn = sqlite3.connect(db_path)
+    frames = []
+    codes = sorted(by_code)
+    for i in range(0, len(codes), 500):
+        chunk = codes[i:i + 500]
+        query = f"""
+        SELECT code, date, open, high, low, close
+        FROM price_data
+        WHERE code IN ({','.join('?' * len(chunk))}) AND date > ?
+        ORDER BY code, date
+        """
+        frames.append(pd.read_sql(query, conn, params=(*chunk, start)))
+    conn.close()
+
+    df = pd.concat(frames, ignore_index=True)
+    if df.empty:
+        return empty
+
+    date_arr = df['date'].astype(str).to_numpy()
+    positions = df.groupby('code', sort=False).indices
+    idx = np.full((S, n_days), -1, dtype=np.int64)
+    for code, sig_ids in by_code.items():
+        pos = positions.get(code)
+        if pos is None:
+            continue
+        sig_dates = [str(signals[i][date_key])[:10] for i in sig_ids]
+        first = pos[0] + np.searchsorted(date_arr[pos], sig_dates, side='right')
+        cand = first[:, None] + np.arange(n_days)
+        cand[cand > pos[-1]] = -1
+        idx[sig_ids] = cand
+
+    valid = idx >= 0
+    safe = np.where(valid, idx, 0)
+
+    def take(col):
+        return np.where(valid, df[col].to_numpy(dtype=float)[safe], np.nan)
+
+    dates = np.where(valid, date_arr[safe], None).astype(object)
+    return ForwardBars(dates, take('open'), take('high'), take('low'), take('close'),
+                       valid.sum(axis=1))
+
+
+@dataclass
+class ExitGridResult:
+    """
+    청산 그리드 결과 큐브
+
+    returns/days/reasons 모양: (신호, 보유기간, 손절, 익절)
+    pairs=True면 손절·익절이 짝지어진 조합이라 (신호, 보유기간, 조합)
+    거래가 성립하지 않은 칸은 returns=NaN, reasons=NO_TRADE
+    """
+    returns: np.ndarray
+    days: np.ndarray
+    reasons: np.ndarray
+    holding_days: np.ndarray
+    stop_labels: list
+    target_labels: list
+    pairs: bool = False
+    stop_reason: str = 'stop_loss'
+
+    def reason_names(self) -> np.ndarray:
+        names = np.array(REASONS, dtype=object)
+        names[STOP_LOSS] = self.stop_reason
+        return names[self.reasons]
+
+    def _combos(self) -> pd.DataFrame:
+        """큐브의 (보유, 손절, 익절) 축을 C 순서로 펼친 좌표"""
+        if self.pairs:
+            h, p = np.meshgrid(np.arange(len(self.holding_days)),
+                               np.arange(len(self.stop_labels)), indexing='ij')
+            s, t = p.ravel(), p.ravel()
+            h = h.ravel()
+        else:
+            h, s, t = (a.ravel() for a in np.meshgrid(np.arange(len(self.holding_days)),
+                                                       np.arange(len(self.stop_labels)),
+                                                       np.arange(len(self.target_labels)),
+                                                       indexing='ij'))
+        return pd.DataFrame({
+            'holding_days': self.holding_days[h],
+            'stop_loss': np.asarray(self.stop_labels, dtype=object)[s],
+            'take_profit': np.asarray(self.target_labels, dtype=object)[t],
+        })
+
+    def to_frame(self, dropna: bool = True) -> pd.DataFrame:
+        """(신호, 보유, 손절, 익절)별 한 행의 평면 테이블"""
+        S = self.returns.shape[0]
+        combos = self._combos()
+        n = len(combos)
+        frame = combos.iloc[np.tile(np.arange(n), S)].reset_index(drop=True)
+        frame.insert(0, 'signal', np.repeat(np.arange(S), n))
+        frame['return'] = self.returns.reshape(S * n)
+        frame['days'] = self.days.reshape(S * n)
+        frame['reason'] = self.reason_names().reshape(S * n)
+        if dropna:
+            frame = frame[self.reasons.reshape(S * n) != NO_TRADE].reset_index(drop=True)
+        return frame
+
+    def summary(self) -> pd.DataFrame:
+        """조합별 거래수/승률/평균·중간·최대·최소 수익률"""
+        S = self.returns.shape[0]
+        flat = self.returns.reshape(S, -1)
+        traded = self.reasons.reshape(S, -1) != NO_TRADE
+        trades = traded.sum(axis=0)
+        wins = (traded & (flat > 0)).sum(axis=0)
+
+        summary = self._combos()
+        summary['total_trades'] = trades
+        summary['win_rate'] = np.where(trades > 0, wins / np.maximum(trades, 1) * 100, np.nan)
+        if S:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                summary['avg_return'] = np.nanmean(flat, axis=0)
+                summary['median_return'] = np.nanmedian(flat, axis=0)
+                summary['max_return'] = np.nanmax(flat, axis=0)
+                summary['min_return'] = np.nanmin(flat, axis=0)
+        else:
+            for col in ('avg_return', 'median_return', 'max_return', 'min_return'):
+                summary[col] = np.nan
+        return summary
+
+
+def _levels(values, S: int) -> np.ndarray:
+    """공통 수준 (K,) 또는 신호별 수준 (S, K) → (S, K)"""
+    arr = np.asarray(values, dtype=float)
+    if arr.ndim == 0:
+        arr = arr.reshape(1)
+    if arr.ndim == 1:
+        arr = np.broadcast_to(arr, (S, len(arr)))
+    return arr
+
+
+def _first_day(hit: np.ndarray) -> np.ndarray:
+    """마지막 축에서 처음 True가 되는 날 (1부터, 없으면 일수+1)"""
+    D = hit.shape[-1]
+    any_hit = hit.any(axis=-1)
+    return np.where(any_hit, hit.argmax(axis=-1) + 1, D + 1)
+
+
+def evaluate_exit_grid(entry, high, low, close,
+                       holding_days: Sequence[int],
+                       stop_pcts, target_pcts,
+                       n_bars=None,
+                       pairs: bool = False,
+                       partial: str = 'drop',
+                       trail_pct: Optional[float] = None,
+                       trail_amount=None,
+                       stop_labels: Optional[list] = None,
+                       target_labels: Optional[list] = None) -> ExitGridResult:
+    """
+    청산 조건 그리드 일괄 평가
+
+    Args:
+        entry: (S,) 진입가 (NaN/0 이하면 거래 없음)
+        high, low, close: (S, D) 진입 이후 1일차부터의 경로
+        holding_days: 보유기간 후보 (일)
+        stop_pcts: 손절 수익률(%) - (K,) 공통 또는 (S, K) 신호별 (ATR 기반 등)
+        target_pcts: 익절 수익률(%) - (J,) 공통 또는 (S, J) 신호별
+        n_bars: (S,) 유효 일수 (기본: 종가가 있는 칸 수)
+        pairs: True면 stop_pcts[i]와 target_pcts[i]를 짝지어 평가 (K == J)
+        partial: 보유기간보다 경로가 짧고 미청산일 때
+                 'drop' 거래 없음 / 'last' 마지막 종가 청산 / 'entry' 진입가 보유(수익 0, 청산일 0)
+        trail_pct: 신고가 대비 % 트레일링 스탑
+        trail_amount: (S,) 신고가 대비 가격폭 트레일링 스탑 (ATR 등)
+    """
+    entry = np.asarray(entry, dtype=float)
+    high, low, close = (np.asarray(a, dtype=float) for a in (high, low, close))
+    if close.shape[1] == 0:
+        high, low, close = (np.full((len(close), 1), np.nan) for _ in range(3))
+    S, D = close.shape
+    holding = np.asarray(holding_days, dtype=int)
+    if n_bars is None:
+        n_bars = np.isfinite(close).sum(axis=1)
+    n_bars = np.minimum(np.asarray(n_bars, dtype=int), D)
+    n_bars = np.where(np.isfinite(entry) & (entry > 0), n_bars, 0)
+
+    stops = _levels(stop_pcts, S)
+    targets = _levels(target_pcts, S)
+    if pairs and stops.shape[1] != targets.shape[1]:
+        raise ValueError("pairs=True requires the same number of stops and targets")
+
+    base = entry[:, None]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        high_ret = (high - base) / base * 100
+        low_ret = (low - base) / base * 100
+        close_ret = (close - base) / base * 100
+
+    # 일자별 손절 수준 (S, K, D) - 트레일링이면 신고가를 따라 올라간다
+    stop_path = np.broadcast_to(stops[:, :, None], stops.shape + (D,))
+    trailing = trail_pct is not None or trail_amount is not None
+    if trailing:
+        peak = np.fmax.accumulate(np.where(np.isnan(high), -np.inf, high), axis=1)
+        if trail_amount is not None:
+            trail_price = peak - np.asarray(trail_amount, dtype=float)[:, None]
+        else:
+            trail_price = peak * (1 - trail_pct / 100)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            trail_ret = np.where(peak > base, (trail_price - base) / base * 100, -np.inf)
+        stop_path = np.maximum(stop_path, trail_ret[:, None, :])
+
+    in_range = np.arange(D)[None, :] < n_bars[:, None]
+    stop_hit = (low_ret[:, None, :] <= stop_path) & in_range[:, None, :]
+    target_hit = (high_ret[:, None, :] >= targets[:, :, None]) & in_range[:, None, :]
+    stop_day = _first_day(stop_hit)          # (S, K)
+    target_day = _first_day(target_hit)      # (S, J)
+    stop_ret = np.take_along_axis(stop_path, np.minimum(stop_day, D)[:, :, None] - 1, axis=2)[:, :, 0]
+
+    # 보유기간별 판정 가능 마지막 날과 그날 종가 수익률 (S, H)
+    limit = np.minimum(holding[None, :], n_bars[:, None])
+    close_exit = np.take_along_axis(close_ret, np.clip(limit - 1, 0, D - 1), axis=1)
+    full = n_bars[:, None] >= holding[None, :]
+
+    if pairs:
+        sd, sr = stop_day[:, None, :], stop_ret[:, None, :]
+        td, tr = target_day[:, None, :], targets[:, None, :]
+        lim, cx, full_ = limit[:, :, None], close_exit[:, :, None], full[:, :, None]
+    else:
+        sd, sr = stop_day[:, None, :, None], stop_ret[:, None, :, None]
+        td, tr = target_day[:, None, None, :], targets[:, None, None, :]
+        lim, cx, full_ = limit[:, :, None, None], close_exit[:, :, None, None], full[:, :, None, None]
+
+    is_stop = (sd <= lim) & (sd <= td)
+    is_target = ~is_stop & (td <= lim)
+    open_end = ~is_stop & ~is_target
+    is_time = open_end & full_
+    reasons = np.select([is_stop, is_target, is_time], [STOP_LOSS, TAKE_PROFIT, TIME_EXIT], NO_TRADE)
+    returns = np.select([is_stop, is_target, is_time], [sr, tr, cx], np.nan)
+    days = np.select([is_stop, is_target, is_time], [sd, td, lim], 0)
+
+    if partial != 'drop':
+        tradable = (n_bars > 0) if partial == 'last' else (np.isfinite(entry) & (entry > 0))
+        short = open_end & ~full_ & tradable.reshape((S,) + (1,) * (reasons.ndim - 1))
+        fill_reason, fill_return, fill_day = (TIME_EXIT, cx, lim) if partial == 'last' else (HOLD, 0.0, 0)
+        reasons = np.where(short, fill_reason, reasons)
+        returns = np.where(short, fill_return, returns)
+        days = np.where(short, fill_day, days)
+
+    if stop_labels is None:
+        stop_labels = list(np.asarray(stop_pcts, dtype=float).ravel()) \
+            if np.ndim(stop_pcts) <= 1 else list(range(stops.shape[1]))
+    if target_labels is None:
+        target_labels = list(np.asarray(target_pcts, dtype=float).ravel()) \
+            if np.ndim(target_pcts) <= 1 else list(range(targets.shape[1]))
+
+    return ExitGridResult(
+        returns=returns,
+        days=days.astype(int),
+        reasons=reasons.astype(np.int8),
+        holding_days=holding,
+        stop_labels=stop_labels,
+        target_labels=target_labels,
+        pairs=pairs,
+        stop_reason='trailing_stop' if trailing else 'stop_loss',
+    )
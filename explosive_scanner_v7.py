@@ -22,6 +22,7 @@ import numpy as np
 from datetime import datetime, timedelta
 import json
 import logging
+from collections import deque
 from typing import Dict, List, Tuple, Optional
 import warnings
 warnings.filterwarnings('ignore')
@@ -891,6 +892,379 @@ class ExplosiveScannerV7:
         return html
 
 
+class _EwmState:
+    """pandas ewm(span, adjust=False).mean()과 동일한 O(1) 증분 계산 상태"""
+    
+    __slots__ = ('alpha', 'weighted', 'old_wt')
+    
+    def __init__(self, span: int):
+        self.alpha = 2.0 / (span + 1.0)
+        self.weighted = np.nan
+        self.old_wt = 1.0
+    
+    def peek(self, value: float) -> float:
+        """value를 반영한 결과 (상태 변경 없음)"""
+        weighted, _ = self._step(value)
+        return weighted
+    
+    def push(self, value: float) -> float:
+        self.weighted, self.old_wt = self._step(value)
+        return self.weighted
+    
+    def _step(self, value: float) -> Tuple[float, float]:
+        weighted, old_wt = self.weighted, self.old_wt
+        is_obs = value == value
+        if weighted == weighted:
+            old_wt *= 1.0 - self.alpha
+            if is_obs:
+                if weighted != value:
+                    weighted = (old_wt * weighted + self.alpha * value) / (old_wt + self.alpha)
+                old_wt = 1.0
+        elif is_obs:
+            weighted = value
+        return weighted, old_wt
+
+
+class _RollingMean:
+    """rolling(period, min_periods=1).mean() 증분 계산 (확정봉 합계 유지)"""
+    
+    __slots__ = ('period', 'window', 'total')
+    
+    def __init__(self, period: int):
+        self.period = period
+        self.window = deque(maxlen=period - 1) if period > 1 else deque(maxlen=0)
+        self.total = 0.0
+    
+    def peek(self, value: float) -> float:
+        return (self.total + value) / (len(self.window) + 1)
+    
+    def push(self, value: float):
+        if self.window.maxlen == 0:
+            return
+        if len(self.window) == self.window.maxlen:
+            self.total -= self.window[0]
+        self.window.append(value)
+        self.total += value
+
+
+class _StockStreamState:
+    """
+    종목별 스트리밍 지표 상태
+    
+    확정된 봉까지의 상태(committed)와 진행 중인 현재봉(current)을 분리하여
+    같은 날짜의 틱이 여러 번 들어와도 현재봉만 교체하고 O(1)로 재계산한다.
+    """
+    
+    def __init__(self, code: str, name: str = '', market: str = ''):
+        self.code = code
+        self.name = name
+        self.market = market
+        self.bar_count = 0          # 현재봉 포함 봉 수
+        self.current: Optional[Dict] = None
+        
+        self.ma = {p: _RollingMean(p) for p in (5, 20, 60)}
+        self.vol20 = _RollingMean(20)
+        self.closes = deque(maxlen=19)  # 20봉 전 종가 확인용
+        self.first_close: Optional[float] = None
+        
+        # RSI (Wilder 대신 기존 배치와 동일한 ewm span 방식)
+        self.rsi_gain = _EwmState(14)
+        self.rsi_loss = _EwmState(14)
+        # ADX
+        self.atr = _EwmState(14)
+        self.plus_dm = _EwmState(14)
+        self.minus_dm = _EwmState(14)
+        self.adx = _EwmState(14)
+        
+        self.prev_bar: Optional[Dict] = None     # 직전 확정봉
+        self.prev_ma20: Optional[float] = None   # 직전 확정봉의 ma20
+        self.snapshot: Optional[Dict] = None     # 현재봉 기준 지표
+    
+    def update(self, bar: Dict) -> bool:
+        """
+        봉/틱 반영. 날짜가 바뀌면 이전 현재봉을 확정한다.
+        
+        Returns:
+            지표 입력값이 바뀌었는지 여부
+        """
+        if self.current is not None and bar['date'] == self.current['date']:
+            if all(self.current.get(k) == bar.get(k) for k in ('high', 'low', 'close', 'volume')):
+                return False
+        elif self.current is not None:
+            if bar['date'] < self.current['date']:
+                return False  # 과거 데이터 무시
+            self._commit()
+        
+        if self.current is None or bar['date'] != self.current['date']:
+            self.bar_count += 1
+        self.current = bar
+        if bar.get('name'):
+            self.name = bar['name']
+        if bar.get('market'):
+            self.market = bar['market']
+        self.snapshot = self._compute(bar, commit=False)
+        return True
+    
+    def _commit(self):
+        bar = self.current
+        self._compute(bar, commit=True)
+        for p, rolling in self.ma.items():
+            if p == 20:
+                self.prev_ma20 = rolling.peek(bar['close'])
+            rolling.push(bar['close'])
+        self.vol20.push(bar['volume'])
+        if self.first_close is None:
+            self.first_close = bar['close']
+        self.closes.append(bar['close'])
+        self.prev_bar = bar
+        self.current = None
+    
+    def _compute(self, bar: Dict, commit: bool) -> Dict:
+        prev = self.prev_bar
+        high, low, close = bar['high'], bar['low'], bar['close']
+        
+        # RSI
+        if prev is None:
+            gain = loss = 0.0
+        else:
+            delta = close - prev['close']
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+        
+        # ADX 입력
+        if prev is None:
+            tr = high - low
+            plus_dm = minus_dm = 0.0
+        else:
+            tr = max(high - low, abs(high - prev['close']), abs(low - prev['close']))
+            up = high - prev['high']
+            down = prev['low'] - low
+            plus_dm = max(up, 0.0) if up > down else 0.0
+            minus_dm = max(down, 0.0) if down > up else 0.0
+        
+        step = (lambda s, v: s.push(v)) if commit else (lambda s, v: s.peek(v))
+        avg_gain = step(self.rsi_gain, gain)
+        avg_loss = step(self.rsi_loss, loss)
+        atr = step(self.atr, tr)
+        pdm = step(self.plus_dm, plus_dm)
+        mdm = step(self.minus_dm, minus_dm)
+        
+        rsi = 100 - 100 / (1 + avg_gain / avg_loss) if avg_loss else 50.0
+        if atr:
+            plus_di, minus_di = 100 * pdm / atr, 100 * mdm / atr
+            di_sum = plus_di + minus_di
+            dx = 100 * abs(plus_di - minus_di) / di_sum if di_sum else np.nan
+        else:
+            dx = np.nan
+        adx = step(self.adx, dx)
+        
+        if commit:
+            return {}
+        
+        ma = {p: rolling.peek(close) for p, rolling in self.ma.items()}
+        vol_20_avg = self.vol20.peek(bar['volume'])
+        if self.bar_count >= 20:
+            price_20_days_ago = self.closes[0]
+        else:
+            price_20_days_ago = self.first_close if self.first_close is not None else close
+        
+        change_pct = bar.get('change_pct')
+        if change_pct is None and prev is not None and prev['close']:
+            change_pct = (close - prev['close']) / prev['close'] * 100
+        
+        return {
+            'ma5': ma[5], 'ma20': ma[20], 'ma60': ma[60],
+            'rsi': rsi,
+            'adx': adx if adx == adx else 0.0,
+            'vol_20_avg': vol_20_avg,
+            'price_20_days_ago': price_20_days_ago,
+            'change_pct': change_pct,
+        }
+    
+    def to_stock(self) -> Optional[Dict]:
+        """ExplosiveScannerV7.analyze_stock()과 같은 형식의 분석 결과"""
+        if self.snapshot is None or self.bar_count < 30:
+            return None
+        bar, snap = self.current, self.snapshot
+        close = bar['close']
+        vol_20_avg = snap['vol_20_avg']
+        ma5, ma20, ma60 = snap['ma5'], snap['ma20'], snap['ma60']
+        
+        ma20_breakout = False
+        if self.prev_bar is not None and self.prev_ma20 is not None:
+            ma20_breakout = (close > ma20) and (self.prev_bar['close'] <= self.prev_ma20)
+        
+        p20 = snap['price_20_days_ago']
+        daily_change = snap['change_pct']
+        try:
+            daily_change = float(daily_change) if daily_change is not None else 0
+        except (TypeError, ValueError):
+            daily_change = 0
+        
+        return {
+            'code': self.code,
+            'name': self.name,
+            'market': self.market,
+            'date': str(bar['date']),
+            'close': float(close),
+            'volume': int(bar['volume']),
+            'vol_20_avg': int(vol_20_avg),
+            'vol_ratio': float(bar['volume'] / vol_20_avg) if vol_20_avg > 0 else 0.0,
+            'daily_change': float(daily_change),
+            'price_change_20d': float((close - p20) / p20 * 100) if p20 > 0 else 0.0,
+            'ma5': float(ma5),
+            'ma20': float(ma20),
+            'ma60': float(ma60),
+            'ma_aligned': bool(close > ma5 > ma20 > ma60),
+            'ma20_breakout': bool(ma20_breakout),
+            'rsi': float(snap['rsi']),
+            'adx': float(snap['adx']),
+            'macd': 0
+        }
+
+
+class ExplosiveStreamScanner(ExplosiveScannerV7):
+    """
+    개선안 7 스캐너 - 장중 스트리밍 모드
+    
+    종목별 이동평균/RSI/ADX/거래량 평균 상태를 메모리에 유지하고,
+    새 틱(봉)이 들어올 때마다 O(1)로 갱신한 뒤 입력이 바뀐 종목만 재채점한다.
+    
+    사용법:
+        scanner = ExplosiveStreamScanner().connect()
+        scanner.warm_up(scan_date='2026-04-02')   # 과거 봉으로 상태 초기화
+        scanner.update_bar({'code': '005930', 'date': '2026-04-03', ...})
+        new_signals = scanner.rescore()
+    """
+    
+    BAR_FIELDS = ('code', 'date', 'open', 'high', 'low', 'close', 'volume')
+    
+    def __init__(self, db_path: str = 'data/level1_prices.db'):
+        super().__init__(db_path)
+        self.states: Dict[str, _StockStreamState] = {}
+        self.results: Dict[str, Dict] = {}
+        self._dirty: set = set()
+    
+    def warm_up(self, days: int = 60, scan_date: str = None) -> int:
+        """DB의 과거 봉을 순서대로 반영하여 종목별 상태 초기화"""
+        if self.data is None:
+            self.fetch_data(days=days, scan_date=scan_date)
+        self.update_bars(self.data.sort_values(['code', 'date']).to_dict('records'))
+        logger.info(f"Stream state initialized for {len(self.states):,} stocks")
+        return len(self.states)
+    
+    def update_bar(self, bar: Dict) -> bool:
+        """
+        틱/봉 1개 반영
+        
+        Args:
+            bar: code, date, open, high, low, close, volume (+name, market, change_pct 선택)
+                 같은 date가 다시 들어오면 진행 중인 봉을 교체한다.
+        """
+        code = bar['code']
+        state = self.states.get(code)
+        if state is None:
+            state = _StockStreamState(code, bar.get('name') or '', bar.get('market') or '')
+            self.states[code] = state
+        bar = dict(bar)
+        bar['date'] = pd.Timestamp(bar['date'])
+        for key in ('open', 'high', 'low', 'close', 'volume'):
+            bar[key] = float(bar[key])
+        changed = state.update(bar)
+        if changed:
+            self._dirty.add(code)
+        return changed
+    
+    def update_bars(self, bars) -> int:
+        """여러 봉 반영, 변경된 종목 수 반환"""
+        for bar in bars:
+            self.update_bar(bar)
+        return len(self._dirty)
+    
+    def rescore(self) -> List[Dict]:
+        """
+        입력이 바뀐 종목만 재채점
+        
+        Returns:
+            이번 갱신으로 새로 진입조건을 충족한 종목 리스트
+        """
+        new_signals = []
+        dirty, self._dirty = self._dirty, set()
+        for code in dirty:
+            stock = self.states[code].to_stock()
+            if stock is None:
+                continue
+            try:
+                stock = self._score_stock(stock)
+            except Exception as e:
+                logger.warning(f"Error scoring {code}: {e}")
+                continue
+            was_candidate = self.results.get(code, {}).get('can_enter', False)
+            self.results[code] = stock
+            if stock['can_enter'] and not was_candidate:
+                new_signals.append(stock)
+        
+        new_signals.sort(key=lambda x: (x['score'], x['vol_ratio']), reverse=True)
+        if new_signals:
+            self.latest_date = max(self.states[s['code']].current['date'] for s in new_signals)
+        return new_signals
+    
+    def _score_stock(self, stock: Dict) -> Dict:
+        """scan_all_stocks()와 동일한 채점/진입조건/포지션 사이징"""
+        score, score_details = self.calculate_score(stock)
+        stock['score'] = score
+        stock['score_details'] = score_details
+        can_enter, conditions = self.check_entry_conditions(stock, score)
+        stock['can_enter'] = can_enter
+        stock['entry_conditions'] = conditions
+        if score >= 90:
+            stock['position_size'] = 20
+        elif score >= 85:
+            stock['position_size'] = 8
+        else:
+            stock['position_size'] = 0
+        return stock
+    
+    def current_candidates(self) -> List[Dict]:
+        """현재 진입조건 충족 종목 (점수순)"""
+        return self.filter_candidates(list(self.results.values()))
+    
+    def replay_bar_file(self, path: str, rescore_every: str = 'timestamp') -> List[Dict]:
+        """
+        기록된 봉 파일(CSV/JSONL) 재생
+        
+        Args:
+            path: code,date,open,high,low,close,volume[,timestamp] 컬럼을 가진 파일
+            rescore_every: 'timestamp'면 timestamp(없으면 date) 단위로 재채점,
+                           'bar'면 봉마다 재채점
+        
+        Returns:
+            재생 중 발생한 신호 리스트 (발생 순서)
+        """
+        if path.endswith('.jsonl') or path.endswith('.json'):
+            bars = pd.read_json(path, lines=path.endswith('.jsonl'), dtype={'code': str, 'name': str},
+                                convert_dates=False)
+        else:
+            bars = pd.read_csv(path, dtype={'code': str, 'name': str})
+        missing = [c for c in self.BAR_FIELDS if c not in bars.columns]
+        if missing:
+            raise ValueError(f"Bar file missing columns: {missing}")
+        # 숫자로 기록된 종목코드(5930)도 6자리(005930)로 맞춤
+        bars['code'] = bars['code'].astype(str).str.zfill(6)
+        
+        group_col = 'timestamp' if 'timestamp' in bars.columns else 'date'
+        emitted = []
+        if rescore_every == 'bar':
+            for bar in bars.to_dict('records'):
+                self.update_bar(bar)
+                emitted.extend(self.rescore())
+        else:
+            for _, group in bars.groupby(group_col, sort=False):
+                self.update_bars(group.to_dict('records'))
+                emitted.extend(self.rescore())
+        return emitted
+
+
 def main():
     """메인 실행 함수"""
     scanner = ExplosiveScannerV7()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Forward Return Store - 신호 이후 수익률 텐서 (memmap)
+"이 신호 다음에 무슨 일이 있었나"를 SQL 대신 배열 인덱싱으로 답하기 위한 사전 계산 저장소
+
+구조 (out_dir 아래 .npy, np.load(mmap_mode='r')로 열어 필요한 부분만 디스크에서 읽음):
+- fwd_return.npy   (거래일 × 종목 × 보유일) float32: close[d+h] / close[d] - 1 (%)
+- fwd_max_high.npy (거래일 × 종목 × 보유일) float32: max(high[d+1..d+h]) / close[d] - 1 (%)
+- fwd_min_low.npy  (거래일 × 종목 × 보유일) float32: min(low[d+1..d+h]) / close[d] - 1 (%)
+- open/high/low/close.npy (거래일 × 종목) float32, volume.npy float64: 경로 의존 시뮬레이션용 원 패널
+- meta.json: 거래일/종목/보유일 목록 + 원본 DB 버전 (크기·수정시각)
+
+규칙:
+- 거래일 축은 price_data 전체 날짜의 합집합, 해당일 데이터가 없는 칸(거래정지 등)은 NaN
+- 보유일 h는 거래일 축 기준 h번째 다음 거래일
+- 최고/최저는 진입 다음날부터 (진입일 당일 제외), NaN 칸은 건너뜀
+
+사용법:
+    python3 forward_returns.py --db data/level1_prices.db --out data/forward_returns
+
+    store = ForwardReturnStore.load_or_build('data/level1_prices.db')
+    ret = store.lookup(codes, dates, 'fwd_return')      # (신호, 보유일)
+    print(store.event_study(signals, horizons=[1, 3, 5, 10, 20]))
+    bars = store.bars(codes, dates, n_days=10)          # exit_grid.ForwardBars
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+import warnings
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from exit_grid import ForwardBars
+from param_optimizer import file_data_version
+
+
+DEFAULT_DIR = 'data/forward_returns'
+TENSORS = ('fwd_return', 'fwd_max_high', 'fwd_min_low')
+PANELS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def _load_panels(db_path: str):
+    """price_data 전체 → (거래일 × 종목) OHLCV 배열"""
+    conn = sqlite3.connect(db_path)
+    df = pd.read_sql("SELECT code, date, open, high, low, close, volume FROM price_data", conn)
+    conn.close()
+
+    df['date'] = df['date'].astype(str).str[:10]
+    d_idx, dates = pd.factorize(df['date'], sort=True)
+    c_idx, codes = pd.factorize(df['code'].astype(str), sort=True)
+    shape = (len(dates), len(codes))
+    panels = {}
+    for col in PANELS:
+        arr = np.full(shape, np.nan, dtype=np.float64 if col == 'volume' else np.float32)
+        arr[d_idx, c_idx] = df[col].to_numpy(dtype=float)
+        panels[col] = arr
+    return list(dates), list(codes), panels
+
+
+class ForwardReturnStore:
+    """보유일별 이후 수익률 텐서 + OHLCV 패널 (memmap)"""
+
+    def __init__(self, out_dir: str = DEFAULT_DIR):
+        self.out_dir = out_dir
+        with open(os.path.join(out_dir, 'meta.json'), encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.dates = pd.Index(self.meta['dates'])
+        self.codes = pd.Index(self.meta['codes'])
+        self.horizons = np.asarray(self.meta['horizons'])
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name not in self._arrays:
+            self._arrays[name] = np.load(os.path.join(self.out_dir, f'{name}.npy'), mmap_mode='r')
+        return self._arrays[name]
+
+    # ==================== 생성 ====================
+
+    @classmethod
+    def build(cls, db_path: str, out_dir: str = DEFAULT_DIR,
+              max_horizon: int = 20) -> 'ForwardReturnStore':
+        """DB 전체로 텐서 생성 (보유일 1..max_horizon)"""
+        start = time.time()
+        os.makedirs(out_dir, exist_ok=True)
+        dates, codes, panels = _load_panels(db_path)
+        D, C, H = len(dates), len(codes), max_horizon
+
+        for col, arr in panels.items():
+            np.save(os.path.join(out_dir, f'{col}.npy'), arr)
+
+        close = panels['close']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            base = np.where(close > 0, 100.0 / close, np.nan).astype(np.float32)
+        out = {name: np.lib.format.open_memmap(os.path.join(out_dir, f'{name}.npy'), mode='w+',
+                                               dtype=np.float32, shape=(D, C, H))
+               for name in TENSORS}
+
+        # 보유일을 하나씩 늘리며 최고/최저를 누적 (O(H) 패스, 날짜 루프 없음)
+        run_high = np.full((D, C), np.nan, dtype=np.float32)
+        run_low = np.full((D, C), np.nan, dtype=np.float32)
+        for h in range(1, H + 1):
+            shifted = {}
+            for col in ('close', 'high', 'low'):
+                s = np.full((D, C), np.nan, dtype=np.float32)
+                s[:D - h] = panels[col][h:]
+                shifted[col] = s
+            run_high = np.fmax(run_high, shifted['high'])
+            run_low = np.fmin(run_low, shifted['low'])
+            out['fwd_return'][:, :, h - 1] = shifted['close'] * base - 100
+            out['fwd_max_high'][:, :, h - 1] = run_high * base - 100
+            out['fwd_min_low'][:, :, h - 1] = run_low * base - 100
+        for arr in out.values():
+            arr.flush()
+        del out
+
+        meta = {
+            'db_path': db_path,
+            'data_version': file_data_version(db_path),
+            'built_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'dates': dates,
+            'codes': codes,
+            'horizons': list(range(1, H + 1)),
+        }
+        with open(os.path.join(out_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        print(f"✅ 이후 수익률 텐서 생성: {D}일 × {C}종목 × {H}보유일 ({time.time() - start:.1f}초)")
+        return cls(out_dir)
+
+    @classmethod
+    def load_or_build(cls, db_path: str, out_dir: str = DEFAULT_DIR,
+                      max_horizon: int = 20) -> 'ForwardReturnStore':
+        """저장된 텐서가 현재 DB 버전·보유일 범위와 맞으면 재사용, 아니면 재생성"""
+        meta_path = os.path.join(out_dir, 'meta.json')
+        if os.path.exists(meta_path):
+            store = cls(out_dir)
+            if (store.meta.get('data_version') == file_data_version(db_path)
+                    and len(store.horizons) >= max_horizon):
+                return store
+        return cls.build(db_path, out_dir, max_horizon)
+
+    # ==================== 조회 ====================
+
+    def index(self, codes: Sequence[str], dates: Sequence[str]):
+        """(종목, 날짜) → (날짜 인덱스, 종목 인덱스), 없는 값은 -1"""
+        d = self.dates.get_indexer([str(x)[:10] for x in dates])
+        c = self.codes.get_indexer([str(x) for x in codes])
+        return d, c
+
+    def lookup(self, codes: Sequence[str], dates: Sequence[str], name: str = 'fwd_return',
+               horizons: Optional[Sequence[int]] = None) -> np.ndarray:
+        """신호별 (보유일) 값 배열 (신호 × 보유일), 없는 신호는 NaN"""
+        d, c = self.index(codes, dates)
+        cols = np.arange(len(self.horizons)) if horizons is None else np.asarray(horizons) - 1
+        ok = (d >= 0) & (c >= 0)
+        out = np.full((len(d), len(cols)), np.nan, dtype=np.float32)
+        if ok.any():
+            out[ok] = self[name][d[ok], c[ok]][:, cols]
+        return out
+
+    def panel_value(self, codes: Sequence[str], dates: Sequence[str], col: str = 'close',
+                    offset: int = 0) -> np.ndarray:
+        """신호일 기준 offset 거래일 뒤의 패널 값 (예: 다음날 시가 → col='open', offset=1)"""
+        d, c = self.index(codes, dates)
+        d = np.where(d >= 0, d + offset, -1)
+        ok = (d >= 0) & (d < len(self.dates)) & (c >= 0)
+        out = np.full(len(d), np.nan)
+        out[ok] = self[col][d[ok], c[ok]]
+        return out
+
+    def bars(self, codes: Sequence[str], dates: Sequence[str], n_days: int,
+             offset: int = 1) -> ForwardBars:
+        """
+        신호일 + offset 거래일부터 n_days일 경로 (exit_grid.ForwardBars)
+
+        종목 기준으로 데이터가 있는 날만 왼쪽 정렬한다 (load_forward_bars와 같은 모양).
+        """
+        keys = [str(x)[:10] for x in dates]
+        c = self.codes.get_indexer([str(x) for x in codes])
+        D = len(self.dates)
+        # 신호일이 거래일 축에 없으면(휴일 등) 그 다음 거래일을 offset 1로 본다 (SQL의 date > ?와 동일)
+        pos = self.dates.searchsorted(keys, side='left')
+        exact = (pos < D) & (self.dates[np.minimum(pos, D - 1)] == np.asarray(keys, dtype=object))
+        start = pos + offset - ((~exact) & (offset > 0))
+        # 거래정지일을 건너뛰기 위해 여유 있게 잘라 온 뒤 유효 칸만 앞으로 모음
+        span = n_days * 2 + 5
+        rows = start[:, None] + np.arange(span)
+        valid = (c >= 0)[:, None] & (rows < D)
+        safe_r, safe_c = np.where(valid, rows, 0), np.where(valid, c[:, None], 0)
+        close = np.where(valid, self['close'][safe_r, safe_c], np.nan)
+        valid &= ~np.isnan(close)
+        order = np.argsort(~valid, axis=1, kind='stable')[:, :n_days]
+        keep = np.take_along_axis(valid, order, axis=1)
+        pick_r = np.take_along_axis(safe_r, order, axis=1)
+        pick_c = np.take_along_axis(safe_c, order, axis=1)
+
+        def take(col):
+            return np.where(keep, self[col][pick_r, pick_c], np.nan).astype(float)
+
+        date_arr = np.asarray(self.meta['dates'], dtype=object)
+        return ForwardBars(np.where(keep, date_arr[pick_r], None).astype(object),
+                           take('open'), take('high'), take('low'), take('close'),
+                           keep.sum(axis=1))
+
+    def future_frame(self, code: str, date: str, days: int, inclusive: bool = False) -> pd.DataFrame:
+        """
+        단일 신호의 이후 OHLCV DataFrame (get_future_data SQL 대체)
+
+        inclusive=True: date 당일 포함 (date >= ?), False: 다음 거래일부터 (date > ?)
+        """
+        bars = self.bars([code], [date], days, offset=0 if inclusive else 1)
+        n = int(bars.n_bars[0])
+        if n == 0:
+            return pd.DataFrame(columns=['date', 'open', 'high', 'low', 'close', 'volume'])
+        c = self.codes.get_indexer([str(code)])
+        rows = self.dates.get_indexer(bars.dates[0, :n])
+        return pd.DataFrame({
+            'date': bars.dates[0, :n],
+            'open': bars.open[0, :n],
+            'high': bars.high[0, :n],
+            'low': bars.low[0, :n],
+            'close': bars.close[0, :n],
+            'volume': self['volume'][rows, c[0]],
+        })
+
+    # ==================== 이벤트 스터디 ====================
+
+    def event_study(self, signals, horizons: Sequence[int] = (1, 3, 5, 10, 20),
+                    code_key: str = 'code', date_key: str = 'date') -> pd.DataFrame:
+        """
+        신호 목록 전체의 보유일별 수익률 분포를 한 번에 계산
+
+        signals: dict 리스트 또는 code/date 컬럼을 가진 DataFrame
+        """
+        if isinstance(signals, pd.DataFrame):
+            codes, dates = signals[code_key].tolist(), signals[date_key].tolist()
+        else:
+            codes = [s[code_key] for s in signals]
+            dates = [s[date_key] for s in signals]
+        return self._summarize(
+            self.lookup(codes, dates, 'fwd_return', horizons),
+            self.lookup(codes, dates, 'fwd_max_high', horizons),
+            self.lookup(codes, dates, 'fwd_min_low', horizons),
+            horizons,
+        )
+
+    def event_study_mask(self, mask: np.ndarray,
+                         horizons: Sequence[int] = (1, 3, 5, 10, 20)) -> pd.DataFrame:
+        """(거래일 × 종목) 불리언 마스크의 모든 True 칸을 신호로 보고 보유일별 분포 계산"""
+        d, c = np.nonzero(mask)
+        cols = np.asarray(horizons) - 1
+        return self._summarize(self['fwd_return'][d, c][:, cols],
+                               self['fwd_max_high'][d, c][:, cols],
+                               self['fwd_min_low'][d, c][:, cols],
+                               horizons)
+
+    @staticmethod
+    def _summarize(ret, high, low, horizons) -> pd.DataFrame:
+        ret = np.asarray(ret, dtype=float)
+        valid = ~np.isnan(ret)
+        n = valid.sum(axis=0)
+        # 전부 NaN인 보유일(데이터 끝)은 경고 없이 NaN으로 둠
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            return pd.DataFrame({
+                'horizon': list(horizons),
+                'signals': n,
+                'win_rate': np.where(n > 0, (ret > 0).sum(axis=0) / np.maximum(n, 1) * 100, np.nan),
+                'avg_return': np.nanmean(ret, axis=0),
+                'median_return': np.nanmedian(ret, axis=0),
+                'std_return': np.nanstd(ret, axis=0),
+                'avg_max_high': np.nanmean(np.asarray(high, dtype=float), axis=0),
+                'avg_min_low': np.nanmean(np.asarray(low, dtype=float), axis=0),
+            }).set_index('horizon')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='이후 수익률 텐서 생성')
+    parser.add_argument('--db', default='data/level1_prices.db', help='price_data DB 경로')
+    parser.add_argument('--out', default=DEFAULT_DIR, help='저장 디렉토리')
+    parser.add_argument('--horizons', type=int, default=20, help='최대 보유일')
+    parser.add_argument('--force', action='store_true', help='DB 버전이 같아도 재생성')
+    args = parser.parse_args()
+
+    if args.force:
+        store = ForwardReturnStore.build(args.db, args.out, args.horizons)
+    else:
+        store = ForwardReturnStore.load_or_build(args.db, args.out, args.horizons)
+    print(f"📦 {args.out}: {len(store.dates)}일 × {len(store.codes)}종목 × {len(store.horizons)}보유일 "
+          f"({store.dates[0]} ~ {store.dates[-1]})")
+
+
+if __name__ == '__main__':
+    main()
@@ -19,6 +19,8 @@ from typing import List, Dict, Tuple, Optional
 import json
 import os
 
+from forward_returns import ForwardReturnStore
+
 
 class GapUpMomentumScanner:
     """갭상승 모멘텀 스캐너"""
@@ -135,11 +137,16 @@ class GapUpMomentumScanner:
 class GapUpBacktester:
     """갭상승 전략 백테스터"""
     
-    def __init__(self, db_path: str = 'data/level1_prices.db'):
+    def __init__(self, db_path: str = 'data/level1_prices.db',
+                 forward: Optional[ForwardReturnStore] = None):
         self.db_path = db_path
+        self.forward = forward  # 지정 시 신호별 SQL 대신 memmap 패널에서 조회
         
     def get_future_data(self, code: str, entry_date: str, days: int = 20) -> pd.DataFrame:
         """진입 후 미래 데이터 조회"""
+        if self.forward is not None:
+            return self.forward.future_frame(code, entry_date, days)
+        
         conn = sqlite3.connect(self.db_path)
         
         query = """
@@ -334,7 +341,8 @@ def main():
     
     if signals:
         # 백테스트 실행
-        backtester = GapUpBacktester()
+        backtester = GapUpBacktester(
+            forward=ForwardReturnStore.load_or_build(scanner.db_path))
         stats = backtester.run_backtest(
             signals, 
             holding_days=10,
@@ -12,6 +12,8 @@ import json
 import warnings
 warnings.filterwarnings('ignore')
 
+from crypto_batch_backtest import EXIT_REASONS, align_frames, run_bracket_machine
+
 def calculate_rsi(prices, period=14):
     delta = prices.diff()
     gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
@@ -122,6 +124,48 @@ class RSIBBBacktestGlobal:
         return trades, f"✅ {len(trades)}거래"
 
 
+    def batch_trades(self, assets, frames, asset_type='Crypto'):
+        """전 종목을 공통 시각 격자에서 한 번에 백테스트 → {심볼: 거래 리스트} (backtest_asset과 동일 규칙)"""
+        names = {a['symbol']: a['name'] for a in assets}
+        prepared = {}
+        for symbol in names:
+            df = self.prepare_data(frames.get(symbol))
+            if df is not None:
+                prepared[symbol] = df
+        if not prepared:
+            return {}
+        
+        panel = align_frames(prepared, ['Close', 'RSI', 'Buy_Signal'])
+        cols, entry_t, exit_t, reasons = run_bracket_machine(
+            panel['Close'], panel.flag('Buy_Signal'), panel.active(35), panel.index,
+            self.sl_rate, self.tp_rate, self.tp_rate_ext, self.max_hold_days)
+        
+        close, rsi = panel['Close'], panel['RSI']
+        trades = {s: [] for s in prepared}
+        for j, ei, xi, r in zip(cols.tolist(), entry_t.tolist(), exit_t.tolist(), reasons.tolist()):
+            symbol = panel.symbols[j]
+            entry_price, current_price = float(close[ei, j]), float(close[xi, j])
+            entry_date, date = panel.index[ei], panel.index[xi]
+            pnl_rate = (current_price - entry_price) / entry_price
+            net_pnl_rate = (pnl_rate - self.fee_rate * 2) * 100
+            
+            trades[symbol].append({
+                'symbol': symbol,
+                'name': names[symbol],
+                'type': asset_type,
+                'entry_date': str(entry_date)[:10],
+                'exit_date': str(date)[:10],
+                'entry_price': round(entry_price, 2),
+                'exit_price': round(current_price, 2),
+                'entry_rsi': round(float(rsi[ei, j]), 1),
+                'holding_days': (date - entry_date).days,
+                'net_pnl_rate': round(net_pnl_rate, 2),
+                'result': 'WIN' if net_pnl_rate > 0 else 'LOSS',
+                'exit_reason': EXIT_REASONS[r]
+            })
+        return trades
+
+
 class USStockBacktest:
     """미국 주식 백테스트"""
     
@@ -239,22 +283,28 @@ class CryptoBacktest:
         print(f"   청산: -{self.backtest.sl_rate*100:.0f}% 손절 / +{self.backtest.tp_rate*100:.0f}% 익절")
         print("="*70)
         
+        # 데이터 수집 후 전 코인 배치 백테스트
+        frames = {}
+        for coin in self.coins:
+            df = self.get_data(coin['symbol'], start_date, end_date)
+            if df is not None:
+                frames[coin['symbol']] = df
+        trades_by_symbol = self.backtest.batch_trades(self.coins, frames, 'Crypto')
+        
         all_trades = []
         
         for i, coin in enumerate(self.coins, 1):
             print(f"[{i:2d}/{len(self.coins)}] {coin['symbol']:<12} ({coin['name']:<12})", end=' ')
             
-            df = self.get_data(coin['symbol'], start_date, end_date)
-            trades, msg = self.backtest.backtest_asset(
-                coin['symbol'], coin['name'], 'Crypto', df
-            )
-            
+            trades = trades_by_symbol.get(coin['symbol'])
             if trades:
                 all_trades.extend(trades)
                 wins = sum(1 for t in trades if t['result'] == 'WIN')
                 print(f"→ {len(trades)}거래 (승: {wins})")
+            elif coin['symbol'] in trades_by_symbol:
+                print(f"→ ✅ 0거래")
             else:
-                print(f"→ {msg}")
+                print(f"→ 데이터 부족")
         
         return all_trades
 
@@ -19,17 +19,27 @@ import json
 import requests
 import time
 
+from crypto_candle_store import CryptoCandleStore, bithumb_fetcher
+
 
 class BithumbPublicAPI:
     """빗썸 Public API"""
     
     BASE_URL = "https://api.bithumb.com"
     
-    def __init__(self):
+    def __init__(self, candle_store: Optional[CryptoCandleStore] = None):
         self.session = requests.Session()
+        self.candle_store = candle_store
     
     def get_ohlcv(self, order_currency: str, chart_intervals: str = "24h", count: int = 100) -> pd.DataFrame:
-        """OHLCV 데이터 조회"""
+        """OHLCV 데이터 조회 (candle_store가 있으면 저장된 마감 봉 + 새 봉만 요청)"""
+        if self.candle_store is not None:
+            try:
+                df = self.candle_store.load(f"{order_currency}_KRW", chart_intervals, start=0)
+                return df[['open', 'close', 'high', 'low', 'volume']]
+            except Exception as e:
+                return pd.DataFrame()
+        
         url = f"{self.BASE_URL}/public/candlestick/{order_currency}_KRW/{chart_intervals}"
         try:
             response = self.session.get(url, timeout=10)
@@ -68,8 +78,9 @@ class HighWinRateStrategy:
     - 목표 승률: 60%+
     """
     
-    def __init__(self, initial_balance: float = 10_000_000):
-        self.api = BithumbPublicAPI()
+    def __init__(self, initial_balance: float = 10_000_000,
+                 candle_store: Optional[CryptoCandleStore] = None):
+        self.api = BithumbPublicAPI(candle_store)
         self.initial_balance = initial_balance
         self.balance = initial_balance
         self.positions = {}
@@ -307,10 +318,12 @@ def main():
                        help='실행 모드')
     parser.add_argument('--coin', default='BTC', help='대상 코인')
     parser.add_argument('--days', type=int, default=200, help='백테스트 일수')
+    parser.add_argument('--no-cache', action='store_true', help='로컬 캔들 저장소 없이 매번 전체 조회')
     
     args = parser.parse_args()
     
-    trader = HighWinRateStrategy()
+    store = None if args.no_cache else CryptoCandleStore(fetcher=bithumb_fetcher(), exchange='bithumb')
+    trader = HighWinRateStrategy(candle_store=store)
     
     if args.mode == 'backtest':
         result = trader.backtest(args.coin, args.days)
@@ -15,6 +15,12 @@ import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
 import sqlite3
+import sys
+from pathlib import Path
+
+# Vectorized theme detection (all dates at once), shared with v2 DPlusStrategy
+sys.path.insert(0, str(Path(__file__).parent / 'v2' / 'core'))
+from theme_detection import flag_sector_themes, select_daily_leaders, dominant_theme_table
 
 
 class DPlusLeadingStockStrategy:
@@ -334,54 +340,63 @@ class DPlusLeadingStockStrategy:
         """
         Run backtest of the strategy
         
+        Theme flags and the daily leader are computed once for the whole
+        period (see flag_sector_themes / select_daily_leaders); the daily
+        loop only walks the selected leaders and open positions, reading
+        prices from a (dates x codes) panel instead of re-filtering
+        market_data every day.
+        
         Args:
             market_data: DataFrame with columns:
                 - date, code, name, sector, open, high, low, close, volume, change_pct
             start_date: Backtest start date
             end_date: Backtest end date
         """
-        dates = pd.date_range(start=start_date, end=end_date, freq='B')  # Business days
+        business_days = pd.date_range(start=start_date, end=end_date, freq='B').strftime('%Y-%m-%d')
+        data = market_data[market_data['date'].isin(business_days)]
+        data = data[~data.duplicated(['date', 'code'], keep='first')].reset_index(drop=True)
+        if data.empty:
+            return pd.DataFrame(self.daily_stats)
         
-        for date in dates:
-            date_str = date.strftime('%Y-%m-%d')
-            
-            # Skip if no data for this date
-            day_data = market_data[market_data['date'] == date_str]
-            if day_data.empty:
-                continue
-            
-            # 1. Detect dominant themes
-            dominant_themes = self.detect_dominant_theme(market_data, date_str)
-            
-            if dominant_themes:
-                # 2. Select leader stock
-                leader = self.select_leader_stock(market_data, dominant_themes, date_str)
-                
-                if leader:
-                    leader_data = day_data[day_data['code'] == leader]
-                    if not leader_data.empty:
-                        # 3. Check entry conditions and enter
-                        if self.check_entry_conditions(leader_data, market_data, date_str):
-                            entry_price = leader_data.iloc[0]['open'] * 1.05  # Enter after some rise
-                            self.enter_position(leader, date_str, entry_price)
+        flags = flag_sector_themes(data)
+        leaders = select_daily_leaders(flags)
+        
+        dates = pd.Index(sorted(data['date'].unique()))
+        codes = pd.Index(data['code'].unique())
+        d_idx, c_idx = dates.get_indexer(data['date']), codes.get_indexer(data['code'])
+        panel = {}
+        for col in ('close', 'high', 'low'):
+            arr = np.full((len(dates), len(codes)), np.nan)
+            arr[d_idx, c_idx] = data[col].to_numpy(dtype=float)
+            panel[col] = arr
+        
+        for i, date_str in enumerate(dates):
+            # 1-3. Leader of the day's dominant themes -> entry
+            label = leaders.get(date_str)
+            if label is not None:
+                leader_data = data.loc[[label]]
+                leader = leader_data['code'].iloc[0]
+                if self.check_entry_conditions(leader_data, market_data, date_str):
+                    entry_price = leader_data.iloc[0]['open'] * 1.05  # Enter after some rise
+                    self.enter_position(leader, date_str, entry_price)
             
             # 4. Manage existing positions
             for stock_code in list(self.positions.keys()):
-                stock_day_data = day_data[day_data['code'] == stock_code]
-                if not stock_day_data.empty:
+                j = codes.get_loc(stock_code)
+                if not np.isnan(panel['close'][i, j]):
                     self.manage_position(
                         stock_code,
                         date_str,
-                        stock_day_data.iloc[0]['close'],
-                        stock_day_data.iloc[0]['high'],
-                        stock_day_data.iloc[0]['low']
+                        panel['close'][i, j],
+                        panel['high'][i, j],
+                        panel['low'][i, j]
                     )
             
             # 5. Record daily stats
             portfolio_value = self.cash + sum(
-                pos['shares'] * day_data[day_data['code'] == code]['close'].iloc[0]
+                pos['shares'] * panel['close'][i, codes.get_loc(code)]
                 for code, pos in self.positions.items()
-                if not day_data[day_data['code'] == code].empty
+                if not np.isnan(panel['close'][i, codes.get_loc(code)])
             )
             
             self.daily_stats.append({
@@ -10,8 +10,34 @@ sys.path.insert(0, '/root/.openclaw/workspace/strg')
 import sqlite3
 import json
 import numpy as np
+import pandas as pd
 from datetime import datetime, timedelta
+from typing import Optional
 from fdr_wrapper import get_price
+from param_optimizer import Optimizer, ParamSpace, code_version
+
+
+# 테스트할 종목들 (이전 스캔 결과 기반)
+# (symbol, name, entry_date, entry_price, score)
+TEST_CASES = [
+    ('033100', '제룡전기', '2026-03-03', 51100, 65),
+    ('140860', '파크시스템스', '2026-03-03', 279500, 65),
+    ('348210', '넥스틴', '2026-03-03', 82000, 65),
+    ('006730', '서부T&D', '2026-03-03', 15320, 65),
+    ('009620', '삼보산업', '2026-03-03', 1642, 65),
+    ('012210', '삼미금속', '2026-03-03', 15480, 65),
+    ('025980', '아난티', '2026-03-03', 8210, 65),
+    ('042700', '한미반도체', '2026-03-03', 282000, 65),
+]
+
+# 필터 임계값/손익 탐색 공간 (기본값: RSI 35~65, 거래량 1.2배, -7%/+21%)
+FILTER_SPACE = ParamSpace(
+    rsi_low=[30, 35, 40],
+    rsi_high=[60, 65, 70],
+    volume_mult=[1.0, 1.2, 1.5, 2.0],
+    stop_pct=[5, 7, 10],
+    target_pct=[10, 15, 21],
+)
 
 
 class ImprovedKaggBacktestV2:
@@ -52,7 +78,7 @@ class ImprovedKaggBacktestV2:
             return None
         return np.mean(prices[-period:])
     
-    def check_filters(self, symbol, date_str):
+    def check_filters(self, symbol, date_str, rsi_low=35, rsi_high=65, volume_mult=1.2):
         """필터 확인 - 딕셔너리 반환"""
         df = self.get_stock_data(symbol, date_str)
         if df is None or len(df) < 30:
@@ -72,17 +98,17 @@ class ImprovedKaggBacktestV2:
             'filters_pass': False
         }
         
-        # RSI (35~65)
+        # RSI (기본 35~65)
         rsi = self.calculate_rsi(closes, 14)
         if rsi:
             result['rsi'] = round(rsi, 1)
-            result['rsi_pass'] = 35 <= rsi <= 65
+            result['rsi_pass'] = rsi_low <= rsi <= rsi_high
         
-        # 거래량 (1.2배)
+        # 거래량 (기본 1.2배)
         if len(volumes) >= 20:
             vol_ma20 = np.mean(volumes[-20:])
             result['volume_ratio'] = round(volumes[-1] / vol_ma20, 2)
-            result['volume_pass'] = volumes[-1] >= vol_ma20 * 1.2
+            result['volume_pass'] = volumes[-1] >= vol_ma20 * volume_mult
         
         # 5일선
         sma5 = self.calculate_sma(closes, 5)
@@ -98,11 +124,11 @@ class ImprovedKaggBacktestV2:
         
         return result
     
-    def simulate_trade(self, symbol, entry_date_str, entry_price, filters):
+    def simulate_trade(self, symbol, entry_date_str, entry_price, filters, stop_pct=7, target_pct=21):
         """거래 시뮬레이션"""
-        # R:R 1:3 설정
-        stop_loss = entry_price * 0.93  # -7%
-        target_price = entry_price * 1.21  # +21%
+        # R:R 1:3 설정 (기본 -7% / +21%)
+        stop_loss = entry_price * ((100 - stop_pct) / 100)
+        target_price = entry_price * ((100 + target_pct) / 100)
         
         entry_date = datetime.strptime(entry_date_str, '%Y-%m-%d')
         hold_days = 7
@@ -162,26 +188,13 @@ class ImprovedKaggBacktestV2:
         print("📊 기존 65점 종목 vs 필터 적용 종목 비교")
         print()
         
-        # 테스트할 종목들 (이전 스캔 결과 기반)
-        test_cases = [
-            # (symbol, name, entry_date, entry_price, score)
-            ('033100', '제룡전기', '2026-03-03', 51100, 65),
-            ('140860', '파크시스템스', '2026-03-03', 279500, 65),
-            ('348210', '넥스틴', '2026-03-03', 82000, 65),
-            ('006730', '서부T&D', '2026-03-03', 15320, 65),
-            ('009620', '삼보산업', '2026-03-03', 1642, 65),
-            ('012210', '삼미금속', '2026-03-03', 15480, 65),
-            ('025980', '아난티', '2026-03-03', 8210, 65),
-            ('042700', '한미반도체', '2026-03-03', 282000, 65),
-        ]
-        
         baseline_trades = []
         filtered_trades = []
         
         print("🔍 개별 종목 분석 중...")
         print("-" * 70)
         
-        for symbol, name, entry_date, entry_price, score in test_cases:
+        for symbol, name, entry_date, entry_price, score in TEST_CASES:
             print(f"\n📈 {name} ({symbol}) - {entry_date}")
             
             # 필터 확인
@@ -251,6 +264,26 @@ class ImprovedKaggBacktestV2:
             'filtered': filtered_trades
         }
     
+    def run_filter_search(self, n_trials: Optional[int] = None, n_workers: Optional[int] = None) -> pd.DataFrame:
+        """
+        FILTER_SPACE 탐색 (param_optimizer) - n_trials 미지정 시 전체 격자
+        
+        시행 결과는 data/optimizer_cache.db에 캐시 (FDR 데이터는 당일 기준 버전)
+        """
+        optimizer = Optimizer(
+            kagg_filter_trial, FILTER_SPACE,
+            study='improved_kagg_filters',
+            metric='win_rate',
+            n_workers=n_workers,
+            fixed={'test_cases': TEST_CASES},
+            data_version=f"fdr:{datetime.now().strftime('%Y-%m-%d')}",
+            code_ver=code_version(kagg_filter_trial),
+            leaderboard_path='docs/improved_kagg_filter_search.json',
+        )
+        if n_trials is None:
+            return optimizer.run_grid()
+        return optimizer.run_random(n_trials, seed=42)
+    
     def save_report(self, report, filename='docs/improved_kagg_comparison.json'):
         """리포트 저장"""
         # numpy bool_ to python bool 변환
@@ -270,9 +303,31 @@ class ImprovedKaggBacktestV2:
         print(f"\n✅ 리포트 저장: {filename}")
 
 
-if __name__ == '__main__':
-    import pandas as pd
+def kagg_filter_trial(params, test_cases):
+    """param_optimizer 시행: 필터 임계값 + 손익 한 세트"""
+    backtest = ImprovedKaggBacktestV2()
+    returns = []
+    for symbol, name, entry_date, entry_price, score in test_cases:
+        filters = backtest.check_filters(symbol, entry_date, params['rsi_low'],
+                                         params['rsi_high'], params['volume_mult'])
+        if not filters or not filters['filters_pass']:
+            continue
+        trade = backtest.simulate_trade(symbol, entry_date, entry_price, filters,
+                                        params['stop_pct'], params['target_pct'])
+        if trade:
+            returns.append(trade['return_pct'])
     
+    if not returns:
+        return {'trades': 0}
+    return {
+        'trades': len(returns),
+        'win_rate': len([r for r in returns if r > 0]) / len(returns) * 100,
+        'avg_return': float(np.mean(returns)),
+        'total_return': float(np.sum(returns)),
+    }
+
+
+if __name__ == '__main__':
     backtest = ImprovedKaggBacktestV2()
     report = backtest.run_comparison_backtest()
     backtest.save_report(report)
@@ -11,10 +11,13 @@ import json
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from dataclasses import dataclass
-from typing import List, Dict, Tuple
+from dataclasses import dataclass, replace
+from typing import List, Dict, Optional, Tuple
 from fdr_wrapper import get_price
 from ivf_scanner_v2 import calculate_rsi, calculate_stochastic, detect_candle_patterns, analyze_rsi_divergence
+from exit_grid import ForwardBars, evaluate_exit_grid, STOP_LOSS, TAKE_PROFIT
+from param_optimizer import Optimizer, ParamSpace, code_version
+from forward_returns import ForwardReturnStore
 
 
 @dataclass
@@ -222,17 +225,85 @@ def simulate_trade(signal: Dict, symbol: str, entry_date: str) -> Dict:
         return None
 
 
-def run_combo_backtest(symbols: List[str], dates: List[str]) -> Dict:
-    """모든 조합 백테스트 실행"""
+def simulate_trades(signals: List[Dict], symbol: str, entry_date: str,
+                    forward: Optional[ForwardReturnStore] = None) -> List[Dict]:
+    """
+    같은 종목/날짜의 여러 조합 신호를 한 번에 시뮬레이션 (simulate_trade와 동일 규칙)
+    이후 가격은 한 번만 조회하고 청산 그리드로 일괄 평가한다.
+    forward 지정 시 get_price 대신 이후 수익률 저장소의 OHLC 패널에서 꺼내며,
+    get_price 경로와 같이 진입일 + 12일(달력일)까지의 봉만 쓴다 (최대 10거래일).
+    """
+    if not signals:
+        return []
+    if forward is not None:
+        bars = forward.bars([symbol], [entry_date], 10)
+        end = (datetime.strptime(entry_date, '%Y-%m-%d') + timedelta(days=12)).strftime('%Y-%m-%d')
+        in_window = sum(d is not None and d <= end for d in bars.dates[0])
+        bars = bars.window(0, in_window)
+        if bars.n_bars[0] < 3:
+            return [None] * len(signals)
+    else:
+        try:
+            entry_dt = datetime.strptime(entry_date, '%Y-%m-%d')
+            end_dt = entry_dt + timedelta(days=12)
+            
+            df = get_price(symbol,
+                          (entry_dt + timedelta(days=1)).strftime('%Y-%m-%d'),
+                          end_dt.strftime('%Y-%m-%d'))
+        except Exception as e:
+            return [None] * len(signals)
+        
+        if df is None or len(df) < 3:
+            return [None] * len(signals)
+        
+        bars = ForwardBars.from_frames([df], 10)
+    n = len(signals)
+    entry = np.array([s['price'] for s in signals], dtype=float)
+    stops = np.array([s['stop_loss'] for s in signals], dtype=float)
+    targets = np.array([s['target_price'] for s in signals], dtype=float)
+    
+    grid = evaluate_exit_grid(
+        entry,
+        np.repeat(bars.high, n, axis=0), np.repeat(bars.low, n, axis=0),
+        np.repeat(bars.close, n, axis=0),
+        holding_days=[10],
+        stop_pcts=((stops - entry) / entry * 100)[:, None],
+        target_pcts=((targets - entry) / entry * 100)[:, None],
+        n_bars=np.repeat(bars.n_bars, n),
+        partial='last',
+    )
+    labels = {STOP_LOSS: '손절', TAKE_PROFIT: '목표도달'}
+    
+    trades = []
+    for i, signal in enumerate(signals):
+        reason = int(grid.reasons[i, 0, 0, 0])
+        trades.append({
+            'symbol': symbol,
+            'entry_date': entry_date,
+            'combo': signal['combo_name'],
+            'score': signal['score'],
+            'return_pct': round(float(grid.returns[i, 0, 0, 0]), 2),
+            'exit_reason': labels.get(reason, '보유만기'),
+            'hold_days': int(grid.days[i, 0, 0, 0]),
+            'confluence': signal['confluence']
+        })
+    return trades
+
+
+def run_combo_backtest(symbols: List[str], dates: List[str],
+                       combos: Optional[List[IndicatorCombo]] = None,
+                       forward: Optional[ForwardReturnStore] = None) -> Dict:
+    """모든 조합 백테스트 실행 (combos 미지정 시 COMBINATIONS, forward 지정 시 이후 가격은 memmap 조회)"""
+    combos = combos or COMBINATIONS
     print("=" * 80)
     print("🔥 IVF 지표 조합 최적화 테스터")
     print("=" * 80)
     print(f"대상 종목: {len(symbols)}개")
     print(f"테스트 날짜: {len(dates)}개")
-    print(f"테스트 조합: {len(COMBINATIONS)}개")
+    print(f"테스트 조합: {len(combos)}개")
     print("=" * 80)
     
-    results = {combo.name: {'trades': [], 'signals': 0} for combo in COMBINATIONS}
+    results = {combo.name: {'trades': [], 'signals': 0} for combo in combos}
     
     # 각 종목/날짜별 모든 조합 테스트
     for symbol in symbols:
@@ -250,21 +321,79 @@ def run_combo_backtest(symbols: List[str], dates: List[str]) -> Dict:
             df = df.reset_index()
             
             # 각 조합 테스트
-            for combo in COMBINATIONS:
+            signals = []
+            for combo in combos:
                 signal = calculate_combo_score(df, combo)
                 if signal:
                     signal['symbol'] = symbol
                     signal['date'] = date
                     results[combo.name]['signals'] += 1
-                    
-                    # 시뮬레이션
-                    trade = simulate_trade(signal, symbol, date)
-                    if trade:
-                        results[combo.name]['trades'].append(trade)
+                    signals.append(signal)
+            
+            # 시뮬레이션 (이후 가격 1회 조회로 전체 조합 평가)
+            for signal, trade in zip(signals, simulate_trades(signals, symbol, date, forward)):
+                if trade:
+                    results[signal['combo_name']]['trades'].append(trade)
     
     return results
 
 
+def summarize_combo(data: Dict) -> Optional[Dict]:
+    """조합 하나의 성과 통계 (거래 없으면 None)"""
+    trades = data['trades']
+    if not trades:
+        return None
+    
+    returns = [t['return_pct'] for t in trades]
+    wins = [r for r in returns if r > 0]
+    
+    total = len(trades)
+    gross_profit = sum([r for r in returns if r > 0])
+    gross_loss = abs(sum([r for r in returns if r <= 0]))
+    
+    return {
+        'signals': data['signals'],
+        'trades': total,
+        'win_rate': len(wins) / total * 100,
+        'avg_return': float(np.mean(returns)),
+        'total_return': float(sum(returns)),
+        'profit_factor': gross_profit / gross_loss if gross_loss > 0 else 0,
+        'avg_win': float(np.mean(wins)) if wins else 0,
+        'avg_loss': float(np.mean([r for r in returns if r <= 0])) if len(returns) > len(wins) else 0
+    }
+
+
+def combo_trial(params: Dict, symbols: List[str], dates: List[str]) -> Dict:
+    """param_optimizer 시행: 지표 조합 × 최소 점수 하나"""
+    base = next(c for c in COMBINATIONS if c.name == params['combo'])
+    combo = replace(base, min_score=params['min_score'])
+    results = run_combo_backtest(symbols, dates, combos=[combo])
+    return summarize_combo(results[combo.name]) or {'signals': results[combo.name]['signals'], 'trades': 0}
+
+
+def run_combo_search(symbols: List[str], dates: List[str],
+                     min_scores: Tuple[int, ...] = (50, 55, 60, 65, 70),
+                     n_workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    조합 × 최소 점수 격자 탐색 (param_optimizer)
+    
+    시행별 결과는 data/optimizer_cache.db에 캐시되어 중단 후 재실행 시 이어서 진행.
+    FDR 데이터는 당일 기준으로 버전을 매긴다 (다음 날 재실행은 새로 계산)
+    """
+    optimizer = Optimizer(
+        combo_trial,
+        ParamSpace(combo=[c.name for c in COMBINATIONS], min_score=list(min_scores)),
+        study='ivf_combo_search',
+        metric='win_rate',
+        n_workers=n_workers,
+        fixed={'symbols': list(symbols), 'dates': list(dates)},
+        data_version=f"fdr:{datetime.now().strftime('%Y-%m-%d')}",
+        code_ver=code_version(combo_trial, calculate_rsi, evaluate_exit_grid),
+        leaderboard_path='docs/ivf_combo_search.json',
+    )
+    return optimizer.run_grid()
+
+
 def analyze_combo_results(results: Dict) -> List[Dict]:
     """조합별 결과 분석"""
     print("\n" + "=" * 80)
@@ -274,35 +403,9 @@ def analyze_combo_results(results: Dict) -> List[Dict]:
     analysis = []
     
     for combo_name, data in results.items():
-        trades = data['trades']
-        signals = data['signals']
-        
-        if not trades:
-            continue
-        
-        returns = [t['return_pct'] for t in trades]
-        wins = [r for r in returns if r > 0]
-        
-        total = len(trades)
-        win_rate = len(wins) / total * 100 if total > 0 else 0
-        avg_return = np.mean(returns)
-        total_return = sum(returns)
-        
-        gross_profit = sum([r for r in returns if r > 0])
-        gross_loss = abs(sum([r for r in returns if r <= 0]))
-        pf = gross_profit / gross_loss if gross_loss > 0 else 0
-        
-        analysis.append({
-            'combo': combo_name,
-            'signals': signals,
-            'trades': total,
-            'win_rate': win_rate,
-            'avg_return': avg_return,
-            'total_return': total_return,
-            'profit_factor': pf,
-            'avg_win': np.mean(wins) if wins else 0,
-            'avg_loss': np.mean([r for r in returns if r <= 0]) if len(returns) > len(wins) else 0
-        })
+        stats = summarize_combo(data)
+        if stats:
+            analysis.append({'combo': combo_name, **stats})
     
     # 승률 기준 정렬
     analysis.sort(key=lambda x: x['win_rate'], reverse=True)
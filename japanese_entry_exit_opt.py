@@ -20,6 +20,9 @@ import json
 from dataclasses import dataclass
 from enum import Enum
 
+from exit_grid import ForwardBars, load_forward_bars, evaluate_exit_grid
+from param_optimizer import Optimizer, ParamSpace, code_version, file_data_version
+
 
 class EntryType(Enum):
     """진입 유형"""
@@ -325,6 +328,64 @@ class OptimizedJapaneseBacktester:
             'r_r_ratio': r_r_ratio,
         }
     
+    def backtest_signals_grid(self, signals: List[Dict], params: RiskRewardParams,
+                              bars: ForwardBars, holding_days: int = 5) -> Dict[str, np.ndarray]:
+        """
+        backtest_signal()의 일괄 버전 - 미리 읽은 경로(bars)로 전체 신호를 한 번에 평가
+        
+        bars는 load_forward_bars(..., holding_days + 2)의 결과 (신호일 다음날부터).
+        반환: final_return / exit_day / exit_reason / r_r_ratio 배열 (거래 불성립은 NaN, '')
+        """
+        close = np.array([sig['close'] for sig in signals], dtype=float)
+        high = np.array([sig['high'] for sig in signals], dtype=float)
+        low = np.array([sig['low'] for sig in signals], dtype=float)
+        kijun = np.array([sig['kijun'] for sig in signals], dtype=float)
+        atr = np.array([sig['atr'] for sig in signals], dtype=float)
+        next_open, next_low = bars.open[:, 1], bars.low[:, 1]
+        
+        # 진입가 (calculate_entry_price와 동일)
+        if params.entry_type == EntryType.NEXT_LOW:
+            entry = np.minimum(close, next_low)
+        elif params.entry_type == EntryType.PULLBACK_50:
+            entry = np.maximum(close - (high - low) * 0.5, next_low)
+        elif params.entry_type == EntryType.BELOW_KIJUN:
+            target_price = kijun * 0.99
+            entry = np.where(next_low <= target_price, target_price, next_open)
+        else:
+            entry = next_open.copy()
+        entry[bars.n_bars < 2] = np.nan
+        
+        # 손절/익절가 (calculate_exit_levels와 동일)
+        if params.exit_type == ExitType.FIXED:
+            stop_loss = entry * (1 + params.stop_loss_pct / 100)
+            take_profit = entry * (1 + params.take_profit_pct / 100)
+        elif params.exit_type == ExitType.ATR_BASED:
+            stop_loss = entry - atr * params.atr_multiplier_sl
+            take_profit = entry + atr * params.atr_multiplier_tp
+        else:
+            stop_loss = low * 0.99
+            take_profit = entry + (high - low) * params.fib_level_tp
+        
+        path = bars.window(2)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            grid = evaluate_exit_grid(
+                entry, path.high, path.low, path.close,
+                holding_days=[holding_days],
+                stop_pcts=((stop_loss - entry) / entry * 100)[:, None],
+                target_pcts=((take_profit - entry) / entry * 100)[:, None],
+                n_bars=path.n_bars,
+                partial='entry',
+                trail_amount=atr * 1.0 if params.trailing_stop else None,
+            )
+            r_r_ratio = (take_profit - entry) / (entry - stop_loss)
+        
+        return {
+            'final_return': grid.returns[:, 0, 0, 0],
+            'exit_day': grid.days[:, 0, 0, 0],
+            'exit_reason': grid.reason_names()[:, 0, 0, 0],
+            'r_r_ratio': r_r_ratio,
+        }
+    
     def run_optimization(self, dates: List[str]) -> Dict:
         """최적화 실행"""
         
@@ -358,42 +419,31 @@ class OptimizedJapaneseBacktester:
                            fib_level_tp=2.0),
         ]
         
+        # 신호와 이후 경로는 파라미터와 무관하므로 한 번만 수집
+        all_signals = []
+        for date in dates:
+            signals = self.find_entry_signals(date)
+            all_signals.extend(signals)
+        
+        holding_days = 5
+        bars = load_forward_bars(self.db_path, all_signals, holding_days + 2)
+        
         results = {}
         
         for params in param_combos:
             print(f"\n{'='*60}")
             print(f"🧪 테스트: {params.name}")
             print(f"   진입: {params.entry_type.value}, 청산: {params.exit_type.value}")
-            
-            all_signals = []
-            for date in dates:
-                signals = self.find_entry_signals(date)
-                all_signals.extend(signals)
-            
             print(f"   총 신호: {len(all_signals)}개")
             
             if not all_signals:
                 continue
             
-            backtests = []
-            for sig in all_signals:
-                result = self.backtest_signal(sig, params)
-                if result:
-                    backtests.append(result)
+            backtests = self.backtest_signals_grid(all_signals, params, bars, holding_days)
+            stats = summarize_backtests(backtests)
             
-            if backtests:
-                returns = [b['final_return'] for b in backtests]
-                wins = len([b for b in backtests if b['final_return'] > 0])
-                
-                results[params.name] = {
-                    'total': len(backtests),
-                    'win_rate': wins / len(backtests) * 100,
-                    'avg_return': np.mean(returns),
-                    'median_return': np.median(returns),
-                    'max_return': max(returns),
-                    'min_return': min(returns),
-                    'avg_r_r': np.mean([b['r_r_ratio'] for b in backtests]),
-                }
+            if stats is not None:
+                results[params.name] = stats
                 
                 print(f"   승률: {results[params.name]['win_rate']:.1f}%")
                 print(f"   평균수익: {results[params.name]['avg_return']:+.2f}%")
@@ -401,6 +451,26 @@ class OptimizedJapaneseBacktester:
         
         return results
     
+    def run_search(self, dates: List[str], n_trials: int = 60, n_workers: Optional[int] = None,
+                   holding_days: int = 5, seed: Optional[int] = 42) -> pd.DataFrame:
+        """
+        SEARCH_SPACE 무작위 탐색 (param_optimizer, 결과 캐시)
+
+        run_optimization()의 고정 10개 조합 대신 진입/청산 유형과 손익 배수를
+        폭넓게 탐색. 각 워커는 신호·경로를 한 번만 준비해 재사용
+        """
+        optimizer = Optimizer(
+            entry_exit_trial, SEARCH_SPACE,
+            study='japanese_entry_exit_opt',
+            metric='win_rate',
+            n_workers=n_workers,
+            fixed={'db_path': self.db_path, 'dates': list(dates), 'holding_days': holding_days},
+            data_version=file_data_version(self.db_path),
+            code_ver=code_version(entry_exit_trial, evaluate_exit_grid),
+            leaderboard_path='reports/japanese_entry_exit_search.json',
+        )
+        return optimizer.run_random(n_trials, seed=seed)
+    
     def print_best(self, results: Dict):
         """최고 결과 출력"""
         print("\n" + "=" * 70)
@@ -422,6 +492,66 @@ class OptimizedJapaneseBacktester:
             print(f"   R:R: {r['avg_r_r']:.2f}")
 
 
+def summarize_backtests(backtests: Dict[str, np.ndarray]) -> Optional[Dict]:
+    """backtest_signals_grid 결과 → 승률/수익 통계 (거래 없으면 None)"""
+    traded = ~np.isnan(backtests['final_return'])
+    if not traded.any():
+        return None
+    returns = backtests['final_return'][traded]
+    return {
+        'total': int(traded.sum()),
+        'win_rate': float((returns > 0).sum() / len(returns) * 100),
+        'avg_return': float(np.mean(returns)),
+        'median_return': float(np.median(returns)),
+        'max_return': float(returns.max()),
+        'min_return': float(returns.min()),
+        'avg_r_r': float(np.mean(backtests['r_r_ratio'][traded])),
+    }
+
+
+# run_search 탐색 공간 (RiskRewardParams 필드)
+SEARCH_SPACE = ParamSpace(
+    entry_type=[e.value for e in EntryType],
+    exit_type=[e.value for e in ExitType],
+    stop_loss_pct=[-3, -5, -7],
+    take_profit_pct=[6, 10, 15, 20],
+    atr_multiplier_sl=[1.0, 1.5, 2.0],
+    atr_multiplier_tp=[2.0, 3.0, 4.0],
+    fib_level_tp=[1.272, 1.618, 2.0],
+    trailing_stop=[False, True],
+)
+
+# 워커 프로세스별 (신호, 경로) 캐시 - 시행마다 DB를 다시 읽지 않도록
+_PREPARED: Dict[tuple, Tuple[List[Dict], ForwardBars]] = {}
+
+
+def entry_exit_trial(params: Dict, db_path: str, dates: List[str], holding_days: int = 5) -> Dict:
+    """param_optimizer 시행: RiskRewardParams 하나 평가"""
+    backtester = OptimizedJapaneseBacktester(db_path)
+    key = (db_path, tuple(dates), holding_days)
+    if key not in _PREPARED:
+        signals = []
+        for date in dates:
+            signals.extend(backtester.find_entry_signals(date))
+        _PREPARED[key] = (signals, load_forward_bars(db_path, signals, holding_days + 2))
+    signals, bars = _PREPARED[key]
+    if not signals:
+        return {'total': 0}
+
+    rr = RiskRewardParams(
+        name='search',
+        entry_type=EntryType(params['entry_type']),
+        exit_type=ExitType(params['exit_type']),
+        stop_loss_pct=params['stop_loss_pct'],
+        take_profit_pct=params['take_profit_pct'],
+        trailing_stop=params['trailing_stop'],
+        atr_multiplier_sl=params['atr_multiplier_sl'],
+        atr_multiplier_tp=params['atr_multiplier_tp'],
+        fib_level_tp=params['fib_level_tp'],
+    )
+    return summarize_backtests(backtester.backtest_signals_grid(signals, rr, bars, holding_days)) or {'total': 0}
+
+
 def main():
     backtester = OptimizedJapaneseBacktester()
     
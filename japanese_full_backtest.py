@@ -19,6 +19,8 @@ import json
 from datetime import datetime
 import os
 
+from japanese_pattern_scanner import IchimokuCloud, JapanesePatternScanner
+
 
 class FullMarketBacktester:
     """전체 시장 백테스터"""
@@ -226,8 +228,39 @@ class FullMarketBacktester:
         print(f"  📊 완료: {len(backtests)}건")
         return backtests
     
-    def run_full_backtest(self, dates: List[str]) -> Dict:
-        """전체 백테스트 실행"""
+    def scan_signals_panel(self, dates: List[str], min_price: int = 1000,
+                           history_days: int = 120) -> Dict[str, List[Dict]]:
+        """
+        여러 날짜 신호를 패널로 한 번에 탐지
+        
+        scan_and_backtest_date()의 종목별 조회 + detect_signal()과 같은 신호를 낸다.
+        history_days는 첫 날짜 이전에 추가로 읽을 달력일 수.
+        """
+        load_start = (pd.Timestamp(min(dates)) - pd.Timedelta(days=history_days)).strftime('%Y-%m-%d')
+        panel, names = JapanesePatternScanner(self.db_path).get_panel(load_start, max(dates))
+        high, low, close = panel['high'], panel['low'], panel['close']
+        
+        cloud = IchimokuCloud(tenkan_period=5, kijun_period=10)
+        golden = cloud.generate_signals_panel(high, low, close, min_bars=20)['TK_CROSS_BULLISH']
+        
+        signals = {}
+        for date in dates:
+            if date not in close.index:
+                signals[date] = []
+                continue
+            hit = golden.loc[date] & (close.loc[date] >= min_price)
+            signals[date] = [{
+                'code': code,
+                'name': names.get(code, code),
+                'date': date,
+                'close': close.at[date, code],
+                'high': high.at[date, code],
+                'low': low.at[date, code],
+            } for code in hit.index[hit]]
+        return signals
+    
+    def run_full_backtest(self, dates: List[str], use_panel: bool = True) -> Dict:
+        """전체 백테스트 실행 (use_panel=True면 전 날짜 신호를 패널로 일괄 탐지)"""
         print("=" * 70)
         print("📊 일본 전략 - 전체 종목 대상 백테스트")
         print("=" * 70)
@@ -235,9 +268,22 @@ class FullMarketBacktester:
         print(f"테스트 기간: {dates[0]} ~ {dates[-1]}")
         
         all_results = []
-        for date in dates:
-            results = self.scan_and_backtest_date(date)
-            all_results.extend(results)
+        if use_panel:
+            signals_by_date = self.scan_signals_panel(dates)
+            for date in dates:
+                signals = signals_by_date.get(date, [])
+                print(f"\n📅 {date} - 신호 {len(signals)}개, 백테스트 진행...")
+                for sig in signals:
+                    result = self.backtest_single(
+                        sig['code'], sig['name'], sig['date'],
+                        sig['close'], sig['high'], sig['low']
+                    )
+                    if result:
+                        all_results.append(result)
+        else:
+            for date in dates:
+                results = self.scan_and_backtest_date(date)
+                all_results.extend(results)
         
         # 통계 계산
         if not all_results:
@@ -12,12 +12,14 @@ Japanese Pattern Parameter Sweep Backtest
 
 import sqlite3
 import pandas as pd
-import numpy as np
 from typing import List, Dict, Optional, Tuple
 import json
 from dataclasses import dataclass
 from datetime import datetime
 
+from exit_grid import load_forward_bars, evaluate_exit_grid
+from param_optimizer import Optimizer, ParamSpace, code_version, file_data_version
+
 
 @dataclass
 class IchimokuParams:
@@ -221,59 +223,97 @@ class MultiParamBacktester:
         
         return None
     
-    def run_sweep(self, dates: List[str]) -> Dict:
-        """파라미터 스윕 실행"""
-        results = {}
-        
+    def run_sweep(self, dates: List[str], n_workers: int = 1) -> Dict:
+        """
+        파라미터 스윕 실행
+
+        일목 파라미터 세트별 시행을 param_optimizer로 병렬 실행하고 캐시
+        (같은 코드·DB로 재실행하면 끝난 세트는 건너뜀)
+        """
+        optimizer = Optimizer(
+            sweep_trial,
+            ParamSpace(ichimoku=[params.name for params in PARAMS_SETS]),
+            study='japanese_param_sweep',
+            metric='best_win_rate',
+            n_workers=n_workers,
+            fixed={'db_path': self.db_path, 'dates': list(dates)},
+            data_version=file_data_version(self.db_path),
+            code_ver=code_version(sweep_trial, evaluate_exit_grid),
+            leaderboard_path='reports/japanese_param_sweep_progress.json',
+        )
+        optimizer.run_grid()
+
+        results, failed = {}, []
         for params in PARAMS_SETS:
-            print(f"\n{'='*70}")
-            print(f"📊 파라미터: {params.name} ({params.desc})")
-            print(f"{'='*70}")
-            
-            # 신호 수집
-            all_signals = []
-            for date in dates:
-                sigs = self.find_signals_for_date(date, params)
-                all_signals.extend(sigs)
-            
-            print(f"총 신호: {len(all_signals)}개")
-            
-            if not all_signals:
-                continue
-            
-            # 각 조합 테스트
-            for holding in HOLDING_PERIODS:
-                for stop, profit in STOP_PROFIT_SETS:
-                    key = f"{params.name}_H{holding}_SL{stop}_TP{profit}"
-                    
-                    print(f"\n  테스트: 보유{holding}일 / 손절{stop}% / 익절{profit}%")
-                    
-                    backtests = []
-                    for sig in all_signals:
-                        result = self.backtest_single(sig, holding, stop, profit)
-                        if result:
-                            backtests.append(result)
-                    
-                    if backtests:
-                        returns = [b['return'] for b in backtests]
-                        wins = len([b for b in backtests if b['return'] > 0])
-                        
-                        results[key] = {
-                            'params': params.name,
-                            'holding_days': holding,
-                            'stop_loss': stop,
-                            'take_profit': profit,
-                            'total_trades': len(backtests),
-                            'win_rate': wins / len(backtests) * 100,
-                            'avg_return': np.mean(returns),
-                            'median_return': np.median(returns),
-                            'max_return': max(returns),
-                            'min_return': min(returns),
-                        }
-                        
-                        print(f"    승률: {results[key]['win_rate']:.1f}%")
-                        print(f"    평균수익: {results[key]['avg_return']:+.2f}%")
-        
+            for rec in optimizer.records:
+                if rec['params']['ichimoku'] != params.name:
+                    continue
+                if rec.get('error') is not None:     # 빈 메시지 예외도 실패로 센다
+                    failed.append(f"{params.name}: {rec['error'] or '오류'}")
+                else:
+                    results.update(rec['result'].get('combos', {}))
+        if failed:
+            print(f"\n⚠️ 실패한 파라미터 세트 {len(failed)}/{len(PARAMS_SETS)}개 - 결과에서 제외됨:")
+            for item in failed:
+                print(f"   - {item}")
+        return results
+
+    def sweep_params(self, params: IchimokuParams, dates: List[str]) -> Dict:
+        """일목 파라미터 세트 하나의 보유기간 × 손절/익절 조합 평가"""
+        results = {}
+
+        print(f"\n{'='*70}")
+        print(f"📊 파라미터: {params.name} ({params.desc})")
+        print(f"{'='*70}")
+
+        # 신호 수집
+        all_signals = []
+        for date in dates:
+            sigs = self.find_signals_for_date(date, params)
+            all_signals.extend(sigs)
+
+        print(f"총 신호: {len(all_signals)}개")
+
+        if not all_signals:
+            return results
+
+        # 각 조합 테스트 - 신호별 경로를 한 번 읽고 전체 조합을 일괄 평가
+        # (backtest_single과 동일: 다다음날 시가 진입, 그 다음날부터 청산 판정)
+        bars = load_forward_bars(self.db_path, all_signals, max(HOLDING_PERIODS) + 2)
+        path = bars.window(2)
+        grid = evaluate_exit_grid(
+            bars.open[:, 1], path.high, path.low, path.close,
+            holding_days=HOLDING_PERIODS,
+            stop_pcts=[stop for stop, _ in STOP_PROFIT_SETS],
+            target_pcts=[profit for _, profit in STOP_PROFIT_SETS],
+            n_bars=path.n_bars,
+            pairs=True,
+        )
+
+        for _, row in grid.summary().iterrows():
+            holding = int(row['holding_days'])
+            stop, profit = int(row['stop_loss']), int(row['take_profit'])
+            key = f"{params.name}_H{holding}_SL{stop}_TP{profit}"
+
+            print(f"\n  테스트: 보유{holding}일 / 손절{stop}% / 익절{profit}%")
+
+            if row['total_trades'] > 0:
+                results[key] = {
+                    'params': params.name,
+                    'holding_days': holding,
+                    'stop_loss': stop,
+                    'take_profit': profit,
+                    'total_trades': int(row['total_trades']),
+                    'win_rate': float(row['win_rate']),
+                    'avg_return': float(row['avg_return']),
+                    'median_return': float(row['median_return']),
+                    'max_return': float(row['max_return']),
+                    'min_return': float(row['min_return']),
+                }
+
+                print(f"    승률: {results[key]['win_rate']:.1f}%")
+                print(f"    평균수익: {results[key]['avg_return']:+.2f}%")
+
         return results
     
     def print_best_results(self, results: Dict):
@@ -296,6 +336,17 @@ class MultiParamBacktester:
             print(f"  중간: {r['median_return']:+.2f}%")
 
 
+def sweep_trial(params: Dict, db_path: str, dates: List[str]) -> Dict:
+    """param_optimizer 시행: 일목 파라미터 세트 하나 (프로세스 풀에서 실행)"""
+    ichimoku = next(p for p in PARAMS_SETS if p.name == params['ichimoku'])
+    combos = MultiParamBacktester(db_path).sweep_params(ichimoku, dates)
+    return {
+        'best_win_rate': max((r['win_rate'] for r in combos.values()), default=None),
+        'best_avg_return': max((r['avg_return'] for r in combos.values()), default=None),
+        'combos': combos,
+    }
+
+
 def main():
     backtester = MultiParamBacktester()
     
@@ -309,13 +360,13 @@ def main():
     
     print(f"📅 테스트 기간: {test_dates[0]} ~ {test_dates[-1]}")
     
-    results = backtester.run_sweep(test_dates)
-    backtester.print_best_results(results)
-    
     # 결과 저장
     import os
     os.makedirs('reports', exist_ok=True)
     
+    results = backtester.run_sweep(test_dates, n_workers=len(PARAMS_SETS))
+    backtester.print_best_results(results)
+    
     with open('reports/japanese_param_sweep.json', 'w', encoding='utf-8') as f:
         json.dump(results, f, ensure_ascii=False, indent=2)
     
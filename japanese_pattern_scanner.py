@@ -18,6 +18,7 @@ Date: 2026-04-10
 import sqlite3
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 import json
@@ -213,6 +214,215 @@ class SakataFiveMethods:
         return {'detected': False}
 
 
+# ==================== 패널(날짜 × 종목) 벡터화 ====================
+
+class _CompactPanel:
+    """
+    wide 패널(날짜 × 종목) ↔ 종목별로 이어붙인 1차원 배열 변환
+
+    기준 프레임의 NaN(거래 없음) 칸은 건너뛰므로 각 종목 구간의 행 순서는
+    단일 종목 DataFrame과 같다. rolling/shift는 종목 경계를 넘지 않는다.
+    """
+
+    def __init__(self, ref: pd.DataFrame):
+        self.index = ref.index
+        self.columns = ref.columns
+        self.mask = ref.notna().to_numpy().T                        # (종목, 날짜)
+        counts = self.mask.sum(axis=1)
+        self.pos = (np.cumsum(self.mask, axis=1) - 1)[self.mask]    # 종목 내 순번
+        self.rpos = np.repeat(counts, counts) - 1 - self.pos         # 종목 내 역순번
+
+    def flat(self, wide: pd.DataFrame) -> np.ndarray:
+        values = wide.reindex(index=self.index, columns=self.columns).to_numpy(dtype=float)
+        return values.T[self.mask]
+
+    def shift(self, x: np.ndarray, n: int) -> np.ndarray:
+        out = np.full(len(x), np.nan)
+        if n > 0:
+            out[n:] = x[:-n]
+            out[self.pos < n] = np.nan
+        elif n < 0:
+            out[:n] = x[-n:]
+            out[self.rpos < -n] = np.nan
+        else:
+            out[:] = x
+        return out
+
+    def rolling(self, x: np.ndarray, window: int, how: str) -> np.ndarray:
+        """rolling(window).max()/min() (min_periods=window)"""
+        out = np.full(len(x), np.nan)
+        if len(x) >= window:
+            view = sliding_window_view(x, window)
+            out[window - 1:] = view.max(axis=1) if how == 'max' else view.min(axis=1)
+        out[self.pos < window - 1] = np.nan
+        return out
+
+    def window_ends(self, window: int) -> np.ndarray:
+        """종목 경계를 넘지 않는 길이 window 윈도우의 끝 위치"""
+        ends = np.arange(window - 1, len(self.pos))
+        return ends[self.pos[ends] >= window - 1]
+
+    def to_frame(self, x: np.ndarray) -> pd.DataFrame:
+        fill = False if x.dtype == bool else np.nan
+        out = np.full(self.mask.shape, fill, dtype=x.dtype)
+        out[self.mask] = x
+        return pd.DataFrame(out.T, index=self.index, columns=self.columns)
+
+
+def _window_peaks(X: np.ndarray, distance: int = 3, prominence_factor: float = 0.5) -> np.ndarray:
+    """
+    각 행(윈도우) w에 find_peaks(w, distance=distance, prominence=w.std() * prominence_factor)를
+    적용한 결과를 (윈도우 수, 길이) 불리언 마스크로 반환
+    """
+    M, L = X.shape
+    cols = np.arange(L)
+    rows = np.arange(M)[:, None]
+
+    # 1) 국소 최대 - 같은 값이 이어지는 평탄 구간은 중앙(왼쪽 반올림)을 고점으로
+    run_start = np.zeros((M, L), dtype=np.intp)
+    run_end = np.full((M, L), L - 1, dtype=np.intp)
+    for j in range(1, L):
+        run_start[:, j] = np.where(X[:, j] == X[:, j - 1], run_start[:, j - 1], j)
+    for j in range(L - 2, -1, -1):
+        run_end[:, j] = np.where(X[:, j] == X[:, j + 1], run_end[:, j + 1], j)
+    before = X[rows, np.maximum(run_start - 1, 0)]
+    after = X[rows, np.minimum(run_end + 1, L - 1)]
+    peaks = ((run_start >= 1) & (run_end <= L - 2) & (before < X) & (after < X)
+             & (cols == (run_start + run_end) // 2))
+
+    # 2) 최소 간격 - 높은 고점부터 채택하고 distance 미만으로 붙은 고점 제거.
+    #    동점 처리 순서까지 맞추기 위해 find_peaks처럼 고점 값 배열을 argsort 한다
+    keep = peaks.copy()
+    n_peaks = peaks.sum(axis=1)
+    for k in np.unique(n_peaks[n_peaks > 1]):
+        r = np.flatnonzero(n_peaks == k)
+        P = np.nonzero(peaks[r])[1].reshape(len(r), k)
+        order = np.argsort(X[r[:, None], P], axis=1)
+        kept = np.ones((len(r), k), dtype=bool)
+        idx = np.arange(len(r))
+        for i in range(k - 1, -1, -1):
+            j = order[:, i]
+            near = np.abs(P - P[idx, j][:, None]) < np.ceil(distance)
+            near[idx, j] = False
+            kept &= ~(near & kept[idx, j][:, None])
+        keep[r[:, None], P] = kept
+
+    # 3) prominence - 더 높은 값을 만나기 전까지 좌/우 최저점
+    left_min = X.copy()
+    right_min = X.copy()
+    open_left = np.ones((M, L), dtype=bool)
+    open_right = np.ones((M, L), dtype=bool)
+    for d in range(1, L):
+        ok = open_left[:, d:] & (X[:, :L - d] <= X[:, d:])
+        open_left[:, d:] = ok
+        left_min[:, d:] = np.where(ok, np.minimum(left_min[:, d:], X[:, :L - d]), left_min[:, d:])
+        ok = open_right[:, :L - d] & (X[:, d:] <= X[:, :L - d])
+        open_right[:, :L - d] = ok
+        right_min[:, :L - d] = np.where(ok, np.minimum(right_min[:, :L - d], X[:, d:]), right_min[:, :L - d])
+        if not (open_left.any() or open_right.any()):
+            break
+    prominence = X - np.maximum(left_min, right_min)
+    threshold = X.std(axis=1, keepdims=True) * prominence_factor
+
+    return keep & (prominence >= threshold)
+
+
+class PanelSakata:
+    """
+    사카타 5법 패널 버전
+    ===================
+    (날짜 × 종목) wide 패널 전체에 대해 SakataFiveMethods와 같은 판정을
+    모든 종목·모든 날짜에 한 번에 수행하고 불리언 패턴 행렬을 반환한다.
+    각 칸은 해당 종목의 그 날짜까지 데이터로 단일 종목 함수를 호출한 결과와 같다.
+    """
+
+    CHUNK = 20000  # 한 번에 처리할 윈도우 수 (메모리 제한)
+
+    @staticmethod
+    def detect_triple_top(high: pd.DataFrame, lookback: int = 20,
+                          tolerance: float = 0.02) -> pd.DataFrame:
+        """삼산 (三尊) 패턴 행렬"""
+        return PanelSakata._detect_triple(high, lookback, tolerance, top=True)
+
+    @staticmethod
+    def detect_triple_bottom(low: pd.DataFrame, lookback: int = 20,
+                             tolerance: float = 0.02) -> pd.DataFrame:
+        """삼천 (三底) 패턴 행렬"""
+        return PanelSakata._detect_triple(low, lookback, tolerance, top=False)
+
+    @staticmethod
+    def detect_three_gaps(open_: pd.DataFrame, close: pd.DataFrame,
+                          lookback: Optional[int] = None,
+                          min_bars: int = 10) -> Dict[str, pd.DataFrame]:
+        """
+        삼공 (三空) 패턴 행렬
+
+        lookback: 날짜별로 최근 N행만 보고 판정 (None이면 패널 전체 이력)
+        반환: {'up': 상승 삼공 행렬, 'down': 하락 삼공 행렬}
+        """
+        cp = _CompactPanel(close)
+        o, c = cp.flat(open_), cp.flat(close)
+        prev_close = cp.shift(c, 1)
+        up = o > prev_close * 1.01
+        down = ~up & (o < prev_close * 0.99)
+        gap_type = np.where(up, 1, np.where(down, -1, 0))
+
+        events = np.flatnonzero(gap_type)
+        types = gap_type[events]
+        same3 = np.zeros(len(events), dtype=bool)
+        same3[2:] = (types[2:] == types[1:-1]) & (types[1:-1] == types[:-2])
+
+        t = np.arange(len(c))
+        n_rows = cp.pos + 1 if lookback is None else np.minimum(cp.pos + 1, lookback)
+        window_start = t - (n_rows - 1)
+        last = np.searchsorted(events, t, side='right') - 1   # t 이전 마지막 갭
+        detected = np.zeros(len(c), dtype=bool)
+        kind = np.zeros(len(c), dtype=int)
+        if len(events):
+            k = np.clip(last, 0, None)
+            third = events[np.clip(last - 2, 0, None)]
+            # 윈도우 첫 행은 직전 종가가 없어 갭 판정에서 제외됨
+            detected = (last >= 2) & same3[k] & (third >= window_start + 1) & (n_rows >= min_bars)
+            kind = types[k]
+
+        return {
+            'up': cp.to_frame(detected & (kind == 1)),
+            'down': cp.to_frame(detected & (kind == -1)),
+        }
+
+    @staticmethod
+    def _detect_triple(prices: pd.DataFrame, lookback: int, tolerance: float,
+                       top: bool) -> pd.DataFrame:
+        cp = _CompactPanel(prices)
+        x = cp.flat(prices)
+        out = np.zeros(len(x), dtype=bool)
+        if len(x) < lookback:
+            return cp.to_frame(out)
+
+        view = sliding_window_view(x, lookback)
+        ends = cp.window_ends(lookback)
+        for i in range(0, len(ends), PanelSakata.CHUNK):
+            end = ends[i:i + PanelSakata.CHUNK]
+            W = view[end - (lookback - 1)]
+            mask = _window_peaks(W if top else -W)
+
+            # 뒤에서부터 1, 2, 3번째 고점(저점) = 오른쪽 어깨, 머리, 왼쪽 어깨
+            rank = np.cumsum(mask[:, ::-1], axis=1)[:, ::-1]
+            nth = [np.where(mask & (rank == n), W, 0.0).sum(axis=1) for n in (1, 2, 3)]
+            right, head, left = nth
+            enough = mask.sum(axis=1) >= 3
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                shoulder_diff = np.abs(left - right) / left
+            if top:
+                shape = ~(head <= np.maximum(left, right))
+            else:
+                shape = ~(head >= np.minimum(left, right))
+            out[end] = enough & shape & ~(shoulder_diff > tolerance)
+
+        return cp.to_frame(out)
+
+
 class IchimokuCloud:
     """
     일목균형표 (Ichimoku Kinko Hyo)
@@ -312,6 +522,77 @@ class IchimokuCloud:
                              'below' if latest['close'] < latest['kumo_bottom'] else 'inside'
         }
 
+    
+    def calculate_panel(self, high: pd.DataFrame, low: pd.DataFrame, close: pd.DataFrame,
+                        point_in_time: bool = False) -> Dict[str, pd.DataFrame]:
+        """
+        calculate()의 패널 버전: 지표별 (날짜 × 종목) 행렬
+        
+        point_in_time=True면 각 날짜에 그 날짜까지의 데이터로 calculate()를 돌렸을 때의
+        값을 돌려준다. 선행스팬은 -displacement 만큼 당겨 쓰므로 이 경우 구름은 비어 있다.
+        """
+        cp = _CompactPanel(close)
+        flat = self._calculate_flat(cp, high, low, close, point_in_time)
+        return {name: cp.to_frame(values) for name, values in flat.items()}
+    
+    def generate_signals_panel(self, high: pd.DataFrame, low: pd.DataFrame, close: pd.DataFrame,
+                               min_bars: int = 60) -> Dict[str, pd.DataFrame]:
+        """
+        generate_signals()의 패널 버전: 신호명 → (날짜 × 종목) 불리언 행렬
+        
+        각 칸은 해당 종목의 그 날짜까지 데이터로 generate_signals()를 호출했을 때
+        그 신호가 포함되는지 여부다 (min_bars 미만 구간은 False).
+        """
+        cp = _CompactPanel(close)
+        ind = self._calculate_flat(cp, high, low, close, point_in_time=True)
+        c = cp.flat(close)
+        prev = {name: cp.shift(ind[name], 1)
+                for name in ('tenkan_sen', 'kijun_sen', 'kumo_top', 'kumo_bottom')}
+        prev_close = cp.shift(c, 1)
+        enough = cp.pos + 1 >= max(min_bars, 2)
+        
+        tk_bullish = enough & (prev['tenkan_sen'] <= prev['kijun_sen']) & (ind['tenkan_sen'] > ind['kijun_sen'])
+        tk_bearish = (enough & ~tk_bullish & (prev['tenkan_sen'] >= prev['kijun_sen'])
+                      & (ind['tenkan_sen'] < ind['kijun_sen']))
+        above = enough & (prev_close <= prev['kumo_top']) & (c > ind['kumo_top'])
+        below = enough & ~above & (prev_close >= prev['kumo_bottom']) & (c < ind['kumo_bottom'])
+        bullish_cloud = enough & (ind['senkou_span_a'] > ind['senkou_span_b'])
+        bearish_cloud = enough & ~bullish_cloud & (ind['senkou_span_a'] < ind['senkou_span_b'])
+        
+        return {
+            'TK_CROSS_BULLISH': cp.to_frame(tk_bullish),
+            'TK_CROSS_BEARISH': cp.to_frame(tk_bearish),
+            'PRICE_ABOVE_CLOUD': cp.to_frame(above),
+            'PRICE_BELOW_CLOUD': cp.to_frame(below),
+            'BULLISH_CLOUD': cp.to_frame(bullish_cloud),
+            'BEARISH_CLOUD': cp.to_frame(bearish_cloud),
+        }
+    
+    def _calculate_flat(self, cp: '_CompactPanel', high: pd.DataFrame, low: pd.DataFrame,
+                        close: pd.DataFrame, point_in_time: bool) -> Dict[str, np.ndarray]:
+        h, l, c = cp.flat(high), cp.flat(low), cp.flat(close)
+        
+        tenkan = (cp.rolling(h, self.tenkan_period, 'max') + cp.rolling(l, self.tenkan_period, 'min')) / 2
+        kijun = (cp.rolling(h, self.kijun_period, 'max') + cp.rolling(l, self.kijun_period, 'min')) / 2
+        span_b_base = (cp.rolling(h, self.senkou_b_period, 'max') +
+                       cp.rolling(l, self.senkou_b_period, 'min')) / 2
+        span_a = cp.shift((tenkan + kijun) / 2, -self.displacement)
+        span_b = cp.shift(span_b_base, -self.displacement)
+        if point_in_time and self.displacement > 0:
+            # t 행의 선행스팬은 t + displacement 행 데이터로 만들어지므로 t 시점엔 없다
+            span_a = np.full(len(c), np.nan)
+            span_b = np.full(len(c), np.nan)
+        
+        return {
+            'tenkan_sen': tenkan,
+            'kijun_sen': kijun,
+            'senkou_span_a': span_a,
+            'senkou_span_b': span_b,
+            'chikou_span': cp.shift(c, self.displacement),
+            'kumo_top': np.fmax(span_a, span_b),
+            'kumo_bottom': np.fmin(span_a, span_b),
+        }
+
 
 class JapanesePatternScanner:
     """
@@ -416,6 +697,93 @@ class JapanesePatternScanner:
         print(f"  ✅ {len(results)} 종목 발견 (신호 {min_signals}개 이상)")
         return results
 
+    
+    def get_panel(self, start_date: str, end_date: str) -> Tuple[Dict[str, pd.DataFrame], pd.Series]:
+        """기간 내 전 종목 OHLCV를 (날짜 × 종목) 패널로 한 번에 조회 → (패널, 종목명)"""
+        conn = sqlite3.connect(self.db_path)
+        
+        query = """
+        SELECT code, name, date, open, high, low, close, volume
+        FROM price_data
+        WHERE date >= ? AND date <= ?
+        ORDER BY code, date
+        """
+        
+        df = pd.read_sql(query, conn, params=(start_date, end_date))
+        conn.close()
+        
+        df = df.drop_duplicates(['code', 'date'], keep='last')
+        panel = {col: df.pivot(index='date', columns='code', values=col)
+                 for col in ('open', 'high', 'low', 'close', 'volume')}
+        names = df.drop_duplicates('code', keep='last').set_index('code')['name']
+        return panel, names
+    
+    def scan_panel(self, start_date: str, end_date: str, min_signals: int = 2,
+                   min_close: float = 2000, history_days: int = 150) -> Dict[str, List[Dict]]:
+        """
+        기간 내 모든 날짜 전체 시장 스캔 (패널 일괄 계산)
+        
+        날짜별 결과는 scan_market()과 같은 형식이다. history_days는 첫 날짜 이전에
+        추가로 읽을 달력일 수 (60거래일 이상 확보용).
+        """
+        load_start = (pd.Timestamp(start_date) - pd.Timedelta(days=history_days)).strftime('%Y-%m-%d')
+        panel, names = self.get_panel(load_start, end_date)
+        high, low, close = panel['high'], panel['low'], panel['close']
+        
+        patterns = {
+            'TRIPLE_TOP': PanelSakata.detect_triple_top(high),
+            'TRIPLE_BOTTOM': PanelSakata.detect_triple_bottom(low),
+        }
+        gaps = PanelSakata.detect_three_gaps(panel['open'], close, lookback=100)
+        patterns['THREE_GAPS_UP'] = gaps['up']
+        patterns['THREE_GAPS_DOWN'] = gaps['down']
+        ichimoku_patterns = self.ichimoku.generate_signals_panel(high, low, close)
+        patterns.update(ichimoku_patterns)
+        ichimoku_values = self.ichimoku.calculate_panel(high, low, close, point_in_time=True)
+        
+        # scan_stock()과 같은 최소 60행 조건
+        eligible = (close.notna().cumsum() >= 60) & (close >= min_close)
+        dates = close.index[(close.index >= start_date) & (close.index <= end_date)]
+        
+        results = {}
+        for date in dates:
+            row_ok = eligible.loc[date]
+            hits = {name: matrix.loc[date][row_ok] for name, matrix in patterns.items()}
+            counts = sum(hit.astype(int) for hit in hits.values())
+            day_results = []
+            for code in counts.index[counts >= max(min_signals, 1)]:
+                signals = [name for name, hit in hits.items() if hit[code]]
+                day_results.append({
+                    'code': code,
+                    'name': names.get(code, code),
+                    'date': date,
+                    'close': float(close.at[date, code]),
+                    'signals': signals,
+                    'ichimoku': self._ichimoku_summary(
+                        [name for name in signals if name in ichimoku_patterns],
+                        {key: values.at[date, code] for key, values in ichimoku_values.items()},
+                        float(close.at[date, code])),
+                    'signal_count': len(signals),
+                })
+            results[date] = sorted(day_results, key=lambda x: x['signal_count'], reverse=True)
+        
+        return results
+    
+    @staticmethod
+    def _ichimoku_summary(signals: List[str], latest: Dict[str, float], price: float) -> Dict:
+        """패널 지표 한 칸 → IchimokuCloud.generate_signals()와 같은 형식의 dict"""
+        return {
+            'signals': signals,
+            'bullish_count': sum(1 for s in signals if 'BULLISH' in s or 'ABOVE' in s),
+            'bearish_count': sum(1 for s in signals if 'BEARISH' in s or 'BELOW' in s),
+            'tenkan_sen': latest['tenkan_sen'],
+            'kijun_sen': latest['kijun_sen'],
+            'senkou_span_a': latest['senkou_span_a'],
+            'senkou_span_b': latest['senkou_span_b'],
+            'price_vs_cloud': 'above' if price > latest['kumo_top'] else
+                             'below' if price < latest['kumo_bottom'] else 'inside'
+        }
+
 
 if __name__ == '__main__':
     # 테스트
@@ -20,10 +20,12 @@ import pandas as pd
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass, field
-from collections import defaultdict
 import warnings
 warnings.filterwarnings('ignore')
 
+from v2.core.trade_ledger import TradeLedger, max_drawdown
+from v2.core.robustness import run_robustness
+
 
 @dataclass
 class StockScore:
@@ -158,6 +160,7 @@ class CompositeExplosiveGainsBacktest:
         
         self.positions: Dict[str, Trade] = {}
         self.trade_history: List[Trade] = []
+        self.ledger = TradeLedger()
         self.monthly_results: List[MonthlyResult] = []
         self.price_cache: Dict[str, pd.DataFrame] = {}
         self.stock_info: Dict[str, Dict] = {}
@@ -607,6 +610,7 @@ class CompositeExplosiveGainsBacktest:
         
         trade.exit_date = date
         trade.exit_price = exit_price
+        trade.exit_reason = reason
         trade.calculate_return()
         
         # 자본 업데이트
@@ -615,6 +619,7 @@ class CompositeExplosiveGainsBacktest:
         self.current_capital += (exit_value - position_value)
         
         self.trade_history.append(trade)
+        self.ledger.append_trade(trade)
         
         emoji = '📈' if trade.return_pct > 0 else '📉'
         print(f"   {emoji} 청산: {trade.name} - {reason} ({trade.return_pct:+.2f}%) [{trade.hold_days}일 보유]")
@@ -798,36 +803,27 @@ class CompositeExplosiveGainsBacktest:
                 }
             }
         
-        # 거래 통계
-        total_trades = len(self.trade_history)
-        wins = [t for t in self.trade_history if t.return_pct > 0]
-        losses = [t for t in self.trade_history if t.return_pct <= 0]
-        
-        win_rate = len(wins) / total_trades * 100
-        avg_return = np.mean([t.return_pct for t in self.trade_history])
-        avg_win = np.mean([t.return_pct for t in wins]) if wins else 0
-        avg_loss = np.mean([t.return_pct for t in losses]) if losses else 0
+        # 거래 통계 (컬럼형 원장)
+        stats = self.ledger.stats()
+        total_trades = stats['total_trades']
+        win_count, loss_count = stats['winning_trades'], stats['losing_trades']
+        win_rate = stats['win_rate']
+        avg_return = stats['avg_return']
+        avg_win = stats['avg_win']
+        avg_loss = stats['avg_loss']
         
         # 리스크 지표
-        values = [d['total_value'] for d in self.daily_values]
-        peak = values[0]
-        max_drawdown = 0
-        peak_date = self.daily_values[0]['date']
-        
-        for d in self.daily_values:
-            if d['total_value'] > peak:
-                peak = d['total_value']
-                peak_date = d['date']
-            drawdown = (peak - d['total_value']) / peak * 100
-            max_drawdown = max(max_drawdown, drawdown)
+        values = np.array([d['total_value'] for d in self.daily_values], dtype=float)
+        max_drawdown_pct = max_drawdown(values)
+        # 최고점은 처음 도달한 날 기준
+        peak_idx = int(np.argmax(values))
+        peak = values[peak_idx]
+        peak_date = self.daily_values[peak_idx]['date']
         
         # 연간 수익률 및 샤프비율
-        daily_returns = []
-        for i in range(1, len(self.daily_values)):
-            ret = (self.daily_values[i]['total_value'] - self.daily_values[i-1]['total_value']) / self.daily_values[i-1]['total_value']
-            daily_returns.append(ret)
+        daily_returns = np.diff(values) / values[:-1]
         
-        if daily_returns:
+        if len(daily_returns):
             annual_return = np.mean(daily_returns) * 252 * 100
             annual_volatility = np.std(daily_returns) * np.sqrt(252) * 100
             sharpe_ratio = (annual_return - 3) / annual_volatility if annual_volatility > 0 else 0
@@ -835,12 +831,13 @@ class CompositeExplosiveGainsBacktest:
             annual_return = annual_volatility = sharpe_ratio = 0
         
         # 보유 기간 통계
-        avg_hold_days = np.mean([t.hold_days for t in self.trade_history])
+        avg_hold_days = stats['avg_hold_days']
         
         # 청산 사유별 통계
-        exit_reasons = defaultdict(int)
-        for t in self.trade_history:
-            exit_reasons[t.exit_reason] += 1
+        exit_reasons = {reason: int(n) for reason, n in self.ledger.breakdown('exit_reason')['trades'].items()}
+        
+        # 거래 재표본 강건성 (부트스트랩 신뢰구간)
+        robustness = run_robustness(self.ledger, method='bootstrap', n_sims=2000)
         
         # 출력
         print(f"\n📈 성과 요약")
@@ -851,7 +848,7 @@ class CompositeExplosiveGainsBacktest:
         
         print(f"\n📊 거래 통계")
         print(f"   총 거래: {total_trades}회")
-        print(f"   승률: {win_rate:.1f}% ({len(wins)}승 {len(losses)}패)")
+        print(f"   승률: {win_rate:.1f}% ({win_count}승 {loss_count}패)")
         print(f"   평균 수익률: {avg_return:+.2f}%")
         print(f"   평균 수익: {avg_win:+.2f}%")
         print(f"   평균 손실: {avg_loss:.2f}%")
@@ -859,10 +856,17 @@ class CompositeExplosiveGainsBacktest:
         print(f"   평균 보유기간: {avg_hold_days:.1f}일")
         
         print(f"\n📉 리스크 지표")
-        print(f"   최대 낙폭 (MDD): {max_drawdown:.2f}%")
+        print(f"   최대 낙폭 (MDD): {max_drawdown_pct:.2f}%")
         print(f"   변동성 (연간): {annual_volatility:.2f}%")
         print(f"   샤프비율: {sharpe_ratio:.2f}")
         
+        bands = robustness.bands((5, 50, 95))
+        print(f"\n🎲 부트스트랩 90% 구간 ({robustness.n_sims:,}회)")
+        print(f"   누적 수익률(%p): {bands.loc['total_return', 'p5']:+.1f} ~ {bands.loc['total_return', 'p95']:+.1f}")
+        print(f"   거래 MDD(%p): {bands.loc['max_drawdown', 'p5']:.1f} ~ {bands.loc['max_drawdown', 'p95']:.1f}")
+        print(f"   승률: {bands.loc['win_rate', 'p5']:.1f}% ~ {bands.loc['win_rate', 'p95']:.1f}%")
+        print(f"   손실 확률: {robustness.prob_loss():.1f}%")
+        
         print(f"\n🏁 청산 사유별 통계")
         for reason, count in sorted(exit_reasons.items(), key=lambda x: -x[1]):
             pct = count / total_trades * 100
@@ -886,21 +890,22 @@ class CompositeExplosiveGainsBacktest:
                 'total_return_pct': total_return,
                 'annual_return_pct': annual_return,
                 'total_trades': total_trades,
-                'win_count': len(wins),
-                'loss_count': len(losses),
+                'win_count': win_count,
+                'loss_count': loss_count,
                 'win_rate': win_rate,
                 'avg_return': avg_return,
                 'avg_win': avg_win,
                 'avg_loss': avg_loss,
                 'profit_loss_ratio': abs(avg_win/avg_loss) if avg_loss != 0 else 0,
                 'avg_hold_days': avg_hold_days,
-                'max_drawdown_pct': max_drawdown,
+                'max_drawdown_pct': max_drawdown_pct,
                 'annual_volatility': annual_volatility,
                 'sharpe_ratio': sharpe_ratio,
                 'peak_value': peak,
                 'peak_date': peak_date
             },
             'exit_reasons': dict(exit_reasons),
+            'robustness': robustness.to_dict(),
             'monthly_results': [
                 {
                     'year_month': mr.year_month,
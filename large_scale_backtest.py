@@ -11,7 +11,7 @@ import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from fdr_wrapper import get_price
-from advanced_candle_detector import scan_with_candles
+from advanced_candle_detector import scan_dates_with_candles
 
 
 # 확장 종목 리스트 (KOSPI 대형주 + 중형주)
@@ -146,12 +146,21 @@ def run_large_scale_backtest():
     all_trades = []
     pattern_stats = {}
     
+    # 종목당 한 번 조회 후 전 기준일을 벡터화 스캔 (날짜별 scan_with_candles와 동일)
+    fetch_start = (datetime.strptime(min(dates), '%Y-%m-%d') - timedelta(days=90)).strftime('%Y-%m-%d')
+    
     for symbol in ALL_STOCKS:
         print(f"\n📊 {symbol} 스캐닝...", end=' ')
         symbol_signals = 0
         
+        try:
+            df = get_price(symbol, fetch_start, max(dates))
+            signals = scan_dates_with_candles(symbol, df, dates, combo_type='normal')
+        except Exception:
+            signals = {}
+        
         for date in dates:
-            signal = scan_with_candles(symbol, date, combo_type='normal')
+            signal = signals.get(date)
             if signal:
                 symbol_signals += 1
                 trade = simulate_trade(signal)
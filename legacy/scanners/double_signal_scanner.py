@@ -10,8 +10,11 @@ import numpy as np
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import json
+import sys
 
 BASE_PATH = '/home/programs/kstock_analyzer'
+sys.path.insert(0, BASE_PATH)
+from signal_confluence import SignalStore
 
 
 class DoubleSignalScanner:
@@ -44,6 +47,7 @@ class DoubleSignalScanner:
         }
         
         self.results = []
+        self.signal_store = SignalStore(f'{BASE_PATH}/data/signal_store.db')
     
     def fetch_data(self, symbol: str) -> Optional[pd.DataFrame]:
         """1년치 데이터 수집"""
@@ -134,6 +138,15 @@ class DoubleSignalScanner:
         
         return signals
     
+    def record_signals(self, symbol: str, signals: Dict[str, List[Dict]]):
+        """신호를 SignalStore에 저장 (signal_confluence로 재스캔 없이 중첩 검색)"""
+        code = symbol.split('.')[0]
+        self.signal_store.record(
+            {'code': code, 'date': sig['date'], 'strategy': strategy, 'score': 1.0}
+            for strategy, sig_list in signals.items()
+            for sig in sig_list
+        )
+    
     def scan_stock(self, symbol: str) -> Optional[Dict]:
         """개별 종목 스캔"""
         print(f"  {self.name_map.get(symbol, symbol)} ({symbol})...", end=' ')
@@ -144,6 +157,7 @@ class DoubleSignalScanner:
             return None
         
         signals = self.check_signals(df)
+        self.record_signals(symbol, signals)
         
         # 신호 개수 계산
         livermore_count = len(signals['livermore'])
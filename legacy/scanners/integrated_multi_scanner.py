@@ -13,6 +13,7 @@ from pathlib import Path
 import sys
 sys.path.insert(0, '.')
 from fdr_wrapper import get_price
+from signal_confluence import SignalStore
 
 
 class IntegratedMultiStrategyScanner:
@@ -33,6 +34,7 @@ class IntegratedMultiStrategyScanner:
             'NPS': [],
             'Multi': []
         }
+        self.signal_store = SignalStore('data/signal_store.db')
     
     def _load_all_symbols(self) -> List[str]:
         """DB에서 전체 종목 리스트 로드"""
@@ -338,6 +340,14 @@ class IntegratedMultiStrategyScanner:
             
             # Multi-Strategy - 평균 65점 이상
             multi_score = (v_result['score'] + b01_result['score'] + nps_result['score']) / 3
+            
+            # 전략별 신호 저장 (signal_confluence 중첩 검색용)
+            signal_date = str(df.index[-1])[:10]
+            self.signal_store.record(
+                {'code': symbol, 'date': signal_date, 'strategy': name, 'score': result['score']}
+                for name, result, threshold in [('V', v_result, 70), ('B01', b01_result, 65), ('NPS', nps_result, 70)]
+                if result['score'] >= threshold
+            )
             if multi_score >= 65:
                 targets = self.calculate_atr_targets(current_price, latest['atr'])
                 self.results['Multi'].append({
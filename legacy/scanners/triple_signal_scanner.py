@@ -10,8 +10,11 @@ import numpy as np
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 import json
+import sys
 
 BASE_PATH = '/home/programs/kstock_analyzer'
+sys.path.insert(0, BASE_PATH)
+from signal_confluence import SignalStore
 
 
 class TripleSignalScanner:
@@ -56,6 +59,7 @@ class TripleSignalScanner:
         }
         
         self.results = []
+        self.signal_store = SignalStore(f'{BASE_PATH}/data/signal_store.db')
     
     def fetch_data(self, symbol: str) -> Optional[pd.DataFrame]:
         """1년치 데이터 수집"""
@@ -243,6 +247,15 @@ class TripleSignalScanner:
         
         return triple_signals
     
+    def record_signals(self, symbol: str, signals: Dict[str, List[Dict]]):
+        """신호를 SignalStore에 저장 (signal_confluence로 재스캔 없이 중첩 검색)"""
+        code = symbol.split('.')[0]
+        self.signal_store.record(
+            {'code': code, 'date': sig['date'], 'strategy': strategy, 'score': 1.0}
+            for strategy, sig_list in signals.items()
+            for sig in sig_list
+        )
+    
     def scan_stock(self, symbol: str) -> Optional[Dict]:
         """개별 종목 스캔"""
         print(f"  {symbol} 분석 중...", end=' ')
@@ -256,6 +269,11 @@ class TripleSignalScanner:
         livermore_signals = self.check_livermore_signal(df)
         oneil_signals = self.check_oneil_signal(df)
         minervini_signals = self.check_minervini_signal(df)
+        self.record_signals(symbol, {
+            'livermore': livermore_signals,
+            'oneil': oneil_signals,
+            'minervini': minervini_signals
+        })
         
         # 신호 개수 출력
         print(f"L:{len(livermore_signals)} O:{len(oneil_signals)} M:{len(minervini_signals)}", end=' ')
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+MTF Resampler - 멀티 타임프레임 리샘플 엔진
+기준 시간대(1m/15m/1h) 봉 한 줄기로 상위 시간대(4h/1d/1w) 봉을 만든다.
+시간대마다 거래소를 따로 부르지 않고, 모든 전략이 같은 상위 봉을 보게 한다.
+
+- 집계: 시가 첫 봉, 고가 max, 저가 min, 종가 마지막 봉, 거래량 math.fsum (순서 무관 정확 합)
+- 정렬: epoch(UTC 00:00) 기준, 주봉은 월요일 00:00 UTC 시작 (바이낸스와 동일)
+- 완성 봉: 버킷의 기준 봉이 모두 있고 마지막 기준 봉이 마감된 경우만 (시작 구간/결측 버킷은 버림)
+  keep_gaps=True면 거래소 공백으로 기준 봉이 빠진 버킷은 남기고, 데이터 앞뒤에서 잘린 버킷만 버린다
+  (거래소가 직접 주는 상위 봉과 같이 빈 시간이 있어도 봉이 생김)
+- MTFResampler: 기준 봉을 증분으로 받아 완성된 상위 봉을 내보내고, 진행 중 봉(partial)도 조회 가능
+- align_higher / view: 기준 봉마다 "그 봉 마감 시점까지 마감된" 상위 봉만 붙임 (미래 참조 없음)
+
+사용법:
+    h4 = resample_ohlcv(df_1h, '4h', '1h')
+    mtf = MTFResampler('15m', ('1h', '4h'))
+    done = mtf.update(candles_15m)          # {'1h': [...], '4h': [...]} 새로 완성된 봉
+    trend_4h = mtf.view('4h')               # 15m 인덱스에 맞춘 4h 봉
+"""
+
+import math
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+_UNIT_MS = {'m': 60_000, 'h': 3_600_000, 'd': 86_400_000, 'w': 604_800_000}
+WEEK_ORIGIN_MS = 4 * 86_400_000  # 1970-01-05 (월) 00:00 UTC
+
+Row = Tuple[int, float, float, float, float, float]
+
+
+def timeframe_ms(timeframe: str) -> int:
+    """'15m' / '4h' / '24h' / '1d' / '1w' → 봉 길이 (ms)"""
+    unit = timeframe[-1].lower()
+    if unit not in _UNIT_MS or not timeframe[:-1].isdigit():
+        raise ValueError(f"지원하지 않는 시간대: {timeframe}")
+    return int(timeframe[:-1]) * _UNIT_MS[unit]
+
+
+def canonical_timeframe(timeframe: str) -> str:
+    """저장 파일 이름용 시간대 (빗썸 '24h' → '1d')"""
+    ms = timeframe_ms(timeframe)
+    for unit in ('w', 'd', 'h', 'm'):
+        if ms % _UNIT_MS[unit] == 0:
+            return f"{ms // _UNIT_MS[unit]}{unit}"
+    return timeframe
+
+
+def to_ms(value) -> int:
+    """'2024-01-01' / datetime / Timestamp / ms 정수 → UTC ms"""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert('UTC').tz_localize(None)
+    return int(ts.value // 1_000_000)
+
+
+def _origin_ms(timeframe: str) -> int:
+    return WEEK_ORIGIN_MS if timeframe[-1].lower() == 'w' else 0
+
+
+def bucket_start(ts_ms, timeframe: str):
+    """봉 시작 ms (정수 / 배열) → 속한 상위 봉 시작 ms"""
+    step, origin = timeframe_ms(timeframe), _origin_ms(timeframe)
+    return (ts_ms - origin) // step * step + origin
+
+
+def check_multiple(base_timeframe: str, timeframe: str) -> bool:
+    """timeframe이 base_timeframe 봉으로 빈틈없이 나뉘는지"""
+    base, step = timeframe_ms(base_timeframe), timeframe_ms(timeframe)
+    return step > base and step % base == 0 and _origin_ms(timeframe) % base == 0
+
+
+def _index_ms(index: pd.DatetimeIndex) -> np.ndarray:
+    return np.asarray(index.as_unit('ms').asi8, dtype=np.int64)
+
+
+def _frame(rows: Sequence[Row], name: str = 'timestamp') -> pd.DataFrame:
+    arr = np.asarray(rows, dtype=float).reshape(-1, 6)
+    df = pd.DataFrame(arr[:, 1:], columns=list(FIELDS),
+                      index=pd.to_datetime(arr[:, 0].astype(np.int64), unit='ms'))
+    df.index.name = name
+    return df
+
+
+def resample_ohlcv(df: pd.DataFrame, timeframe: str, base_timeframe: str,
+                   complete_only: bool = True, keep_gaps: bool = False) -> pd.DataFrame:
+    """
+    기준 봉 DataFrame(index: 봉 시작, 컬럼 open/high/low/close/volume) → 상위 시간대
+
+    complete_only=False면 기준 봉이 모자란 버킷(시작 구간, 진행 중 봉)도 남긴다.
+    keep_gaps=True면 중간 결측 버킷은 남기고 첫/마지막 잘린 버킷만 버린다.
+    결과 attrs: 'gap_buckets' (남긴 결측 버킷 수), 'dropped_buckets' (버린 버킷 수)
+    """
+    if not check_multiple(base_timeframe, timeframe):
+        raise ValueError(f"{timeframe}은 {base_timeframe}의 배수가 아닙니다")
+    if df.empty:
+        return df[list(FIELDS)].iloc[:0]
+
+    ts = _index_ms(df.index)
+    buckets = bucket_start(ts, timeframe)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(ts)]
+
+    out = pd.DataFrame({
+        'open': df['open'].to_numpy(dtype=float)[starts],
+        'high': np.maximum.reduceat(df['high'].to_numpy(dtype=float), starts),
+        'low': np.minimum.reduceat(df['low'].to_numpy(dtype=float), starts),
+        'close': df['close'].to_numpy(dtype=float)[ends - 1],
+        'volume': [math.fsum(seg) for seg in np.split(df['volume'].to_numpy(dtype=float), starts[1:])],
+    }, index=pd.to_datetime(buckets[starts], unit='ms'))
+    out.index.name = df.index.name
+    step, base_step = timeframe_ms(timeframe), timeframe_ms(base_timeframe)
+    full = ends - starts == step // base_step
+    keep = np.ones(len(out), dtype=bool)
+    if complete_only:
+        if keep_gaps:
+            # 데이터 시작 이후에 열린 첫 버킷 / 끝나기 전에 끊긴 마지막 버킷만 잘린 것으로 봄
+            keep[0] = full[0] or ts[0] == buckets[0]
+            keep[-1] = keep[-1] and (full[-1] or ts[-1] == buckets[-1] + step - base_step)
+        else:
+            keep = full
+    out = out[keep]
+    out.attrs['gap_buckets'] = int((keep & ~full).sum())
+    out.attrs['dropped_buckets'] = int((~keep).sum())
+    return out
+
+
+def align_higher(index: pd.DatetimeIndex, higher: pd.DataFrame,
+                 base_timeframe: str, timeframe: str) -> pd.DataFrame:
+    """
+    기준 봉 index마다 그 봉 마감 시점까지 마감된 가장 최근 상위 봉 (없으면 NaN)
+
+    상위 봉 마감(시작 + 상위 길이) ≤ 기준 봉 마감(시작 + 기준 길이)인 봉만 쓴다.
+    """
+    if higher.empty:
+        return pd.DataFrame(np.nan, index=index, columns=higher.columns)
+    base_close = _index_ms(index) + timeframe_ms(base_timeframe)
+    higher_close = _index_ms(higher.index) + timeframe_ms(timeframe)
+    pos = np.searchsorted(higher_close, base_close, side='right') - 1
+    out = higher.iloc[np.maximum(pos, 0)].copy()
+    out.index = index
+    out.loc[pos < 0] = np.nan
+    return out
+
+
+class MTFResampler:
+    """
+    기준 봉 증분 입력 → 상위 시간대 완성 봉 / 진행 중 봉
+
+    update에 같은 ts 봉을 다시 넣으면 진행 중 봉(forming)으로 보고 교체한다.
+    max_bars: 시간대별 보관 봉 수 (None이면 무제한)
+    keep_gaps: 결측 버킷도 다음 버킷이 시작될 때 봉으로 내보냄 (첫 버킷이 잘렸으면 버림)
+    dropped: 시간대별 버린 버킷 수
+    """
+
+    def __init__(self, base_timeframe: str = '1h', timeframes: Iterable[str] = ('4h', '1d', '1w'),
+                 max_bars: Optional[int] = None, keep_gaps: bool = False):
+        self.base_timeframe = canonical_timeframe(base_timeframe)
+        self.timeframes = [canonical_timeframe(tf) for tf in timeframes]
+        for tf in self.timeframes:
+            if not check_multiple(self.base_timeframe, tf):
+                raise ValueError(f"{tf}은 {self.base_timeframe}의 배수가 아닙니다")
+        self.base_step = timeframe_ms(self.base_timeframe)
+
+        self._base: deque = deque(maxlen=max_bars)
+        self._forming = False                                   # 마지막 기준 봉이 진행 중인지
+        self._bars = {tf: deque(maxlen=max_bars) for tf in self.timeframes}
+        self._bucket: Dict[str, Optional[int]] = {tf: None for tf in self.timeframes}
+        self._rows: Dict[str, List[Row]] = {tf: [] for tf in self.timeframes}
+        self.keep_gaps = keep_gaps
+        self._anchored = {tf: False for tf in self.timeframes}  # 현재 버킷이 잘린 시작 버킷이 아닌지
+        self._opened = {tf: False for tf in self.timeframes}
+        self.dropped = {tf: 0 for tf in self.timeframes}
+
+    # ── 입력 ──
+    def last_timestamp(self) -> Optional[int]:
+        """마지막 기준 봉 시작 ms"""
+        return self._base[-1][0] if self._base else None
+
+    def update(self, candles: Iterable[Sequence[float]], forming: bool = False) -> Dict[str, List[Row]]:
+        """
+        기준 봉 [[ts, o, h, l, c, v], ...] (ts 오름차순) 반영 → {시간대: 새로 완성된 봉}
+
+        forming=True면 마지막 봉은 진행 중 봉 (다음 update에서 같은 ts로 교체되거나 마감됨).
+        이미 마감된 봉 이전/같은 ts는 건너뛴다.
+        """
+        candles = list(candles)
+        done: Dict[str, List[Row]] = {tf: [] for tf in self.timeframes}
+        for k, c in enumerate(candles):
+            row = (int(c[0]), float(c[1]), float(c[2]), float(c[3]), float(c[4]), float(c[5]))
+            last = self.last_timestamp()
+            replace = last is not None and row[0] == last and self._forming
+            if last is not None and row[0] <= last and not replace:
+                continue
+            if not replace and self._forming:
+                # 다음 봉이 왔으니 직전 진행 중 봉은 마감
+                self._forming = False
+                for tf in self.timeframes:
+                    self._try_close(tf, done)
+
+            closed = not (forming and k == len(candles) - 1)
+            if replace:
+                self._base[-1] = row
+            else:
+                self._base.append(row)
+            self._forming = not closed
+            for tf in self.timeframes:
+                self._add(tf, row, replace, done)
+                if closed:
+                    self._try_close(tf, done)
+        return done
+
+    def _add(self, tf: str, row: Row, replace: bool, done: Dict[str, List[Row]]):
+        bucket = int(bucket_start(row[0], tf))
+        if replace and self._rows[tf] and self._rows[tf][-1][0] == row[0]:
+            self._rows[tf][-1] = row
+            return
+        if bucket != self._bucket[tf]:
+            rows = self._rows[tf]
+            if rows:
+                # 채워지지 않은 채 넘어간 버킷: keep_gaps면 결측 봉으로 내보내고, 아니면 버림
+                if self.keep_gaps and self._anchored[tf]:
+                    bar = self._aggregate(self._bucket[tf], rows)
+                    self._bars[tf].append(bar)
+                    done[tf].append(bar)
+                else:
+                    self.dropped[tf] += 1
+            self._anchored[tf] = self._opened[tf] or row[0] == bucket
+            self._opened[tf] = True
+            self._bucket[tf], self._rows[tf] = bucket, []
+        self._rows[tf].append(row)
+
+    def _try_close(self, tf: str, done: Dict[str, List[Row]]):
+        rows = self._rows[tf]
+        if len(rows) == timeframe_ms(tf) // self.base_step:
+            bar = self._aggregate(self._bucket[tf], rows)
+            self._bars[tf].append(bar)
+            done[tf].append(bar)
+            self._bucket[tf], self._rows[tf] = None, []
+
+    @staticmethod
+    def _aggregate(bucket: int, rows: List[Row]) -> Row:
+        return (bucket, rows[0][1], max(r[2] for r in rows), min(r[3] for r in rows),
+                rows[-1][4], math.fsum(r[5] for r in rows))
+
+    # ── 조회 ──
+    def bars(self, timeframe: str, partial: bool = False) -> List[Row]:
+        """완성 봉 리스트 (partial=True면 진행 중 봉을 끝에 붙임)"""
+        timeframe = canonical_timeframe(timeframe)
+        if timeframe == self.base_timeframe:
+            rows = list(self._base)
+            return rows if partial or not self._forming else rows[:-1]
+        rows = list(self._bars[timeframe])
+        if partial and self._rows[timeframe]:
+            rows.append(self._aggregate(self._bucket[timeframe], self._rows[timeframe]))
+        return rows
+
+    def frame(self, timeframe: str, partial: bool = False) -> pd.DataFrame:
+        """bars()를 DataFrame으로 (index: 봉 시작 UTC)"""
+        return _frame(self.bars(timeframe, partial))
+
+    def view(self, timeframe: str, index: Optional[pd.DatetimeIndex] = None) -> pd.DataFrame:
+        """기준 봉 index에 맞춘 상위 시간대 완성 봉 (미래 참조 없음)"""
+        if index is None:
+            index = self.frame(self.base_timeframe, partial=True).index
+        return align_higher(index, self.frame(timeframe), self.base_timeframe, canonical_timeframe(timeframe))
@@ -18,6 +18,8 @@ from dataclasses import dataclass
 from typing import List, Dict, Optional
 from fdr_wrapper import get_price
 from trend_following_strategies import MovingAverageCross, ATRChannelBreakout, RSI2MeanReversion
+from exit_grid import ForwardBars, evaluate_exit_grid
+from portfolio_accounting import PortfolioAccountant, EquityCurve, load_close_panel
 
 
 @dataclass
@@ -217,6 +219,60 @@ class MultiStrategyPortfolio:
         except Exception as e:
             return None
     
+    def sweep_exit_grid(self, signals: List[Dict],
+                        hold_days: tuple = (5, 7, 10, 15),
+                        stop_loss_pcts: tuple = (0.03, 0.05, 0.07),
+                        target_rrs: tuple = (1.5, 2.0, 3.0, 4.0)) -> pd.DataFrame:
+        """
+        보유일수 × 손절 × 목표 R:R 전체 조합 일괄 평가 (simulate_trade와 같은 청산 모델)
+        
+        신호별 이후 가격을 한 번만 조회해 StrategyConfig 후보 전체를 청산 그리드로 계산한다.
+        보유일수 h마다 simulate_trade처럼 신호일 + (h-2) ~ (h+5)일 구간을 잘라, 첫 봉은 건너뛰고
+        h-1번째 봉까지 매일 손절 → 목표 순으로 확인하고, 미청산이면 그 봉(없으면 마지막 봉) 종가로 청산.
+        (구간에 봉이 1개뿐인 경우만 simulate_trade와 달리 거래 없음으로 센다)
+        반환: 조합별 거래수/승률/평균·중간·최대·최소 수익률 (stop_loss, target_rr 컬럼)
+        """
+        entry_dates = [datetime.strptime(s['date'], '%Y-%m-%d') for s in signals]
+        frames = []
+        for signal, entry_date in zip(signals, entry_dates):
+            try:
+                start = entry_date + timedelta(days=min(hold_days) - 2)
+                end = entry_date + timedelta(days=max(hold_days) + 5)
+                df = get_price(signal['symbol'], start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'))
+            except Exception as e:
+                df = None
+            frames.append(df)
+        
+        combos = [(sl, rr) for sl in stop_loss_pcts for rr in target_rrs]
+        entry = np.array([s['price'] for s in signals], dtype=float)
+        summaries = []
+        for h in hold_days:
+            windows = []
+            for df, entry_date in zip(frames, entry_dates):
+                if df is None or df.empty:
+                    windows.append(None)
+                    continue
+                dates = pd.to_datetime(df.index)
+                keep = ((dates >= entry_date + timedelta(days=h - 2))
+                        & (dates <= entry_date + timedelta(days=h + 5)))
+                windows.append(df[keep])
+            bars = ForwardBars.from_frames(windows, h).window(1)
+            grid = evaluate_exit_grid(
+                entry, bars.high, bars.low, bars.close,
+                holding_days=[h - 1],
+                stop_pcts=[-sl * 100 for sl, _ in combos],
+                target_pcts=[sl * rr * 100 for sl, rr in combos],
+                n_bars=bars.n_bars,
+                pairs=True,
+                partial='last',
+                stop_labels=[sl for sl, _ in combos],
+                target_labels=[rr for _, rr in combos],
+            )
+            summary = grid.summary()
+            summary['holding_days'] = h
+            summaries.append(summary)
+        return pd.concat(summaries, ignore_index=True).rename(columns={'take_profit': 'target_rr'})
+    
     def run_portfolio_backtest(self, config_set: Dict, test_dates: List[str]) -> Dict:
         """포트폴리오 백테스트 실행"""
         print(f"\n{'='*70}")
@@ -269,11 +325,44 @@ class MultiStrategyPortfolio:
             
             trades.extend(day_trades)
         
+        # 일별 시가평가
+        curve = self.mark_to_market(trades, config_set)
+        self.daily_values = curve.to_records()
+        
         # 결과 분석
-        return self.analyze_results(trades, config_set)
+        return self.analyze_results(trades, config_set, curve)
     
-    def analyze_results(self, trades: List[Trade], config: Dict) -> Dict:
-        """결과 분석"""
+    def mark_to_market(self, trades: List[Trade], config_set: Dict,
+                       db_path: str = 'data/pivot_strategy.db') -> EquityCurve:
+        """
+        거래 목록을 전략 가중치대로 자금 배분해 일별 자산/현금/노출도 계산
+        
+        편입 대상 전 종목의 종가 패널을 한 번 조회해 전 포지션을 매일 일괄 평가한다.
+        """
+        accountant = PortfolioAccountant(
+            self.initial_capital,
+            {cfg.name: cfg.weight for cfg in config_set['configs']},
+            position_size_pct=config_set['position_size_pct'],
+            max_positions=config_set['max_positions'],
+        )
+        if not trades:
+            return accountant.run(None, pd.DataFrame())
+        
+        book = pd.DataFrame({
+            'sleeve': [t.strategy for t in trades],
+            'symbol': [t.symbol for t in trades],
+            'entry_date': [t.entry_date for t in trades],
+            'exit_date': [t.exit_date for t in trades],
+            'entry_price': [t.entry_price for t in trades],
+            'exit_price': [t.exit_price for t in trades],
+        })
+        panel = load_close_panel(db_path, book['symbol'].unique(),
+                                 book['entry_date'].min(), book['exit_date'].max())
+        return accountant.run(book, panel)
+    
+    def analyze_results(self, trades: List[Trade], config: Dict,
+                        curve: Optional[EquityCurve] = None) -> Dict:
+        """결과 분석 (curve가 있으면 시가평가 자산 곡선 지표 포함)"""
         if not trades:
             return {
                 'config_name': config['name'],
@@ -307,7 +396,7 @@ class MultiStrategyPortfolio:
             if dd > max_dd:
                 max_dd = dd
         
-        return {
+        result = {
             'config_name': config['name'],
             'description': config['description'],
             'total_trades': len(trades),
@@ -330,6 +419,16 @@ class MultiStrategyPortfolio:
                 } for t in trades
             ]
         }
+        
+        if curve is not None:
+            result['portfolio'] = curve.summary()
+            result['equity_curve'] = curve.to_records()
+            p = result['portfolio']
+            print(f"\n   💼 시가평가: 최종 {p['final_equity']:,.0f}원 ({p['total_return']:+.2f}%), "
+                  f"MDD {p['max_drawdown']:.2f}%, 평균 노출 {p['avg_exposure']:.1f}%, "
+                  f"편입 {p['positions']}건 / 제외 {p['rejected']}건")
+        
+        return result
     
     def run_all_backtests(self, test_dates: List[str]):
         """모든 조합 백테스트"""
@@ -360,17 +459,21 @@ class MultiStrategyPortfolio:
                     'total_return': r['total_return'],
                     'rr_ratio': r['rr_ratio'],
                     'sharpe': r['sharpe'],
-                    'max_dd': r['max_drawdown']
+                    'max_dd': r['max_drawdown'],
+                    'equity_return': r.get('portfolio', {}).get('total_return', 0.0),
+                    'equity_mdd': r.get('portfolio', {}).get('max_drawdown', 0.0),
+                    'exposure': r.get('portfolio', {}).get('avg_exposure', 0.0),
                 })
         
         # 정렬 (총 수익률 기준)
         comparison.sort(key=lambda x: x['total_return'], reverse=True)
         
-        print(f"\n{'순위':<4} {'전략명':<20} {'거래':<6} {'승률':<8} {'총수익':<10} {'R:R':<6} {'샤프':<6} {'MDD':<8}")
-        print("-" * 70)
+        print(f"\n{'순위':<4} {'전략명':<20} {'거래':<6} {'승률':<8} {'총수익':<10} {'R:R':<6} {'샤프':<6} {'MDD':<8} {'자산수익':<10} {'자산MDD':<8} {'노출':<6}")
+        print("-" * 100)
         
         for i, c in enumerate(comparison, 1):
-            print(f"{i:<4} {c['name']:<20} {c['trades']:<6} {c['win_rate']:<8.1f} {c['total_return']:<10.2f} {c['rr_ratio']:<6.2f} {c['sharpe']:<6.2f} {c['max_dd']:<8.2f}")
+            print(f"{i:<4} {c['name']:<20} {c['trades']:<6} {c['win_rate']:<8.1f} {c['total_return']:<10.2f} {c['rr_ratio']:<6.2f} {c['sharpe']:<6.2f} {c['max_dd']:<8.2f} "
+                  f"{c['equity_return']:<10.2f} {c['equity_mdd']:<8.2f} {c['exposure']:<6.1f}")
         
         # 최적 전략 저장
         if comparison:
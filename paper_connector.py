@@ -9,30 +9,41 @@ sys.path.insert(0, '/tmp/okcomputer_analysis/bithumb_trading')
 
 from paper_trading import PaperAccount, PaperTradingEngine, Order
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
 import os
 
+from event_log import EventLog
+
+ACCOUNT_STREAM = 'paper_account'
+
 
 class PaperTradingConnector:
     """페이퍼트레이딩 연동 클래스"""
     
-    def __init__(self, initial_balance: float = 10_000_000):
+    def __init__(self, initial_balance: float = 10_000_000, event_log: Optional[EventLog] = None):
         self.initial_balance = initial_balance
         self.account = PaperAccount(initial_balance=initial_balance)
         self.engine = PaperTradingEngine(self.account)
         self.data_dir = '/tmp/crypto_signal_data'
-        self.state_file = f"{self.data_dir}/paper_account.json"
+        self.state_file = f"{self.data_dir}/paper_account.json"  # 이전 버전 상태 파일 (로그가 비었을 때만 읽음)
+        # 계좌 스냅샷은 신호 히스토리와 같은 로그에 누적
+        self.event_log = event_log or EventLog(f"{self.data_dir}/signal_log.db")
         
         # 기존 상태 로드
         self._load_state()
     
     def _load_state(self):
-        """계좌 상태 로드"""
-        if os.path.exists(self.state_file):
+        """계좌 상태 로드 (최근 스냅샷)"""
+        data = self.event_log.latest(ACCOUNT_STREAM)
+        if data is None and os.path.exists(self.state_file):
             try:
                 with open(self.state_file, 'r') as f:
                     data = json.load(f)
+            except Exception as e:
+                print(f"⚠️ 상태 로드 실패: {e}")
+        if data is not None:
+            try:
                 self.account.balance = data.get('balance', self.initial_balance)
                 
                 # 포지션 복원
@@ -63,17 +74,21 @@ class PaperTradingConnector:
                     'avg_buy_price': pos.avg_buy_price
                 }
             
-            with open(self.state_file, 'w') as f:
-                json.dump({
-                    'balance': self.account.balance,
-                    'initial_balance': self.initial_balance,
-                    'positions': positions_data,
-                    'last_update': datetime.now().isoformat(),
-                    'trade_count': len(self.account.trade_history)
-                }, f, indent=2)
+            now = datetime.now()
+            self.event_log.append(ACCOUNT_STREAM, {
+                'balance': self.account.balance,
+                'initial_balance': self.initial_balance,
+                'positions': positions_data,
+                'last_update': now.isoformat(),
+                'trade_count': len(self.account.trade_history)
+            }, now)
         except Exception as e:
             print(f"⚠️ 상태 저장 실패: {e}")
     
+    def compact_history(self, keep_days: int = 90, keep_last_per: Optional[str] = 'day') -> int:
+        """keep_days 이전 계좌 스냅샷은 하루 마지막 1건만 남김"""
+        return self.event_log.compact(ACCOUNT_STREAM, datetime.now() - timedelta(days=keep_days), keep_last_per)
+    
     def execute_signal(self, signal, max_investment_pct: float = 10.0) -> Optional[Order]:
         """
         신호에 따라 페이퍼트레이딩 주문 실행
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+Parameter Optimizer - 병렬·재개 가능한 파라미터 최적화 프레임워크
+파라미터 공간을 선언하면 프로세스 풀에서 시행(trial)을 돌리고 결과를 캐시
+
+구조:
+- ParamSpace: 파라미터 공간 (값 목록 / IntRange / Uniform)
+- TrialCache: SQLite 시행 결과 캐시 (data/optimizer_cache.db)
+  키 = hash(목적함수 코드 버전, 파라미터, 고정 인자, 데이터 버전, 예산)
+  → 재실행 시 끝난 시행은 건너뛰고, 중단돼도 완료분은 보존
+- Optimizer: grid / random / successive halving 탐색 + 실시간 리더보드
+
+목적함수 규약:
+    def trial(params: dict, **fixed) -> dict      # metric 키를 포함한 dict (또는 float)
+    def trial(params: dict, budget, **fixed)      # successive halving용
+    ProcessPool에서 실행되므로 모듈 최상위 함수여야 한다.
+
+사용법:
+    space = ParamSpace(holding=[3, 5, 10], stop=IntRange(-7, -3), target=Uniform(5, 20))
+    opt = Optimizer(my_trial, space, study='my_sweep', metric='win_rate',
+                    fixed={'dates': dates}, data_version=file_data_version('data/level1_prices.db'))
+    board = opt.run_grid()               # 또는 run_random(50), run_successive_halving(27, 1, 9)
+"""
+
+import hashlib
+import inspect
+import itertools
+import json
+import os
+import random
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_CACHE_PATH = 'data/optimizer_cache.db'
+
+
+# ==================== 파라미터 공간 ====================
+
+@dataclass
+class IntRange:
+    """정수 구간 [low, high] (grid는 step 간격)"""
+    low: int
+    high: int
+    step: int = 1
+
+    def values(self) -> list:
+        return list(range(self.low, self.high + 1, self.step))
+
+    def sample(self, rng: random.Random):
+        return rng.choice(self.values())
+
+
+@dataclass
+class Uniform:
+    """실수 균등분포 [low, high] (random/halving 전용, grid는 points개 등분)"""
+    low: float
+    high: float
+    points: int = 5
+
+    def values(self) -> list:
+        return [float(v) for v in np.linspace(self.low, self.high, self.points)]
+
+    def sample(self, rng: random.Random):
+        return rng.uniform(self.low, self.high)
+
+
+class ParamSpace:
+    """파라미터 공간 - 이름별 값 목록, IntRange 또는 Uniform"""
+
+    def __init__(self, **dims):
+        self.dims = dims
+
+    def _values(self, dim) -> list:
+        if isinstance(dim, (IntRange, Uniform)):
+            return dim.values()
+        return list(dim)
+
+    def grid(self) -> List[Dict]:
+        names = list(self.dims)
+        return [dict(zip(names, combo))
+                for combo in itertools.product(*(self._values(self.dims[n]) for n in names))]
+
+    def sample(self, n: int, seed: Optional[int] = None) -> List[Dict]:
+        """중복 없는 무작위 n개 (이산 공간이 n보다 작으면 전체)"""
+        rng = random.Random(seed)
+        discrete = not any(isinstance(d, Uniform) for d in self.dims.values())
+        if discrete and len(self) <= n:
+            configs = self.grid()
+            rng.shuffle(configs)
+            return configs
+
+        configs, seen = [], set()
+        for _ in range(n * 20):
+            params = {name: dim.sample(rng) if isinstance(dim, (IntRange, Uniform)) else rng.choice(list(dim))
+                      for name, dim in self.dims.items()}
+            key = _canonical(params)
+            if key not in seen:
+                seen.add(key)
+                configs.append(params)
+                if len(configs) == n:
+                    break
+        return configs
+
+    def __len__(self) -> int:
+        size = 1
+        for dim in self.dims.values():
+            size *= len(self._values(dim))
+        return size
+
+
+# ==================== 버전/키 ====================
+
+def _json_default(obj):
+    if isinstance(obj, np.bool_):
+        return bool(obj)
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return float(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    return str(obj)
+
+
+def _canonical(obj) -> str:
+    return json.dumps(obj, sort_keys=True, ensure_ascii=False, default=_json_default)
+
+
+def code_version(*objs) -> str:
+    """객체들이 정의된 소스 파일 내용의 해시 (전략 코드가 바뀌면 캐시 무효)"""
+    digest = hashlib.sha256()
+    files = set()
+    for obj in objs:
+        try:
+            files.add(inspect.getsourcefile(obj))
+        except TypeError:
+            digest.update(repr(obj).encode())
+    for path in sorted(f for f in files if f):
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def file_data_version(*paths: str) -> str:
+    """데이터 파일 크기·수정시각 기반 버전 (DB가 갱신되면 캐시 무효)"""
+    digest = hashlib.sha256()
+    for path in paths:
+        if os.path.exists(path):
+            st = os.stat(path)
+            digest.update(f"{path}:{st.st_size}:{st.st_mtime_ns}".encode())
+        else:
+            digest.update(f"{path}:missing".encode())
+    return digest.hexdigest()[:16]
+
+
+def trial_key(objective_name: str, code_ver: str, data_ver: str, params: Dict,
+              fixed: Optional[Dict] = None, budget=None) -> str:
+    payload = _canonical({
+        'objective': objective_name, 'code': code_ver, 'data': data_ver,
+        'params': params, 'fixed': fixed or {}, 'budget': budget,
+    })
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+# ==================== 캐시 ====================
+
+class TrialCache:
+    """시행 결과 캐시 (SQLite)"""
+
+    def __init__(self, db_path: str = DEFAULT_CACHE_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._create_table()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path)
+
+    def _create_table(self):
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS trials (
+                key TEXT PRIMARY KEY,
+                study TEXT NOT NULL,
+                params TEXT NOT NULL,
+                budget REAL,
+                result TEXT NOT NULL,
+                score REAL,
+                elapsed REAL,
+                created_at TEXT
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_trials_study ON trials(study)")
+        conn.commit()
+        conn.close()
+
+    def get(self, key: str) -> Optional[Dict]:
+        conn = self._connect()
+        row = conn.execute("SELECT result, elapsed FROM trials WHERE key = ?", (key,)).fetchone()
+        conn.close()
+        if row is None:
+            return None
+        return {'result': json.loads(row[0]), 'elapsed': row[1]}
+
+    def put(self, key: str, study: str, params: Dict, budget, result: Dict,
+            score: Optional[float], elapsed: float):
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO trials VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, study, _canonical(params), budget, _canonical(result),
+             None if score is None or not np.isfinite(score) else float(score),
+             elapsed, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+        conn.commit()
+        conn.close()
+
+    def load_study(self, study: str) -> pd.DataFrame:
+        """스터디의 저장된 시행 전체"""
+        conn = self._connect()
+        df = pd.read_sql("SELECT * FROM trials WHERE study = ? ORDER BY created_at",
+                         conn, params=(study,))
+        conn.close()
+        return df
+
+    def clear_study(self, study: str) -> int:
+        conn = self._connect()
+        cur = conn.execute("DELETE FROM trials WHERE study = ?", (study,))
+        conn.commit()
+        conn.close()
+        return cur.rowcount
+
+
+# ==================== 실행 ====================
+
+def _call_objective(objective: Callable, params: Dict, budget, fixed: Dict):
+    start = time.time()
+    if budget is None:
+        result = objective(params, **fixed)
+    else:
+        result = objective(params, budget=budget, **fixed)
+    if not isinstance(result, dict):
+        result = {'score': result}
+    return json.loads(_canonical(result)), time.time() - start
+
+
+class Optimizer:
+    """
+    파라미터 최적화 실행기
+
+    - 캐시에 있는 시행은 건너뛰고 나머지만 프로세스 풀에서 실행
+    - 시행이 끝날 때마다 캐시에 기록 (중단 후 재실행하면 이어서 진행)
+    - leaderboard_path를 주면 완료 시마다 상위 결과를 JSON으로 갱신
+    """
+
+    def __init__(self, objective: Callable, space: ParamSpace, study: str,
+                 metric: str = 'score', maximize: bool = True,
+                 n_workers: Optional[int] = None,
+                 fixed: Optional[Dict[str, Any]] = None,
+                 data_version: str = '',
+                 code_ver: Optional[str] = None,
+                 cache: Optional[TrialCache] = None,
+                 leaderboard_path: Optional[str] = None,
+                 top_k: int = 10,
+                 verbose: bool = True):
+        self.objective = objective
+        self.space = space
+        self.study = study
+        self.metric = metric
+        self.maximize = maximize
+        self.n_workers = n_workers if n_workers is not None else (os.cpu_count() or 1)
+        self.fixed = fixed or {}
+        self.data_version = data_version
+        self.code_ver = code_ver or code_version(objective)
+        self.cache = cache if cache is not None else TrialCache()
+        self.leaderboard_path = leaderboard_path
+        self.top_k = top_k
+        self.verbose = verbose
+        self.records: List[Dict] = []
+        self._objective_name = f"{objective.__module__}.{objective.__qualname__}"
+
+    # ---------- 탐색 방법 ----------
+
+    def run_grid(self) -> pd.DataFrame:
+        """전체 격자 탐색"""
+        self._run(self.space.grid())
+        return self.leaderboard(None)
+
+    def run_random(self, n_trials: int, seed: Optional[int] = None) -> pd.DataFrame:
+        """무작위 탐색"""
+        self._run(self.space.sample(n_trials, seed))
+        return self.leaderboard(None)
+
+    def run_successive_halving(self, n_configs: int, min_budget, max_budget,
+                               eta: int = 3, seed: Optional[int] = None) -> pd.DataFrame:
+        """
+        Successive halving: 작은 예산으로 많은 후보를 돌리고 상위 1/eta만
+        eta배 예산으로 다시 평가 (목적함수가 budget 인자를 받아야 함)
+        """
+        configs = self.space.sample(n_configs, seed)
+        budget = min_budget
+        rung = 0
+        while configs:
+            records = self._run(configs, budget=budget)
+            for rec in records:
+                rec['rung'] = rung
+            if budget >= max_budget or len(configs) <= 1:
+                break
+            ranked = sorted(records, key=self._sort_key)
+            configs = [rec['params'] for rec in ranked[:max(1, len(configs) // eta)]]
+            budget = min(budget * eta, max_budget)
+            rung += 1
+        return self.leaderboard(None)
+
+    # ---------- 결과 ----------
+
+    def leaderboard(self, k: Optional[int] = 10) -> pd.DataFrame:
+        """이번 실행 시행 순위 (halving이면 높은 예산 우선)"""
+        if not self.records:
+            return pd.DataFrame()
+        ranked = sorted(self.records, key=lambda r: (-(r['budget'] or 0),) + self._sort_key(r))
+        rows = []
+        for rec in ranked[:k] if k else ranked:
+            row = dict(rec['params'])
+            row[self.metric] = rec['score']
+            if rec['budget'] is not None:
+                row['budget'] = rec['budget']
+            row['elapsed'] = round(rec['elapsed'] or 0, 2)
+            row['cached'] = rec['cached']
+            if rec.get('error'):
+                row['error'] = rec['error']
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    def best(self) -> Optional[Dict]:
+        """최고 시행 (params, score, result)"""
+        ok = [r for r in self.records if r['score'] is not None and np.isfinite(r['score'])]
+        if not ok:
+            return None
+        return sorted(ok, key=lambda r: (-(r['budget'] or 0),) + self._sort_key(r))[0]
+
+    # ---------- 내부 ----------
+
+    def _sort_key(self, rec: Dict) -> tuple:
+        score = rec['score']
+        if score is None or not np.isfinite(score):
+            return (1, 0.0)
+        return (0, -score if self.maximize else score)
+
+    def _score(self, result: Dict) -> Optional[float]:
+        value = result.get(self.metric)
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    def _run(self, configs: List[Dict], budget=None) -> List[Dict]:
+        records, pending = [], []
+        for params in configs:
+            key = trial_key(self._objective_name, self.code_ver, self.data_version,
+                            params, self.fixed, budget)
+            hit = self.cache.get(key)
+            if hit is not None:
+                records.append(self._record(params, budget, hit['result'], hit['elapsed'], True))
+            else:
+                pending.append((key, params))
+
+        total = len(configs)
+        if self.verbose:
+            label = f" budget={budget}" if budget is not None else ""
+            print(f"🔧 [{self.study}]{label} 시행 {total}개 (캐시 {total - len(pending)}, 실행 {len(pending)})")
+        self.records.extend(records)
+
+        def finish(key, params, result, elapsed, error=None):
+            if error is None:
+                self.cache.put(key, self.study, params, budget, result, self._score(result), elapsed)
+            rec = self._record(params, budget, result, elapsed, False, error)
+            records.append(rec)
+            self.records.append(rec)
+            self._report(rec, len(records), total)
+
+        if self.n_workers <= 1 or len(pending) <= 1:
+            for key, params in pending:
+                try:
+                    result, elapsed = _call_objective(self.objective, params, budget, self.fixed)
+                    finish(key, params, result, elapsed)
+                except Exception as e:
+                    finish(key, params, {}, 0.0, str(e))
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.n_workers, len(pending))) as executor:
+                futures = {executor.submit(_call_objective, self.objective, params, budget, self.fixed): (key, params)
+                           for key, params in pending}
+                for future in as_completed(futures):
+                    key, params = futures[future]
+                    try:
+                        result, elapsed = future.result()
+                        finish(key, params, result, elapsed)
+                    except Exception as e:
+                        finish(key, params, {}, 0.0, str(e))
+
+        return records
+
+    def _record(self, params, budget, result, elapsed, cached, error=None) -> Dict:
+        return {
+            'params': params, 'budget': budget, 'result': result,
+            'score': self._score(result) if error is None else None,
+            'elapsed': elapsed, 'cached': cached, 'error': error,
+        }
+
+    def _report(self, rec: Dict, done: int, total: int):
+        if self.verbose:
+            if rec['error']:
+                print(f"   [{done}/{total}] ❌ {rec['params']} - {rec['error'][:60]}")
+            else:
+                best = self.best()
+                mark = '🏆' if best is rec else '  '
+                print(f"   [{done}/{total}] {mark} {self.metric}={rec['score']} {rec['params']}")
+        if self.leaderboard_path:
+            board = self.leaderboard(self.top_k)
+            payload = {
+                'study': self.study,
+                'metric': self.metric,
+                'completed': done,
+                'total': total,
+                'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'top': board.to_dict('records'),
+            }
+            os.makedirs(os.path.dirname(self.leaderboard_path) or '.', exist_ok=True)
+            tmp = f"{self.leaderboard_path}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False, indent=2, default=_json_default)
+            os.replace(tmp, self.leaderboard_path)
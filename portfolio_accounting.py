@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Portfolio Accounting - 일별 시가평가 포트폴리오 회계
+개별 거래 목록을 실제 자금 배분 규칙으로 편입한 뒤, 종가 패널 하나로 전 보유 포지션을
+매일 한 번에 시가평가해 자산/현금/노출도 시계열을 만든다.
+
+구조:
+- load_close_panel(): stock_prices에서 (거래일 × 종목) 종가 패널을 한 번에 조회
+- PortfolioAccountant.allocate(): 전략(슬리브)별 예산·동시 보유 한도·현금 잔고로 거래 편입
+- PortfolioAccountant.mark(): 편입 포지션의 보유 수량 행렬을 진입/청산 증감의 누적합으로 만들고
+  종가 패널과 곱해 일별 평가액 계산 (날짜 루프 없음)
+- EquityCurve: 일별 시계열 + 편입 내역 + 요약 지표(summary)
+
+회계 규칙:
+- 진입일 종가(진입가)로 매수, 청산일에 청산가로 매도 → 청산일 이후 현금으로 반영
+- 같은 날 청산과 진입이 겹치면 청산을 먼저 처리해 한도/현금을 돌려받음
+- 포지션 크기 = 초기자본 × position_size_pct, 슬리브 예산 = 초기자본 × 전략 가중치
+
+사용법:
+    acct = PortfolioAccountant(100_000_000, {'MA_CROSS': 0.5, 'ATR_BREAK': 0.5},
+                               position_size_pct=0.12, max_positions=5)
+    panel = load_close_panel('data/pivot_strategy.db', symbols, '2026-03-03', '2026-04-10')
+    curve = acct.run(trades, panel)
+    print(curve.summary())
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from v2.core.trade_ledger import max_drawdown, sharpe_ratio
+
+
+def load_close_panel(db_path: str, symbols: Sequence[str], start: str, end: str) -> pd.DataFrame:
+    """
+    (거래일 × 종목) 종가 패널 조회
+
+    종목별 get_price 반복 대신 500종목 단위 IN 쿼리로 읽어 pivot한다.
+    거래정지 등으로 빈 칸은 직전 종가로 채운다.
+    """
+    symbols = sorted(set(symbols))
+    if not symbols:
+        return pd.DataFrame()
+
+    conn = sqlite3.connect(db_path)
+    frames = []
+    for i in range(0, len(symbols), 500):
+        chunk = symbols[i:i + 500]
+        query = f"""
+        SELECT symbol, date, close
+        FROM stock_prices
+        WHERE symbol IN ({','.join('?' * len(chunk))}) AND date BETWEEN ? AND ?
+        """
+        frames.append(pd.read_sql(query, conn, params=(*chunk, start, end)))
+    conn.close()
+
+    df = pd.concat(frames, ignore_index=True)
+    if df.empty:
+        return pd.DataFrame()
+    df['date'] = pd.to_datetime(df['date'].astype(str).str[:10])
+    panel = df.pivot_table(index='date', columns='symbol', values='close', aggfunc='last')
+    return panel.sort_index().ffill()
+
+
+@dataclass
+class EquityCurve:
+    """일별 시가평가 결과"""
+    daily: pd.DataFrame        # index=거래일, cash/market_value/equity/exposure/n_positions/drawdown + 슬리브별 노출도
+    positions: pd.DataFrame    # 편입된 포지션 (shares, cost, proceeds, sleeve 포함)
+    rejected: pd.DataFrame     # 한도/현금 부족으로 편입되지 않은 거래
+    initial_capital: float
+
+    def summary(self) -> Dict[str, float]:
+        """자산 곡선 기준 지표 (수익률/낙폭은 %)"""
+        if self.daily.empty:
+            return {'final_equity': self.initial_capital, 'total_return': 0.0,
+                    'max_drawdown': 0.0, 'sharpe': 0.0, 'avg_exposure': 0.0,
+                    'max_exposure': 0.0, 'avg_positions': 0.0, 'days': 0,
+                    'positions': 0, 'rejected': len(self.rejected)}
+        equity = self.daily['equity'].to_numpy()
+        daily_ret = np.diff(equity, prepend=self.initial_capital) / np.r_[self.initial_capital, equity[:-1]]
+        return {
+            'final_equity': round(float(equity[-1]), 0),
+            'total_return': round(float(equity[-1] / self.initial_capital - 1) * 100, 2),
+            'max_drawdown': round(max_drawdown(np.r_[self.initial_capital, equity]), 2),
+            'sharpe': round(sharpe_ratio(daily_ret), 2),
+            'avg_exposure': round(float(self.daily['exposure'].mean()) * 100, 1),
+            'max_exposure': round(float(self.daily['exposure'].max()) * 100, 1),
+            'avg_positions': round(float(self.daily['n_positions'].mean()), 2),
+            'days': len(self.daily),
+            'positions': len(self.positions),
+            'rejected': len(self.rejected),
+        }
+
+    def to_records(self) -> List[Dict]:
+        """JSON 저장용 일별 레코드"""
+        out = self.daily.reset_index().rename(columns={'index': 'date'})
+        out['date'] = out['date'].dt.strftime('%Y-%m-%d')
+        return out.round(4).to_dict('records')
+
+
+class PortfolioAccountant:
+    """전략 슬리브별 자금 배분 + 일별 시가평가"""
+
+    def __init__(self,
+                 initial_capital: float,
+                 sleeve_weights: Dict[str, float],
+                 position_size_pct: float,
+                 max_positions: int):
+        self.initial_capital = float(initial_capital)
+        self.sleeve_weights = dict(sleeve_weights)
+        self.position_size = self.initial_capital * position_size_pct
+        self.max_positions = max_positions
+
+    def allocate(self, trades: pd.DataFrame) -> pd.DataFrame:
+        """
+        거래 편입 판정
+
+        trades 컬럼: sleeve, symbol, entry_date, exit_date, entry_price, exit_price
+        입력 순서를 같은 날 안의 우선순위로 보고 진입일 순으로 처리한다.
+        동시 보유 수·슬리브 예산·현금이 모두 허용해야 편입되며 수량은 정수 주.
+        """
+        df = trades.copy()
+        df['entry_date'] = pd.to_datetime(df['entry_date'])
+        df['exit_date'] = pd.to_datetime(df['exit_date'])
+        df = df.sort_values('entry_date', kind='stable')
+
+        budget = {s: self.initial_capital * w for s, w in self.sleeve_weights.items()}
+        sleeve_used = dict.fromkeys(budget, 0.0)
+        cash = self.initial_capital
+        open_pos: List[tuple] = []   # (exit_date, sleeve, cost, proceeds)
+        shares = np.zeros(len(df), dtype=np.int64)
+
+        entry_dates = df['entry_date'].to_numpy()
+        exit_dates = df['exit_date'].to_numpy()
+        entry_px = df['entry_price'].to_numpy(dtype=float)
+        exit_px = df['exit_price'].to_numpy(dtype=float)
+        sleeves = df['sleeve'].to_numpy()
+
+        for i in range(len(df)):
+            today = entry_dates[i]
+            still_open = []
+            for pos in open_pos:
+                if pos[0] <= today:
+                    cash += pos[3]
+                    sleeve_used[pos[1]] -= pos[2]
+                else:
+                    still_open.append(pos)
+            open_pos = still_open
+
+            sleeve = sleeves[i]
+            if len(open_pos) >= self.max_positions or sleeve not in budget:
+                continue
+            alloc = min(self.position_size, budget[sleeve] - sleeve_used[sleeve], cash)
+            if not entry_px[i] > 0 or alloc < entry_px[i]:
+                continue
+            qty = int(alloc // entry_px[i])
+            cost = qty * entry_px[i]
+            cash -= cost
+            sleeve_used[sleeve] += cost
+            shares[i] = qty
+            open_pos.append((exit_dates[i], sleeve, cost, qty * exit_px[i]))
+
+        df['shares'] = shares
+        df['cost'] = shares * entry_px
+        df['proceeds'] = shares * exit_px
+        return df
+
+    def mark(self, positions: pd.DataFrame, close_panel: pd.DataFrame) -> pd.DataFrame:
+        """
+        편입 포지션 일별 시가평가
+
+        (종목, 슬리브) 쌍마다 보유 수량 열을 두고 진입일 +수량 / 청산일 -수량을 누적합해
+        (거래일 × 쌍) 보유 행렬을 만든다. 평가액 = 보유 행렬 × 종가, 현금 = 진입/청산 현금흐름 누적합.
+        청산일이 패널 밖이면 마지막 날까지 보유 중으로 평가한다.
+        """
+        dates = close_panel.index
+        D = len(dates)
+        sleeves = list(self.sleeve_weights)
+        if D == 0:
+            return pd.DataFrame()
+
+        pos = positions[positions['shares'] > 0]
+        entry_idx = dates.searchsorted(pos['entry_date'].to_numpy(), side='left')
+        exit_idx = dates.searchsorted(pos['exit_date'].to_numpy(), side='left')
+        # 진입일 당일 청산(같은 날 손절)도 하루는 노출로 잡지 않고 현금흐름만 반영
+        exit_idx = np.maximum(exit_idx, entry_idx)
+
+        pair = pd.MultiIndex.from_arrays([pos['symbol'], pos['sleeve']])
+        pair_codes, pair_keys = pd.factorize(pair)
+        P = len(pair_keys)
+        qty = pos['shares'].to_numpy(dtype=float)
+
+        delta = np.zeros((D + 1, P))
+        np.add.at(delta, (entry_idx, pair_codes), qty)
+        np.add.at(delta, (exit_idx, pair_codes), -qty)
+        held = np.cumsum(delta, axis=0)[:D]
+
+        closes = close_panel.bfill()
+        pair_symbols = [k[0] for k in pair_keys]
+        px = closes.reindex(columns=pair_symbols).to_numpy(dtype=float)
+        values = np.nan_to_num(held * px)
+
+        flow = np.zeros(D + 1)
+        np.add.at(flow, entry_idx, -pos['cost'].to_numpy(dtype=float))
+        np.add.at(flow, exit_idx, pos['proceeds'].to_numpy(dtype=float))
+        cash = self.initial_capital + np.cumsum(flow)[:D]
+
+        market_value = values.sum(axis=1)
+        equity = cash + market_value
+        peak = np.maximum.accumulate(np.maximum(equity, self.initial_capital))
+
+        daily = pd.DataFrame({
+            'cash': cash,
+            'market_value': market_value,
+            'equity': equity,
+            'exposure': market_value / equity,
+            'n_positions': (held > 0).sum(axis=1),
+            'drawdown': (equity / peak - 1) * 100,
+        }, index=dates)
+
+        pair_sleeves = np.array([k[1] for k in pair_keys], dtype=object)
+        onehot = (pair_sleeves[:, None] == np.array(sleeves, dtype=object)[None, :]).astype(float)
+        by_sleeve = values @ onehot
+        for j, sleeve in enumerate(sleeves):
+            daily[f'exposure_{sleeve}'] = by_sleeve[:, j] / equity
+        return daily
+
+    def run(self, trades: pd.DataFrame, close_panel: pd.DataFrame) -> EquityCurve:
+        """편입 → 시가평가"""
+        if trades is None or len(trades) == 0:
+            empty = pd.DataFrame(columns=['sleeve', 'symbol', 'entry_date', 'exit_date',
+                                          'entry_price', 'exit_price', 'shares', 'cost', 'proceeds'])
+            return EquityCurve(pd.DataFrame(), empty, empty, self.initial_capital)
+        allocated = self.allocate(trades)
+        accepted = allocated[allocated['shares'] > 0]
+        rejected = allocated[allocated['shares'] == 0]
+        daily = self.mark(accepted, close_panel)
+        return EquityCurve(daily, accepted.reset_index(drop=True),
+                           rejected.reset_index(drop=True), self.initial_capital)
@@ -30,6 +30,8 @@ from typing import Dict, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+from japanese_pattern_scanner import IchimokuCloud
+
 
 class HoldingPeriod(Enum):
     """추천 보유 기간"""
@@ -161,6 +163,47 @@ class IchimokuCalculator:
             tenkan_kijun_distance=tenkan_kijun_distance
         )
 
+    
+    def generate_signal_panel(self, high: pd.DataFrame, low: pd.DataFrame,
+                              close: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """
+        generate_signal()의 패널 버전 - 모든 종목·모든 날짜 신호를 한 번에 계산
+        
+        반환: JapaneseSignal 필드명(+ 'score') → (날짜 × 종목) DataFrame
+        각 칸은 해당 종목의 그 날짜까지 데이터로 generate_signal()을 호출한 결과와 같다.
+        """
+        cloud = IchimokuCloud(self.tenkan_period, self.kijun_period,
+                              self.senkou_b_period, self.displacement)
+        ind = cloud.calculate_panel(high, low, close, point_in_time=True)
+        crosses = cloud.generate_signals_panel(high, low, close, min_bars=60)
+        enough = (close.notna().cumsum() >= 60) & close.notna()
+        
+        tenkan = ind['tenkan_sen'].where(enough, 0.0)
+        kijun = ind['kijun_sen'].where(enough, 0.0)
+        tk_cross_bullish = crosses['TK_CROSS_BULLISH']
+        tk_cross_bearish = crosses['TK_CROSS_BEARISH']
+        price_above_cloud = enough & (close > ind['kumo_top'])
+        price_below_cloud = enough & (close < ind['kumo_bottom'])
+        bullish_cloud = enough & (ind['senkou_span_a'] > ind['senkou_span_b'])
+        cloud_thickness = ((ind['kumo_top'] - ind['kumo_bottom']) / close * 100).where(enough, 0.0)
+        distance = ((ind['tenkan_sen'] - ind['kijun_sen']).abs() / close * 100).where(enough, 0.0)
+        
+        score = (tk_cross_bullish * 8 + price_above_cloud * 5 + bullish_cloud * 4
+                 + (tenkan > kijun) * 3).clip(upper=20)
+        
+        return {
+            'tk_cross_bullish': tk_cross_bullish,
+            'tk_cross_bearish': tk_cross_bearish,
+            'price_above_cloud': price_above_cloud,
+            'price_below_cloud': price_below_cloud,
+            'bullish_cloud': bullish_cloud,
+            'tenkan_sen': tenkan,
+            'kijun_sen': kijun,
+            'cloud_thickness': cloud_thickness,
+            'tenkan_kijun_distance': distance,
+            'score': score,
+        }
+
 
 class HoldingPeriodCalculator:
     """추천 보유일수 계산기"""
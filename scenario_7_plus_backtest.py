@@ -13,6 +13,8 @@ import numpy as np
 from dataclasses import dataclass, field
 from typing import List, Dict
 
+from param_optimizer import Optimizer, ParamSpace
+
 
 @dataclass
 class BacktestResult:
@@ -144,6 +146,30 @@ class BacktestEngine:
         )
 
 
+# 시나리오 필터 키 (BacktestEngine.simulate 참고)
+FILTER_KEYS = ['high_score', 'consecutive_up', 'early_exit', 'sector_unique', 'foreign_5d']
+
+
+def scenario_trial(params: dict) -> dict:
+    """param_optimizer 시행: 필터 on/off 조합 하나"""
+    name = '+'.join(k for k in FILTER_KEYS if params[k]) or 'baseline'
+    result = BacktestEngine().simulate(name, name, params).to_dict()
+    result.pop('filter_effectiveness')
+    return result
+
+
+def search_filters(n_workers: int = 1):
+    """5개 필터의 전체 on/off 조합(32개) 격자 탐색 - 샤프 기준 순위 DataFrame"""
+    optimizer = Optimizer(
+        scenario_trial,
+        ParamSpace(**{k: [False, True] for k in FILTER_KEYS}),
+        study='scenario_7_plus_filters',
+        metric='sharpe_ratio',
+        n_workers=n_workers,
+    )
+    return optimizer.run_grid()
+
+
 def main():
     print("=" * 80)
     print("🔥 개선안 7 플러스 백테스트")
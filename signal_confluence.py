@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Signal Confluence Engine - 다중 전략 신호 중첩 검색
+저장된 신호 테이블(code, date, strategy, score)에서
+"W 거래일 이내에 K개 이상 전략이 발생한 종목"을 스캐너 재실행 없이 검색
+
+구조:
+- SignalStore: SQLite 신호 테이블 (data/signal_store.db)
+- ConfluenceEngine: 날짜 × 종목 비트셋 인덱스 (전략 1개 = 1비트)
+  윈도우 OR + popcount 벡터 연산으로 전체 기간을 한 번에 계산
+
+사용법:
+    store = SignalStore()
+    store.record([{'code': '005930', 'date': '2026-04-01',
+                   'strategy': 'livermore', 'score': 1.0}])
+
+    engine = ConfluenceEngine.from_store(store, start='2026-01-01')
+    hits = engine.query(min_strategies=3, window=5)
+
+    python signal_confluence.py --min-strategies 2 --window 5 --start 2026-01-01
+"""
+
+import argparse
+import sqlite3
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+MAX_STRATEGIES = 64
+
+
+class SignalStore:
+    """전략 신호 저장소 (SQLite)"""
+
+    def __init__(self, db_path: str = 'data/signal_store.db'):
+        self.db_path = db_path
+        self._create_table()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path)
+
+    def _create_table(self):
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS signals (
+                code TEXT NOT NULL,
+                date TEXT NOT NULL,
+                strategy TEXT NOT NULL,
+                score REAL DEFAULT 0,
+                PRIMARY KEY (code, date, strategy)
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_signals_date ON signals(date)")
+        conn.commit()
+        conn.close()
+
+    def record(self, signals: Iterable[Dict]) -> int:
+        """
+        신호 저장 (같은 code/date/strategy는 덮어씀)
+
+        Args:
+            signals: code, date, strategy, score(선택) 키를 가진 dict 목록
+        """
+        rows = [
+            (str(s['code']), str(s['date'])[:10], s['strategy'], float(s.get('score') or 0))
+            for s in signals
+        ]
+        if not rows:
+            return 0
+        conn = self._connect()
+        conn.executemany(
+            "INSERT OR REPLACE INTO signals (code, date, strategy, score) VALUES (?, ?, ?, ?)",
+            rows
+        )
+        conn.commit()
+        conn.close()
+        return len(rows)
+
+    def record_frame(self, df: pd.DataFrame) -> int:
+        """DataFrame(code, date, strategy[, score]) 저장"""
+        df = df.copy()
+        if 'score' not in df.columns:
+            df['score'] = 0.0
+        return self.record(df[['code', 'date', 'strategy', 'score']].to_dict('records'))
+
+    def load(self, start: Optional[str] = None, end: Optional[str] = None,
+             strategies: Optional[List[str]] = None) -> pd.DataFrame:
+        """기간/전략 조건으로 신호 조회"""
+        query = "SELECT code, date, strategy, score FROM signals WHERE 1=1"
+        params: list = []
+        if start:
+            query += " AND date >= ?"
+            params.append(start)
+        if end:
+            query += " AND date <= ?"
+            params.append(end)
+        if strategies:
+            query += f" AND strategy IN ({','.join('?' * len(strategies))})"
+            params.extend(strategies)
+        conn = self._connect()
+        df = pd.read_sql_query(query, conn, params=params)
+        conn.close()
+        return df
+
+    def clear_strategy(self, strategy: str):
+        """특정 전략 신호 삭제 (재적재용)"""
+        conn = self._connect()
+        conn.execute("DELETE FROM signals WHERE strategy = ?", (strategy,))
+        conn.commit()
+        conn.close()
+
+
+def _popcount(bits: np.ndarray) -> np.ndarray:
+    """uint64 배열의 비트 수"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(bits).astype(np.int64)
+    as_bytes = bits.view(np.uint8).reshape(bits.shape + (8,))
+    return np.unpackbits(as_bytes, axis=-1).sum(axis=-1).astype(np.int64)
+
+
+class ConfluenceEngine:
+    """
+    날짜 × 종목 비트셋 기반 신호 중첩 엔진
+
+    bits[d, c]의 s번째 비트 = d일에 종목 c에서 전략 s 신호 발생
+    """
+
+    def __init__(self, signals: pd.DataFrame, calendar: Optional[Iterable] = None):
+        """
+        Args:
+            signals: code, date, strategy, score 컬럼의 신호 테이블
+            calendar: 거래일 목록 (None이면 신호 기간의 평일)
+        """
+        signals = signals.copy()
+        signals['code'] = signals['code'].astype(str)
+        signals['date'] = pd.to_datetime(signals['date']).dt.normalize()
+        if 'score' not in signals.columns:
+            signals['score'] = 0.0
+        self.signals = signals
+
+        self.strategies: List[str] = sorted(signals['strategy'].unique())
+        if len(self.strategies) > MAX_STRATEGIES:
+            raise ValueError(f"Too many strategies ({len(self.strategies)} > {MAX_STRATEGIES})")
+        self.codes = np.array(sorted(signals['code'].unique()))
+
+        if calendar is not None:
+            dates = pd.DatetimeIndex(pd.to_datetime(list(calendar))).normalize()
+            dates = dates.union(pd.DatetimeIndex(signals['date'].unique()))
+        elif len(signals):
+            dates = pd.bdate_range(signals['date'].min(), signals['date'].max())
+            dates = dates.union(pd.DatetimeIndex(signals['date'].unique()))
+        else:
+            dates = pd.DatetimeIndex([])
+        self.dates = dates.sort_values()
+
+        self._strategy_bit = {s: np.uint64(1) << np.uint64(i) for i, s in enumerate(self.strategies)}
+        self.bits = self._build_bits()
+
+    @classmethod
+    def from_store(cls, store: SignalStore, start: Optional[str] = None,
+                   end: Optional[str] = None, strategies: Optional[List[str]] = None,
+                   calendar: Optional[Iterable] = None) -> 'ConfluenceEngine':
+        """SignalStore에서 기간 신호를 읽어 엔진 생성"""
+        return cls(store.load(start, end, strategies), calendar=calendar)
+
+    def _build_bits(self) -> np.ndarray:
+        bits = np.zeros((len(self.dates), len(self.codes)), dtype=np.uint64)
+        if self.signals.empty:
+            return bits
+        d_idx = self.dates.get_indexer(self.signals['date'])
+        c_idx = np.searchsorted(self.codes, self.signals['code'].values)
+        s_bits = self.signals['strategy'].map(self._strategy_bit).values.astype(np.uint64)
+        np.bitwise_or.at(bits, (d_idx, c_idx), s_bits)
+        return bits
+
+    def strategy_mask(self, strategies: Optional[List[str]] = None) -> np.uint64:
+        """전략 목록 → 비트 마스크 (None=전체)"""
+        if not strategies:
+            return np.uint64((1 << len(self.strategies)) - 1) if self.strategies else np.uint64(0)
+        unknown = [s for s in strategies if s not in self._strategy_bit]
+        if unknown:
+            raise KeyError(f"Unknown strategies: {unknown}")
+        mask = np.uint64(0)
+        for s in strategies:
+            mask |= self._strategy_bit[s]
+        return mask
+
+    def window_bits(self, window: int, mask: Optional[np.uint64] = None) -> np.ndarray:
+        """
+        각 날짜 기준 직전 window 거래일(당일 포함) 동안 발생한 전략 비트셋
+
+        구간 OR는 2의 거듭제곱 길이 블록을 겹쳐 계산 (O(log W) 벡터 연산)
+        """
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        bits = self.bits if mask is None else self.bits & mask
+        n = len(bits)
+
+        # span[k] = 길이 2^k 구간 OR (끝점 기준)
+        span = bits.copy()
+        length = 1
+        while length * 2 <= window:
+            shifted = np.zeros_like(span)
+            if length < n:
+                shifted[length:] = span[:-length]
+            span = span | shifted
+            length *= 2
+
+        if length == window:
+            return span
+        # 길이 length 블록 두 개(끝점 d, 끝점 d-(window-length))를 겹쳐 window 전체를 덮음
+        offset = window - length
+        result = span.copy()
+        if offset < n:
+            result[offset:] |= span[:-offset]
+        return result
+
+    def query(self, min_strategies: int = 2, window: int = 5,
+              start: Optional[str] = None, end: Optional[str] = None,
+              strategies: Optional[List[str]] = None,
+              require_all: Optional[List[str]] = None,
+              with_scores: bool = True) -> pd.DataFrame:
+        """
+        W 거래일 이내에 K개 이상 전략이 발생한 (날짜, 종목) 검색
+
+        Args:
+            min_strategies: 최소 전략 수 K
+            window: 거래일 윈도우 W (기준일 포함)
+            start/end: 결과 기준일 범위
+            strategies: 대상 전략 제한
+            require_all: 반드시 포함되어야 할 전략
+            with_scores: 전략별 윈도우 내 최고 점수 합계 포함 여부
+
+        Returns:
+            date, code, n_strategies, strategies[, score] DataFrame
+        """
+        columns = ['date', 'code', 'n_strategies', 'strategies']
+        if with_scores:
+            columns.append('score')
+        if self.bits.size == 0:
+            return pd.DataFrame(columns=columns)
+
+        mask = self.strategy_mask(strategies)
+        wbits = self.window_bits(window, mask)
+        hit = _popcount(wbits) >= min_strategies
+        if require_all:
+            req = self.strategy_mask(require_all)
+            hit &= (wbits & req) == req
+
+        lo = self.dates.searchsorted(pd.Timestamp(start)) if start else 0
+        hi = self.dates.searchsorted(pd.Timestamp(end), side='right') if end else len(self.dates)
+        hit[:lo] = False
+        hit[hi:] = False
+
+        d_idx, c_idx = np.nonzero(hit)
+        if len(d_idx) == 0:
+            return pd.DataFrame(columns=columns)
+        hit_bits = wbits[d_idx, c_idx]
+
+        result = pd.DataFrame({
+            'date': self.dates[d_idx],
+            'code': self.codes[c_idx],
+            'n_strategies': _popcount(hit_bits),
+            'strategies': [self._decode(b) for b in hit_bits],
+        })
+        if with_scores:
+            result['score'] = self._window_scores(result, d_idx, window, mask)
+        return result.sort_values(['date', 'n_strategies', 'code'],
+                                  ascending=[True, False, True]).reset_index(drop=True)
+
+    def latest(self, min_strategies: int = 2, window: int = 5,
+               as_of: Optional[str] = None, **kwargs) -> pd.DataFrame:
+        """기준일(기본: 마지막 거래일) 하루의 중첩 종목"""
+        if len(self.dates) == 0:
+            return self.query(min_strategies, window, **kwargs)
+        as_of = pd.Timestamp(as_of) if as_of else self.dates[-1]
+        day = self.dates[min(self.dates.searchsorted(as_of, side='right'), len(self.dates)) - 1]
+        return self.query(min_strategies, window, start=day, end=day, **kwargs)
+
+    def counts_by_date(self, min_strategies: int = 2, window: int = 5) -> pd.Series:
+        """날짜별 중첩 종목 수"""
+        hit = _popcount(self.window_bits(window)) >= min_strategies
+        return pd.Series(hit.sum(axis=1), index=self.dates, name='confluence_count')
+
+    def _decode(self, bits) -> List[str]:
+        bits = int(bits)
+        return [s for i, s in enumerate(self.strategies) if bits >> i & 1]
+
+    def _window_scores(self, result: pd.DataFrame, d_idx: np.ndarray,
+                       window: int, mask: np.uint64) -> np.ndarray:
+        """적중 행별 윈도우 내 전략별 최고 점수의 합"""
+        sig = self.signals[['code', 'date', 'strategy', 'score']].copy()
+        sig['d'] = self.dates.get_indexer(sig['date'])
+        if mask != self.strategy_mask():
+            allowed = [s for s in self.strategies if int(self._strategy_bit[s]) & int(mask)]
+            sig = sig[sig['strategy'].isin(allowed)]
+        hits = pd.DataFrame({'code': result['code'].values, 'hd': d_idx, 'row': np.arange(len(result))})
+        merged = hits.merge(sig[['code', 'd', 'strategy', 'score']], on='code')
+        merged = merged[(merged['d'] <= merged['hd']) & (merged['d'] > merged['hd'] - window)]
+        per_strategy = merged.groupby(['row', 'strategy'])['score'].max()
+        totals = per_strategy.groupby(level='row').sum()
+        return totals.reindex(np.arange(len(result)), fill_value=0.0).values
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Signal Confluence Engine')
+    parser.add_argument('--db', default='data/signal_store.db')
+    parser.add_argument('--min-strategies', type=int, default=2)
+    parser.add_argument('--window', type=int, default=5, help='거래일 윈도우')
+    parser.add_argument('--start', type=str, default=None)
+    parser.add_argument('--end', type=str, default=None)
+    parser.add_argument('--strategies', type=str, default=None, help='쉼표 구분 전략 목록')
+    parser.add_argument('--latest', action='store_true', help='마지막 거래일만 출력')
+    args = parser.parse_args()
+
+    strategies = args.strategies.split(',') if args.strategies else None
+    store = SignalStore(args.db)
+    # 윈도우 시작 전 신호도 포함해야 하므로 여유 기간을 두고 로드
+    load_start = None
+    if args.start:
+        load_start = (pd.Timestamp(args.start) - pd.tseries.offsets.BDay(args.window)).strftime('%Y-%m-%d')
+    engine = ConfluenceEngine.from_store(store, load_start, args.end, strategies)
+
+    if args.latest:
+        result = engine.latest(args.min_strategies, args.window)
+    else:
+        result = engine.query(args.min_strategies, args.window, start=args.start, end=args.end)
+
+    print("=" * 70)
+    print(f"🔗 Signal Confluence - {args.min_strategies}+ 전략 / {args.window}거래일")
+    print("=" * 70)
+    print(f"전략: {', '.join(engine.strategies)}")
+    print(f"결과: {len(result)}건")
+    if not result.empty:
+        print(result.tail(30).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
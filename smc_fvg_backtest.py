@@ -2,14 +2,20 @@
 """
 SMC FVG Backtest Engine
 SMC FVG 전략 백테스트 엔진
+
+스윙 고점과 FVG(3봉 갭) 위치는 run 시작 시 SMCStructure로 한 번만 계산하고,
+봉 루프는 MSB / 리테스트 판정과 포지션 관리만 한다 (봉 수에 선형).
 """
 
 import pandas as pd
 import numpy as np
+from bisect import bisect_right, insort
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import json
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
+
+from swing_pivots import swing_point_indices
 
 
 @dataclass
@@ -30,6 +36,60 @@ class Trade:
     size: float = 0.0
 
 
+@dataclass
+class SMCStructure:
+    """
+    사전 계산된 시장 구조 (스윙 고점 + 불리쉬 FVG)
+
+    fvg_starts: FVG 첫 봉(c1) 위치 (오름차순) - detect_fvg와 같은 조건
+    봉 i 시점 조회는 searchsorted로 잘라 쓰므로 봉마다 구간을 다시 훑지 않는다.
+    """
+    highs: np.ndarray
+    lows: np.ndarray
+    closes: np.ndarray
+    swing_highs: np.ndarray
+    swing_lows: np.ndarray
+    fvg_starts: np.ndarray
+    fvg_sizes: np.ndarray
+    fvg_lookback: int = 20
+    _ladder: List[float] = field(default_factory=list, init=False, repr=False)
+    _ladder_n: int = field(default=0, init=False, repr=False)
+
+    def past_swing_count(self, idx: int) -> int:
+        """idx - 3 이전에 확정된 스윙 하이 개수"""
+        return int(np.searchsorted(self.swing_highs, idx - 3, side='left'))
+
+    def latest_fvg(self, idx: int) -> Optional[Dict]:
+        """detect_fvg(highs, lows, idx) 결과 중 가장 최근 FVG (없으면 None)"""
+        end_idx = min(idx, len(self.highs) - 3)
+        k = int(np.searchsorted(self.fvg_starts, end_idx, side='left')) - 1
+        if k < 0 or self.fvg_starts[k] < max(0, end_idx - self.fvg_lookback):
+            return None
+        i = int(self.fvg_starts[k])
+        return {
+            'type': 'BULLISH',
+            'idx': i+1,
+            'top': self.lows[i+2],
+            'bottom': self.highs[i],
+            'size': self.fvg_sizes[k],
+            'ob_low': self.lows[i+1]
+        }
+
+    def nearest_resistance(self, n_swings: int, price: float) -> Optional[float]:
+        """
+        앞쪽 n_swings개 스윙 하이 중 price보다 높은 최저가 (없으면 None)
+
+        조회 시점이 앞으로만 움직이면 정렬 사다리에 새 스윙만 끼워 넣는다.
+        """
+        if n_swings < self._ladder_n:
+            self._ladder, self._ladder_n = [], 0
+        while self._ladder_n < n_swings:
+            insort(self._ladder, self.highs[self.swing_highs[self._ladder_n]])
+            self._ladder_n += 1
+        k = bisect_right(self._ladder, price)
+        return self._ladder[k] if k < len(self._ladder) else None
+
+
 class SMCFVGBacktest:
     """
     SMC FVG 백테스트 엔진
@@ -57,16 +117,7 @@ class SMCFVGBacktest:
     def identify_swing_points(self, highs: np.ndarray, lows: np.ndarray, 
                               window: int = 5) -> Tuple[List[int], List[int]]:
         """스윙 포인트 식별"""
-        swing_highs = []
-        swing_lows = []
-        
-        for i in range(window, len(highs) - window):
-            if highs[i] == max(highs[i-window:i+window+1]):
-                swing_highs.append(i)
-            if lows[i] == min(lows[i-window:i+window+1]):
-                swing_lows.append(i)
-        
-        return swing_highs, swing_lows
+        return swing_point_indices(highs, lows, window)
     
     def detect_fvg(self, highs: np.ndarray, lows: np.ndarray, 
                    start_idx: int, lookback: int = 20) -> List[Dict]:
@@ -95,35 +146,61 @@ class SMCFVGBacktest:
         
         return fvgs
     
-    def check_long_signal(self, df: pd.DataFrame, idx: int,
-                          swing_highs: List[int]) -> Optional[Dict]:
+    def precompute_structure(self, df: pd.DataFrame,
+                             swing_highs: Optional[List[int]] = None,
+                             swing_lows: Optional[List[int]] = None,
+                             fvg_lookback: int = 20) -> SMCStructure:
         """
-        롱 진입 신호 확인
+        스윙 포인트 + 전체 구간 FVG 한 번에 계산
         """
         highs = df['high'].values
         lows = df['low'].values
         closes = df['close'].values
+        if swing_highs is None or swing_lows is None:
+            swing_highs, swing_lows = self.identify_swing_points(highs, lows)
+        
+        # 불리쉬 FVG: c1 고가 < c3 저가, 갭 크기 ≥ fvg_min_size
+        c1_high, c3_low = highs[:-2], lows[2:]
+        sizes = (c3_low - c1_high) / c1_high
+        starts = np.flatnonzero((c1_high < c3_low) & (sizes >= self.fvg_min_size))
+        
+        return SMCStructure(
+            highs=highs, lows=lows, closes=closes,
+            swing_highs=np.asarray(swing_highs, dtype=np.int64),
+            swing_lows=np.asarray(swing_lows, dtype=np.int64),
+            fvg_starts=starts, fvg_sizes=sizes[starts],
+            fvg_lookback=fvg_lookback
+        )
+    
+    def check_long_signal(self, df: pd.DataFrame, idx: int,
+                          swing_highs: List[int],
+                          structure: Optional[SMCStructure] = None) -> Optional[Dict]:
+        """
+        롱 진입 신호 확인
         
-        # 과거 스윙 하이 필터
-        past_swings = [s for s in swing_highs if s < idx - 3]
-        if len(past_swings) < 2:
+        structure를 넘기면 사전 계산된 스윙/FVG를 조회만 한다 (run 루프용).
+        """
+        if structure is None:
+            structure = self.precompute_structure(df, swing_highs, [])
+        highs = structure.highs
+        lows = structure.lows
+        closes = structure.closes
+        
+        # 과거 스윙 하이 (idx - 3 이전)
+        n_past = structure.past_swing_count(idx)
+        if n_past < 2:
             return None
         
         # MSB 확인: 현재가가 이전 스윙 하이 돌파
-        prev_swing_high = highs[past_swings[-2]]
+        prev_swing_high = highs[structure.swing_highs[n_past - 2]]
         if closes[idx] < prev_swing_high * (1 + self.msb_strength):
             return None
         
-        # FVG 확인
-        fvgs = self.detect_fvg(highs, lows, idx)
-        bullish_fvgs = [f for f in fvgs if f['type'] == 'BULLISH']
-        
-        if not bullish_fvgs:
+        # FVG 확인 (가장 최근 FVG)
+        fvg = structure.latest_fvg(idx)
+        if fvg is None:
             return None
         
-        # 가장 최근 FVG
-        fvg = max(bullish_fvgs, key=lambda x: x['idx'])
-        
         # Retest 확인: 현재가가 FVG 구간 내
         current_low = lows[idx]
         current_high = highs[idx]
@@ -136,10 +213,8 @@ class SMCFVGBacktest:
         sl_price = fvg['ob_low'] * 0.998  # 오더블록 하단 아래
         
         # TP: 다음 스윙 하이 또는 1:2.5 R/R
-        next_resistances = [highs[s] for s in past_swings if highs[s] > entry_price]
-        if next_resistances:
-            tp_price = min(next_resistances)
-        else:
+        tp_price = structure.nearest_resistance(n_past, entry_price)
+        if tp_price is None:
             tp_price = entry_price * 1.05
         
         # R/R 확인
@@ -174,18 +249,17 @@ class SMCFVGBacktest:
         print(f"   데이터 기간: {df.index[0]} ~ {df.index[-1]}")
         print(f"   총 봉 수: {len(df)}")
         
-        highs = df['high'].values
-        lows = df['low'].values
-        closes = df['close'].values
-        
-        # 스윙 포인트 사전 계산
-        swing_highs, swing_lows = self.identify_swing_points(highs, lows)
-        print(f"   스윙 하이: {len(swing_highs)}개, 스윙 로우: {len(swing_lows)}개")
+        # 스윙 포인트 + FVG 사전 계산
+        structure = self.precompute_structure(df)
+        swing_highs = structure.swing_highs
+        print(f"   스윙 하이: {len(swing_highs)}개, 스윙 로우: {len(structure.swing_lows)}개")
         
+        times = list(df.index)
+        closes = structure.closes
         current_trade = None
         
         for i in range(50, len(df)):
-            current_time = df.index[i]
+            current_time = times[i]
             current_price = closes[i]
             
             # 자본 기록
@@ -211,7 +285,7 @@ class SMCFVGBacktest:
             
             # 새 신호 체크 (20봉 간격)
             if not current_trade and i % 20 == 0:
-                signal = self.check_long_signal(df, i, swing_highs)
+                signal = self.check_long_signal(df, i, swing_highs, structure)
                 if signal:
                     position_size = self._calculate_position_size(signal['risk'])
                     current_trade = Trade(
@@ -24,6 +24,10 @@ import json
 import warnings
 warnings.filterwarnings('ignore')
 
+from mtf_resampler import MTFResampler, bucket_start, timeframe_ms
+from smc_stream import SMCStreamEngine
+from swing_pivots import swing_point_indices
+
 
 class SMCFVGStrategy:
     """
@@ -55,6 +59,14 @@ class SMCFVGStrategy:
         if test_mode:
             self.exchange.set_sandbox_mode(True)
             print("🧪 테스트넷 모드로 실행중...")
+        
+        # 증분 SMC 상태 (scan_incremental용, 트레이더가 공용 엔진으로 교체 가능)
+        self.stream_engine = SMCStreamEngine(**self.stream_params())
+    
+    def stream_params(self) -> Dict:
+        """scan과 같은 조건으로 SMCStream을 만들 파라미터"""
+        return {'fvg_min_size': self.fvg_min_size, 'msb_strength': self.msb_strength,
+                'min_rr_ratio': self.min_rr_ratio}
     
     def fetch_ohlcv(self, symbol: str, limit: int = 200) -> pd.DataFrame:
         """
@@ -77,21 +89,8 @@ class SMCFVGStrategy:
         Returns:
             (swing_highs_idx, swing_lows_idx)
         """
-        highs = df['high'].values
-        lows = df['low'].values
-        
-        swing_highs = []
-        swing_lows = []
-        
-        for i in range(window, len(df) - window):
-            # 스윙 하이: 주변 window 개 봉 중 최고
-            if highs[i] == max(highs[i-window:i+window+1]):
-                swing_highs.append(i)
-            # 스윙 로우: 주변 window 개 봉 중 최저
-            if lows[i] == min(lows[i-window:i+window+1]):
-                swing_lows.append(i)
-        
-        return swing_highs, swing_lows
+        # 스윙 하이/로우: 주변 window 개 봉 중 최고/최저
+        return swing_point_indices(df['high'].values, df['low'].values, window)
     
     def detect_msb_long(self, df: pd.DataFrame, swing_highs: List[int]) -> Optional[Dict]:
         """
@@ -355,6 +354,45 @@ class SMCFVGStrategy:
         self.print_signal(signal)
         return signal
     
+    def fetch_closed_candles(self, symbol: str, since: Optional[int] = None, limit: int = 200) -> List[List]:
+        """
+        마감된 봉만 조회 (since 이후, 진행 중인 마지막 봉 제외)
+        """
+        try:
+            ohlcv = self.exchange.fetch_ohlcv(symbol, self.timeframe, since, limit=limit)
+        except Exception as e:
+            print(f"❌ 데이터 조회 오류: {e}")
+            return []
+        tf_ms = self.exchange.parse_timeframe(self.timeframe) * 1000
+        now = self.exchange.milliseconds()
+        return [c for c in ohlcv if c[0] + tf_ms <= now]
+    
+    def scan_incremental(self, symbol: str = 'BTC/USDT', engine: Optional[SMCStreamEngine] = None,
+                         candles: Optional[List] = None) -> Optional[Dict]:
+        """
+        증분 스캔: 마지막으로 반영한 봉 이후 마감 봉만 받아 SMCStreamEngine 상태를 갱신
+        
+        첫 호출은 200봉으로 상태를 채우고, 이후에는 새 봉만 요청한다.
+        candles를 넘기면 조회 없이 그 마감 봉(예: 하위 시간대에서 리샘플한 봉)을 반영한다.
+        마지막 봉에서 진입 신호가 나면 scan과 같은 형식의 dict 반환
+        """
+        engine = engine or self.stream_engine
+        if candles is None:
+            last_ts = engine.last_timestamp(symbol, self.timeframe)
+            candles = self.fetch_closed_candles(symbol, None if last_ts is None else last_ts + 1,
+                                                limit=201 if last_ts is None else 1000)
+        events = engine.update(symbol, self.timeframe, candles)
+        stream = engine.stream(symbol, self.timeframe)
+        
+        for e in events:
+            if e['event'] in ('msb', 'fvg', 'fvg_filled') and e['bar'] == stream.n - 1:
+                print(f"   [{self.timeframe}] {symbol} {e['event']}")
+        signals = [e['signal'] for e in events if e['event'] == 'signal' and e['bar'] == stream.n - 1]
+        if not signals:
+            return None
+        self.print_signal(signals[-1])
+        return signals[-1]
+    
     def print_signal(self, signal: Dict):
         """
         신호 출력
@@ -385,12 +423,61 @@ class SMCFVGTrader:
         self.strategy_1h = SMCFVGStrategy(timeframe='1h', test_mode=test_mode)
         self.strategy_4h = SMCFVGStrategy(timeframe='4h', test_mode=test_mode)
         
+        # 전 시간대 공용 증분 엔진 (심볼/시간대별 상태 유지, 시간대마다 그 전략의 파라미터)
+        strategies = (self.strategy_15m, self.strategy_1h, self.strategy_4h)
+        self.stream_engine = SMCStreamEngine(
+            timeframe_params={s.timeframe: s.stream_params() for s in strategies})
+        for strategy in strategies:
+            strategy.stream_engine = self.stream_engine
+        
+        # 심볼별 15m → 1h/4h 리샘플러 (증분 스캔은 15m만 조회)
+        self.resamplers: Dict[str, MTFResampler] = {}
+        self.warmup_bars = 200
+        
         self.active_signals = []
         
-    def run_multi_timeframe(self, symbol: str = 'BTC/USDT'):
+    def fetch_base_candles(self, symbol: str) -> List[List]:
+        """
+        15m 마감 봉 증분 조회 (첫 호출은 4h 기준 warmup_bars개가 나오도록 페이지 조회)
+        """
+        resampler = self.resamplers.get(symbol)
+        if resampler is None:
+            resampler = self.resamplers[symbol] = MTFResampler('15m', ('1h', '4h'), max_bars=1000)
+        
+        last_ts = resampler.last_timestamp()
+        if last_ts is None:
+            now = self.strategy_15m.exchange.milliseconds()
+            since = int(bucket_start(now - self.warmup_bars * timeframe_ms('4h'), '4h'))
+        else:
+            since = last_ts + 1
+        
+        candles = []
+        while True:
+            page = self.strategy_15m.fetch_closed_candles(symbol, since, limit=1000)
+            candles.extend(page)
+            if len(page) < 1000:
+                return candles
+            since = page[-1][0] + 1
+    
+    def run_multi_timeframe(self, symbol: str = 'BTC/USDT', incremental: bool = False):
         """
         멀티 타임프레임 스캔
+        
+        incremental=True면 15m 새 마감 봉만 받아 1h/4h는 로컬 리샘플 → 시간대별 증분 엔진으로 판정
         """
+        if incremental:
+            base = self.fetch_base_candles(symbol)
+            completed = self.resamplers[symbol].update(base)
+            feeds = (('15m', self.strategy_15m, base),
+                     ('1h', self.strategy_1h, completed['1h']),
+                     ('4h', self.strategy_4h, completed['4h']))
+            results = {}
+            for tf, strategy, candles in feeds:
+                results[tf] = strategy.scan_incremental(symbol, candles=candles)
+                if results[tf]:
+                    self.active_signals.append(results[tf])
+            return results
+        
         print("\n" + "🔄"*30)
         print(f"멀티 타임프레임 스캔: {symbol}")
         print("🔄"*30)
@@ -422,6 +509,19 @@ class SMCFVGTrader:
         
         return results
     
+    def watch(self, symbols: List[str], interval_sec: int = 60, cycles: Optional[int] = None):
+        """
+        여러 심볼 × 시간대 감시 루프 (주기마다 새 마감 봉만 반영)
+        """
+        cycle = 0
+        while cycles is None or cycle < cycles:
+            for symbol in symbols:
+                self.run_multi_timeframe(symbol, incremental=True)
+            cycle += 1
+            if cycles is None or cycle < cycles:
+                time.sleep(interval_sec)
+        return self.active_signals
+    
     def save_signals(self, filename: str = 'smc_signals.json'):
         """
         신호 저장
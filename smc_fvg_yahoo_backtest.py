@@ -14,6 +14,8 @@ from dataclasses import dataclass, asdict
 import warnings
 warnings.filterwarnings('ignore')
 
+from swing_pivots import swing_point_indices
+
 
 @dataclass
 class Trade:
@@ -94,16 +96,7 @@ class SMCFVGYahooBacktest:
     def identify_swing_points(self, highs: np.ndarray, lows: np.ndarray,
                               window: int = 5) -> Tuple[List[int], List[int]]:
         """스윙 포인트 식별"""
-        swing_highs = []
-        swing_lows = []
-        
-        for i in range(window, len(highs) - window):
-            if highs[i] == max(highs[i-window:i+window+1]):
-                swing_highs.append(i)
-            if lows[i] == min(lows[i-window:i+window+1]):
-                swing_lows.append(i)
-        
-        return swing_highs, swing_lows
+        return swing_point_indices(highs, lows, window)
     
     def detect_fvg(self, highs: np.ndarray, lows: np.ndarray,
                    end_idx: int, lookback: int = 30) -> List[Dict]:
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+SMC Stream - 봉 마감마다 갱신하는 증분 SMC/FVG 엔진
+SMCFVGStrategy.scan이 매번 200봉을 다시 받아 스윙/MSB/FVG를 처음부터 계산하던 것을
+심볼/시간대별 상태(최근 봉 링 버퍼, 스윙 고저점, 최근·열린 FVG, MSB)로 유지해
+새 봉 하나당 상각 O(1)로 갱신한다.
+
+- 스윙: 좌우 swing_window봉 극값 - 단조 덱으로 2w+1 구간 최대/최소 유지, 봉 i는 i+w봉 마감 때 확정
+- FVG: 마감된 3봉 (i, i+1, i+2) 갭, 열린 구역은 반대편 종가 돌파 시 fvg_filled로 닫힘
+- MSB / retest / signal: 최근 window봉을 df로 넘긴 SMCFVGStrategy.scan과 같은 조건·같은 결과 dict
+  (인덱스는 창 기준 상대 위치)
+
+이벤트: swing_high, swing_low, fvg, fvg_filled, msb, retest, signal
+
+사용법:
+    engine = SMCStreamEngine()
+    for event in engine.update('BTC/USDT', '1h', new_candles):  # [[ts, o, h, l, c, v], ...]
+        if event['event'] == 'signal':
+            print(event['signal'])
+"""
+
+import math
+from collections import deque
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+
+def _as_timestamp(ts) -> pd.Timestamp:
+    """봉 시각(ms 정수 또는 시각) → pd.Timestamp (fetch_ohlcv 인덱스와 같은 naive UTC)"""
+    if isinstance(ts, (int, float)) and not isinstance(ts, bool):
+        return pd.Timestamp(int(ts), unit='ms')
+    return pd.Timestamp(ts)
+
+
+class SMCStream:
+    """심볼/시간대 하나의 증분 SMC 상태"""
+
+    def __init__(self,
+                 symbol: str = '',
+                 timeframe: str = '',
+                 window: int = 200,
+                 swing_window: int = 5,
+                 fvg_lookback: int = 10,
+                 fvg_min_size: float = 0.001,
+                 msb_strength: float = 0.005,
+                 min_rr_ratio: float = 2.5,
+                 min_bars: int = 50,
+                 max_open_zones: int = 50):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.window = window
+        self.w = swing_window
+        self.fvg_lookback = fvg_lookback
+        self.fvg_min_size = fvg_min_size
+        self.msb_strength = msb_strength
+        self.min_rr_ratio = min_rr_ratio
+        self.min_bars = min_bars
+        self.max_open_zones = max_open_zones
+
+        self.n = 0                      # 지금까지 받은 봉 수 (다음 봉의 절대 인덱스)
+        self.last_ts = None
+        size = max(window, 2 * swing_window + 1, fvg_lookback + 3)
+        self._size = size
+        self._ts = [None] * size
+        self._high = [math.nan] * size
+        self._low = [math.nan] * size
+        self._close = [math.nan] * size
+
+        self._max_q: deque = deque()    # (idx, high) 단조 감소
+        self._min_q: deque = deque()    # (idx, low) 단조 증가
+        self._last_nan = -1
+        self.swing_highs: deque = deque()   # 확정 스윙 고점 절대 인덱스
+        self.swing_lows: deque = deque()
+        self.recent_fvgs: deque = deque()   # retest 후보 (candle1 인덱스가 최근 lookback+3봉)
+        self.open_zones: List[Dict] = []    # 아직 메워지지 않은 FVG 구역
+        self.msb: Optional[Dict] = None     # 마지막 봉 기준 MSB 상태
+
+    # ── 링 버퍼 ──
+    def high(self, i: int) -> float:
+        return self._high[i % self._size]
+
+    def low(self, i: int) -> float:
+        return self._low[i % self._size]
+
+    def close(self, i: int) -> float:
+        return self._close[i % self._size]
+
+    def timestamp(self, i: int):
+        return self._ts[i % self._size]
+
+    @property
+    def start(self) -> int:
+        """현재 창(최근 window봉)의 첫 절대 인덱스"""
+        return max(0, self.n - self.window)
+
+    # ── 갱신 ──
+    def update(self, ts, high: float, low: float, close: float) -> List[Dict]:
+        """마감된 봉 하나 반영 → 이벤트 리스트"""
+        t = self.n
+        slot = t % self._size
+        self._ts[slot], self._high[slot], self._low[slot], self._close[slot] = ts, high, low, close
+        self.n += 1
+        self.last_ts = ts
+        events = []
+
+        self._push_extremes(t, high, low)
+        self._confirm_swings(t, events)
+
+        s = self.start
+        while self.swing_highs and self.swing_highs[0] < s + self.w:
+            self.swing_highs.popleft()
+        while self.swing_lows and self.swing_lows[0] < s + self.w:
+            self.swing_lows.popleft()
+
+        self._update_zones(t, close, events)
+
+        if self.n >= self.min_bars:
+            self._evaluate(t, events)
+
+        # 이번 봉이 candle3인 FVG는 다음 봉부터 retest 후보 (scan의 FVG 탐색 범위와 동일)
+        if t >= 2:
+            fvg = self._detect_fvg(t - 2)
+            if fvg:
+                self.recent_fvgs.append(fvg)
+                zone = dict(fvg, touches=0)
+                self.open_zones.append(zone)
+                if len(self.open_zones) > self.max_open_zones:
+                    self.open_zones.pop(0)
+                events.append(self._event('fvg', t, fvg=fvg))
+        return events
+
+    def _event(self, kind: str, t: int, **fields) -> Dict:
+        return dict(event=kind, symbol=self.symbol, timeframe=self.timeframe,
+                    bar=t, timestamp=self.timestamp(t), **fields)
+
+    def _push_extremes(self, t: int, high: float, low: float):
+        span = 2 * self.w + 1
+        if math.isnan(high) or math.isnan(low):
+            self._last_nan = t
+        else:
+            while self._max_q and self._max_q[-1][1] <= high:
+                self._max_q.pop()
+            self._max_q.append((t, high))
+            while self._min_q and self._min_q[-1][1] >= low:
+                self._min_q.pop()
+            self._min_q.append((t, low))
+        while self._max_q and self._max_q[0][0] <= t - span:
+            self._max_q.popleft()
+        while self._min_q and self._min_q[0][0] <= t - span:
+            self._min_q.popleft()
+
+    def _confirm_swings(self, t: int, events: List[Dict]):
+        """봉 c = t - w가 좌우 w봉 극값이면 스윙 확정 (구간에 NaN이 있으면 아님)"""
+        c = t - self.w
+        if c - self.w < 0 or self._last_nan >= c - self.w:
+            return
+        if self.high(c) == self._max_q[0][1]:
+            self.swing_highs.append(c)
+            events.append(self._event('swing_high', c, price=float(self.high(c))))
+        if self.low(c) == self._min_q[0][1]:
+            self.swing_lows.append(c)
+            events.append(self._event('swing_low', c, price=float(self.low(c))))
+
+    def _detect_fvg(self, i: int) -> Optional[Dict]:
+        """3봉 (i, i+1, i+2) FVG (SMCFVGStrategy.detect_fvg와 같은 조건, 인덱스는 절대값)"""
+        c1h, c1l = self.high(i), self.low(i)
+        c2h, c2l = self.high(i + 1), self.low(i + 1)
+        c3h, c3l = self.high(i + 2), self.low(i + 2)
+        if c1h < c3l:
+            size = (c3l - c1h) / c1h
+            if size >= self.fvg_min_size:
+                return {'type': 'BULLISH', 'idx': i + 1, 'top': float(c3l), 'bottom': float(c1h),
+                        'size': float(size * 100), 'candle1_idx': i, 'candle3_idx': i + 2,
+                        'ob_low': float(c2l)}
+        elif c1l > c3h:
+            size = (c1l - c3h) / c3h
+            if size >= self.fvg_min_size:
+                return {'type': 'BEARISH', 'idx': i + 1, 'top': float(c1l), 'bottom': float(c3h),
+                        'size': float(size * 100), 'candle1_idx': i, 'candle3_idx': i + 2,
+                        'ob_high': float(c2h)}
+        return None
+
+    def _update_zones(self, t: int, close: float, events: List[Dict]):
+        """열린 FVG 구역: 터치 횟수 갱신, 반대편 종가 돌파 / 창 밖으로 밀리면 닫음"""
+        if not self.open_zones:
+            return
+        low, high = self.low(t), self.high(t)
+        keep = []
+        for zone in self.open_zones:
+            filled = close < zone['bottom'] if zone['type'] == 'BULLISH' else close > zone['top']
+            if filled:
+                events.append(self._event('fvg_filled', t, fvg=zone))
+            elif zone['candle1_idx'] >= self.start:
+                if low <= zone['top'] and high >= zone['bottom']:
+                    zone['touches'] += 1
+                keep.append(zone)
+        self.open_zones = keep
+
+    # ── scan과 같은 판정 ──
+    def _relative(self, d: Dict, keys: Sequence[str], s: int) -> Dict:
+        out = dict(d)
+        for k in keys:
+            out[k] = d[k] - s
+        return out
+
+    def _evaluate(self, t: int, events: List[Dict]):
+        s = self.start
+        close = self.close(t)
+
+        # MSB: 최근 두 스윙 고점이 낮아지는 중 이전 고점 돌파
+        self.msb = None
+        if len(self.swing_highs) >= 2:
+            prev_idx, last_idx = self.swing_highs[-2], self.swing_highs[-1]
+            prev_high, last_high = self.high(prev_idx), self.high(last_idx)
+            if last_high < prev_high and close > prev_high * (1 + self.msb_strength):
+                self.msb = {
+                    'type': 'MSB_LONG',
+                    'prev_swing_high': float(prev_high),
+                    'last_swing_high': float(last_high),
+                    'breakout_price': float(close),
+                    'strength': float((close - prev_high) / prev_high * 100),
+                    'prev_swing_idx': prev_idx - s,
+                    'last_swing_idx': last_idx - s
+                }
+                events.append(self._event('msb', t, msb=self.msb))
+
+        # retest 후보: candle1이 [max(s, t-lookback-2), t-3] 범위인 가장 최근 불리쉬 FVG
+        lo = max(s, t - self.fvg_lookback - 2)
+        while self.recent_fvgs and self.recent_fvgs[0]['candle1_idx'] < lo:
+            self.recent_fvgs.popleft()
+        target = None
+        for fvg in reversed(self.recent_fvgs):
+            if fvg['type'] == 'BULLISH':
+                target = fvg
+                break
+        if target is None:
+            return
+
+        low, high = self.low(t), self.high(t)
+        in_fvg = (low <= target['top']) and (high >= target['bottom'])
+        near_bottom = abs(close - target['bottom']) / target['bottom'] < 0.002
+        if not (in_fvg or near_bottom):
+            return
+        fvg = self._relative(target, ('idx', 'candle1_idx', 'candle3_idx'), s)
+        retest = {
+            'fvg': fvg,
+            'current_price': float(close),
+            'in_fvg': in_fvg,
+            'entry_zone': (target['bottom'], target['top']),
+            'timestamp': _as_timestamp(self.timestamp(t))      # scan과 같이 pd.Timestamp
+        }
+        events.append(self._event('retest', t, retest=retest))
+
+        if self.msb is None:
+            return
+        levels = self._trade_levels(retest)
+        if levels:
+            events.append(self._event('signal', t, signal={
+                'symbol': self.symbol,
+                'timeframe': self.timeframe,
+                'timestamp': datetime.now().isoformat(),
+                'type': 'LONG',
+                'msb': self.msb,
+                'fvg': fvg,
+                'retest': retest,
+                'entry_price': levels['entry_price'],
+                'sl_price': levels['sl_price'],
+                'tp_price': levels['tp_price'],
+                'risk': levels['risk'],
+                'reward': levels['reward'],
+                'rr_ratio': levels['rr_ratio'],
+                'expected_return': (levels['tp_price'] - levels['entry_price']) / levels['entry_price'] * 100
+            }))
+
+    def _trade_levels(self, retest: Dict) -> Optional[Dict]:
+        """SMCFVGStrategy.calculate_trade_levels와 동일"""
+        fvg = retest['fvg']
+        entry_price = retest['current_price']
+        sl_price = fvg['ob_low'] if 'ob_low' in fvg else fvg['bottom'] * 0.998
+
+        resistances = [self.high(i) for i in self.swing_highs if self.high(i) > entry_price]
+        if not self.swing_highs:
+            tp_price = entry_price * 1.05
+        else:
+            tp_price = min(resistances) if resistances else entry_price * 1.05
+
+        risk = entry_price - sl_price
+        reward = tp_price - entry_price
+        if risk <= 0:
+            return None
+        rr_ratio = reward / risk
+        if rr_ratio < self.min_rr_ratio:
+            tp_price = entry_price + (risk * self.min_rr_ratio)
+            reward = tp_price - entry_price
+            rr_ratio = self.min_rr_ratio
+        return {
+            'entry_price': float(entry_price),
+            'sl_price': float(sl_price),
+            'tp_price': float(tp_price),
+            'risk': float(risk),
+            'reward': float(reward),
+            'rr_ratio': float(rr_ratio),
+            'position_size': None
+        }
+
+
+class SMCStreamEngine:
+    """
+    (심볼, 시간대)별 SMCStream 묶음 - 새 봉만 넣으면 된다
+
+    timeframe_params: 시간대별로 stream_params를 덮어쓸 파라미터 (예: {'4h': {'msb_strength': 0.01}})
+    """
+
+    def __init__(self, timeframe_params: Optional[Dict[str, Dict]] = None, **stream_params):
+        self.stream_params = stream_params
+        self.timeframe_params = timeframe_params or {}
+        self.streams: Dict[Tuple[str, str], SMCStream] = {}
+
+    def stream(self, symbol: str, timeframe: str) -> SMCStream:
+        key = (symbol, timeframe)
+        if key not in self.streams:
+            params = dict(self.stream_params, **self.timeframe_params.get(timeframe, {}))
+            self.streams[key] = SMCStream(symbol, timeframe, **params)
+        return self.streams[key]
+
+    def last_timestamp(self, symbol: str, timeframe: str):
+        key = (symbol, timeframe)
+        return self.streams[key].last_ts if key in self.streams else None
+
+    def update(self, symbol: str, timeframe: str, candles: Iterable[Sequence]) -> List[Dict]:
+        """
+        마감된 봉 [[ts(ms), open, high, low, close, volume], ...] 반영 → 이벤트
+        이미 받은 시각 이하의 봉은 건너뛴다.
+        """
+        st = self.stream(symbol, timeframe)
+        events = []
+        for c in candles:
+            if st.last_ts is not None and c[0] <= st.last_ts:
+                continue
+            events.extend(st.update(c[0], float(c[2]), float(c[3]), float(c[4])))
+        return events
+
+    def update_frame(self, symbol: str, timeframe: str, df: pd.DataFrame) -> List[Dict]:
+        """DatetimeIndex + high/low/close 컬럼 df 반영"""
+        ts = (df.index.as_unit('ms').asi8 if isinstance(df.index, pd.DatetimeIndex)
+              else df.index.to_numpy())
+        rows = zip(ts.tolist(), [0.0] * len(df), df['high'].tolist(), df['low'].tolist(), df['close'].tolist())
+        return self.update(symbol, timeframe, rows)
@@ -7,10 +7,16 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
+from pathlib import Path
+import sys
 import pandas as pd
 import numpy as np
 from enum import Enum
 
+# Shared process-wide price cache (same module name as v2/core/data_manager uses)
+sys.path.insert(0, str(Path(__file__).parent.parent / 'v2' / 'core'))
+from price_cache import PriceCache, get_price_cache
+
 
 class StrategyType(Enum):
     MOMENTUM = "momentum"
@@ -87,7 +93,8 @@ class BaseStrategy(ABC):
         # State
         self.positions: Dict[str, Trade] = {}
         self.signals: List[Signal] = []
-        self.price_cache: Dict[str, pd.DataFrame] = {}
+        self.price_cache: PriceCache = get_price_cache()
+        self.intraday_ttl: float = 60.0  # 당일 데이터 캐시 유효시간(초), DataManager와 동일
     
     def _init_risk_params(self):
         """Initialize risk management parameters from config"""
@@ -312,18 +319,19 @@ class BaseStrategy(ABC):
     
     def get_price_data(self, symbol: str, start_date: str, end_date: str,
                        data_source: Any) -> pd.DataFrame:
-        """Fetch and cache price data"""
-        cache_key = f"{symbol}_{start_date}_{end_date}"
-        if cache_key in self.price_cache:
-            return self.price_cache[cache_key]
+        """
+        Fetch price data through the shared price cache.
         
+        A cached superset of [start_date, end_date] is sliced instead of refetched.
+        Ranges reaching today expire after intraday_ttl seconds (same as DataManager).
+        """
         # Implementation depends on data source (yfinance, fdr, db, etc.)
-        df = self._fetch_from_source(symbol, start_date, end_date, data_source)
-        
-        if df is not None and not df.empty:
-            self.price_cache[cache_key] = df
-        
-        return df
+        ttl = self.intraday_ttl if str(end_date)[:10] >= datetime.now().strftime('%Y-%m-%d') else None
+        return self.price_cache.get_or_load(
+            symbol, start_date, end_date,
+            lambda: self._fetch_from_source(symbol, start_date, end_date, data_source),
+            ttl=ttl
+        )
     
     def _fetch_from_source(self, symbol: str, start_date: str, end_date: str,
                            data_source: Any) -> pd.DataFrame:
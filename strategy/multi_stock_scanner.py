@@ -23,6 +23,7 @@ import warnings
 warnings.filterwarnings('ignore')
 
 from fdr_wrapper import FDRWrapper
+from pivot_strategy import rank_by_backtest
 
 
 class MultiStockScanner:
@@ -173,7 +174,8 @@ class MultiStockScanner:
         
         return 0
     
-    def scan_all(self, max_workers: int = 4, progress: bool = True) -> pd.DataFrame:
+    def scan_all(self, max_workers: int = 4, progress: bool = True,
+                 backtest_days: int = 0) -> pd.DataFrame:
         """
         전 종목 스캔
         
@@ -183,6 +185,8 @@ class MultiStockScanner:
             병렬 처리 스레드 수
         progress : bool
             진행바 표시 여부
+        backtest_days : int
+            > 0이면 신호 종목을 최근 N일 피벗 전략 백테스트 edge(bt_edge) 순으로 정렬
         """
         # 종목 리스트 수집
         stock_list = self.fetch_stock_list()
@@ -216,6 +220,16 @@ class MultiStockScanner:
             df = pd.DataFrame(self.results)
             df = df.sort_values('volume_ratio', ascending=False).reset_index(drop=True)
             print(f"\n✅ 신호 감지: {len(df)}개 종목")
+            
+            if backtest_days > 0:
+                end = datetime.now()
+                start = end - timedelta(days=backtest_days)
+                print(f"📊 신호 종목 백테스트 중 (최근 {backtest_days}일)...")
+                df = rank_by_backtest(
+                    df, start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'),
+                    max_workers=max_workers, progress=progress,
+                    pivot_period=self.pivot_period, volume_threshold=self.volume_threshold,
+                )
             return df
         else:
             print("\n⚠️ 신호 감지된 종목 없음")
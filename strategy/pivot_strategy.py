@@ -11,19 +11,30 @@ Korean Stock Pivot Point Strategy Backtester
 - 손절: 평균단가 -10%
 - 익절: 최고점 대비 -15% (트레일링 스탑)
 
+백테스트는 종가/진입신호 배열 위의 상태기계 커널로 실행한다.
+numba가 설치되어 있으면 JIT 컴파일 커널, 없으면 거래 구간 단위 NumPy 커널을 쓴다.
+run_pivot_backtests()로 여러 종목을 병렬 백테스트해 스캐너 결과를 순위화할 수 있다.
+
 Dependencies:
     pip install finance-datareader pandas pandas-ta matplotlib plotly
+    pip install numba  # 선택 (커널 JIT)
 """
 
 import pandas as pd
 import numpy as np
-import pandas_ta as ta
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Tuple
+import concurrent.futures
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 from fdr_wrapper import FDRWrapper
 
 
@@ -56,6 +67,267 @@ class BacktestResult:
     profit_factor: float = 0.0
 
 
+# 커널 거래 행렬 컬럼 (행 = 거래 1건)
+_T_ENTRY, _T_EXIT, _T_ENTRY_2ND, _T_ENTRY_3RD = 0, 1, 2, 3
+_T_SHARES_1ST, _T_SHARES_2ND, _T_SHARES_3RD = 4, 5, 6
+_T_AVG_COST, _T_HIGHEST, _T_INVESTED, _T_EXIT_PRICE, _T_PNL, _T_REASON = 7, 8, 9, 10, 11, 12
+_T_FIELDS = 13
+EXIT_REASONS = ('stop_loss', 'take_profit', 'end_of_data')
+
+
+def _pivot_kernel(close, entry, capital, pct_1, pct_2, pct_3, trigger, stop_loss_pct, trailing_stop_pct):
+    """
+    피벗 전략 상태기계 (행 단위 루프, numba 컴파일 대상)
+
+    Returns:
+    --------
+    (cash, shares, holdings, total_value, trades) : 일별 배열 4개 + (거래 수 × _T_FIELDS) 행렬
+    청산일 행은 기존 DataFrame 루프와 같이 평가액을 갱신하지 않는다 (holdings=0, total_value=초기자본).
+    """
+    n = len(close)
+    cash = np.full(n, capital)
+    shares = np.zeros(n)
+    holdings = np.zeros(n)
+    total_value = np.full(n, capital)
+    trades = np.full((n, _T_FIELDS), -1.0)
+
+    k = 0
+    level = 0
+    c = capital
+    sh = 0.0
+    entry_price = 0.0
+    avg_cost = 0.0
+    highest = 0.0
+    invested = 0.0
+
+    for i in range(1, n):
+        px = close[i]
+        exited = False
+
+        if level == 0:
+            if entry[i]:
+                qty = np.floor(capital * pct_1 / px)
+                cost = qty * px
+                if qty > 0 and c >= cost:
+                    c -= cost
+                    sh = qty
+                    entry_price = px
+                    avg_cost = px
+                    highest = px
+                    invested = cost
+                    level = 1
+                    trades[k, _T_ENTRY] = i
+                    trades[k, _T_SHARES_1ST] = qty
+                    trades[k, _T_SHARES_2ND] = 0
+                    trades[k, _T_SHARES_3RD] = 0
+        else:
+            if px > highest:
+                highest = px
+
+            if level == 1:
+                if px >= entry_price * (1 + trigger):
+                    qty = np.floor(capital * pct_2 / px)
+                    cost = qty * px
+                    if qty > 0 and c >= cost:
+                        avg_cost = (avg_cost * sh + cost) / (sh + qty)
+                        invested += cost
+                        c -= cost
+                        sh += qty
+                        level = 2
+                        trades[k, _T_ENTRY_2ND] = i
+                        trades[k, _T_SHARES_2ND] = qty
+            elif level == 2:
+                if px >= entry_price * (1 + trigger) * (1 + trigger):
+                    qty = np.floor(capital * pct_3 / px)
+                    cost = qty * px
+                    if qty > 0 and c >= cost:
+                        avg_cost = (avg_cost * sh + cost) / (sh + qty)
+                        invested += cost
+                        c -= cost
+                        sh += qty
+                        level = 3
+                        trades[k, _T_ENTRY_3RD] = i
+                        trades[k, _T_SHARES_3RD] = qty
+
+            reason = -1
+            if px <= avg_cost * (1 - stop_loss_pct):
+                reason = 0
+            elif px <= highest * (1 - trailing_stop_pct) and px > avg_cost:
+                reason = 1
+            if reason >= 0:
+                revenue = sh * px
+                c += revenue
+                trades[k, _T_EXIT] = i
+                trades[k, _T_AVG_COST] = avg_cost
+                trades[k, _T_HIGHEST] = highest
+                trades[k, _T_INVESTED] = invested
+                trades[k, _T_EXIT_PRICE] = px
+                trades[k, _T_PNL] = revenue - invested
+                trades[k, _T_REASON] = reason
+                k += 1
+                sh = 0.0
+                level = 0
+                exited = True
+
+        cash[i] = c
+        shares[i] = sh
+        if not exited:
+            holdings[i] = sh * px
+            total_value[i] = c + holdings[i]
+
+    # 미청산 포지션은 마지막 날 강제 청산 (평가액 행은 그대로)
+    if level > 0:
+        px = close[n - 1]
+        revenue = sh * px
+        cash[n - 1] += revenue
+        shares[n - 1] = 0.0
+        trades[k, _T_EXIT] = n - 1
+        trades[k, _T_AVG_COST] = avg_cost
+        trades[k, _T_HIGHEST] = highest
+        trades[k, _T_INVESTED] = invested
+        trades[k, _T_EXIT_PRICE] = px
+        trades[k, _T_PNL] = revenue - invested
+        trades[k, _T_REASON] = 2
+        k += 1
+
+    return cash, shares, holdings, total_value, trades[:k]
+
+
+def _first_true(mask: np.ndarray) -> int:
+    """첫 True 위치 (없으면 -1)"""
+    return int(mask.argmax()) if mask.any() else -1
+
+
+def _pivot_kernel_numpy(close, entry, capital, pct_1, pct_2, pct_3, trigger, stop_loss_pct, trailing_stop_pct):
+    """
+    _pivot_kernel과 같은 결과를 내는 NumPy 버전 (numba 미설치 시)
+
+    거래 사이 구간은 진입 가능한 다음 신호로 바로 건너뛰고, 보유 구간은
+    2·3차 진입일 → 구간별 평균단가 → 손절/트레일링 조건을 배열 연산으로 찾는다.
+    """
+    n = len(close)
+    cash = np.full(n, capital)
+    shares = np.zeros(n)
+    exit_rows = []
+    trades = []
+
+    c = capital
+    candidates = np.flatnonzero(entry)
+    candidates = candidates[candidates >= 1]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        qty_1 = np.floor(capital * pct_1 / close[candidates])
+    cost_1 = qty_1 * close[candidates]
+    start = 1
+
+    while True:
+        ok = (candidates >= start) & (qty_1 > 0) & (c >= cost_1)
+        pos = _first_true(ok)
+        if pos < 0:
+            cash[start:] = c
+            break
+        e = candidates[pos]
+        cash[start:e] = c
+        trade = np.full(_T_FIELDS, -1.0)
+        trade[_T_ENTRY] = e
+        trade[_T_SHARES_1ST] = qty_1[pos]
+        trade[_T_SHARES_2ND] = trade[_T_SHARES_3RD] = 0
+
+        # 보유 구간 (진입 다음날 ~ 마지막 날)
+        w = close[e + 1:]
+        m = len(w)
+        c_w = np.full(m, c - cost_1[pos])
+        sh_w = np.full(m, qty_1[pos])
+        avg_w = np.full(m, close[e])
+        invested_w = np.full(m, cost_1[pos])
+
+        fills = []   # (보유 구간 위치, 진입일 컬럼, 주식 수 컬럼, 주식 수) - 청산 이후 체결은 버림
+        with np.errstate(invalid='ignore', divide='ignore'):
+            qty_2 = np.floor(capital * pct_2 / w)
+            j2 = _first_true((w >= close[e] * (1 + trigger)) & (qty_2 > 0) & (c_w >= qty_2 * w))
+            if j2 >= 0:
+                cost = qty_2[j2] * w[j2]
+                avg_w[j2:] = (avg_w[j2] * sh_w[j2] + cost) / (sh_w[j2] + qty_2[j2])
+                invested_w[j2:] += cost
+                c_w[j2:] -= cost
+                sh_w[j2:] += qty_2[j2]
+                fills.append((j2, _T_ENTRY_2ND, _T_SHARES_2ND, qty_2[j2]))
+
+                w3 = w[j2 + 1:]
+                qty_3 = np.floor(capital * pct_3 / w3)
+                j3 = _first_true((w3 >= close[e] * (1 + trigger) * (1 + trigger))
+                                 & (qty_3 > 0) & (c_w[j2 + 1:] >= qty_3 * w3))
+                if j3 >= 0:
+                    cost = qty_3[j3] * w3[j3]
+                    j = j2 + 1 + j3
+                    avg_w[j:] = (avg_w[j] * sh_w[j] + cost) / (sh_w[j] + qty_3[j3])
+                    invested_w[j:] += cost
+                    c_w[j:] -= cost
+                    sh_w[j:] += qty_3[j3]
+                    fills.append((j, _T_ENTRY_3RD, _T_SHARES_3RD, qty_3[j3]))
+
+        highest_w = np.fmax.accumulate(np.concatenate(([close[e]], w)))[1:]
+        stop = w <= avg_w * (1 - stop_loss_pct)
+        take = (w <= highest_w * (1 - trailing_stop_pct)) & (w > avg_w)
+        x = _first_true(stop | take)
+        end = m if x < 0 else x + 1
+        for j, entry_col, shares_col, qty in fills:
+            if j < end:
+                trade[entry_col] = e + 1 + j
+                trade[shares_col] = qty
+
+        cash[e] = c - cost_1[pos]
+        shares[e] = qty_1[pos]
+        cash[e + 1:e + 1 + end] = c_w[:end]
+        shares[e + 1:e + 1 + end] = sh_w[:end]
+
+        last = m - 1 if x < 0 else x
+        if m == 0:
+            # 마지막 날 진입 → 같은 날 강제 청산
+            exit_i, exit_px, sh, avg, hi, inv = e, close[e], qty_1[pos], close[e], close[e], cost_1[pos]
+            c_after = c - cost_1[pos]
+        else:
+            exit_i, exit_px = e + 1 + last, w[last]
+            sh, avg, hi, inv = sh_w[last], avg_w[last], highest_w[last], invested_w[last]
+            c_after = c_w[last]
+        revenue = sh * exit_px
+        c = c_after + revenue
+        trade[_T_EXIT] = exit_i
+        trade[_T_AVG_COST] = avg
+        trade[_T_HIGHEST] = hi
+        trade[_T_INVESTED] = inv
+        trade[_T_EXIT_PRICE] = exit_px
+        trade[_T_PNL] = revenue - inv
+        trade[_T_REASON] = 0 if x >= 0 and stop[x] else (1 if x >= 0 else 2)
+        trades.append(trade)
+
+        if x < 0:
+            break
+        exit_rows.append(exit_i)
+        cash[exit_i] = c
+        shares[exit_i] = 0.0
+        start = exit_i + 1
+
+    holdings = shares * close
+    total_value = cash + holdings
+    holdings[0] = 0.0
+    total_value[0] = capital
+    if exit_rows:
+        holdings[exit_rows] = 0.0
+        total_value[exit_rows] = capital
+    if trades and trades[-1][_T_REASON] == 2:
+        cash[n - 1] += shares[n - 1] * close[n - 1]
+        shares[n - 1] = 0.0
+
+    trades = np.array(trades) if trades else np.empty((0, _T_FIELDS))
+    return cash, shares, holdings, total_value, trades
+
+
+if NUMBA_AVAILABLE:
+    run_pivot_kernel = njit(cache=True, nogil=True)(_pivot_kernel)
+else:
+    run_pivot_kernel = _pivot_kernel_numpy
+
+
 class PivotPointStrategy:
     """
     피벗 포인트 전략 백테스터
@@ -90,6 +362,7 @@ class PivotPointStrategy:
         pyramiding_trigger: float = 0.05,  # 피라미딩 트리거 (5%)
         stop_loss_pct: float = 0.10,  # 손절 -10%
         trailing_stop_pct: float = 0.15,  # 트레일링 스탑 -15%
+        verbose: bool = True,  # 진행/거래 로그 출력 (일괄 백테스트는 False)
     ):
         self.symbol = symbol
         self.start_date = start_date
@@ -105,6 +378,7 @@ class PivotPointStrategy:
         # 리스크 관리 설정
         self.stop_loss_pct = stop_loss_pct
         self.trailing_stop_pct = trailing_stop_pct
+        self.verbose = verbose
         
         # 데이터 저장
         self.data: Optional[pd.DataFrame] = None
@@ -114,7 +388,8 @@ class PivotPointStrategy:
         """
         FDRWrapper로 주가 데이터 수집 (캐시 우선)
         """
-        print(f"📊 {self.symbol} 데이터 수집 중...")
+        if self.verbose:
+            print(f"📊 {self.symbol} 데이터 수집 중...")
         
         # 데이터 수집 (시작일보다 pivot_period만큼 더 가져와서 계산용)
         fetch_start = (datetime.strptime(self.start_date, '%Y-%m-%d') - 
@@ -144,12 +419,15 @@ class PivotPointStrategy:
         df = df[df.index >= self.start_date]
         
         self.data = df
-        print(f"✅ {len(df)}일 분의 데이터 수집 완료")
+        if self.verbose:
+            print(f"✅ {len(df)}일 분의 데이터 수집 완료")
         return df
     
-    def calculate_indicators(self) -> pd.DataFrame:
+    def calculate_indicators(self, with_ta: bool = True) -> pd.DataFrame:
         """
         기술적 지표 계산
+        
+        with_ta=False면 진입 신호 컬럼만 계산 (pandas_ta import 생략, 백테스트용)
         """
         df = self.data.copy()
         
@@ -168,7 +446,12 @@ class PivotPointStrategy:
         # 진입 신호 (피벗 돌파 + 거래량 급증)
         df['entry_signal'] = df['pivot_break'] & df['volume_spike']
         
-        # Pandas TA 추가 지표 (최적화용)
+        if not with_ta:
+            return df
+        
+        # Pandas TA 추가 지표 (최적화용) - import가 무거워 필요할 때만 로드
+        import pandas_ta  # noqa: F401  (df.ta 접근자 등록)
+        
         # RSI
         df.ta.rsi(length=14, append=True)
         
@@ -185,186 +468,77 @@ class PivotPointStrategy:
     
     def run_backtest(self) -> BacktestResult:
         """
-        백테스트 실행
+        백테스트 실행 (종가/진입신호 배열 → run_pivot_kernel)
         """
         if self.data is None:
             self.fetch_data()
         
-        df = self.calculate_indicators()
+        df = self.calculate_indicators(with_ta=False)
         
-        # 결과 DataFrame 준비
-        df['position'] = 0  # 0: 무포지션, 1~3: 피라미딩 단계
-        df['cash'] = self.initial_capital
-        df['holdings'] = 0.0
-        df['total_value'] = self.initial_capital
-        df['shares'] = 0
+        if self.verbose:
+            print(f"🔍 백테스트 실행 중... ({self.start_date} ~ {self.end_date})")
         
-        current_trade: Optional[TradeRecord] = None
-        position_level = 0  # 0, 1, 2, 3
+        close = df['close'].to_numpy(dtype=float)
+        entry = df['entry_signal'].to_numpy(dtype=bool)
+        cash, shares, holdings, total_value, trades = run_pivot_kernel(
+            close, entry, float(self.initial_capital),
+            self.pyramiding_pct[0], self.pyramiding_pct[1], self.pyramiding_pct[2],
+            self.pyramiding_trigger, self.stop_loss_pct, self.trailing_stop_pct,
+        )
         
-        print(f"🔍 백테스트 실행 중... ({self.start_date} ~ {self.end_date})")
+        df['cash'] = cash
+        df['holdings'] = holdings
+        df['total_value'] = total_value
+        df['shares'] = shares.astype(np.int64)
         
-        for i in range(1, len(df)):
-            date = df.index[i]
-            prev_date = df.index[i-1]
-            
-            row = df.iloc[i]
-            prev_row = df.iloc[i-1]
-            
-            # 현재 포지션 복사
-            df.loc[date, 'cash'] = df.loc[prev_date, 'cash']
-            df.loc[date, 'shares'] = df.loc[prev_date, 'shares']
-            
-            if current_trade is None:
-                # 무포지션 상태 - 진입 신호 확인
-                if row['entry_signal'] and not pd.isna(row[f'high_{self.pivot_period}']):
-                    # 1차 진입
-                    entry_amount = self.initial_capital * self.pyramiding_pct[0]
-                    shares = int(entry_amount / row['close'])
-                    cost = shares * row['close']
-                    
-                    if shares > 0 and df.loc[prev_date, 'cash'] >= cost:
-                        current_trade = TradeRecord(
-                            entry_date=date,
-                            entry_price=row['close'],
-                            shares_1st=shares,
-                            avg_cost=row['close'],
-                            highest_price=row['close'],
-                            total_invested=cost
-                        )
-                        
-                        df.loc[date, 'cash'] -= cost
-                        df.loc[date, 'shares'] = shares
-                        position_level = 1
-                        
-                        print(f"  📈 1차 진입: {date.strftime('%Y-%m-%d')} @ {row['close']:,.0f}원 ({shares}주)")
-            
-            else:
-                # 포지션 보유 중
-                current_price = row['close']
-                shares = df.loc[prev_date, 'shares']
-                
-                # 최고가 업데이트 (트레일링 스탑용)
-                if current_price > current_trade.highest_price:
-                    current_trade.highest_price = current_price
-                
-                # 2차 진입 체크 (1차 진입가 대비 5% 상승)
-                if position_level == 1:
-                    trigger_price = current_trade.entry_price * (1 + self.pyramiding_trigger)
-                    if current_price >= trigger_price:
-                        entry_amount = self.initial_capital * self.pyramiding_pct[1]
-                        new_shares = int(entry_amount / current_price)
-                        cost = new_shares * current_price
-                        
-                        if new_shares > 0 and df.loc[prev_date, 'cash'] >= cost:
-                            # 평균단가 재계산
-                            total_shares = shares + new_shares
-                            total_cost = (current_trade.avg_cost * shares) + cost
-                            current_trade.avg_cost = total_cost / total_shares
-                            current_trade.shares_2nd = new_shares
-                            current_trade.total_invested += cost
-                            
-                            df.loc[date, 'cash'] -= cost
-                            df.loc[date, 'shares'] = total_shares
-                            position_level = 2
-                            shares = total_shares
-                            
-                            print(f"  📈 2차 진입: {date.strftime('%Y-%m-%d')} @ {current_price:,.0f}원 ({new_shares}주)")
-                
-                # 3차 진입 체크 (2차 진입가 대비 5% 상승)
-                elif position_level == 2:
-                    # 2차 진입가 계산
-                    second_entry_price = current_trade.entry_price * (1 + self.pyramiding_trigger)
-                    trigger_price = second_entry_price * (1 + self.pyramiding_trigger)
-                    
-                    if current_price >= trigger_price:
-                        entry_amount = self.initial_capital * self.pyramiding_pct[2]
-                        new_shares = int(entry_amount / current_price)
-                        cost = new_shares * current_price
-                        
-                        if new_shares > 0 and df.loc[prev_date, 'cash'] >= cost:
-                            total_shares = shares + new_shares
-                            total_cost = (current_trade.avg_cost * shares) + cost
-                            current_trade.avg_cost = total_cost / total_shares
-                            current_trade.shares_3rd = new_shares
-                            current_trade.total_invested += cost
-                            
-                            df.loc[date, 'cash'] -= cost
-                            df.loc[date, 'shares'] = total_shares
-                            position_level = 3
-                            shares = total_shares
-                            
-                            print(f"  📈 3차 진입: {date.strftime('%Y-%m-%d')} @ {current_price:,.0f}원 ({new_shares}주)")
-                
-                # 손절 체크 (-10%)
-                stop_price = current_trade.avg_cost * (1 - self.stop_loss_pct)
-                if current_price <= stop_price:
-                    # 전량 매도
-                    revenue = shares * current_price
-                    df.loc[date, 'cash'] += revenue
-                    df.loc[date, 'shares'] = 0
-                    
-                    current_trade.exit_date = date
-                    current_trade.exit_price = current_price
-                    current_trade.pnl = revenue - current_trade.total_invested
-                    current_trade.return_pct = (current_trade.pnl / current_trade.total_invested) * 100
-                    current_trade.exit_reason = 'stop_loss'
-                    
-                    self.trades.append(current_trade)
-                    print(f"  🔴 손절: {date.strftime('%Y-%m-%d')} @ {current_price:,.0f}원 (수익률: {current_trade.return_pct:+.2f}%)")
-                    
-                    current_trade = None
-                    position_level = 0
-                    continue
-                
-                # 트레일링 스탑 체크 (-15% from highest)
-                trailing_stop_price = current_trade.highest_price * (1 - self.trailing_stop_pct)
-                if current_price <= trailing_stop_price and current_price > current_trade.avg_cost:
-                    # 익절
-                    revenue = shares * current_price
-                    df.loc[date, 'cash'] += revenue
-                    df.loc[date, 'shares'] = 0
-                    
-                    current_trade.exit_date = date
-                    current_trade.exit_price = current_price
-                    current_trade.pnl = revenue - current_trade.total_invested
-                    current_trade.return_pct = (current_trade.pnl / current_trade.total_invested) * 100
-                    current_trade.exit_reason = 'take_profit'
-                    
-                    self.trades.append(current_trade)
-                    print(f"  🟢 익절: {date.strftime('%Y-%m-%d')} @ {current_price:,.0f}원 (수익률: {current_trade.return_pct:+.2f}%, 최고: {current_trade.highest_price:,.0f})")
-                    
-                    current_trade = None
-                    position_level = 0
-                    continue
-            
-            # 포지션 평가액 업데이트
-            df.loc[date, 'holdings'] = df.loc[date, 'shares'] * row['close']
-            df.loc[date, 'total_value'] = df.loc[date, 'cash'] + df.loc[date, 'holdings']
-        
-        # 미청산 포지션이 있으면 마지막 날에 강제 청산
-        if current_trade is not None:
-            last_date = df.index[-1]
-            last_price = df.loc[last_date, 'close']
-            shares = df.loc[last_date, 'shares']
-            
-            revenue = shares * last_price
-            df.loc[last_date, 'cash'] += revenue
-            df.loc[last_date, 'shares'] = 0
-            
-            current_trade.exit_date = last_date
-            current_trade.exit_price = last_price
-            current_trade.pnl = revenue - current_trade.total_invested
-            current_trade.return_pct = (current_trade.pnl / current_trade.total_invested) * 100
-            current_trade.exit_reason = 'end_of_data'
-            
-            self.trades.append(current_trade)
-            print(f"  ⏹️  강제청산: {last_date.strftime('%Y-%m-%d')} @ {last_price:,.0f}원 (수익률: {current_trade.return_pct:+.2f}%)")
+        self.trades = [self._to_trade_record(df.index, close, row) for row in trades]
+        if self.verbose:
+            for row, trade in zip(trades, self.trades):
+                self._print_trade(df.index, close, row, trade)
         
         # 결과 계산
         result = self._calculate_results(df)
         return result
     
+    @staticmethod
+    def _to_trade_record(index: pd.DatetimeIndex, close: np.ndarray, row: np.ndarray) -> TradeRecord:
+        """커널 거래 행렬 한 행 → TradeRecord"""
+        entry_i, exit_i = int(row[_T_ENTRY]), int(row[_T_EXIT])
+        pnl = row[_T_PNL]
+        return TradeRecord(
+            entry_date=index[entry_i],
+            exit_date=index[exit_i],
+            entry_price=close[entry_i],
+            exit_price=row[_T_EXIT_PRICE],
+            shares_1st=int(row[_T_SHARES_1ST]),
+            shares_2nd=int(row[_T_SHARES_2ND]),
+            shares_3rd=int(row[_T_SHARES_3RD]),
+            avg_cost=row[_T_AVG_COST],
+            highest_price=row[_T_HIGHEST],
+            total_invested=row[_T_INVESTED],
+            pnl=pnl,
+            return_pct=(pnl / row[_T_INVESTED]) * 100,
+            exit_reason=EXIT_REASONS[int(row[_T_REASON])],
+        )
+    
+    @staticmethod
+    def _print_trade(index: pd.DatetimeIndex, close: np.ndarray, row: np.ndarray, trade: TradeRecord):
+        """거래 1건의 진입/추가진입/청산 로그"""
+        for col, shares_col, label in ((_T_ENTRY, _T_SHARES_1ST, '1차'),
+                                       (_T_ENTRY_2ND, _T_SHARES_2ND, '2차'),
+                                       (_T_ENTRY_3RD, _T_SHARES_3RD, '3차')):
+            if row[col] >= 0:
+                i = int(row[col])
+                print(f"  📈 {label} 진입: {index[i].strftime('%Y-%m-%d')} @ {close[i]:,.0f}원 ({int(row[shares_col])}주)")
+        
+        date = trade.exit_date.strftime('%Y-%m-%d')
+        if trade.exit_reason == 'stop_loss':
+            print(f"  🔴 손절: {date} @ {trade.exit_price:,.0f}원 (수익률: {trade.return_pct:+.2f}%)")
+        elif trade.exit_reason == 'take_profit':
+            print(f"  🟢 익절: {date} @ {trade.exit_price:,.0f}원 (수익률: {trade.return_pct:+.2f}%, 최고: {trade.highest_price:,.0f})")
+        else:
+            print(f"  ⏹️  강제청산: {date} @ {trade.exit_price:,.0f}원 (수익률: {trade.return_pct:+.2f}%)")
+    
     def _calculate_results(self, df: pd.DataFrame) -> BacktestResult:
         """
         백테스트 결과 계산
@@ -420,7 +594,8 @@ class PivotPointStrategy:
         )
         
         # 결과 출력
-        self._print_results(result, trades_df)
+        if self.verbose:
+            self._print_results(result, trades_df)
         
         return result, trades_df
     
@@ -445,6 +620,116 @@ class PivotPointStrategy:
             print(trades_df.to_string(index=False))
 
 
+def _backtest_symbol(symbol: str, start_date: str, end_date: str,
+                     data: Optional[pd.DataFrame], params: Dict) -> Optional[Dict]:
+    """
+    종목 1개 백테스트 → 요약 dict (데이터 조회 실패/부족 시 None)
+
+    조회 실패만 경고 후 건너뛰고, 백테스트 자체의 예외는 그대로 올린다.
+    """
+    strategy = PivotPointStrategy(symbol, start_date, end_date, verbose=False, **params)
+    if data is not None:
+        df = data.copy()
+        df.columns = [col.lower() for col in df.columns]
+        df.index = pd.to_datetime(df.index)
+        strategy.data = df.sort_index().loc[start_date:end_date]
+    else:
+        try:
+            strategy.fetch_data()
+        except Exception as e:
+            print(f"⚠️ {symbol}: 데이터 조회 실패, 건너뜀 ({type(e).__name__}: {e})")
+            return None
+    if len(strategy.data) < 2:
+        return None
+    result, _ = strategy.run_backtest()
+    
+    returns = [t.return_pct for t in result.trades]
+    return {
+        'symbol': symbol,
+        'bt_trades': len(returns),
+        'bt_win_rate': result.win_rate,
+        'bt_profit_factor': result.profit_factor,
+        'bt_avg_return': float(np.mean(returns)) if returns else 0.0,
+        'bt_final_return': result.final_return,
+        'bt_mdd': result.mdd,
+    }
+
+
+def run_pivot_backtests(
+    symbols: List[str],
+    start_date: str,
+    end_date: str,
+    data: Optional[Dict[str, pd.DataFrame]] = None,
+    max_workers: int = 4,
+    min_trades: int = 1,
+    progress: bool = False,
+    **params,
+) -> pd.DataFrame:
+    """
+    여러 종목 피벗 전략 일괄 백테스트 (스레드 병렬)
+    
+    Parameters:
+    -----------
+    symbols : List[str]
+        종목코드 리스트
+    data : Dict[str, pd.DataFrame]
+        미리 조회한 {종목: OHLCV} (없으면 종목별 FDRWrapper 조회)
+    min_trades : int
+        순위 대상 최소 거래 수 (미만이면 bt_edge = NaN)
+    params : dict
+        PivotPointStrategy 파라미터 (pivot_period, volume_threshold, ...)
+    
+    Returns:
+    --------
+    pd.DataFrame : 종목별 요약, bt_edge(거래당 평균 수익률 %) 내림차순
+    """
+    data = data or {}
+    rows = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_backtest_symbol, sym, start_date, end_date, data.get(sym), params)
+            for sym in symbols
+        ]
+        iterator = concurrent.futures.as_completed(futures)
+        if progress:
+            from tqdm import tqdm
+            iterator = tqdm(iterator, total=len(futures), desc="Backtesting")
+        for future in iterator:
+            row = future.result()
+            if row:
+                rows.append(row)
+    
+    columns = ['symbol', 'bt_trades', 'bt_win_rate', 'bt_profit_factor', 'bt_avg_return',
+               'bt_final_return', 'bt_mdd', 'bt_edge']
+    if not rows:
+        return pd.DataFrame(columns=columns)
+    
+    df = pd.DataFrame(rows)
+    df['bt_edge'] = df['bt_avg_return'].where(df['bt_trades'] >= min_trades)
+    df = df.sort_values(['bt_edge', 'bt_final_return'], ascending=False, na_position='last')
+    return df[columns].reset_index(drop=True)
+
+
+def rank_by_backtest(
+    results: pd.DataFrame,
+    start_date: str,
+    end_date: str,
+    symbol_col: str = 'symbol',
+    **kwargs,
+) -> pd.DataFrame:
+    """
+    스캐너 결과에 종목별 백테스트 요약(bt_*)을 붙여 bt_edge 순으로 재정렬
+    
+    kwargs는 run_pivot_backtests로 전달 (max_workers, min_trades, 전략 파라미터 등)
+    """
+    if results.empty:
+        return results
+    
+    bt = run_pivot_backtests(results[symbol_col].tolist(), start_date, end_date, **kwargs)
+    merged = results.merge(bt.rename(columns={'symbol': symbol_col}), on=symbol_col, how='left')
+    return merged.sort_values('bt_edge', ascending=False, na_position='last').reset_index(drop=True)
+
+
 def main():
     """
     메인 실행 함수 - 예시
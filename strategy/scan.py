@@ -19,12 +19,16 @@ Usage:
     
     # 전체 시장 스캔
     python scan.py --mode all --market ALL --limit 50
+    
+    # 신호 종목을 최근 1년 백테스트 edge 순으로 정렬
+    python scan.py --mode all --market KOSPI --backtest-days 365
 """
 
 import argparse
 import sys
 from datetime import datetime, timedelta
 from enhanced_scanner import EnhancedScanner
+from pivot_strategy import rank_by_backtest
 
 
 def main():
@@ -47,6 +51,9 @@ Examples:
   
   # 전체 시장 스캔 (최근 50개 종목)
   python scan.py --mode all --market ALL --limit 50
+  
+  # 신호 종목을 최근 1년 백테스트 edge 순으로 정렬
+  python scan.py --mode all --market KOSPI --backtest-days 365
         """
     )
     
@@ -96,6 +103,11 @@ Examples:
                        default=100000, 
                        help='최소 거래량 (기본: 100,000)')
     
+    parser.add_argument('--backtest-days', 
+                       type=int, 
+                       default=0, 
+                       help='신호 종목을 최근 N일 피벗 전략 백테스트 edge 순으로 정렬 (기본: 0 = 사용 안 함)')
+    
     parser.add_argument('--output-dir', 
                        default='./data', 
                        help='결과 저장 디렉토리 (기본: ./data)')
@@ -116,6 +128,24 @@ Examples:
     print(f"📈 거래량 임계값: {args.volume_threshold * 100:.0f}%")
     print("=" * 70)
     
+    display_cols = ['symbol', 'name', 'market', 'close', 'volume_ratio', 'price_change_pct', 'score']
+    
+    def rank(results):
+        """--backtest-days 지정 시 백테스트 edge 순 재정렬"""
+        if not args.backtest_days or results.empty:
+            return results
+        bt_start = (datetime.strptime(base_date, '%Y-%m-%d') - timedelta(days=args.backtest_days)).strftime('%Y-%m-%d')
+        print(f"\n📊 신호 종목 백테스트 중 ({bt_start} ~ {base_date})...")
+        return rank_by_backtest(
+            results, bt_start, base_date,
+            max_workers=args.workers,
+            pivot_period=args.pivot_period,
+            volume_threshold=args.volume_threshold,
+        )
+    
+    if args.backtest_days:
+        display_cols += ['bt_trades', 'bt_win_rate', 'bt_edge']
+    
     # 스캐너 초기화
     with EnhancedScanner(
         pivot_period=args.pivot_period,
@@ -160,12 +190,12 @@ Examples:
                     max_workers=args.workers,
                     progress=True
                 )
+                results = rank(results)
                 
                 if not results.empty:
                     print(f"\n✅ {len(results)}개 종목 신호 감지!")
                     print("\n🏆 결과:")
                     print("-" * 70)
-                    display_cols = ['symbol', 'name', 'market', 'close', 'volume_ratio', 'price_change_pct', 'score']
                     print(results[display_cols].to_string(index=False))
                     print("-" * 70)
                     
@@ -188,12 +218,12 @@ Examples:
                     max_workers=args.workers,
                     progress=True
                 )
+                results = rank(results)
                 
                 if not results.empty:
                     print(f"\n✅ {len(results)}개 종목 신호 감지!")
                     print("\n🏆 TOP 10:")
                     print("-" * 70)
-                    display_cols = ['symbol', 'name', 'market', 'close', 'volume_ratio', 'price_change_pct', 'score']
                     print(results[display_cols].head(10).to_string(index=False))
                     print("-" * 70)
                     
@@ -16,6 +16,7 @@ warnings.filterwarnings('ignore')
 import sys
 sys.path.insert(0, '/root/.openclaw/workspace/strg')
 from fdr_wrapper import get_price
+from indicator_filters import supertrend_trend, wavetrend
 
 # ============================================================================
 # 공통 함수
@@ -171,21 +172,10 @@ class SuperTrendBacktest:
         df['Upper_Band'] = hl2 + (self.multiplier * df['ATR'])
         df['Lower_Band'] = hl2 - (self.multiplier * df['ATR'])
         
-        df['SuperTrend'] = np.nan
-        df['Trend'] = 1  # 1: 상승, -1: 하락
-        
-        for i in range(1, len(df)):
-            if df['Close'].iloc[i] > df['Upper_Band'].iloc[i-1]:
-                df.loc[df.index[i], 'Trend'] = 1
-            elif df['Close'].iloc[i] < df['Lower_Band'].iloc[i-1]:
-                df.loc[df.index[i], 'Trend'] = -1
-            else:
-                df.loc[df.index[i], 'Trend'] = df['Trend'].iloc[i-1]
-            
-            if df['Trend'].iloc[i] == 1:
-                df.loc[df.index[i], 'SuperTrend'] = max(df['Lower_Band'].iloc[i], df['Lower_Band'].iloc[i-1])
-            else:
-                df.loc[df.index[i], 'SuperTrend'] = min(df['Upper_Band'].iloc[i], df['Upper_Band'].iloc[i-1])
+        # 1: 상승, -1: 하락
+        trend, line = supertrend_trend(df['Close'], df['Upper_Band'], df['Lower_Band'])
+        df['SuperTrend'] = line
+        df['Trend'] = trend
         
         # 매수/매도 신호
         df['Buy_Signal'] = (df['Trend'] == 1) & (df['Trend'].shift(1) == -1)
@@ -270,18 +260,9 @@ class WaveTrendBacktest:
         """WaveTrend (LazyBear) 계산"""
         df = df.copy()
         
-        hlc3 = (df['High'] + df['Low'] + df['Close']) / 3
-        
-        # EMA
-        esa = hlc3.ewm(span=self.channel_len, adjust=False).mean()
-        de = abs(hlc3 - esa).ewm(span=self.channel_len, adjust=False).mean()
-        
-        # CI
-        ci = (hlc3 - esa) / (0.015 * de)
-        
         # WaveTrend
-        df['WT1'] = ci.ewm(span=self.avg_len, adjust=False).mean()
-        df['WT2'] = df['WT1'].rolling(window=4).mean()
+        df['WT1'], df['WT2'] = wavetrend(df['High'], df['Low'], df['Close'],
+                                         self.channel_len, self.avg_len)
         
         # 신호
         df['Buy_Signal'] = (df['WT1'] < self.os_level) & (df['WT1'] > df['WT2'])
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Swing Pivots - 스윙 고점/저점 감지 커널
+좌우 N봉 비교 피봇을 롤링 최대/최소 한 번으로 계산한다 (봉 수에 선형).
+
+피봇 고점: i-left ~ i+right 구간에서 high[i]가 최댓값 (동률 허용)
+피봇 저점: 같은 구간에서 low[i]가 최솟값
+양끝 left / right 봉은 구간이 모자라 피봇이 될 수 없다.
+NaN 처리 (기존 루프와 동일):
+- swing_pivots / pivot_mask 기본: 구간에 NaN이 있으면 피봇이 아니다 (모든 봉과 >= 비교하던 BTC 루프)
+- swing_point_indices (skip_nan=True): 파이썬 내장 max/min(구간)과 같이 구간 첫 봉이 NaN이면 피봇 아님,
+  그 밖의 NaN은 건너뛰고 나머지 봉의 극값과 비교한다 (SMC 루프)
+
+사용법:
+    ph, pl = swing_pivots(df['high'], df['low'], left=5, right=5)
+    highs_idx, lows_idx = swing_point_indices(highs, lows, window=5)
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def pivot_mask(values, left: int, right: Optional[int] = None, mode: str = 'high',
+               skip_nan: bool = False) -> np.ndarray:
+    """
+    좌우 left/right봉 대비 극값인 봉 마스크
+
+    rolling(left+right+1).max()를 right만큼 당겨 i-left ~ i+right 중심 구간 극값과 비교한다.
+    mode: 'high' (최댓값) | 'low' (최솟값)
+    skip_nan: 내장 max/min처럼 구간 첫 봉이 아닌 NaN은 건너뜀 (기본은 NaN이 있으면 피봇 아님)
+    """
+    if right is None:
+        right = left
+    x = pd.Series(np.asarray(values, dtype=float))
+    window = left + right + 1
+    roll = x.rolling(window, min_periods=1 if skip_nan else None)
+    extreme = (roll.max() if mode == 'high' else roll.min()).shift(-right)
+    mask = (x == extreme).to_numpy().copy()
+    if skip_nan:
+        # 구간이 모자란 양끝 제외 + 구간 첫 봉(i-left)이 NaN이면 내장 max/min 결과가 NaN
+        n = len(mask)
+        mask[:min(left, n)] = False
+        mask[max(n - right, 0):] = False
+        if n > left:
+            mask[left:] &= ~np.isnan(x.to_numpy()[:n - left])
+    return mask
+
+
+def swing_pivots(highs, lows, left: int, right: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """(피봇 고점 마스크, 피봇 저점 마스크)"""
+    return pivot_mask(highs, left, right, 'high'), pivot_mask(lows, left, right, 'low')
+
+
+def swing_point_indices(highs, lows, window: int = 5) -> Tuple[List[int], List[int]]:
+    """좌우 window봉 스윙 고점/저점 위치 리스트 (오름차순, NaN은 내장 max/min 규칙)"""
+    ph = pivot_mask(highs, window, window, 'high', skip_nan=True)
+    pl = pivot_mask(lows, window, window, 'low', skip_nan=True)
+    return np.flatnonzero(ph).tolist(), np.flatnonzero(pl).tolist()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Crypto Candle Store Test - 로컬 캔들 저장소 테스트
+거래소 대신 메모리의 가짜 fetcher로 증분 수집 / 재요청 없음 / 과거 확장 / 리샘플을 확인한다.
+
+실행: python -m pytest -q test_crypto_candle_store.py
+"""
+
+import pandas as pd
+
+from crypto_candle_store import CryptoCandleStore, to_ms
+
+H = 3_600_000
+T0 = to_ms('2024-01-01')            # 월요일 00:00 UTC
+
+
+class FakeExchange:
+    """1h 봉 [ts, o, h, l, c, v]를 돌려주는 가짜 거래소 (요청 since 기록)"""
+
+    def __init__(self, n_hours: int):
+        self.rows = [[T0 + i * H, 100 + i, 102 + i, 99 + i, 101 + i, 1.0 + i % 3] for i in range(n_hours)]
+        self.calls = []
+
+    def __call__(self, symbol, timeframe, since, limit):
+        self.calls.append(since)
+        return [r for r in self.rows if r[0] >= since][:limit]
+
+
+def make_store(tmp_path, exchange, now_ms, **kwargs):
+    return CryptoCandleStore(exchange, root=str(tmp_path), page_limit=100,
+                             clock=lambda: now_ms / 1000, **kwargs)
+
+
+def test_incremental_fetch_starts_after_last_stored_bar(tmp_path):
+    exchange = FakeExchange(300)
+    store = make_store(tmp_path, exchange, T0 + 200 * H)
+    assert store.update('BTC/USDT', '1h', start=T0) == 200
+    assert store.last_timestamp('BTC/USDT', '1h') == T0 + 199 * H
+
+    exchange.calls.clear()
+    later = make_store(tmp_path, exchange, T0 + 250 * H)
+    assert later.update('BTC/USDT', '1h') == 50
+    assert exchange.calls[0] == T0 + 200 * H
+    df = later.load('BTC/USDT', '1h', start=T0)
+    assert len(df) == 250 and df.index.is_monotonic_increasing
+
+
+def test_fresh_store_makes_no_requests(tmp_path):
+    exchange = FakeExchange(300)
+    now = T0 + 120 * H + H // 2      # ts=120h 봉은 진행 중
+    make_store(tmp_path, exchange, now).load('BTC/USDT', '1h', start=T0)
+
+    store = make_store(tmp_path, exchange, now)
+    df = store.load('BTC/USDT', '1h', start=T0)
+    assert store.requests == 0
+    assert len(df) == 120             # 마감된 봉만 저장
+
+
+def test_backfill_earlier_range(tmp_path):
+    exchange = FakeExchange(300)
+    store = make_store(tmp_path, exchange, T0 + 300 * H)
+    store.update('BTC/USDT', '1h', start=T0 + 100 * H)
+    exchange.calls.clear()
+
+    df = store.load('BTC/USDT', '1h', start=T0 + 40 * H)
+    assert exchange.calls[0] == T0 + 40 * H
+    assert df.index[0] == pd.Timestamp(T0 + 40 * H, unit='ms')
+    assert len(df) == 260
+    assert not df.index.duplicated().any()
+
+
+def test_resample_1h_to_4h_and_1d(tmp_path):
+    exchange = FakeExchange(24 * 5 + 6)
+    store = make_store(tmp_path, exchange, T0 + (24 * 5 + 6) * H, resample_from='1h')
+
+    h4 = store.load('BTC/USDT', '4h', start=T0)
+    d1 = store.load('BTC/USDT', '1d', start=T0)
+    assert len(h4) == 31 and len(d1) == 5    # 진행 중 버킷(2h)은 제외
+    assert store.path('BTC/USDT', '4h').exists() is False
+
+    first = exchange.rows[:4]
+    assert h4.iloc[0].tolist() == [first[0][1], max(r[2] for r in first), min(r[3] for r in first),
+                                   first[-1][4], sum(r[5] for r in first)]
+    day = exchange.rows[24:48]
+    assert d1.index[1] == pd.Timestamp('2024-01-02')
+    assert d1.iloc[1]['open'] == day[0][1] and d1.iloc[1]['close'] == day[-1][4]
+    assert d1.iloc[1]['volume'] == sum(r[5] for r in day)
+
+
+def test_resample_keeps_exchange_gap_buckets(tmp_path):
+    exchange = FakeExchange(24 * 5 + 6)
+    del exchange.rows[30]                    # 2일차 06:00 봉 결측
+    now = T0 + (24 * 5 + 6) * H
+
+    store = make_store(tmp_path / 'gaps', exchange, now, resample_from='1h')
+    d1 = store.load('BTC/USDT', '1d', start=T0)
+    assert len(d1) == 5
+    assert store.resample_stats[('BTC/USDT', '1d')] == {'gap_buckets': 1, 'dropped_buckets': 1}
+
+    strict = make_store(tmp_path / 'strict', exchange, now, resample_from='1h', keep_gaps=False)
+    assert len(strict.load('BTC/USDT', '1d', start=T0)) == 4
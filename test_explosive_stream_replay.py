@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Explosive Stream Replay Test - 장중 스트리밍 스캐너 봉 파일 재생 테스트
+기록된 봉 파일(CSV/JSONL)을 재생한 결과가 같은 봉으로 돌린 배치 분석과 같은지 확인한다.
+
+실행: python -m pytest -q test_explosive_stream_replay.py
+"""
+
+import json
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from explosive_scanner_v7 import ExplosiveStreamScanner
+
+logging.disable(logging.INFO)
+
+CODES = ('005930', '000660', '035720')
+
+
+def make_bars() -> pd.DataFrame:
+    """3종목 × 70영업일 일봉 (종목코드 앞자리 0 포함)"""
+    rng = np.random.default_rng(3)
+    dates = pd.bdate_range('2026-01-05', periods=70).strftime('%Y-%m-%d')
+    rows = []
+    for code, drift in zip(CODES, (0.01, 0.0, -0.005)):
+        price = 10_000.0
+        for d in dates:
+            close = price * (1 + drift + rng.normal(0, 0.02))
+            rows.append({'code': code, 'name': f'종목{code}', 'market': 'KOSPI', 'date': d,
+                         'open': price, 'high': max(price, close) * 1.01, 'low': min(price, close) * 0.99,
+                         'close': close, 'volume': float(rng.integers(100_000, 1_000_000)),
+                         'change_pct': (close / price - 1) * 100})
+            price = close
+    return pd.DataFrame(rows)
+
+
+def write_jsonl(path, bars: pd.DataFrame, numeric_code: bool):
+    with open(path, 'w') as f:
+        for bar in bars.to_dict('records'):
+            if numeric_code:
+                bar['code'] = int(bar['code'])      # 5930처럼 숫자로 기록된 파일
+            f.write(json.dumps(bar, ensure_ascii=False) + '\n')
+
+
+def batch_scores(bars: pd.DataFrame) -> dict:
+    scanner = ExplosiveStreamScanner()
+    scanner.data = bars
+    return {code: scanner._score_stock(scanner.analyze_stock(code)) for code in CODES}
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'jsonl', 'jsonl_numeric_code'])
+def test_replay_matches_batch_scan(tmp_path, fmt):
+    bars = make_bars()
+    path = tmp_path / f'bars.{fmt.split("_")[0]}'
+    if fmt == 'csv':
+        bars.to_csv(path, index=False)
+    else:
+        write_jsonl(path, bars, numeric_code=fmt == 'jsonl_numeric_code')
+
+    scanner = ExplosiveStreamScanner()
+    scanner.replay_bar_file(str(path))
+
+    assert sorted(scanner.results) == sorted(CODES)
+    expected = batch_scores(bars)
+    for code in CODES:
+        got, want = scanner.results[code], expected[code]
+        assert got['score'] == want['score']
+        assert got['can_enter'] == want['can_enter']
+        assert got['rsi'] == pytest.approx(want['rsi'])
+        assert got['ma20'] == pytest.approx(want['ma20'])
+        assert got['vol_ratio'] == pytest.approx(want['vol_ratio'])
+
+
+def test_replay_per_bar_equals_per_timestamp(tmp_path):
+    path = tmp_path / 'bars.csv'
+    make_bars().to_csv(path, index=False)
+
+    by_date, by_bar = ExplosiveStreamScanner(), ExplosiveStreamScanner()
+    by_date.replay_bar_file(str(path))
+    by_bar.replay_bar_file(str(path), rescore_every='bar')
+    assert {c: r['score'] for c, r in by_date.results.items()} == \
+           {c: r['score'] for c, r in by_bar.results.items()}
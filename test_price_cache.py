@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Price Cache Test - 프로세스 전역 가격 캐시 테스트
+범위 포함 조회가 실제로 받은 날짜 범위 안에서만 재사용되는지 확인한다.
+
+실행: python -m pytest -q test_price_cache.py
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent / 'v2' / 'core'))
+from price_cache import PriceCache
+
+
+def make_bars(start: str, end: str) -> pd.DataFrame:
+    dates = pd.bdate_range(start, end)
+    return pd.DataFrame({'date': dates, 'close': range(len(dates))})
+
+
+class Loader:
+    """기준일(today)까지 존재하는 봉만 돌려주는 가짜 DB"""
+
+    def __init__(self, today: str):
+        self.today = today
+        self.calls = 0
+
+    def __call__(self, start: str, end: str):
+        self.calls += 1
+        return make_bars(start, min(end, self.today))
+
+
+def test_subrange_inside_loaded_range_is_sliced():
+    cache, load = PriceCache(), Loader('2026-03-31')
+    cache.get_or_load('005930', '2026-01-01', '2026-03-31', lambda: load('2026-01-01', '2026-03-31'))
+    df = cache.get_or_load('005930', '2026-02-02', '2026-02-27', lambda: load('2026-02-02', '2026-02-27'))
+    assert load.calls == 1
+    assert cache.stats()['range_hits'] == 1
+    assert df['date'].iloc[0] == pd.Timestamp('2026-02-02') and df['date'].iloc[-1] == pd.Timestamp('2026-02-27')
+
+
+def test_superset_loaded_before_data_existed_is_not_reused_past_its_data():
+    cache, load = PriceCache(), Loader('2026-03-10')
+    # 3/10에 미래 종료일(4월 말)까지 요청 → 3/10까지만 들어 있음
+    cache.get_or_load('005930', '2026-01-01', '2026-04-30', lambda: load('2026-01-01', '2026-04-30'))
+
+    load.today = '2026-03-20'
+    df = cache.get_or_load('005930', '2026-03-02', '2026-03-20', lambda: load('2026-03-02', '2026-03-20'))
+    assert load.calls == 2
+    assert df['date'].iloc[-1] == pd.Timestamp('2026-03-20')
+
+    # 데이터가 있는 구간 안의 하위 범위는 계속 재사용
+    cache.get_or_load('005930', '2026-02-02', '2026-03-06', lambda: load('2026-02-02', '2026-03-06'))
+    assert load.calls == 2
+
+
+def test_intraday_ttl_expires_entry(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr('price_cache.time.monotonic', lambda: clock[0])
+    cache, load = PriceCache(), Loader('2026-03-10')
+    cache.get_or_load('005930', '2026-03-02', '2026-03-10', lambda: load('2026-03-02', '2026-03-10'), ttl=60)
+    cache.get_or_load('005930', '2026-03-02', '2026-03-10', lambda: load('2026-03-02', '2026-03-10'), ttl=60)
+    assert load.calls == 1
+
+    clock[0] += 61
+    cache.get_or_load('005930', '2026-03-02', '2026-03-10', lambda: load('2026-03-02', '2026-03-10'), ttl=60)
+    assert load.calls == 2
+    assert cache.stats()['expirations'] == 1
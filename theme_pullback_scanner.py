@@ -22,6 +22,8 @@ from typing import List, Dict, Optional, Tuple
 import json
 import os
 
+from forward_returns import ForwardReturnStore
+
 
 class ThemeMomentumScanner:
     """테마 모멘텀 스캐너"""
@@ -222,11 +224,16 @@ class ThemeMomentumScanner:
 class ThemePullbackBacktester:
     """테마 눌림목 백테스터"""
     
-    def __init__(self, db_path: str = 'data/level1_prices.db'):
+    def __init__(self, db_path: str = 'data/level1_prices.db',
+                 forward: Optional[ForwardReturnStore] = None):
         self.db_path = db_path
+        self.forward = forward  # 지정 시 신호별 SQL 대신 memmap 패널에서 조회
     
     def get_future_data(self, code: str, entry_date: str, days: int = 10) -> pd.DataFrame:
         """진입 후 데이터 조회"""
+        if self.forward is not None:
+            return self.forward.future_frame(code, entry_date, days + 1, inclusive=True)
+        
         conn = sqlite3.connect(self.db_path)
         
         query = """
@@ -425,7 +432,8 @@ def main():
     print(f"📊 총 눌림목 진입: {len(all_entries)} 개")
     
     if all_entries:
-        backtester = ThemePullbackBacktester()
+        backtester = ThemePullbackBacktester(
+            forward=ForwardReturnStore.load_or_build(scanner.db_path))
         
         # 시나리오 1: 보수적 (손절 -5%, 익절 10%)
         print("\n" + "=" * 60)
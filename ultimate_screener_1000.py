@@ -343,6 +343,288 @@ class UltimateScreener:
             'liquidity': liquidity
         }
     
+    # ==================== 전종목 일괄 채점 (벡터화) ====================
+    
+    ETF_KEYWORDS = ['ETF', 'ETN', '레버리지', '인버스', ' SECURITIES', 'FUND']
+    ETF_CODE_PREFIXES = ('3', '4', '5', '6')
+    
+    def build_etf_universe(self, symbols):
+        """종목 유니버스 전체의 ETF 여부를 한 번에 계산 (is_etf와 동일 규칙)"""
+        symbols = pd.Series(list(symbols), dtype=str)
+        names = symbols.map(lambda s: self.stock_names.get(s, s)).str.upper()
+        pattern = '|'.join(k.upper() for k in self.ETF_KEYWORDS)
+        flags = names.str.contains(pattern, regex=True) | symbols.str.startswith(self.ETF_CODE_PREFIXES)
+        self.etf_universe = dict(zip(symbols, flags.astype(bool)))
+        return self.etf_universe
+    
+    def load_panel(self, days=120, symbols=None):
+        """전종목 N일 가격 일괄 로드 (symbol, date 정렬 long 포맷)"""
+        query = '''SELECT symbol, date, open, high, low, close, volume 
+                   FROM stock_prices WHERE date >= date('now', '-{} days')
+                   ORDER BY symbol, date'''.format(days)
+        df = pd.read_sql_query(query, self.conn)
+        if symbols is not None:
+            df = df[df['symbol'].isin(set(symbols))]
+        df['date'] = pd.to_datetime(df['date'])
+        return df.reset_index(drop=True)
+    
+    def calc_indicators_panel(self, df):
+        """calc_indicators()를 전종목 long 포맷 패널에 그룹 단위로 적용"""
+        df = df.copy()
+        g = df.groupby('symbol', sort=False)
+        close = g['close']
+        
+        def per_group(result):
+            return result.reset_index(level=0, drop=True)
+        
+        # EMA
+        df['ema20'] = per_group(close.ewm(span=20).mean())
+        df['ema60'] = per_group(close.ewm(span=60).mean())
+        df['ema120'] = per_group(close.ewm(span=120).mean())
+        
+        # RSI
+        delta = close.diff()
+        df['_gain'] = delta.where(delta > 0, 0)
+        df['_loss'] = -delta.where(delta < 0, 0)
+        gain = per_group(df.groupby('symbol', sort=False)['_gain'].rolling(14).mean())
+        loss = per_group(df.groupby('symbol', sort=False)['_loss'].rolling(14).mean())
+        df['rsi'] = 100 - (100 / (1 + gain / loss))
+        
+        # MACD
+        ema12 = per_group(close.ewm(span=12).mean())
+        ema26 = per_group(close.ewm(span=26).mean())
+        df['macd'] = ema12 - ema26
+        df['macd_sig'] = per_group(df.groupby('symbol', sort=False)['macd'].ewm(span=9).mean())
+        df['macd_hist'] = df['macd'] - df['macd_sig']
+        
+        # 볼린저
+        df['ma20'] = per_group(close.rolling(20).mean())
+        df['std20'] = per_group(close.rolling(20).std())
+        df['bb_up'] = df['ma20'] + df['std20'] * 2
+        df['bb_low'] = df['ma20'] - df['std20'] * 2
+        
+        # ATR
+        prev_close = close.shift(1)
+        df['tr'] = np.maximum(df['high'] - df['low'],
+            np.maximum(abs(df['high'] - prev_close),
+                      abs(df['low'] - prev_close)))
+        df['atr14'] = per_group(df.groupby('symbol', sort=False)['tr'].rolling(14).mean())
+        
+        # 거래량
+        df['vol_ma20'] = per_group(g['volume'].rolling(20).mean())
+        df['vol_ratio'] = df['volume'] / df['vol_ma20']
+        
+        # 종목 내 끝에서부터의 위치 (0 = 최신)
+        df['rpos'] = g.cumcount(ascending=False)
+        df['n_rows'] = g['close'].transform('size')
+        return df.drop(columns=['_gain', '_loss'])
+    
+    def score_all(self, panel):
+        """
+        score_stock()의 채점 규칙을 종목별 벡터 연산으로 평가
+        
+        Returns:
+            종목당 1행 DataFrame (점수, 세부점수, 목표가/손절가, 판단 플래그)
+        """
+        panel = panel[panel['n_rows'] >= 60]
+        if panel.empty:
+            return pd.DataFrame()
+        
+        def tail_agg(col, n, how, source=None):
+            values = panel[source or col].where(panel['rpos'] < n)
+            return values.groupby(panel['symbol'], sort=False).agg(how)
+        
+        def at_rpos(col, k):
+            rows = panel[panel['rpos'] == k]
+            return rows.set_index('symbol')[col]
+        
+        s = panel[panel['rpos'] == 0].set_index('symbol')[[
+            'close', 'ema20', 'ema60', 'ema120', 'rsi', 'macd_hist',
+            'bb_up', 'bb_low', 'atr14', 'vol_ratio'
+        ]].rename(columns={'close': 'price'})
+        s['high_52w'] = tail_agg('high', 252, 'max')
+        s['close_60'] = at_rpos('close', 59)
+        s['close_20'] = at_rpos('close', 19)
+        s['hist_1'] = at_rpos('macd_hist', 1)
+        s['hist_2'] = at_rpos('macd_hist', 2)
+        panel = panel.assign(_amount=panel['close'] * panel['volume'])
+        s['amount'] = tail_agg('_amount', 20, 'mean') / 100000000
+        s['vol_5'] = tail_agg('volume', 5, 'mean')
+        s['vol_20'] = tail_agg('volume', 20, 'mean')
+        s['recent_high'] = tail_agg('high', 20, 'max')
+        s['recent_low'] = tail_agg('low', 20, 'min')
+        s['last_low'] = tail_agg('low', 10, 'min')
+        s['recent_low_5d'] = tail_agg('low', 5, 'min')
+        
+        price = s['price']
+        rsi = s['rsi']
+        vol_ratio = s['vol_ratio']
+        
+        # 1. 추세 점수 (0-250)
+        s['f_above_ema20'] = price > s['ema20']
+        s['f_ema20_60'] = s['ema20'] > s['ema60']
+        s['f_ema60_120'] = s['ema60'] > s['ema120']
+        s['from_high'] = (s['high_52w'] - price) / s['high_52w']
+        valid_high = s['high_52w'] > 0
+        s['f_high10'] = valid_high & (s['from_high'] < 0.10)
+        s['f_high20'] = valid_high & ~s['f_high10'] & (s['from_high'] < 0.20)
+        s['ret60'] = (price - s['close_60']) / s['close_60'] * 100
+        s['f_ret60'] = s['ret60'] > 20
+        trend = (60 * s['f_above_ema20'] + 60 * s['f_ema20_60'] + 50 * s['f_ema60_120']
+                 + 50 * s['f_high10'] + 30 * s['f_high20'] + 30 * s['f_ret60'])
+        s['trend'] = np.minimum(trend, 250)
+        
+        # 2. 모멘텀 점수 (0-200)
+        s['f_rsi'] = (rsi >= 45) & (rsi <= 65)
+        rsi_wide = ~s['f_rsi'] & (rsi >= 40) & (rsi <= 70)
+        s['f_macd'] = s['macd_hist'] > 0
+        s['f_macd_up'] = (s['macd_hist'] > s['hist_1']) & (s['hist_1'] > s['hist_2'])
+        s['ret20'] = (price - s['close_20']) / s['close_20'] * 100
+        s['f_ret20'] = (s['ret20'] >= 5) & (s['ret20'] <= 30)
+        ret20_pos = ~s['f_ret20'] & (s['ret20'] > 0)
+        mom = (60 * s['f_rsi'] + 30 * rsi_wide + 40 * s['f_macd'] + 30 * s['f_macd_up']
+               + 50 * s['f_ret20'] + 20 * ret20_pos)
+        s['momentum'] = np.minimum(mom, 200)
+        
+        # 3. 거래량 점수 (0-200)
+        vol_pts = np.select(
+            [vol_ratio >= 2.5, vol_ratio >= 2.0, vol_ratio >= 1.5, vol_ratio >= 1.0],
+            [80, 60, 40, 20], 0
+        )
+        amount_pts = np.select(
+            [s['amount'] >= 100, s['amount'] >= 50, s['amount'] >= 10],
+            [60, 40, 20], 0
+        )
+        s['f_vol_up'] = s['vol_5'] > s['vol_20']
+        s['volume'] = np.minimum(vol_pts + amount_pts + 20 * s['f_vol_up'], 200)
+        
+        # 4. 변동성/리스크 점수 (0-150)
+        s['atr_pct'] = s['atr14'] / price * 100
+        s['f_atr'] = (s['atr14'] > 0) & (s['atr_pct'] >= 2) & (s['atr_pct'] <= 5)
+        bb_range = s['bb_up'] - s['bb_low']
+        s['bb_pos'] = (price - s['bb_low']) / bb_range
+        s['f_bb'] = (bb_range > 0) & (s['bb_pos'] >= 0.4) & (s['bb_pos'] <= 0.7)
+        s['volatility'] = np.minimum(60 * s['f_atr'] + 50 * s['f_bb'], 150)
+        
+        # 5. 피봇/브레이크아웃 점수 (0-200)
+        s['proximity'] = (s['recent_high'] - price) / s['recent_high'] * 100
+        valid_rh = s['recent_high'] > 0
+        s['f_near_high'] = valid_rh & (s['proximity'] <= 3)
+        s['f_pullback'] = valid_rh & ~s['f_near_high'] & (s['proximity'] <= 7)
+        box_range = (s['recent_high'] - s['recent_low']) / s['recent_low'] * 100
+        s['f_box'] = (s['recent_high'] > s['recent_low']) & (box_range < 15)
+        s['pivot'] = np.minimum(80 * s['f_near_high'] + 40 * s['f_pullback'] + 40 * s['f_box'], 200)
+        
+        s['score'] = s['trend'] + s['momentum'] + s['volume'] + s['volatility'] + s['pivot']
+        
+        # 목표가/손절가
+        atr = s['atr14']
+        has_atr = atr > 0
+        box = s['recent_high'] - s['recent_low']
+        move = price - s['last_low']
+        above_box = s['recent_high'] > price
+        targets = np.column_stack([
+            price + atr * 3,
+            price + atr * 4.5,
+            np.where(above_box, s['recent_high'] + box * 0.5, np.nan),
+            np.where(above_box, s['recent_high'] + box * 0.8, np.nan),
+            np.where(move > 0, price + move * 1.272, np.nan),
+            np.where(move > 0, price + move * 1.618, np.nan),
+        ])
+        stops = np.column_stack([
+            price - atr * 1.5,
+            price - atr * 2.0,
+            price - atr * 2.5,
+            s['ema20'] * 0.98,
+            s['ema20'] * 0.95,
+            s['recent_low_5d'] * 0.99,
+        ])
+        p = price.values[:, None]
+        with np.errstate(invalid='ignore'):
+            targets = np.where(targets > p, targets, np.nan)
+            stops = np.where(stops < p, stops, np.nan)
+        all_nan_t = np.isnan(targets).all(axis=1)
+        all_nan_s = np.isnan(stops).all(axis=1)
+        target = np.where(all_nan_t, price * 1.10, np.nanmax(np.where(all_nan_t[:, None], 0, targets), axis=1))
+        stop_loss = np.where(all_nan_s, price * 0.93, np.nanmin(np.where(all_nan_s[:, None], 0, stops), axis=1))
+        potential_loss = price - stop_loss
+        rr = np.where(potential_loss > 0, (target - price) / potential_loss.where(potential_loss > 0), 0)
+        
+        s['target'] = np.where(has_atr, target, price * 1.15)
+        s['stop_loss'] = np.where(has_atr, stop_loss, price * 0.93)
+        s['rr_ratio'] = np.where(has_atr, rr, (0.15 * price) / (0.07 * price))
+        
+        s['liquidity'] = np.select([vol_ratio >= 1.0, vol_ratio >= 0.5], ['high', 'medium'], 'low')
+        s['is_etf'] = [self.etf_universe.get(sym) if sym in self.etf_universe
+                       else self.is_etf(sym, self.stock_names.get(sym, sym)) for sym in s.index]
+        return s
+    
+    def _build_reasons(self, row):
+        """채점 플래그 → score_stock()과 동일 순서의 선정근거"""
+        reasons = []
+        if row['f_above_ema20']:
+            reasons.append('주가>EMA20')
+        if row['f_ema20_60']:
+            reasons.append('정배열20>60')
+        if row['f_ema60_120']:
+            reasons.append('정배열60>120')
+        if row['f_high10']:
+            reasons.append('52주고가-10%')
+        elif row['f_high20']:
+            reasons.append('52주고가-20%')
+        if row['f_ret60']:
+            reasons.append(f"60일+{row['ret60']:.0f}%")
+        if row['f_rsi']:
+            reasons.append(f"RSI{row['rsi']:.0f}")
+        if row['f_macd']:
+            reasons.append('MACD+')
+        if row['f_macd_up']:
+            reasons.append('MACD증가')
+        if row['f_ret20']:
+            reasons.append(f"20일+{row['ret20']:.0f}%")
+        if row['vol_ratio'] >= 2.0:
+            reasons.append(f"거래량{row['vol_ratio']:.1f}배")
+        if row['amount'] >= 100:
+            reasons.append(f"대금{row['amount']:.0f}억")
+        if row['f_vol_up']:
+            reasons.append('거래량증가')
+        if row['f_atr']:
+            reasons.append(f"ATR{row['atr_pct']:.1f}%")
+        if row['f_bb']:
+            reasons.append(f"BB상단{row['bb_pos']*100:.0f}%")
+        if row['f_near_high']:
+            reasons.append(f"고가근접{row['proximity']:.1f}%")
+        elif row['f_pullback']:
+            reasons.append(f"눌림목{row['proximity']:.1f}%")
+        if row['f_box']:
+            reasons.append('박스권수렴')
+        return reasons[:8]
+    
+    def _to_result(self, symbol, row):
+        """벡터 채점 결과 1행 → score_stock() 반환 형식"""
+        return {
+            'symbol': symbol,
+            'name': self.stock_names.get(symbol, symbol),
+            'price': round(float(row['price']), 0),
+            'score': int(row['score']),
+            'scores': {
+                'total': int(row['score']),
+                'trend': int(row['trend']),
+                'momentum': int(row['momentum']),
+                'volume': int(row['volume']),
+                'volatility': int(row['volatility']),
+                'pivot': int(row['pivot']),
+            },
+            'rsi': round(float(row['rsi']), 1),
+            'vol_ratio': round(float(row['vol_ratio']), 2),
+            'stop_loss': round(float(row['stop_loss']), 0),
+            'target': round(float(row['target']), 0),
+            'rr_ratio': round(float(row['rr_ratio']), 2),
+            'reasons': self._build_reasons(row),
+            'is_etf': bool(row['is_etf']),
+            'liquidity': row['liquidity']
+        }
+    
     def scan_all(self):
         cursor = self.conn.cursor()
         cursor.execute('SELECT DISTINCT symbol FROM stock_prices WHERE date >= "2025-01-01"')
@@ -350,28 +632,32 @@ class UltimateScreener:
         
         print(f"총 {len(symbols)}개 종목 분석 시작...")
         
+        # 120일 가격 1회 일괄 로드 → 전종목 지표/채점 벡터 연산
+        self.build_etf_universe(symbols)
+        panel = self.calc_indicators_panel(self.load_panel(days=120, symbols=symbols))
+        scored = self.score_all(panel)
+        if not scored.empty:
+            scored = scored.reindex([sym for sym in symbols if sym in scored.index])
+        
         all_results = []
         etf_results = []
         stock_results = []
         low_liquidity = []  # 유동성 부족 종목
         
-        for i, symbol in enumerate(symbols, 1):
-            if i % 100 == 0:
-                print(f"  진행: {i}/{len(symbols)} ({i/len(symbols)*100:.1f}%)")
+        selected = scored[scored['score'] >= 500] if not scored.empty else scored
+        for symbol, row in selected.iterrows():
+            result = self._to_result(symbol, row)
+            all_results.append(result)
+            
+            # ETF/개별주 분리
+            if result['is_etf']:
+                etf_results.append(result)
+            else:
+                stock_results.append(result)
             
-            result = self.score_stock(symbol)
-            if result and result['score'] >= 500:
-                all_results.append(result)
-                
-                # ETF/개별주 분리
-                if result['is_etf']:
-                    etf_results.append(result)
-                else:
-                    stock_results.append(result)
-                
-                # 유동성 부족 종목 체크
-                if result['liquidity'] == 'low':
-                    low_liquidity.append(result)
+            # 유동성 부족 종목 체크
+            if result['liquidity'] == 'low':
+                low_liquidity.append(result)
         
         # 점수 순 정렬
         all_results.sort(key=lambda x: x['score'], reverse=True)
@@ -27,6 +27,8 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import argparse
 
+from forward_returns import ForwardReturnStore
+
 
 DB_PATH = 'data/level1_prices.db'
 
@@ -257,9 +259,48 @@ class UpperLimitPredictor:
         print(f"총 {len(results)}개 종목 선별됨")
         print(f"{'='*70}")
     
-    def backtest(self, scan_date: str, min_score: int = 40, hold_days: int = 1) -> Dict:
+    def _future_from_db(self, code: str, scan_date: str, hold_days: int) -> Optional[Tuple]:
+        """신호 하나의 이후 hold_days일 (청산일, 청산가, 고가, 저가) - SQL 조회"""
+        query = """
+        SELECT date, open, high, low, close
+        FROM price_data 
+        WHERE code = ? AND date > ?
+        ORDER BY date
+        LIMIT ?
+        """
+        df = pd.read_sql_query(query, self.conn, params=(code, scan_date, hold_days))
+        
+        if df.empty:
+            return None
+        
+        # 청산 가격 설정 (다음날 종가)
+        exit_row = df.iloc[-1]
+        return exit_row['date'], exit_row['close'], df['high'].max(), df['low'].min()
+    
+    def _future_from_store(self, forward: ForwardReturnStore, signals: List[Dict],
+                           scan_date: str, hold_days: int) -> List[Optional[Tuple]]:
+        """전 신호의 (청산일, 청산가, 고가, 저가)를 memmap OHLC 패널 인덱싱 한 번으로 조회 (SQL과 같은 행 규칙)"""
+        codes = [s['code'] for s in signals]
+        bars = forward.bars(codes, [scan_date] * len(codes), hold_days)
+        with np.errstate(all='ignore'):
+            max_price = np.nanmax(np.where(bars.n_bars[:, None] > 0, bars.high, 0), axis=1)
+            min_price = np.nanmin(np.where(bars.n_bars[:, None] > 0, bars.low, 0), axis=1)
+        
+        futures = []
+        for i, n in enumerate(bars.n_bars):
+            if n == 0:
+                futures.append(None)
+                continue
+            futures.append((bars.dates[i, n - 1], float(bars.close[i, n - 1]),
+                            float(max_price[i]), float(min_price[i])))
+        return futures
+    
+    def backtest(self, scan_date: str, min_score: int = 40, hold_days: int = 1,
+                 forward: Optional[ForwardReturnStore] = None) -> Dict:
         """
         백테스트: 스캔 당일 매수 → 다음날 청산 수익률 검증
+        
+        forward 지정 시 신호별 SQL 대신 이후 수익률 텐서에서 한 번에 조회
         """
         print(f"\n{'='*70}")
         print(f"📊 상한가 예측 백테스트")
@@ -280,37 +321,26 @@ class UpperLimitPredictor:
         
         print(f"\n📈 {len(test_signals)}개 종목 백테스트 진행...\n")
         
+        if forward is not None:
+            futures = self._future_from_store(forward, test_signals, scan_date, hold_days)
+        else:
+            futures = [self._future_from_db(s['code'], scan_date, hold_days) for s in test_signals]
+        
         trades = []
         
-        for signal in test_signals:
+        for signal, future in zip(test_signals, futures):
+            if future is None:
+                continue
+            
             code = signal['code']
             entry_price = signal['close']
             entry_date = scan_date
-            
-            # 다음날 데이터 조회
-            query = """
-            SELECT date, open, high, low, close
-            FROM price_data 
-            WHERE code = ? AND date > ?
-            ORDER BY date
-            LIMIT ?
-            """
-            df = pd.read_sql_query(query, self.conn, params=(code, scan_date, hold_days))
-            
-            if df.empty:
-                continue
-            
-            # 청산 가격 설정 (다음날 종가)
-            exit_row = df.iloc[-1]
-            exit_price = exit_row['close']
-            exit_date = exit_row['date']
+            exit_date, exit_price, max_price, min_price = future
             
             # 수익률 계산
             return_pct = ((exit_price - entry_price) / entry_price) * 100
             
             # 고점/저점 기록
-            max_price = df['high'].max()
-            min_price = df['low'].min()
             max_return = ((max_price - entry_price) / entry_price) * 100
             min_return = ((min_price - entry_price) / entry_price) * 100
             
@@ -395,6 +425,8 @@ def main():
                        help='최소 점수 (기본 60)')
     parser.add_argument('--top', type=int, default=20,
                        help='상위 N개 출력 (기본 20)')
+    parser.add_argument('--forward', action='store_true',
+                       help='백테스트 시 이후 수익률 텐서(data/forward_returns) 사용')
     
     args = parser.parse_args()
     
@@ -430,7 +462,8 @@ def main():
             scan_date = result[0] if result[0] else datetime.now().strftime('%Y-%m-%d')
         
         # 백테스트 실행
-        result = predictor.backtest(scan_date, args.min_score, hold_days=1)
+        forward = ForwardReturnStore.load_or_build(DB_PATH) if args.forward else None
+        result = predictor.backtest(scan_date, args.min_score, hold_days=1, forward=forward)
         
         # JSON 저장
         if result:
@@ -20,6 +20,7 @@ sys.path.insert(0, str(strategies_dir))
 
 from data_manager import DataManager
 from backtest_engine import BacktestEngine
+from walk_forward import WalkForwardHarness, walk_forward_folds, purged_kfold
 from explosive import ExplosiveV7Strategy
 from dplus import DPlusStrategy
 from ivf import IVFScanner
@@ -43,6 +44,12 @@ def main():
                        help='테스트할 종목 (쉼표 구분, 미지정시 전체)')
     parser.add_argument('--json', type=str, default=None,
                        help='결과 저장 JSON 경로')
+    parser.add_argument('--walk-forward', type=str, default=None,
+                       help='워크포워드 검증 (학습일,검증일 예: 60,20)')
+    parser.add_argument('--kfold', type=int, default=None,
+                       help='purged k-fold 검증 (분할 수)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='병렬 워커 수 (기본: CPU 수)')
     
     args = parser.parse_args()
     
@@ -89,6 +96,11 @@ def main():
         codes = data_manager.get_all_codes(args.end)
         print(f"📈 대상 종목: {len(codes)}개 (전체)")
     
+    # 워크포워드 / k-fold 검증
+    if args.walk_forward or args.kfold:
+        run_validation(args, data_manager, strategy_map[args.strategy], codes)
+        return
+    
     # Create backtest engine
     engine = BacktestEngine(
         data_manager=data_manager,
@@ -141,5 +153,46 @@ def main():
     print("=" * 70)
 
 
+def run_validation(args, data_manager, strategy_cls, codes):
+    """워크포워드 / purged k-fold 검증 실행 (손익 파라미터는 CLI 값 주변 격자)"""
+    harness = WalkForwardHarness(
+        strategy_cls,
+        data_manager=data_manager,
+        param_grid={
+            'stop_loss': sorted({args.stop_loss, -0.05, -0.07, -0.10}),
+            'take_profit': sorted({args.take_profit, 0.10, 0.15, 0.25}),
+            'max_holding_days': sorted({args.max_hold, 3, 5, 10}),
+        },
+        codes=codes,
+        n_workers=args.workers,
+    )
+    days = harness.trading_days(args.start, args.end)
+    purge = max(harness.param_grid['max_holding_days'])
+    
+    if args.kfold:
+        folds = purged_kfold(days, args.kfold, purge=purge, embargo=purge)
+    else:
+        train_size, test_size = (int(x) for x in args.walk_forward.split(','))
+        folds = walk_forward_folds(days, train_size, test_size, purge=purge)
+    
+    if not folds:
+        print(f"❌ 폴드를 만들 수 없음 (거래일 {len(days)}일)")
+        sys.exit(1)
+    
+    report = harness.run(folds)
+    print(harness.format_report(report))
+    
+    if args.json:
+        json_path = Path(args.json)
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'summary': report['summary'],
+                'folds': [{k: v for k, v in r.__dict__.items() if k != 'test_returns'}
+                          for r in report['folds']],
+            }, f, ensure_ascii=False, indent=2, default=float)
+        print(f"\n💾 결과 저장: {json_path}")
+
+
 if __name__ == '__main__':
     main()
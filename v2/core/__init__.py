@@ -1,12 +1,14 @@
 """V2 Core 모듈"""
 from .indicators import Indicators
-from .data_manager import DataManager
+from .data_manager import DataManager, PriceCache, get_price_cache
 from .strategy_base import StrategyBase, Signal, StrategyConfig
 from .report_engine import ReportEngine
 
 __all__ = [
     'Indicators',
     'DataManager',
+    'PriceCache',
+    'get_price_cache',
     'StrategyBase',
     'Signal',
     'StrategyConfig',
@@ -2,12 +2,16 @@
 V2 Core - Backtest Engine
 백테스팅 프레임워크
 """
+import sys
+from pathlib import Path
 import pandas as pd
-import numpy as np
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
+sys.path.insert(0, str(Path(__file__).parent))
+from trade_ledger import TradeLedger, summarize_returns
+
 
 @dataclass
 class Trade:
@@ -40,6 +44,7 @@ class BacktestResult:
     sharpe_ratio: float
     profit_factor: float
     trades: List[Trade]
+    ledger: Optional[TradeLedger] = None
 
 
 class BacktestEngine:
@@ -57,6 +62,7 @@ class BacktestEngine:
         self.trailing_stop = trailing_stop
         self.max_holding_days = max_holding_days
         self.trades: List[Trade] = []
+        self.ledger = TradeLedger()
     
     def run(self, 
             strategy,
@@ -73,6 +79,7 @@ class BacktestEngine:
             codes: 테스트할 종목 리스트 (None=전체)
         """
         self.trades = []
+        self.ledger = TradeLedger()
         
         # 날짜 범위 생성
         date_range = pd.date_range(start=start_date, end=end_date, freq='B')  # Business days
@@ -96,6 +103,7 @@ class BacktestEngine:
                     )
                     if trade:
                         self.trades.append(trade)
+                        self.ledger.append_trade(trade)
         
         return self._calculate_stats(strategy.config.name, start_date, end_date)
     
@@ -178,61 +186,16 @@ class BacktestEngine:
                         strategy_name: str,
                         start_date: str, 
                         end_date: str) -> BacktestResult:
-        """통계 계산"""
-        if not self.trades:
-            return BacktestResult(
-                strategy_name=strategy_name,
-                start_date=start_date,
-                end_date=end_date,
-                total_trades=0,
-                winning_trades=0,
-                losing_trades=0,
-                win_rate=0.0,
-                total_return=0.0,
-                avg_return=0.0,
-                max_drawdown=0.0,
-                sharpe_ratio=0.0,
-                profit_factor=0.0,
-                trades=[]
-            )
-        
-        returns = [t.pnl_pct for t in self.trades]
-        winning = [r for r in returns if r > 0]
-        losing = [r for r in returns if r <= 0]
-        
-        # 누적 수익률
-        total_return = sum(returns)
-        
-        # 최대 낙폭 (MDD)
-        cumulative = np.cumsum(returns)
-        running_max = np.maximum.accumulate(cumulative)
-        drawdown = cumulative - running_max
-        max_drawdown = abs(min(drawdown)) if len(drawdown) > 0 else 0
-        
-        # 샤프 비율 (단순화)
-        avg_return = np.mean(returns)
-        std_return = np.std(returns) if len(returns) > 1 else 1
-        sharpe = (avg_return / std_return) * np.sqrt(252) if std_return > 0 else 0
-        
-        # Profit Factor
-        gross_profit = sum(w for w in winning)
-        gross_loss = abs(sum(l for l in losing))
-        profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
+        """통계 계산 (컬럼형 원장 기반)"""
+        stats = summarize_returns(self.ledger.returns)
         
         return BacktestResult(
             strategy_name=strategy_name,
             start_date=start_date,
             end_date=end_date,
-            total_trades=len(self.trades),
-            winning_trades=len(winning),
-            losing_trades=len(losing),
-            win_rate=len(winning) / len(returns) * 100,
-            total_return=total_return,
-            avg_return=avg_return,
-            max_drawdown=max_drawdown,
-            sharpe_ratio=sharpe,
-            profit_factor=profit_factor,
-            trades=self.trades
+            trades=self.trades,
+            ledger=self.ledger,
+            **stats
         )
     
     def generate_report(self, result: BacktestResult) -> str:
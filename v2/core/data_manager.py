@@ -3,11 +3,17 @@ V2 Core - Data Manager
 DB 및 데이터 소스 통합 관리
 """
 import sqlite3
+import sys
+from pathlib import Path
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict
 import FinanceDataReader as fdr
 
+# price_cache는 항상 같은 모듈명으로 import해야 전역 캐시가 하나로 유지됨
+sys.path.insert(0, str(Path(__file__).parent))
+from price_cache import PriceCache, get_price_cache
+
 
 class DataManager:
     """데이터 관리자 (싱글톤)"""
@@ -24,6 +30,8 @@ class DataManager:
             return
         self.db_path = db_path
         self._name_map: Dict[str, str] = {}
+        self.price_cache: PriceCache = get_price_cache()
+        self.intraday_ttl: float = 60.0  # 당일 데이터 캐시 유효시간(초)
         self._initialized = True
     
     def _get_connection(self) -> sqlite3.Connection:
@@ -42,13 +50,27 @@ class DataManager:
             end_date: 종료일 (YYYY-MM-DD)
             days: 필요한 거래일 수
         """
-        conn = self._get_connection()
-        
         # 날짜 범위 계산 (넉넉히)
         end_dt = datetime.strptime(end_date, '%Y-%m-%d')
         start_dt = end_dt - timedelta(days=days * 2)  # 주말 고려
         start_date = start_dt.strftime('%Y-%m-%d')
         
+        # 당일(장중) 데이터는 TTL 적용
+        ttl = self.intraday_ttl if end_date >= datetime.now().strftime('%Y-%m-%d') else None
+        df = self.price_cache.get_or_load(
+            code, start_date, end_date,
+            lambda: self._read_price_range(code, start_date, end_date),
+            ttl=ttl
+        )
+        
+        if df is None or len(df) < days // 2:  # 최소 데이터 체크
+            return None
+            
+        return df
+    
+    def _read_price_range(self, code: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """DB에서 종목 가격 구간 조회 (캐시 미스 시)"""
+        conn = self._get_connection()
         query = """
             SELECT * FROM price_data 
             WHERE code = ? AND date BETWEEN ? AND ?
@@ -57,9 +79,6 @@ class DataManager:
         df = pd.read_sql(query, conn, params=(code, start_date, end_date))
         conn.close()
         
-        if len(df) < days // 2:  # 최소 데이터 체크
-            return None
-            
         df['date'] = pd.to_datetime(df['date'])
         return df
     
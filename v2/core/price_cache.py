@@ -0,0 +1,249 @@
+"""
+V2 Core - Price Cache
+프로세스 전역 가격 데이터 캐시 (LRU + TTL + 범위 포함 조회)
+
+같은 프로세스의 모든 데이터 접근자(DataManager, strategies_v2.BaseStrategy 등)가
+하나의 캐시를 공유한다. 캐시 키는 (종목코드, 시작일, 종료일)이며, 요청 범위를
+포함하는 더 넓은 범위가 이미 캐시되어 있으면 DB를 다시 읽지 않고 잘라서 반환한다.
+범위 포함 판정은 요청 종료일이 아니라 실제로 받은 마지막 날짜까지만 인정한다
+(미래 종료일로 받은 항목이 이후 생긴 봉을 빠뜨린 채 재사용되지 않도록).
+
+사용법:
+    from price_cache import get_price_cache
+
+    cache = get_price_cache()
+    df = cache.get_or_load(code, '2026-01-01', '2026-04-01',
+                           lambda: load_from_db(code, '2026-01-01', '2026-04-01'))
+    print(cache.stats())
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256MB
+
+
+@dataclass
+class CacheStats:
+    """캐시 통계"""
+    hits: int = 0           # 정확히 같은 범위 적중
+    range_hits: int = 0     # 상위 범위 적중 후 슬라이스
+    misses: int = 0
+    evictions: int = 0      # 용량 초과로 제거
+    expirations: int = 0    # TTL 만료로 제거
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.range_hits + self.misses
+        return (self.hits + self.range_hits) / total if total else 0.0
+
+
+@dataclass
+class _Entry:
+    df: pd.DataFrame
+    start: pd.Timestamp
+    end: pd.Timestamp       # min(요청 종료일, 데이터 마지막 날짜)
+    nbytes: int
+    expires_at: Optional[float] = None
+
+
+class PriceCache:
+    """
+    바이트 용량 기반 LRU 가격 캐시
+
+    - 용량(max_bytes)을 넘으면 가장 오래 사용되지 않은 항목부터 제거
+    - ttl(초)을 지정한 항목은 만료 후 미스로 처리 (장중 데이터용)
+    - 반환되는 DataFrame은 항상 복사본이므로 호출 측에서 자유롭게 수정 가능
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES,
+                 default_ttl: Optional[float] = None):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[Tuple[str, pd.Timestamp, pd.Timestamp], _Entry]" = OrderedDict()
+        self._by_code: Dict[str, set] = {}
+        self._bytes = 0
+        self._stats = CacheStats()
+        self._lock = threading.RLock()
+
+    # ==================== 조회/저장 ====================
+
+    def get(self, code: str, start, end) -> Optional[pd.DataFrame]:
+        """
+        캐시 조회
+
+        정확히 일치하는 범위가 없으면 요청 범위를 포함하는 항목을 찾아 슬라이스한다.
+        """
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        with self._lock:
+            key = (code, start, end)
+            entry = self._entries.get(key)
+            if entry is not None and not self._expired(key, entry):
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                return entry.df.copy()
+
+            for key in list(self._by_code.get(code, ())):
+                entry = self._entries[key]
+                if entry.start <= start and entry.end >= end:
+                    if self._expired(key, entry):
+                        continue
+                    self._entries.move_to_end(key)
+                    self._stats.range_hits += 1
+                    return _slice_range(entry.df, start, end)
+
+            self._stats.misses += 1
+            return None
+
+    def put(self, code: str, start, end, df: pd.DataFrame,
+            ttl: Optional[float] = None):
+        """
+        캐시 저장 (빈 데이터는 저장하지 않음)
+
+        같은 요청 범위는 그대로 적중하지만, 하위 범위 재사용은 데이터가 실제로 있는
+        마지막 날짜까지로 제한한다.
+        """
+        if df is None or df.empty:
+            return
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        covered = min(end, _dates(df).max())
+        ttl = ttl if ttl is not None else self.default_ttl
+        df = df.copy()
+        nbytes = int(df.memory_usage(index=True, deep=True).sum())
+        if nbytes > self.max_bytes:
+            return
+
+        with self._lock:
+            key = (code, start, end)
+            if key in self._entries:
+                self._remove(key)
+            # 새 범위에 포함되는 기존 항목은 중복이므로 제거
+            for old_key in list(self._by_code.get(code, ())):
+                old = self._entries[old_key]
+                if start <= old.start and old.end <= covered:
+                    self._remove(old_key)
+
+            expires_at = time.monotonic() + ttl if ttl else None
+            self._entries[key] = _Entry(df, start, covered, nbytes, expires_at)
+            self._by_code.setdefault(code, set()).add(key)
+            self._bytes += nbytes
+
+            while self._bytes > self.max_bytes and self._entries:
+                lru_key = next(iter(self._entries))
+                self._remove(lru_key)
+                self._stats.evictions += 1
+
+    def get_or_load(self, code: str, start, end,
+                    loader: Callable[[], Optional[pd.DataFrame]],
+                    ttl: Optional[float] = None) -> Optional[pd.DataFrame]:
+        """캐시 조회 후 미스면 loader()로 로드하여 저장"""
+        df = self.get(code, start, end)
+        if df is not None:
+            return df
+        df = loader()
+        if df is not None and not df.empty:
+            self.put(code, start, end, df, ttl=ttl)
+        return df
+
+    # ==================== 관리 ====================
+
+    def invalidate(self, code: Optional[str] = None):
+        """특정 종목(또는 전체) 캐시 무효화"""
+        with self._lock:
+            if code is None:
+                self._entries.clear()
+                self._by_code.clear()
+                self._bytes = 0
+                return
+            for key in list(self._by_code.get(code, ())):
+                self._remove(key)
+
+    def clear(self):
+        """전체 캐시 및 통계 초기화"""
+        with self._lock:
+            self.invalidate()
+            self._stats = CacheStats()
+
+    def stats(self) -> Dict[str, float]:
+        """hit/miss/eviction 통계"""
+        with self._lock:
+            self._stats.entries = len(self._entries)
+            self._stats.bytes = self._bytes
+            result = asdict(self._stats)
+            result['hit_rate'] = round(self._stats.hit_rate, 4)
+            return result
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ==================== 내부 ====================
+
+    def _expired(self, key, entry: _Entry) -> bool:
+        if entry.expires_at is not None and time.monotonic() >= entry.expires_at:
+            self._remove(key)
+            self._stats.expirations += 1
+            return True
+        return False
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.nbytes
+        keys = self._by_code.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_code[key[0]]
+
+
+def _dates(df: pd.DataFrame) -> pd.Series:
+    """'date' 컬럼(없으면 인덱스)의 날짜 시리즈"""
+    if 'date' in df.columns:
+        dates = df['date']
+    elif 'Date' in df.columns:
+        dates = df['Date']
+    else:
+        dates = df.index.to_series(index=df.index)
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates)
+    return dates
+
+
+def _slice_range(df: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    """'date' 컬럼(없으면 인덱스) 기준으로 [start, end] 구간 복사본 반환"""
+    dates = _dates(df)
+    mask = (dates >= start) & (dates <= end)
+    return df.loc[mask.values].copy()
+
+
+_global_cache: Optional[PriceCache] = None
+_global_lock = threading.Lock()
+
+
+def get_price_cache() -> PriceCache:
+    """프로세스 전역 PriceCache 반환"""
+    global _global_cache
+    if _global_cache is None:
+        with _global_lock:
+            if _global_cache is None:
+                _global_cache = PriceCache()
+    return _global_cache
+
+
+def configure_price_cache(max_bytes: int = DEFAULT_MAX_BYTES,
+                          default_ttl: Optional[float] = None) -> PriceCache:
+    """전역 캐시 용량/TTL 설정 (기존 항목은 유지, 용량 초과분은 즉시 제거)"""
+    cache = get_price_cache()
+    with cache._lock:
+        cache.max_bytes = max_bytes
+        cache.default_ttl = default_ttl
+        while cache._bytes > cache.max_bytes and cache._entries:
+            cache._remove(next(iter(cache._entries)))
+            cache._stats.evictions += 1
+    return cache
@@ -0,0 +1,203 @@
+"""
+V2 Core - Robustness
+거래 원장 재표본 시뮬레이션 (Monte Carlo / bootstrap)
+
+백테스트 한 경로의 결과가 거래 순서·구성의 우연인지 확인하기 위해 거래 수익률을
+수천 번 재표본해 총수익률 / MDD / 승률의 분포와 신뢰구간을 만든다.
+- bootstrap: 복원추출 (거래 구성이 달라짐)
+- shuffle:   순서만 섞음 (총수익·승률은 고정, MDD 분포만 달라짐)
+- block:     길이 block_size 연속 구간을 원형으로 복원추출 (연패·연승 같은 군집 유지)
+
+(시뮬 × 거래) 행렬을 청크 단위로 만들어 누적합 / 누적최대로 한 번에 계산한다.
+청크마다 SeedSequence 자식 시드를 쓰므로 n_workers와 무관하게 결과가 재현된다.
+
+사용법:
+    result = run_robustness(ledger, method='bootstrap', n_sims=10_000)
+    print(result.bands())
+    print(result.format_report())
+"""
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+from trade_ledger import TradeLedger, max_drawdown
+
+
+METHODS = ('bootstrap', 'shuffle', 'block')
+METRICS = ('total_return', 'max_drawdown', 'win_rate')
+
+# 청크 하나의 (시뮬 × 거래) 원소 수 상한 (float64 기준 약 32MB)
+_CHUNK_ELEMENTS = 4_000_000
+
+
+@dataclass
+class RobustnessResult:
+    """재표본 결과 (지표별 시뮬레이션 배열 + 원래 경로 값)"""
+    method: str
+    n_sims: int
+    n_trades: int
+    compound: bool
+    observed: Dict[str, float]
+    samples: Dict[str, np.ndarray] = field(repr=False)
+
+    def bands(self, levels: Sequence[float] = (5, 25, 50, 75, 95)) -> pd.DataFrame:
+        """지표별 백분위 구간 + 평균 + 원래 경로 값과 그 백분위 순위"""
+        rows = {}
+        for metric in METRICS:
+            s = self.samples[metric]
+            row = {f'p{lv:g}': float(v) for lv, v in zip(levels, np.percentile(s, levels))}
+            row['mean'] = float(s.mean())
+            row['observed'] = self.observed[metric]
+            row['observed_rank'] = float((s <= self.observed[metric]).mean() * 100)
+            rows[metric] = row
+        return pd.DataFrame(rows).T
+
+    def prob_loss(self) -> float:
+        """총수익률이 0 이하인 시뮬레이션 비율 (%)"""
+        return float((self.samples['total_return'] <= 0).mean() * 100)
+
+    def prob_drawdown_over(self, threshold: float) -> float:
+        """MDD가 threshold를 넘는 시뮬레이션 비율 (%)"""
+        return float((self.samples['max_drawdown'] > threshold).mean() * 100)
+
+    def to_dict(self, levels: Sequence[float] = (5, 50, 95)) -> Dict:
+        """JSON 저장용 요약"""
+        return {
+            'method': self.method,
+            'n_sims': self.n_sims,
+            'n_trades': self.n_trades,
+            'compound': self.compound,
+            'prob_loss': round(self.prob_loss(), 2),
+            'bands': self.bands(levels).round(4).to_dict('index'),
+        }
+
+    def format_report(self, levels: Sequence[float] = (5, 50, 95)) -> str:
+        """리포트용 마크다운 표"""
+        names = {'total_return': '총 수익률(%)', 'max_drawdown': 'MDD(%)', 'win_rate': '승률(%)'}
+        bands = self.bands(levels)
+        pcols = [f'p{lv:g}' for lv in levels]
+        lines = [
+            f"### 🎲 강건성 검정 ({self.method}, {self.n_sims:,}회 × {self.n_trades:,}거래)",
+            "",
+            "| 지표 | " + " | ".join(pcols) + " | 실제 | 실제 순위 |",
+            "|" + "---|" * (len(pcols) + 3),
+        ]
+        for metric in METRICS:
+            row = bands.loc[metric]
+            lines.append(f"| {names[metric]} | " + " | ".join(f"{row[c]:.2f}" for c in pcols)
+                         + f" | {row['observed']:.2f} | {row['observed_rank']:.0f}% |")
+        lines.append("")
+        lines.append(f"손실 확률: {self.prob_loss():.1f}%")
+        return "\n".join(lines)
+
+
+def _path_metrics(r: np.ndarray, idx: np.ndarray, compound: bool) -> np.ndarray:
+    """(시뮬 × 거래) 인덱스 행렬 → (3, 시뮬) 지표 배열"""
+    path = r[idx]
+    win_rate = (path > 0).mean(axis=1) * 100
+    if compound:
+        path = np.log1p(path / 100)
+    np.cumsum(path, axis=1, out=path)
+    total = path[:, -1].copy()
+    # path ← 누적최대 - 누적값 (고점 대비 낙폭), 제자리 연산으로 메모리 1벌만 사용
+    peak = np.maximum.accumulate(path, axis=1)
+    np.subtract(peak, path, out=path)
+    dd = path.max(axis=1)
+    if compound:
+        total = np.expm1(total) * 100
+        dd = -np.expm1(-dd) * 100
+    return np.stack([total, dd, win_rate])
+
+
+def _simulate_chunk(args) -> np.ndarray:
+    r, method, n_sims, block_size, compound, seed = args
+    rng = np.random.default_rng(seed)
+    n = len(r)
+    if method == 'bootstrap':
+        idx = rng.integers(0, n, size=(n_sims, n), dtype=np.int32)
+    elif method == 'shuffle':
+        # 행별 Fisher-Yates(rng.permuted)보다 난수 키 argsort가 2~3배 빠름
+        idx = np.argsort(rng.random((n_sims, n), dtype=np.float32), axis=1)
+    else:
+        n_blocks = -(-n // block_size)
+        starts = rng.integers(0, n, size=(n_sims, n_blocks, 1), dtype=np.int32)
+        idx = (starts + np.arange(block_size, dtype=np.int32)).reshape(n_sims, -1)[:, :n]
+        idx %= n
+    return _path_metrics(r, idx, compound)
+
+
+def _as_returns(trades) -> np.ndarray:
+    """TradeLedger / Trade 리스트 / 수익률(%) 배열 → 청산 순서 수익률 배열"""
+    # v2.core.trade_ledger / trade_ledger 어느 경로로 import된 원장이든 허용
+    if hasattr(trades, 'breakdown') and hasattr(trades, 'returns'):
+        return np.nan_to_num(trades.returns[np.argsort(trades['exit_date'], kind='stable')])
+    if len(trades) and not np.isscalar(trades[0]):
+        ledger = TradeLedger()
+        ledger.extend_trades(trades)
+        return _as_returns(ledger)
+    return np.nan_to_num(np.asarray(trades, dtype=float))
+
+
+def run_robustness(trades,
+                   method: str = 'bootstrap',
+                   n_sims: int = 10_000,
+                   block_size: int = 20,
+                   compound: bool = False,
+                   seed: int = 42,
+                   n_workers: Optional[int] = None) -> RobustnessResult:
+    """
+    거래 재표본 시뮬레이션
+
+    Args:
+        trades: TradeLedger, Trade 객체 리스트, 또는 거래 수익률(%) 배열 (시간 순서)
+        method: 'bootstrap' | 'shuffle' | 'block'
+        n_sims: 시뮬레이션 횟수
+        block_size: block 방식의 구간 길이 (거래 수)
+        compound: True면 복리 자산곡선 기준 수익률/MDD, False면 수익률 단순 합산 (summarize_returns와 동일)
+        seed: 난수 시드
+        n_workers: 프로세스 수 (None이면 CPU 수, 청크가 하나뿐이면 단일 프로세스)
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}: {method}")
+    # 누적합 오차를 막기 위해 수익률은 float64로 누적 (float32는 셔플 난수 키에만 사용)
+    r = _as_returns(trades).astype(np.float64)
+    n = len(r)
+    if n == 0:
+        raise ValueError("거래가 없습니다")
+
+    observed_curve = np.cumsum(np.log1p(r / 100)) if compound else np.cumsum(r)
+    observed = {
+        'total_return': float(np.expm1(observed_curve[-1]) * 100 if compound else observed_curve[-1]),
+        'max_drawdown': (max_drawdown(np.exp(observed_curve)) if compound
+                         else max_drawdown(observed_curve, relative=False)),
+        'win_rate': float((r > 0).mean() * 100),
+    }
+
+    chunk = max(1, _CHUNK_ELEMENTS // n)
+    sizes = [min(chunk, n_sims - i) for i in range(0, n_sims, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(r, method, size, block_size, compound, s) for size, s in zip(sizes, seeds)]
+
+    n_workers = n_workers or os.cpu_count() or 1
+    if n_workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(jobs))) as ex:
+            parts = list(ex.map(_simulate_chunk, jobs))
+    else:
+        parts = [_simulate_chunk(job) for job in jobs]
+    metrics = np.concatenate(parts, axis=1).astype(float)
+
+    return RobustnessResult(
+        method=method,
+        n_sims=n_sims,
+        n_trades=n,
+        compound=compound,
+        observed=observed,
+        samples=dict(zip(METRICS, metrics)),
+    )
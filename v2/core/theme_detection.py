@@ -0,0 +1,87 @@
+"""
+V2 Core - Theme Detection
+상한가 기반 주도 테마 / 대장주 벡터화 감지 (전 기간 한 번에)
+
+(날짜, 섹터) 그룹별 상한가 종목 수로 주도 테마를 판정하고, 날짜별 대장주를 고른다.
+v2 DPlusStrategy와 루트의 honginki_dplus_strategy(DPlusLeadingStockStrategy)가 함께 사용한다.
+
+사용법:
+    from theme_detection import flag_sector_themes, select_daily_leaders, dominant_theme_table
+
+    flags = flag_sector_themes(market_data)           # date, code, sector, change_pct, ... 컬럼
+    leaders = select_daily_leaders(flags)             # 날짜 → 대장주 행 라벨
+    table = dominant_theme_table(market_data)         # 주도 (날짜, 섹터)별 한 행
+"""
+import pandas as pd
+
+
+def flag_sector_themes(market_data: pd.DataFrame,
+                       min_limit_up_stocks: int = 5,
+                       limit_up_pct: float = 29.5,
+                       sector_col: str = 'sector') -> pd.DataFrame:
+    """
+    모든 행에 상한가 / 섹터 테마 플래그 추가 (groupby-transform 한 번)
+
+    DPlusLeadingStockStrategy.detect_dominant_theme과 같은 규칙을 모든 (날짜, 섹터) 그룹에
+    한 번에 적용한다. 추가 컬럼: hit_limit_up, sector_limit_ups, sector_total, is_dominant
+    """
+    df = market_data.copy()
+    df['hit_limit_up'] = df['change_pct'] >= limit_up_pct
+    grouped = df.groupby(['date', sector_col], sort=False)['hit_limit_up']
+    df['sector_limit_ups'] = grouped.transform('sum').fillna(0).astype(int)
+    df['sector_total'] = grouped.transform('size').fillna(0).astype(int)
+    df['is_dominant'] = df['sector_limit_ups'] >= min_limit_up_stocks
+    return df
+
+
+def select_daily_leaders(flags: pd.DataFrame,
+                         min_volume: float = 1_000_000_000,
+                         min_price: float = 1000) -> pd.Series:
+    """
+    날짜별 주도 테마 대장주 (select_leader_stock과 같은 점수)
+
+    flags: flag_sector_themes 결과
+    Returns: 날짜 → flags 안의 대장주 행 라벨
+    """
+    candidates = flags[
+        flags['is_dominant'] &
+        (flags['volume'] * flags['close'] >= min_volume) &
+        (flags['close'] >= min_price)
+    ]
+    if candidates.empty:
+        return pd.Series(dtype=object)
+
+    day_max_volume = candidates.groupby('date')['volume'].transform('max')
+    score = (
+        candidates['change_pct'] * 0.4 +
+        (candidates['volume'] / day_max_volume) * 30 +
+        candidates['high'] / candidates['close'] * 20
+    )
+    return score.groupby(candidates['date']).idxmax().dropna()
+
+
+def dominant_theme_table(market_data: pd.DataFrame,
+                         min_limit_up_stocks: int = 5,
+                         limit_up_pct: float = 29.5,
+                         sector_col: str = 'sector',
+                         top_leaders: int = 3) -> pd.DataFrame:
+    """
+    전 기간 주도 (날짜, 섹터)별 한 행
+
+    컬럼: date, sector, limit_up_count, total_stocks, [amount],
+          leaders (그날 섹터 안 상승률 상위 top_leaders 종목코드)
+    """
+    flags = flag_sector_themes(market_data, min_limit_up_stocks, limit_up_pct, sector_col)
+    dominant = flags[flags['is_dominant']]
+
+    agg = {'limit_up_count': ('hit_limit_up', 'sum'), 'total_stocks': ('code', 'count')}
+    if 'amount' in dominant.columns:
+        agg['amount'] = ('amount', 'sum')
+    table = dominant.groupby(['date', sector_col]).agg(**agg)
+
+    top = (dominant.dropna(subset=['change_pct'])
+           .sort_values('change_pct', ascending=False, kind='stable')
+           .groupby(['date', sector_col], sort=False).head(top_leaders))
+    table['leaders'] = top.groupby(['date', sector_col])['code'].agg(list)
+    table['leaders'] = table['leaders'].apply(lambda x: x if isinstance(x, list) else [])
+    return table.reset_index().rename(columns={sector_col: 'sector'})
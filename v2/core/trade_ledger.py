@@ -0,0 +1,387 @@
+"""
+V2 Core - Trade Ledger
+컬럼형(struct-of-arrays) 거래 원장 + 벡터화 성과 지표
+
+백테스터별 Trade 데이터클래스(v2 BacktestEngine, strategies_v2, v8, 복합 백테스트)를
+하나의 원장에 모아 넘파이 배열로 보관한다.
+- 숫자 컬럼은 용량 2배씩 늘어나는 넘파이 버퍼, 문자열 컬럼(code/name/exit_reason 등)은
+  사전 인코딩(int32 인덱스) → 수십만 건도 수십 MB 이내
+- 지표(equity curve, MDD, Sharpe/Sortino, PF, 월별/청산사유별 집계)는 전부 벡터 연산
+
+사용법:
+    ledger = TradeLedger()
+    ledger.append_trade(trade)                      # 어떤 Trade 데이터클래스든 가능
+    ledger.append(code='005930', entry_date='2026-03-03', exit_date='2026-03-10',
+                  entry_price=70000, exit_price=73500, exit_reason='target')
+    print(ledger.stats())
+    print(ledger.breakdown('exit_reason'))
+    print(ledger.breakdown('month'))
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# 컬럼 정의: 이름 → 넘파이 dtype ('cat'은 사전 인코딩 문자열)
+BASE_COLUMNS = {
+    'code': 'cat',
+    'name': 'cat',
+    'entry_date': 'datetime64[D]',
+    'exit_date': 'datetime64[D]',
+    'entry_price': np.float64,
+    'exit_price': np.float64,
+    'shares': np.int64,
+    'pnl': np.float64,
+    'pnl_pct': np.float64,
+    'hold_days': np.int32,
+    'exit_reason': 'cat',
+    'score': np.float32,
+}
+
+# 백테스터별 Trade 필드명 → 원장 컬럼
+_ALIASES = {
+    'symbol': 'code',
+    'return_pct': 'pnl_pct',
+    'holding_days': 'hold_days',
+    'signal_score': 'score',
+    'score_at_entry': 'score',
+}
+
+_NAT = np.datetime64('NaT', 'D')
+
+
+def _missing_filled(values, derived: np.ndarray) -> np.ndarray:
+    """values의 결측(None/NaN) 자리만 derived로 채운 float 배열 (values가 없으면 derived)"""
+    if values is None:
+        return derived
+    values = np.array(values, dtype=np.float64)
+    return np.where(np.isnan(values), derived, values)
+
+
+def _to_day(value) -> np.datetime64:
+    if value is None or value == '':
+        return _NAT
+    return np.datetime64(pd.Timestamp(value).date(), 'D')
+
+
+class TradeLedger:
+    """
+    컬럼형 거래 원장
+
+    Args:
+        extra_columns: 추가 컬럼 {이름: dtype 또는 'cat'} (예: {'holding': 'cat', 'tk_cross': bool})
+        capacity: 초기 버퍼 크기
+    """
+
+    def __init__(self, extra_columns: Optional[Dict[str, Any]] = None, capacity: int = 1024):
+        self.schema: Dict[str, Any] = dict(BASE_COLUMNS)
+        self.schema.update(extra_columns or {})
+        self._n = 0
+        self._capacity = max(int(capacity), 1)
+        self._data: Dict[str, np.ndarray] = {}
+        self._vocab: Dict[str, Dict[str, int]] = {}
+        self._labels: Dict[str, List[str]] = {}
+        for col, dtype in self.schema.items():
+            self._init_column(col, dtype)
+
+    def _init_column(self, col: str, dtype):
+        if dtype == 'cat':
+            self._data[col] = np.full(self._capacity, -1, dtype=np.int32)
+            self._vocab[col] = {}
+            self._labels[col] = []
+        elif np.dtype(dtype).kind == 'M':
+            self._data[col] = np.full(self._capacity, _NAT, dtype=dtype)
+        elif np.dtype(dtype).kind == 'f':
+            self._data[col] = np.full(self._capacity, np.nan, dtype=dtype)
+        else:
+            self._data[col] = np.zeros(self._capacity, dtype=dtype)
+
+    # ==================== 추가 ====================
+
+    def _reserve(self, n: int):
+        if self._n + n <= self._capacity:
+            return
+        new_capacity = max(self._capacity * 2, self._n + n)
+        for col, arr in self._data.items():
+            grown = np.empty(new_capacity, dtype=arr.dtype)
+            grown[:self._n] = arr[:self._n]
+            fill = -1 if self.schema[col] == 'cat' else (
+                _NAT if arr.dtype.kind == 'M' else (np.nan if arr.dtype.kind == 'f' else 0))
+            grown[self._n:] = fill
+            self._data[col] = grown
+        self._capacity = new_capacity
+
+    def _encode(self, col: str, value) -> int:
+        if value is None:
+            return -1
+        value = str(value)
+        vocab = self._vocab[col]
+        idx = vocab.get(value)
+        if idx is None:
+            idx = vocab[value] = len(self._labels[col])
+            self._labels[col].append(value)
+        return idx
+
+    def append(self, **fields):
+        """
+        거래 1건 추가
+
+        pnl_pct가 없으면 진입/청산가로 계산, pnl이 없으면 (청산가-진입가)×수량
+        """
+        self._reserve(1)
+        i = self._n
+        fields = {_ALIASES.get(k, k): v for k, v in fields.items()}
+        entry, exit_ = fields.get('entry_price'), fields.get('exit_price')
+        if fields.get('pnl_pct') is None and entry and exit_ is not None:
+            fields['pnl_pct'] = (exit_ - entry) / entry * 100
+        if fields.get('pnl') is None and entry is not None and exit_ is not None:
+            fields['pnl'] = (exit_ - entry) * (fields.get('shares') or 0)
+
+        for col, value in fields.items():
+            if col not in self.schema or value is None:
+                continue
+            dtype = self.schema[col]
+            if dtype == 'cat':
+                self._data[col][i] = self._encode(col, value)
+            elif np.dtype(dtype).kind == 'M':
+                self._data[col][i] = _to_day(value)
+            else:
+                self._data[col][i] = value
+        self._n += 1
+
+    def append_trade(self, trade, **extra):
+        """Trade 데이터클래스(필드명이 달라도 별칭으로 매핑) 1건 추가"""
+        fields = {}
+        for attr, value in vars(trade).items():
+            col = _ALIASES.get(attr, attr)
+            if col in self.schema and col not in fields:
+                fields[col] = value
+        fields.update(extra)
+        self.append(**fields)
+
+    def extend_trades(self, trades: Iterable):
+        """Trade 여러 건 추가 (건별 append와 같이 pnl_pct/pnl 보완)"""
+        for trade in trades:
+            self.append_trade(trade)
+
+    def extend(self, **columns):
+        """
+        컬럼 배열 일괄 추가 (모든 배열 길이 동일)
+
+        append와 같이 pnl_pct/pnl이 없거나 결측인 행은 진입/청산가(와 수량)로 계산
+        """
+        columns = {_ALIASES.get(k, k): v for k, v in columns.items()}
+        lengths = {len(v) for v in columns.values()}
+        if len(lengths) != 1:
+            raise ValueError("extend: 컬럼 길이가 서로 다름")
+        n = lengths.pop()
+        if columns.get('entry_price') is not None and columns.get('exit_price') is not None:
+            entry = np.array(columns['entry_price'], dtype=np.float64)
+            exit_ = np.array(columns['exit_price'], dtype=np.float64)
+            shares = columns.get('shares')
+            shares = np.zeros(n) if shares is None else np.nan_to_num(np.array(shares, dtype=np.float64))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                pct = np.where(entry != 0, (exit_ - entry) / entry * 100, np.nan)
+            columns['pnl_pct'] = _missing_filled(columns.get('pnl_pct'), pct)
+            columns['pnl'] = _missing_filled(columns.get('pnl'), (exit_ - entry) * shares)
+        self._reserve(n)
+        sl = slice(self._n, self._n + n)
+        for col, values in columns.items():
+            if col not in self.schema:
+                continue
+            dtype = self.schema[col]
+            if dtype == 'cat':
+                codes, uniques = pd.factorize(pd.Series(values, dtype=object).astype(str))
+                mapping = np.array([self._encode(col, u) for u in uniques], dtype=np.int32)
+                self._data[col][sl] = mapping[codes] if len(mapping) else -1
+            elif np.dtype(dtype).kind == 'M':
+                self._data[col][sl] = pd.to_datetime(pd.Series(values)).values.astype(dtype)
+            else:
+                self._data[col][sl] = np.asarray(values, dtype=dtype)
+        self._n += n
+
+    # ==================== 조회 ====================
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, col: str) -> np.ndarray:
+        """컬럼 배열 (숫자/날짜 컬럼은 뷰, 문자열 컬럼은 라벨 배열)"""
+        if self.schema[col] == 'cat':
+            return self.labels(col)[self.codes(col)]
+        return self._data[col][:self._n]
+
+    def codes(self, col: str) -> np.ndarray:
+        """문자열 컬럼의 정수 코드 (-1은 결측)"""
+        return self._data[col][:self._n]
+
+    def labels(self, col: str) -> np.ndarray:
+        return np.array(self._labels[col] + [''], dtype=object)
+
+    @property
+    def returns(self) -> np.ndarray:
+        return self._data['pnl_pct'][:self._n]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(arr[:self._n].nbytes for arr in self._data.values())
+
+    def to_frame(self) -> pd.DataFrame:
+        frame = {}
+        for col, dtype in self.schema.items():
+            if dtype == 'cat':
+                frame[col] = pd.Categorical.from_codes(self.codes(col), self._labels[col]) \
+                    if self._labels[col] else pd.Categorical([None] * self._n)
+            else:
+                frame[col] = self[col]
+        return pd.DataFrame(frame)
+
+    def to_arrow(self):
+        """pyarrow.Table 변환 (pyarrow 필요)"""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("to_arrow()에는 pyarrow가 필요합니다: pip install pyarrow")
+        return pa.Table.from_pandas(self.to_frame(), preserve_index=False)
+
+    # ==================== 지표 ====================
+
+    def equity_curve(self, initial: float = 100.0, compound: bool = False,
+                     by_exit: bool = True) -> pd.Series:
+        """청산 순서(또는 기록 순서) 누적 수익 곡선"""
+        returns = np.nan_to_num(self.returns)
+        order = np.argsort(self['exit_date'], kind='stable') if by_exit else np.arange(self._n)
+        curve = equity_curve(returns[order], initial, compound)
+        return pd.Series(curve, index=self['exit_date'][order] if by_exit else order)
+
+    def stats(self) -> Dict[str, float]:
+        """기본 성과 지표 (BacktestResult 필드 + sortino / avg_win / avg_loss / avg_hold_days)"""
+        result = summarize_returns(self.returns)
+        r = self.returns
+        wins, losses = r[r > 0], r[r <= 0]
+        result.update({
+            'sortino_ratio': sortino_ratio(r),
+            'avg_win': float(wins.mean()) if len(wins) else 0.0,
+            'avg_loss': float(losses.mean()) if len(losses) else 0.0,
+            'avg_hold_days': float(self['hold_days'].mean()) if self._n else 0.0,
+        })
+        return result
+
+    def breakdown(self, by: str) -> pd.DataFrame:
+        """
+        그룹별 거래수/승률/평균·합계 수익률
+
+        by: 문자열·정수 컬럼명, 'month'(청산월) 또는 'entry_month'
+        """
+        if by in ('month', 'entry_month'):
+            dates = self['exit_date' if by == 'month' else 'entry_date']
+            keys = dates.astype('datetime64[M]')
+            group, labels = pd.factorize(keys, sort=True)
+            labels = [str(m) for m in labels]
+        elif self.schema.get(by) == 'cat':
+            group, labels = self.codes(by), self._labels[by]
+        else:
+            group, labels = pd.factorize(self[by], sort=True)
+            labels = list(labels)
+
+        valid = group >= 0
+        return group_stats(self.returns[valid], group[valid], labels)
+
+
+# ==================== 벡터화 지표 함수 ====================
+
+def summarize_returns(returns) -> Dict[str, float]:
+    """
+    거래 수익률(%) 배열 → 성과 지표 (BacktestResult 필드와 동일한 키)
+
+    MDD는 거래 순서대로 누적한 수익률 기준, Sharpe는 거래 단위 × √252
+    """
+    r = np.asarray(returns, dtype=float)
+    if len(r) == 0:
+        return {
+            'total_trades': 0, 'winning_trades': 0, 'losing_trades': 0,
+            'win_rate': 0.0, 'total_return': 0.0, 'avg_return': 0.0,
+            'max_drawdown': 0.0, 'sharpe_ratio': 0.0, 'profit_factor': 0.0,
+        }
+    winning = int((r > 0).sum())
+    avg_return = r.mean()
+    std_return = r.std() if len(r) > 1 else 1
+    return {
+        'total_trades': len(r),
+        'winning_trades': winning,
+        'losing_trades': len(r) - winning,
+        'win_rate': winning / len(r) * 100,
+        'total_return': float(r.sum()),
+        'avg_return': float(avg_return),
+        'max_drawdown': max_drawdown(np.cumsum(r), relative=False),
+        'sharpe_ratio': float(avg_return / std_return * np.sqrt(252)) if std_return > 0 else 0,
+        'profit_factor': profit_factor(r),
+    }
+
+
+def equity_curve(returns_pct, initial: float = 100.0, compound: bool = False) -> np.ndarray:
+    """수익률(%) → 자산 곡선 (compound=False면 단순 합산)"""
+    r = np.asarray(returns_pct, dtype=float) / 100
+    if compound:
+        return initial * np.cumprod(1 + r)
+    return initial * (1 + np.cumsum(r))
+
+
+def max_drawdown(values, relative: bool = True) -> float:
+    """
+    최대 낙폭
+
+    relative=True: 자산 가치 곡선의 고점 대비 하락률(%)
+    relative=False: 누적 수익률(%p) 곡선의 고점 대비 하락폭
+    """
+    v = np.asarray(values, dtype=float)
+    if len(v) == 0:
+        return 0.0
+    peak = np.maximum.accumulate(v)
+    if relative:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dd = np.where(peak > 0, (peak - v) / peak * 100, 0.0)
+        return float(dd.max())
+    return float(abs((v - peak).min()))
+
+
+def sharpe_ratio(returns, periods: int = 252, risk_free: float = 0.0) -> float:
+    """평균/표준편차 × √periods (risk_free는 기간당 수익률 단위)"""
+    r = np.asarray(returns, dtype=float) - risk_free
+    if len(r) < 2:
+        return 0.0
+    std = r.std()
+    return float(r.mean() / std * np.sqrt(periods)) if std > 0 else 0.0
+
+
+def sortino_ratio(returns, periods: int = 252, risk_free: float = 0.0) -> float:
+    """하방편차 기준 Sharpe"""
+    r = np.asarray(returns, dtype=float) - risk_free
+    if len(r) < 2:
+        return 0.0
+    downside = np.sqrt(np.mean(np.minimum(r, 0) ** 2))
+    return float(r.mean() / downside * np.sqrt(periods)) if downside > 0 else 0.0
+
+
+def profit_factor(returns) -> float:
+    r = np.asarray(returns, dtype=float)
+    gross_loss = -r[r <= 0].sum()
+    return float(r[r > 0].sum() / gross_loss) if gross_loss > 0 else 0
+
+
+def group_stats(returns, group: np.ndarray, labels: List[str]) -> pd.DataFrame:
+    """정수 그룹 코드별 거래수/승률/평균·합계 수익률 (bincount)"""
+    r = np.asarray(returns, dtype=float)
+    n_groups = len(labels)
+    count = np.bincount(group, minlength=n_groups)
+    wins = np.bincount(group, weights=(r > 0).astype(float), minlength=n_groups)
+    total = np.bincount(group, weights=r, minlength=n_groups)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        df = pd.DataFrame({
+            'trades': count,
+            'win_rate': np.where(count > 0, wins / count * 100, 0.0),
+            'avg_return': np.where(count > 0, total / count, 0.0),
+            'total_return': total,
+        }, index=pd.Index(labels, name='group'))
+    return df[df['trades'] > 0]
@@ -0,0 +1,476 @@
+"""
+V2 Core - Walk-Forward Harness
+워크포워드 / purged k-fold 과최적화 검증
+
+구조:
+1. preload(): 전체 기간 가격을 한 번에 읽어 PriceCache에 적재 → 모든 폴드의
+   strategy.run()이 DB 대신 캐시 범위 조회로 처리됨
+2. generate_signals(): 날짜별 신호를 SQLite(data/wf_signal_cache.db)에 캐시,
+   없는 날짜만 프로세스 풀에서 생성 (재실행 시 신호 계산 생략)
+3. 청산 파라미터(손절/익절/보유일) 조합별 거래 수익률을 전 신호에 대해 한 번에 계산
+4. 폴드별로 학습 구간에서 최적 파라미터(+최소 점수)를 고르고 검증 구간에 적용
+   (폴드는 프로세스 풀에서 병렬 실행)
+
+거래 규칙은 BacktestEngine과 동일: 신호일 종가 진입, 이후 종가가 손절/익절가에
+닿으면 청산, 아니면 보유일 만료 종가 청산
+
+사용법:
+    harness = WalkForwardHarness(ExplosiveV7Strategy)
+    folds = walk_forward_folds(harness.trading_days('2025-06-01', '2026-03-31'), 60, 20)
+    report = harness.run(folds)
+    print(harness.format_report(report))
+"""
+import hashlib
+import inspect
+import itertools
+import json
+import os
+import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+from data_manager import DataManager
+from backtest_engine import summarize_returns
+
+
+DEFAULT_CACHE_PATH = 'data/wf_signal_cache.db'
+
+
+# ==================== 폴드 분할 ====================
+
+@dataclass
+class Fold:
+    """학습/검증 구간"""
+    index: int
+    train_dates: List[str]
+    test_dates: List[str]
+
+    @property
+    def label(self) -> str:
+        return f"{self.test_dates[0]}~{self.test_dates[-1]}"
+
+
+def walk_forward_folds(dates: List[str], train_size: int, test_size: int,
+                       step: Optional[int] = None, anchored: bool = False,
+                       purge: int = 0) -> List[Fold]:
+    """
+    워크포워드 분할 (거래일 수 기준)
+
+    Args:
+        train_size / test_size: 학습·검증 거래일 수
+        step: 이동 간격 (기본 test_size)
+        anchored: True면 학습 시작을 처음으로 고정 (확장 윈도우)
+        purge: 학습 구간 끝에서 제외할 거래일 수 (보유기간이 검증 구간과 겹치는 신호 제거)
+    """
+    dates = sorted(dates)
+    step = step or test_size
+    folds = []
+    start = 0
+    while start + train_size + test_size <= len(dates):
+        train_start = 0 if anchored else start
+        train = dates[train_start:start + train_size]
+        if purge:
+            train = train[:-purge]
+        test = dates[start + train_size:start + train_size + test_size]
+        folds.append(Fold(len(folds), train, test))
+        start += step
+    return folds
+
+
+def purged_kfold(dates: List[str], n_splits: int = 5, purge: int = 0,
+                 embargo: int = 0) -> List[Fold]:
+    """
+    Purged k-fold 분할
+
+    검증 블록 앞 purge일(학습 신호의 보유기간이 검증 구간으로 넘어감)과
+    뒤 embargo일을 학습에서 제외
+    """
+    dates = sorted(dates)
+    blocks = np.array_split(np.arange(len(dates)), n_splits)
+    folds = []
+    for i, block in enumerate(blocks):
+        if len(block) == 0:
+            continue
+        lo, hi = block[0], block[-1]
+        train = [d for j, d in enumerate(dates)
+                 if j < lo - purge or j > hi + embargo]
+        folds.append(Fold(i, train, [dates[j] for j in block]))
+    return folds
+
+
+# ==================== 신호 캐시 ====================
+
+class SignalCache:
+    """날짜별 전략 신호 캐시 (SQLite)"""
+
+    def __init__(self, db_path: str = DEFAULT_CACHE_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS wf_signals (
+                strategy_key TEXT NOT NULL,
+                date TEXT NOT NULL,
+                signals TEXT NOT NULL,
+                created_at TEXT,
+                PRIMARY KEY (strategy_key, date)
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+    def get_many(self, strategy_key: str, dates: List[str]) -> Dict[str, List[Dict]]:
+        """캐시된 날짜만 반환"""
+        conn = sqlite3.connect(self.db_path)
+        found = {}
+        for i in range(0, len(dates), 500):
+            chunk = dates[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = conn.execute(
+                f"SELECT date, signals FROM wf_signals WHERE strategy_key = ? AND date IN ({placeholders})",
+                [strategy_key] + chunk).fetchall()
+            found.update({date: json.loads(payload) for date, payload in rows})
+        conn.close()
+        return found
+
+    def put(self, strategy_key: str, date: str, signals: List[Dict]):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            "INSERT OR REPLACE INTO wf_signals VALUES (?, ?, ?, ?)",
+            (strategy_key, date, json.dumps(signals, ensure_ascii=False, default=str),
+             datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+        conn.commit()
+        conn.close()
+
+
+def _scan_dates(strategy_factory: Callable, dates: List[str],
+                codes: Optional[List[str]], db_path: str) -> Dict[str, List[Dict]]:
+    """워커: 날짜 묶음 신호 생성 (fork 시 부모의 프리로드 캐시를 그대로 사용)"""
+    dm = DataManager(db_path)
+    strategy = strategy_factory()
+    return {date: [s.to_dict() for s in strategy.run(dm, date, codes)] for date in dates}
+
+
+# ==================== 폴드 평가 ====================
+
+@dataclass
+class FoldResult:
+    """폴드 결과"""
+    fold: int
+    train_period: str
+    test_period: str
+    best_params: Dict[str, Any]
+    train_metrics: Dict[str, float]
+    test_metrics: Dict[str, float]
+    test_returns: List[float] = field(default_factory=list)
+
+
+def _evaluate_fold(fold: Fold, pnl: np.ndarray, exit_params: List[Dict],
+                   sig_dates: np.ndarray, scores: np.ndarray,
+                   min_scores: List[float], metric: str, min_trades: int) -> FoldResult:
+    """학습 구간 최적 파라미터 선택 후 검증 구간 적용"""
+    train_mask = np.isin(sig_dates, fold.train_dates)
+    test_mask = np.isin(sig_dates, fold.test_dates)
+
+    best = None
+    for g, params in enumerate(exit_params):
+        for min_score in min_scores:
+            mask = train_mask & (scores >= min_score)
+            if mask.sum() < min_trades:
+                continue
+            stats = summarize_returns(pnl[g, mask])
+            if best is None or stats[metric] > best[0][metric]:
+                best = (stats, g, min_score)
+
+    if best is None:
+        return FoldResult(fold.index, f"{fold.train_dates[0]}~{fold.train_dates[-1]}" if fold.train_dates else '',
+                          fold.label, {}, summarize_returns([]), summarize_returns([]))
+
+    train_stats, g, min_score = best
+    mask = test_mask & (scores >= min_score)
+    test_returns = pnl[g, mask]
+    return FoldResult(
+        fold=fold.index,
+        train_period=f"{fold.train_dates[0]}~{fold.train_dates[-1]}",
+        test_period=fold.label,
+        best_params={**exit_params[g], 'min_score': min_score},
+        train_metrics=train_stats,
+        test_metrics=summarize_returns(test_returns),
+        test_returns=[float(r) for r in test_returns],
+    )
+
+
+# ==================== 하네스 ====================
+
+class WalkForwardHarness:
+    """
+    워크포워드 / purged k-fold 검증기
+
+    Args:
+        strategy_factory: 인자 없이 전략 인스턴스를 만드는 callable (클래스 또는 partial)
+        param_grid: stop_loss / take_profit / max_holding_days / min_score 후보 목록
+        metric: 학습 구간 최적화 기준 (summarize_returns 키)
+        min_trades: 학습 구간 최소 거래 수 (미달 조합은 선택하지 않음)
+    """
+
+    DEFAULT_GRID = {
+        'stop_loss': [-0.05, -0.07, -0.10],
+        'take_profit': [0.10, 0.15, 0.25],
+        'max_holding_days': [3, 5, 7, 10],
+    }
+
+    def __init__(self,
+                 strategy_factory: Callable,
+                 data_manager: Optional[DataManager] = None,
+                 param_grid: Optional[Dict[str, List]] = None,
+                 metric: str = 'sharpe_ratio',
+                 min_trades: int = 5,
+                 codes: Optional[List[str]] = None,
+                 n_workers: Optional[int] = None,
+                 cache_path: str = DEFAULT_CACHE_PATH,
+                 lookback_days: int = 60):
+        self.strategy_factory = strategy_factory
+        self.dm = data_manager or DataManager()
+        self.metric = metric
+        self.min_trades = min_trades
+        self.codes = codes
+        self.n_workers = n_workers if n_workers is not None else (os.cpu_count() or 1)
+        self.cache = SignalCache(cache_path)
+        self.lookback_days = lookback_days
+
+        strategy = strategy_factory()
+        self.strategy_name = strategy.config.name
+        grid = dict(self.DEFAULT_GRID)
+        grid['min_score'] = [strategy.config.min_score, strategy.config.min_score + 5,
+                             strategy.config.min_score + 10]
+        grid.update(param_grid or {})
+        self.param_grid = grid
+        self.strategy_key = self._strategy_key(strategy)
+
+        self._closes: Dict[str, pd.Series] = {}
+
+    def _strategy_key(self, strategy) -> str:
+        """전략 클래스 소스 + 설정 + 대상 종목 해시 (바뀌면 신호 캐시 무효)"""
+        digest = hashlib.sha256()
+        try:
+            with open(inspect.getsourcefile(type(strategy)), 'rb') as f:
+                digest.update(f.read())
+        except (TypeError, OSError):
+            digest.update(type(strategy).__qualname__.encode())
+        digest.update(json.dumps(asdict(strategy.config), sort_keys=True, default=str).encode())
+        digest.update(json.dumps(sorted(self.codes) if self.codes else None).encode())
+        digest.update(self.dm.db_path.encode())
+        return f"{type(strategy).__name__}:{digest.hexdigest()[:16]}"
+
+    # ---------- 데이터 ----------
+
+    def trading_days(self, start_date: str, end_date: str) -> List[str]:
+        """DB에 존재하는 거래일 목록"""
+        conn = self.dm._get_connection()
+        rows = conn.execute(
+            "SELECT DISTINCT date FROM price_data WHERE date BETWEEN ? AND ? ORDER BY date",
+            (start_date, end_date)).fetchall()
+        conn.close()
+        return [r[0] for r in rows]
+
+    def preload(self, start_date: str, end_date: str):
+        """
+        지표 계산 구간 + 보유기간까지 한 번에 읽어 PriceCache에 적재
+
+        load_stock_data()가 요청하는 (기준일 - days*2, 기준일) 범위를 모두 포함하도록
+        앞쪽은 lookback_days*2일 여유, 뒤쪽은 최대 보유일만큼 여유를 둔다.
+        전 종목을 적재하면 PriceCache 용량(configure_price_cache)을 넉넉히 잡을 것.
+        """
+        load_start = (datetime.strptime(start_date, '%Y-%m-%d')
+                      - timedelta(days=self.lookback_days * 2)).strftime('%Y-%m-%d')
+        max_hold = max(self.param_grid['max_holding_days'])
+        load_end = (datetime.strptime(end_date, '%Y-%m-%d')
+                    + timedelta(days=max_hold * 2 + 7)).strftime('%Y-%m-%d')
+
+        query = "SELECT * FROM price_data WHERE date BETWEEN ? AND ?"
+        params: List[Any] = [load_start, load_end]
+        if self.codes:
+            query += f" AND code IN ({','.join('?' * len(self.codes))})"
+            params += list(self.codes)
+        conn = self.dm._get_connection()
+        panel = pd.read_sql(query + " ORDER BY code, date", conn, params=params)
+        conn.close()
+        panel['date'] = pd.to_datetime(panel['date'])
+
+        for code, df in panel.groupby('code', sort=False):
+            df = df.reset_index(drop=True)
+            self.dm.price_cache.put(code, load_start, load_end, df)
+            self._closes[code] = pd.Series(df['close'].values, index=df['date'].dt.strftime('%Y-%m-%d'))
+
+        print(f"📦 프리로드: {len(self._closes)}종목 ({load_start} ~ {load_end}, {len(panel):,}행)")
+
+    # ---------- 신호 ----------
+
+    def generate_signals(self, dates: List[str], refresh: bool = False) -> Dict[str, List[Dict]]:
+        """날짜별 신호 (캐시 우선, 없는 날짜만 병렬 생성)"""
+        dates = sorted(set(dates))
+        cached = {} if refresh else self.cache.get_many(self.strategy_key, dates)
+        missing = [d for d in dates if d not in cached]
+        print(f"🔍 신호: {len(dates)}일 (캐시 {len(cached)}일, 생성 {len(missing)}일)")
+
+        if missing:
+            n_workers = min(self.n_workers, len(missing))
+            chunks = [missing[i::n_workers] for i in range(n_workers)]
+            if n_workers <= 1:
+                results = [_scan_dates(self.strategy_factory, missing, self.codes, self.dm.db_path)]
+            else:
+                with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                    futures = [executor.submit(_scan_dates, self.strategy_factory, chunk,
+                                               self.codes, self.dm.db_path) for chunk in chunks]
+                    results = [f.result() for f in as_completed(futures)]
+            for result in results:
+                for date, signals in result.items():
+                    self.cache.put(self.strategy_key, date, signals)
+                    cached[date] = signals
+
+        return {d: cached[d] for d in dates}
+
+    # ---------- 거래 수익률 ----------
+
+    def _exit_params(self) -> List[Dict]:
+        grid = self.param_grid
+        return [{'stop_loss': sl, 'take_profit': tp, 'max_holding_days': hold}
+                for sl, tp, hold in itertools.product(grid['stop_loss'], grid['take_profit'],
+                                                      grid['max_holding_days'])]
+
+    def _forward_closes(self, signals: List[Dict], horizon: int):
+        """신호별 진입가(신호일 종가)와 이후 horizon거래일 종가 (없으면 NaN)"""
+        entry = np.full(len(signals), np.nan)
+        fwd = np.full((len(signals), horizon), np.nan)
+        for i, sig in enumerate(signals):
+            closes = self._closes.get(sig['code'])
+            if closes is None:
+                end = (datetime.strptime(sig['date'], '%Y-%m-%d')
+                       + timedelta(days=horizon * 2 + 7)).strftime('%Y-%m-%d')
+                df = self.dm._read_price_range(sig['code'], sig['date'], end)
+                closes = pd.Series(df['close'].values, index=df['date'].dt.strftime('%Y-%m-%d'))
+                self._closes[sig['code']] = closes
+            pos = closes.index.searchsorted(sig['date'])
+            if pos >= len(closes) or closes.index[pos] != sig['date']:
+                continue
+            entry[i] = closes.iloc[pos]
+            path = closes.values[pos + 1:pos + 1 + horizon]
+            fwd[i, :len(path)] = path
+        return entry, fwd
+
+    def trade_returns(self, signals: List[Dict]) -> np.ndarray:
+        """
+        청산 파라미터 조합별 거래 수익률(%) 행렬 (조합 × 신호)
+
+        진입가가 없는 신호는 NaN, 이후 데이터가 없으면 0% (BacktestEngine의 시간제한 처리와 동일)
+        """
+        exit_params = self._exit_params()
+        horizon = max(p['max_holding_days'] for p in exit_params)
+        entry, fwd = self._forward_closes(signals, horizon)
+        n_bars = (~np.isnan(fwd)).sum(axis=1)
+        # 진입일 종가로 청산 (이후 데이터 없음)
+        padded = np.concatenate([entry[:, None], fwd], axis=1)
+
+        pnl = np.full((len(exit_params), len(signals)), np.nan)
+        rows = np.arange(len(signals))
+        for g, p in enumerate(exit_params):
+            hold = p['max_holding_days']
+            window = fwd[:, :hold]
+            stop_price = entry * (1 + p['stop_loss'])
+            target_price = entry * (1 + p['take_profit'])
+            with np.errstate(invalid='ignore'):
+                hit = (window <= stop_price[:, None]) | (window >= target_price[:, None])
+            exit_idx = np.where(hit.any(axis=1), hit.argmax(axis=1), np.minimum(n_bars, hold) - 1)
+            exit_price = padded[rows, exit_idx + 1]
+            pnl[g] = (exit_price / entry - 1) * 100
+        return pnl
+
+    # ---------- 실행 ----------
+
+    def run(self, folds: List[Fold], refresh_signals: bool = False) -> Dict[str, Any]:
+        """
+        폴드별 최적화(학습) → 검증
+
+        Returns:
+            {'folds': [FoldResult], 'summary': {...}}
+        """
+        all_dates = sorted({d for f in folds for d in f.train_dates + f.test_dates})
+        if not self._closes:
+            self.preload(all_dates[0], all_dates[-1])
+
+        by_date = self.generate_signals(all_dates, refresh=refresh_signals)
+        signals = [s for d in all_dates for s in by_date[d] if s.get('signal_type', 'buy') == 'buy']
+        print(f"📊 매수 신호: {len(signals)}개, 폴드: {len(folds)}개")
+
+        exit_params = self._exit_params()
+        pnl = self.trade_returns(signals)
+        traded = ~np.isnan(pnl[0])
+        pnl = pnl[:, traded]
+        signals = [s for s, ok in zip(signals, traded) if ok]
+        sig_dates = np.array([s['date'] for s in signals])
+        scores = np.array([s['score'] for s in signals], dtype=float)
+        args = (pnl, exit_params, sig_dates, scores, self.param_grid['min_score'],
+                self.metric, self.min_trades)
+
+        if self.n_workers <= 1 or len(folds) <= 1:
+            results = [_evaluate_fold(fold, *args) for fold in folds]
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.n_workers, len(folds))) as executor:
+                futures = [executor.submit(_evaluate_fold, fold, *args) for fold in folds]
+                results = [f.result() for f in as_completed(futures)]
+        results.sort(key=lambda r: r.fold)
+
+        return {'folds': results, 'summary': self._summarize(results)}
+
+    def _summarize(self, results: List[FoldResult]) -> Dict[str, Any]:
+        """학습(IS) vs 검증(OOS) 비교 - OOS/IS 비율이 낮을수록 과최적화"""
+        metric = self.metric
+        scored = [r for r in results if r.best_params]
+        is_values = [r.train_metrics[metric] for r in scored]
+        oos_values = [r.test_metrics[metric] for r in scored]
+        oos_returns = [x for r in scored for x in r.test_returns]
+        is_mean = float(np.mean(is_values)) if is_values else 0.0
+        oos_mean = float(np.mean(oos_values)) if oos_values else 0.0
+        return {
+            'strategy': self.strategy_name,
+            'metric': metric,
+            'folds': len(results),
+            'is_mean': is_mean,
+            'oos_mean': oos_mean,
+            'efficiency': oos_mean / is_mean if is_mean else 0.0,
+            'oos_combined': summarize_returns(oos_returns),
+        }
+
+    def format_report(self, report: Dict[str, Any]) -> str:
+        """폴드별 결과 텍스트 리포트"""
+        summary = report['summary']
+        metric = summary['metric']
+        lines = [
+            "=" * 70,
+            f"📊 워크포워드 검증: {summary['strategy']} (기준: {metric})",
+            "=" * 70,
+            f"{'폴드':<5} {'검증 구간':<24} {'IS':>8} {'OOS':>8} {'OOS거래':>7}  최적 파라미터",
+            "-" * 70,
+        ]
+        for r in report['folds']:
+            params = ', '.join(f"{k}={v}" for k, v in r.best_params.items()) or '-'
+            lines.append(f"{r.fold:<5} {r.test_period:<24} {r.train_metrics[metric]:>8.2f} "
+                         f"{r.test_metrics[metric]:>8.2f} {r.test_metrics['total_trades']:>7}  {params}")
+        combined = summary['oos_combined']
+        lines += [
+            "-" * 70,
+            f"IS 평균: {summary['is_mean']:.2f} | OOS 평균: {summary['oos_mean']:.2f} "
+            f"| 효율(OOS/IS): {summary['efficiency']:.2f}",
+            f"OOS 통합: {combined['total_trades']}회, 승률 {combined['win_rate']:.1f}%, "
+            f"총수익 {combined['total_return']:+.2f}%, MDD {combined['max_drawdown']:.2f}%",
+            "=" * 70,
+        ]
+        return "\n".join(lines)
@@ -9,6 +9,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent / 'core'))
 import pandas as pd
 from typing import Optional, List, Dict, Any
 from strategy_base import StrategyBase, Signal, StrategyConfig
+from theme_detection import dominant_theme_table
 
 
 class DPlusStrategy(StrategyBase):
@@ -40,10 +41,12 @@ class DPlusStrategy(StrategyBase):
         )
         super().__init__(config)
         self.market_data = None
+        self._theme_tables: Dict[int, pd.DataFrame] = {}
     
     def set_market_data(self, market_df: pd.DataFrame):
         """전체 시장 데이터 설정"""
         self.market_data = market_df
+        self._theme_tables = {}
     
     def analyze(self, df: pd.DataFrame, code: str, date: str) -> Optional[Signal]:
         """
@@ -124,32 +127,20 @@ class DPlusStrategy(StrategyBase):
         if self.market_data is None:
             return []
         
-        daily_data = self.market_data[self.market_data['date'] == date].copy()
-        
-        # 상한가 종목 필터
-        daily_data['is_limit_up'] = daily_data.get('change_pct', 0) >= 29.5
-        
-        # 섹터별 그룹화
-        sector_stats = daily_data.groupby('sector').agg({
-            'is_limit_up': 'sum',
-            'code': 'count',
-            'amount': 'sum'
-        }).rename(columns={'code': 'total_stocks', 'is_limit_up': 'limit_up_count'})
-        
-        # 주도 테마 필터
-        dominant = sector_stats[sector_stats['limit_up_count'] >= min_limit_up]
-        
-        themes = []
-        for sector in dominant.index:
-            sector_stocks = daily_data[daily_data['sector'] == sector]
-            leaders = sector_stocks.nlargest(3, 'change_pct')['code'].tolist()
-            
-            themes.append({
-                'sector': sector,
-                'count': dominant.loc[sector, 'limit_up_count'],
-                'total': dominant.loc[sector, 'total_stocks'],
-                'amount': dominant.loc[sector, 'amount'],
-                'leaders': leaders
-            })
+        # 전체 날짜의 주도 테마를 한 번에 계산해 두고 날짜별로 꺼내 씀
+        if min_limit_up not in self._theme_tables:
+            self._theme_tables[min_limit_up] = dominant_theme_table(self.market_data, min_limit_up)
+        table = self._theme_tables[min_limit_up]
+        
+        themes = [
+            {
+                'sector': row['sector'],
+                'count': row['limit_up_count'],
+                'total': row['total_stocks'],
+                'amount': row.get('amount', 0),
+                'leaders': row['leaders']
+            }
+            for _, row in table[table['date'] == date].iterrows()
+        ]
         
         return sorted(themes, key=lambda x: x['count'], reverse=True)
@@ -12,11 +12,13 @@ sys.path.insert(0, '/root/.openclaw/workspace/strg')
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
+from functools import partial
 
 from v2.strategies.scanner_2604 import Scanner2604
 from v2.core.data_manager import DataManager
+from v2.core.walk_forward import WalkForwardHarness, walk_forward_folds
 
 
 @dataclass
@@ -194,6 +196,27 @@ def run_backtest(start_date: str, end_date: str, min_score: float = 75.0) -> Dic
     }
 
 
+def run_walk_forward(start_date: str, end_date: str,
+                     train_days: int = 40, test_days: int = 10,
+                     n_workers: Optional[int] = None) -> Dict:
+    """
+    2604 스캐너 워크포워드 검증
+    
+    날짜별 신호는 캐시되므로 재실행 시에는 손익/최소점수 최적화만 다시 수행
+    """
+    harness = WalkForwardHarness(
+        partial(Scanner2604, use_krx=False),
+        data_manager=DataManager(),
+        param_grid={'min_score': [70.0, 75.0, 80.0, 85.0]},
+        n_workers=n_workers,
+    )
+    days = harness.trading_days(start_date, end_date)
+    purge = max(harness.param_grid['max_holding_days'])
+    report = harness.run(walk_forward_folds(days, train_days, test_days, purge=purge))
+    print(harness.format_report(report))
+    return report
+
+
 if __name__ == "__main__":
     import json
     
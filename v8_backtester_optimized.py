@@ -24,6 +24,7 @@ from dataclasses import dataclass
 from enum import Enum
 
 from scanner_2604_v8_unified import Scanner2604V8Unified, HoldingPeriod, IchimokuSignal
+from v2.core.trade_ledger import TradeLedger
 from fibonacci_target_integrated import calculate_scanner_targets
 
 
@@ -239,9 +240,14 @@ class V8BacktesterOptimized:
     def __init__(self, db_path: str = 'data/level1_prices.db'):
         self.db_path = db_path
         self.trades: List[Trade] = []
+        self.ledger = self._new_ledger()
         self._data_cache = None
         self._num_workers = min(mp.cpu_count(), 8)  # 최대 8코어 사용
         
+    @staticmethod
+    def _new_ledger() -> TradeLedger:
+        return TradeLedger(extra_columns={'recommended_holding': 'cat', 'tk_cross': bool})
+    
     def run_backtest(self, start_date: str, end_date: str, 
                      initial_capital: float = 10000000) -> Dict:
         """백테스트 실행"""
@@ -291,6 +297,7 @@ class V8BacktesterOptimized:
                     
                     if trade:
                         self.trades.append(trade)
+                        self.ledger.append_trade(trade, tk_cross=bool(trade.ichimoku_signal['tk_cross']))
                         capital += trade.pnl
                         print(f"   📈 {signal['code']}: {trade.pnl_pct:+.2f}% ({trade.holding_days}일)")
         
@@ -447,40 +454,31 @@ class V8BacktesterOptimized:
         if not self.trades:
             return {'total_trades': 0, 'win_rate': 0, 'total_return': 0, 'message': 'No trades executed'}
         
-        trades_df = pd.DataFrame([{
-            'pnl_pct': t.pnl_pct, 'win': t.pnl_pct > 0,
-            'holding_days': t.holding_days, 'exit_reason': t.exit_reason,
-            'recommended_holding': t.recommended_holding,
-            'tk_cross': t.ichimoku_signal['tk_cross']
-        } for t in self.trades])
+        ledger = self.ledger
+        returns = ledger.returns
+        wins = returns > 0
+        tk_cross = ledger['tk_cross']
         
         results = {
-            'total_trades': len(self.trades),
-            'winning_trades': int(trades_df['win'].sum()),
-            'losing_trades': len(self.trades) - int(trades_df['win'].sum()),
-            'win_rate': trades_df['win'].mean() * 100,
-            'avg_return': trades_df['pnl_pct'].mean(),
+            'total_trades': len(ledger),
+            'winning_trades': int(wins.sum()),
+            'losing_trades': len(ledger) - int(wins.sum()),
+            'win_rate': wins.mean() * 100,
+            'avg_return': returns.mean(),
             'total_return': (final - initial) / initial * 100,
-            'avg_holding_days': trades_df['holding_days'].mean(),
+            'avg_holding_days': ledger['hold_days'].mean(),
             'by_holding_period': {},
             'by_exit_reason': {},
-            'tk_cross_win_rate': trades_df[trades_df['tk_cross'] == True]['win'].mean() * 100 if len(trades_df[trades_df['tk_cross'] == True]) > 0 else 0,
-            'non_tk_cross_win_rate': trades_df[trades_df['tk_cross'] == False]['win'].mean() * 100 if len(trades_df[trades_df['tk_cross'] == False]) > 0 else 0
+            'tk_cross_win_rate': wins[tk_cross].mean() * 100 if tk_cross.any() else 0,
+            'non_tk_cross_win_rate': wins[~tk_cross].mean() * 100 if (~tk_cross).any() else 0
         }
         
-        for period in trades_df['recommended_holding'].unique():
-            period_df = trades_df[trades_df['recommended_holding'] == period]
-            results['by_holding_period'][period] = {
-                'trades': len(period_df), 'win_rate': period_df['win'].mean() * 100,
-                'avg_return': period_df['pnl_pct'].mean()
-            }
-        
-        for reason in trades_df['exit_reason'].unique():
-            reason_df = trades_df[trades_df['exit_reason'] == reason]
-            results['by_exit_reason'][reason] = {
-                'trades': len(reason_df), 'win_rate': reason_df['win'].mean() * 100,
-                'avg_return': reason_df['pnl_pct'].mean()
-            }
+        for key, column in (('by_holding_period', 'recommended_holding'), ('by_exit_reason', 'exit_reason')):
+            for group, row in ledger.breakdown(column).iterrows():
+                results[key][group] = {
+                    'trades': int(row['trades']), 'win_rate': row['win_rate'],
+                    'avg_return': row['avg_return']
+                }
         
         return results
 
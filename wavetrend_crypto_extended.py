@@ -5,12 +5,15 @@ WaveTrend 전략 - 가상화폐 확대 백테스트
 """
 
 import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
 import json
 import warnings
 warnings.filterwarnings('ignore')
 
+from crypto_batch_backtest import align_frames, group_results, run_signal_machine
+from crypto_candle_store import CryptoCandleStore, ccxt_fetcher
+from indicator_filters import wavetrend
+
 class WaveTrendCryptoBacktest:
     """WaveTrend 전략 - 확대된 가상화폐 종목"""
     
@@ -20,6 +23,7 @@ class WaveTrendCryptoBacktest:
         self.avg_len = 21
         self.os_level = -53
         self.ob_level = 53
+        self.candles = None  # CryptoCandleStore (첫 조회 시 생성)
         
         # 확대된 종목 리스트 (TOP 20)
         self.coins = [
@@ -55,13 +59,8 @@ class WaveTrendCryptoBacktest:
         """WaveTrend (LazyBear) 계산"""
         df = df.copy()
         
-        hlc3 = (df['High'] + df['Low'] + df['Close']) / 3
-        esa = hlc3.ewm(span=self.channel_len, adjust=False).mean()
-        de = abs(hlc3 - esa).ewm(span=self.channel_len, adjust=False).mean()
-        ci = (hlc3 - esa) / (0.015 * de)
-        
-        df['WT1'] = ci.ewm(span=self.avg_len, adjust=False).mean()
-        df['WT2'] = df['WT1'].rolling(window=4).mean()
+        df['WT1'], df['WT2'] = wavetrend(df['High'], df['Low'], df['Close'],
+                                         self.channel_len, self.avg_len)
         
         # 크로스오버 신호
         df['Buy_Signal'] = (df['WT1'] < self.os_level) & (df['WT1'] > df['WT2'])
@@ -70,114 +69,95 @@ class WaveTrendCryptoBacktest:
         return df
     
     def get_data(self, symbol, start_date, end_date):
-        """Binance 데이터 조회"""
+        """Binance 데이터 조회 (로컬 캔들 저장소 경유, 새 봉만 요청)"""
         try:
-            import ccxt
-            exchange = ccxt.binance({'enableRateLimit': True})
-            since = exchange.parse8601(f"{start_date}T00:00:00Z")
-            ohlcv = exchange.fetch_ohlcv(symbol, '1d', since)
+            if self.candles is None:
+                import ccxt
+                self.candles = CryptoCandleStore(fetcher=ccxt_fetcher(ccxt.binance({'enableRateLimit': True})))
+            df = self.candles.load(symbol, '1d', start_date, end_date)
             
-            if len(ohlcv) < 50:
+            if len(df) < 50:
                 return None
             
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'Open', 'High', 'Low', 'Close', 'Volume'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
-            df = df[df.index <= end_date]
-            
+            df.columns = ['Open', 'High', 'Low', 'Close', 'Volume']
             return df
         except Exception as e:
             return None
     
+    def load_frames(self, coins, start_date, end_date):
+        """코인별 일봉 {심볼: df} (데이터 없는 코인 제외)"""
+        frames = {}
+        for coin in coins:
+            df = self.get_data(coin['symbol'], start_date, end_date)
+            if df is not None:
+                frames[coin['symbol']] = df
+        return frames
+    
+    def batch_trades(self, coins, frames):
+        """전 코인을 공통 시각 격자에서 한 번에 백테스트 → {심볼: 거래 리스트}"""
+        by_symbol = {c['symbol']: c for c in coins if c['symbol'] in frames}
+        if not by_symbol:
+            return {}
+        signals = {s: self.calculate_wavetrend(frames[s]) for s in by_symbol}
+        panel = align_frames(signals, ['Close', 'WT1', 'Buy_Signal', 'Sell_Signal'])
+        cols, entry_t, exit_t = run_signal_machine(panel.flag('Buy_Signal'), panel.flag('Sell_Signal'),
+                                                   panel.active(30))
+        
+        close, wt1 = panel['Close'], panel['WT1']
+        trades = {s: [] for s in by_symbol}
+        for j, ei, xi in zip(cols.tolist(), entry_t.tolist(), exit_t.tolist()):
+            symbol = panel.symbols[j]
+            coin = by_symbol[symbol]
+            entry_price, exit_price = float(close[ei, j]), float(close[xi, j])
+            entry_date, date = panel.index[ei], panel.index[xi]
+            pnl_rate = (exit_price - entry_price) / entry_price
+            net_pnl_rate = (pnl_rate - self.fee_rate * 2) * 100
+            
+            trades[symbol].append({
+                'symbol': symbol,
+                'name': coin['name'],
+                'tier': coin['tier'],
+                'entry_date': str(entry_date)[:10],
+                'exit_date': str(date)[:10],
+                'entry_price': round(entry_price, 2),
+                'exit_price': round(exit_price, 2),
+                'entry_wt': round(float(wt1[ei, j]), 1),
+                'exit_wt': round(float(wt1[xi, j]), 1),
+                'holding_days': (date - entry_date).days,
+                'net_pnl_rate': round(net_pnl_rate, 2),
+                'result': 'WIN' if net_pnl_rate > 0 else 'LOSS'
+            })
+        return trades
+    
     def backtest_coin(self, coin, start_date='2024-01-01', end_date='2025-03-30'):
         """단일 코인 백테스트"""
-        symbol = coin['symbol']
-        name = coin['name']
-        
-        df = self.get_data(symbol, start_date, end_date)
+        df = self.get_data(coin['symbol'], start_date, end_date)
         if df is None:
             return None, "데이터 없음"
         
-        df = self.calculate_wavetrend(df)
-        
-        trades = []
-        position = None
-        entry_price = entry_date = entry_wt = None
-        
-        for i in range(30, len(df)):
-            date = df.index[i]
-            row = df.iloc[i]
-            
-            # 매수
-            if position is None and row['Buy_Signal']:
-                position = 'LONG'
-                entry_price = row['Close']
-                entry_date = date
-                entry_wt = row['WT1']
-            
-            # 매도
-            elif position == 'LONG' and row['Sell_Signal']:
-                exit_price = row['Close']
-                pnl_rate = (exit_price - entry_price) / entry_price
-                net_pnl_rate = (pnl_rate - self.fee_rate * 2) * 100
-                
-                holding_days = (pd.to_datetime(date) - pd.to_datetime(entry_date)).days
-                
-                trades.append({
-                    'symbol': symbol,
-                    'name': name,
-                    'tier': coin['tier'],
-                    'entry_date': str(entry_date)[:10],
-                    'exit_date': str(date)[:10],
-                    'entry_price': round(entry_price, 2),
-                    'exit_price': round(exit_price, 2),
-                    'entry_wt': round(entry_wt, 1),
-                    'exit_wt': round(row['WT1'], 1),
-                    'holding_days': holding_days,
-                    'net_pnl_rate': round(net_pnl_rate, 2),
-                    'result': 'WIN' if net_pnl_rate > 0 else 'LOSS'
-                })
-                position = None
-        
-        return trades, None
+        return self.batch_trades([coin], {coin['symbol']: df})[coin['symbol']], None
     
     def run(self, start_date='2024-01-01', end_date='2025-03-30'):
-        """전체 백테스트 실행"""
+        """전체 백테스트 실행 (데이터 수집 후 전 코인 배치 백테스트)"""
         print("="*70)
         print("📊 WaveTrend 가상화폐 백테스트 (확대版)")
         print(f"   기간: {start_date} ~ {end_date}")
         print(f"   대상: {len(self.coins)}개 종목")
         print("="*70)
         
-        all_trades = []
-        results_by_tier = {'Major': [], 'Large': [], 'Mid': []}
-        coin_results = []
+        frames = self.load_frames(self.coins, start_date, end_date)
+        trades_by_symbol = self.batch_trades(self.coins, frames)
+        all_trades, results_by_tier, coin_results = group_results(self.coins, trades_by_symbol)
+        summary = {c['symbol']: c for c in coin_results}
         
         for i, coin in enumerate(self.coins, 1):
             print(f"[{i:2d}/{len(self.coins)}] {coin['symbol']:<12} ({coin['name']:<18}) [{coin['tier']}]", end=' ')
             
-            trades, error = self.backtest_coin(coin, start_date, end_date)
-            
-            if trades:
-                all_trades.extend(trades)
-                results_by_tier[coin['tier']].extend(trades)
-                wins = sum(1 for t in trades if t['result'] == 'WIN')
-                win_rate = wins / len(trades) * 100
-                avg_pnl = np.mean([t['net_pnl_rate'] for t in trades])
-                
-                coin_results.append({
-                    'symbol': coin['symbol'],
-                    'name': coin['name'],
-                    'tier': coin['tier'],
-                    'trades': len(trades),
-                    'wins': wins,
-                    'win_rate': win_rate,
-                    'avg_pnl': avg_pnl
-                })
-                
-                print(f"→ {len(trades)}거래 (승: {wins}, {win_rate:.0f}%, 평균 {avg_pnl:+.1f}%)")
-            elif error:
-                print(f"→ {error}")
+            if coin['symbol'] not in frames:
+                print("→ 데이터 없음")
+            elif coin['symbol'] in summary:
+                c = summary[coin['symbol']]
+                print(f"→ {c['trades']}거래 (승: {c['wins']}, {c['win_rate']:.0f}%, 평균 {c['avg_pnl']:+.1f}%)")
             else:
                 print("→ 신호 없음")
         